@@ -0,0 +1,113 @@
+"""add_alert_execution_window
+
+Revision ID: 20261016_alert_execution_window
+Revises: 20261016_drift_state
+Create Date: 2026-10-16 15:00:00
+
+Adds get_alert_execution_window, which returns per-workflow execution
+aggregates for one (tenant, environment, time window) in a single call so
+batched alert rule evaluation can share it across every rule in the window:
+- total_executions / error_count / last_error_at
+- long_running_ms: durations above p_duration_threshold_ms (top 100)
+- consecutive_failures: current failure streak over the last 100 executions
+  (only computed when p_include_streaks is set)
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20261016_alert_execution_window'
+down_revision = '20261016_drift_state'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('''
+        CREATE OR REPLACE FUNCTION get_alert_execution_window(
+            p_tenant_id UUID,
+            p_environment_id UUID DEFAULT NULL,
+            p_time_window_minutes INTEGER DEFAULT 60,
+            p_duration_threshold_ms BIGINT DEFAULT NULL,
+            p_include_streaks BOOLEAN DEFAULT FALSE,
+            p_streak_workflow_ids TEXT[] DEFAULT NULL
+        )
+        RETURNS TABLE(
+            workflow_id TEXT,
+            workflow_name TEXT,
+            total_executions BIGINT,
+            error_count BIGINT,
+            last_error_at TIMESTAMPTZ,
+            long_running_ms BIGINT[],
+            consecutive_failures INTEGER
+        ) AS $$
+            WITH windowed AS (
+                SELECT
+                    e.workflow_id,
+                    e.workflow_name,
+                    e.status,
+                    e.started_at,
+                    COALESCE(
+                        e.execution_time::BIGINT,
+                        (EXTRACT(EPOCH FROM (e.finished_at - e.started_at)) * 1000)::BIGINT
+                    ) AS duration_ms
+                FROM executions e
+                WHERE e.tenant_id = p_tenant_id
+                  AND e.started_at >= NOW() - make_interval(mins => p_time_window_minutes)
+                  AND (p_environment_id IS NULL OR e.environment_id = p_environment_id)
+            ),
+            per_workflow AS (
+                SELECT
+                    w.workflow_id,
+                    MAX(w.workflow_name) AS workflow_name,
+                    COUNT(*)::BIGINT AS total_executions,
+                    COUNT(*) FILTER (WHERE w.status = 'error')::BIGINT AS error_count,
+                    MAX(w.started_at) FILTER (WHERE w.status = 'error') AS last_error_at,
+                    (ARRAY_AGG(w.duration_ms ORDER BY w.duration_ms DESC) FILTER (
+                        WHERE p_duration_threshold_ms IS NOT NULL
+                          AND w.status <> 'running'
+                          AND w.duration_ms > p_duration_threshold_ms
+                    ))[1:100] AS long_running_ms
+                FROM windowed w
+                GROUP BY w.workflow_id
+            ),
+            candidates AS (
+                SELECT pw.workflow_id FROM per_workflow pw
+                UNION
+                SELECT ids.workflow_id
+                FROM unnest(COALESCE(p_streak_workflow_ids, ARRAY[]::TEXT[])) AS ids(workflow_id)
+            )
+            SELECT
+                c.workflow_id,
+                pw.workflow_name,
+                COALESCE(pw.total_executions, 0)::BIGINT,
+                COALESCE(pw.error_count, 0)::BIGINT,
+                pw.last_error_at,
+                pw.long_running_ms,
+                CASE WHEN p_include_streaks THEN (
+                    SELECT COUNT(*)::INTEGER
+                    FROM (
+                        SELECT SUM(CASE WHEN r.status = 'error' THEN 0 ELSE 1 END)
+                            OVER (ORDER BY r.started_at DESC ROWS UNBOUNDED PRECEDING) AS non_errors_so_far
+                        FROM (
+                            SELECT x.status, x.started_at
+                            FROM executions x
+                            WHERE x.tenant_id = p_tenant_id
+                              AND x.workflow_id = c.workflow_id
+                              AND (p_environment_id IS NULL OR x.environment_id = p_environment_id)
+                            ORDER BY x.started_at DESC
+                            LIMIT 100
+                        ) r
+                    ) streak
+                    WHERE streak.non_errors_so_far = 0
+                ) END
+            FROM candidates c
+            LEFT JOIN per_workflow pw ON pw.workflow_id IS NOT DISTINCT FROM c.workflow_id;
+        $$ LANGUAGE sql STABLE;
+    ''')
+
+
+def downgrade() -> None:
+    op.execute(
+        'DROP FUNCTION IF EXISTS get_alert_execution_window(UUID, UUID, INTEGER, BIGINT, BOOLEAN, TEXT[]);'
+    )
@@ -0,0 +1,66 @@
+"""add_entitlements_version_triggers
+
+Revision ID: 20261016_entitlements_version_triggers
+Revises: 20261016_scheduler_lease_last_run
+Create Date: 2026-10-16 21:00:00
+
+Entitlements are cached per worker and revalidated against
+tenant_plans.entitlements_version. A tenant's entitlements also depend on
+tenant_provider_subscriptions (the effective plan is resolved from them) and
+tenant_feature_overrides, so every write to either table bumps the version of
+the tenant's active tenant_plans row. Other workers then drop stale
+entitlements on their next version check instead of at TTL expiry.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20261016_entitlements_version_triggers'
+down_revision = '20261016_scheduler_lease_last_run'
+branch_labels = None
+depends_on = None
+
+
+TABLES = ['tenant_provider_subscriptions', 'tenant_feature_overrides']
+
+
+def upgrade() -> None:
+    op.execute('''
+        CREATE OR REPLACE FUNCTION bump_tenant_entitlements_version()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            UPDATE tenant_plans
+            SET entitlements_version = entitlements_version + 1,
+                updated_at = NOW()
+            WHERE is_active = true
+              AND tenant_id IN (
+                  CASE WHEN TG_OP <> 'INSERT' THEN OLD.tenant_id END,
+                  CASE WHEN TG_OP <> 'DELETE' THEN NEW.tenant_id END
+              );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    ''')
+
+    for table in TABLES:
+        op.execute(f'''
+            DROP TRIGGER IF EXISTS {table}_entitlements_version_write ON {table};
+            CREATE TRIGGER {table}_entitlements_version_write
+                AFTER INSERT OR DELETE ON {table}
+                FOR EACH ROW
+                EXECUTE FUNCTION bump_tenant_entitlements_version();
+
+            DROP TRIGGER IF EXISTS {table}_entitlements_version_update ON {table};
+            CREATE TRIGGER {table}_entitlements_version_update
+                AFTER UPDATE ON {table}
+                FOR EACH ROW
+                WHEN (OLD.* IS DISTINCT FROM NEW.*)
+                EXECUTE FUNCTION bump_tenant_entitlements_version();
+        ''')
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.execute(f'DROP TRIGGER IF EXISTS {table}_entitlements_version_update ON {table};')
+        op.execute(f'DROP TRIGGER IF EXISTS {table}_entitlements_version_write ON {table};')
+    op.execute('DROP FUNCTION IF EXISTS bump_tenant_entitlements_version();')
@@ -0,0 +1,42 @@
+"""add_environment_drift_state
+
+Revision ID: 20261016_drift_state
+Revises: 20261016_scheduler_leases
+Create Date: 2026-10-16 14:00:00
+
+Adds per-environment state for incremental drift detection:
+- git_ref / git_head_sha: branch, environment type and head commit last compared
+- git_workflows: workflow names (and paths) present in Git at that commit
+- workflow_results: per runtime workflow, its n8n fingerprint (versionId,
+  updatedAt, active, name) and the drift result computed for it
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20261016_drift_state'
+down_revision = '20261016_scheduler_leases'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('''
+        CREATE TABLE IF NOT EXISTS environment_drift_state (
+            environment_id UUID PRIMARY KEY REFERENCES environments(id) ON DELETE CASCADE,
+            tenant_id UUID NOT NULL REFERENCES tenants(id) ON DELETE CASCADE,
+            state_version INTEGER NOT NULL DEFAULT 1,
+            git_ref TEXT NULL,
+            git_head_sha TEXT NULL,
+            git_workflows JSONB NOT NULL DEFAULT '{}'::jsonb,
+            workflow_results JSONB NOT NULL DEFAULT '{}'::jsonb,
+            checked_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_environment_drift_state_tenant
+        ON environment_drift_state (tenant_id);
+    ''')
+
+
+def downgrade() -> None:
+    op.execute('DROP TABLE IF EXISTS environment_drift_state;')
@@ -0,0 +1,44 @@
+"""add_execution_sync_cursor
+
+Revision ID: 20261016_execution_sync_cursor
+Revises: db76d7da3b3a
+Create Date: 2026-10-16 09:00:00
+
+Adds a per-environment high-water mark for incremental execution sync:
+- execution_sync_cursor: newest n8n execution ID already ingested
+- execution_sync_cursor_started_at: startedAt of that execution
+- last_execution_sync_at: when the cursor was last advanced
+
+Also adds a partial index for the in-flight execution refresh query.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20261016_execution_sync_cursor'
+down_revision = 'db76d7da3b3a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('''
+        ALTER TABLE environments ADD COLUMN IF NOT EXISTS execution_sync_cursor TEXT NULL;
+        ALTER TABLE environments ADD COLUMN IF NOT EXISTS execution_sync_cursor_started_at TIMESTAMPTZ NULL;
+        ALTER TABLE environments ADD COLUMN IF NOT EXISTS last_execution_sync_at TIMESTAMPTZ NULL;
+    ''')
+
+    op.execute('''
+        CREATE INDEX IF NOT EXISTS idx_executions_unfinished
+        ON executions (tenant_id, environment_id, started_at DESC)
+        WHERE status IN ('new', 'running', 'waiting');
+    ''')
+
+
+def downgrade() -> None:
+    op.execute('DROP INDEX IF EXISTS idx_executions_unfinished;')
+    op.execute('''
+        ALTER TABLE environments DROP COLUMN IF EXISTS last_execution_sync_at;
+        ALTER TABLE environments DROP COLUMN IF EXISTS execution_sync_cursor_started_at;
+        ALTER TABLE environments DROP COLUMN IF EXISTS execution_sync_cursor;
+    ''')
@@ -0,0 +1,32 @@
+"""add_execution_sync_resume_cursor
+
+Revision ID: 20261016_execution_sync_resume
+Revises: 20261016_workflow_matrix_versions
+Create Date: 2026-10-16 20:00:00
+
+Makes the execution sync cursor a low-water mark and lets capped runs resume:
+- execution_sync_cursor now only advances past executions that were stored,
+  have finished and leave no unseen IDs below them
+- execution_sync_resume_cursor: oldest execution ID read by a run that hit
+  its per-run cap; the next run continues below it down to the cursor
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20261016_execution_sync_resume'
+down_revision = '20261016_workflow_matrix_versions'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('''
+        ALTER TABLE environments ADD COLUMN IF NOT EXISTS execution_sync_resume_cursor TEXT NULL;
+    ''')
+
+
+def downgrade() -> None:
+    op.execute('''
+        ALTER TABLE environments DROP COLUMN IF EXISTS execution_sync_resume_cursor;
+    ''')
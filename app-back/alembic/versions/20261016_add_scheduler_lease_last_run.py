@@ -0,0 +1,123 @@
+"""add_scheduler_lease_last_run
+
+Revision ID: 20261016_scheduler_lease_last_run
+Revises: 20261016_execution_sync_resume
+Create Date: 2026-10-16 20:30:00
+
+Lets a worker that takes over a scheduler shard continue the previous
+owner's schedule instead of running the shard straight away:
+- scheduler_leases.last_run_at: when the shard behind the lease last ran
+- record_scheduler_runs RPC: stamps last_run_at for the caller's leases
+- claim_scheduler_leases now returns the seconds since each held shard last
+  ran; it and scheduler_leave expire released leases instead of deleting
+  them, so last_run_at survives handovers and restarts
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20261016_scheduler_lease_last_run'
+down_revision = '20261016_execution_sync_resume'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('''
+        ALTER TABLE scheduler_leases ADD COLUMN IF NOT EXISTS last_run_at TIMESTAMPTZ NULL;
+    ''')
+
+    op.execute('''
+        DROP FUNCTION IF EXISTS claim_scheduler_leases(TEXT, TEXT[], INTEGER);
+
+        CREATE FUNCTION claim_scheduler_leases(p_owner TEXT, p_keys TEXT[], p_ttl_seconds INTEGER)
+        RETURNS TABLE (held_key TEXT, seconds_since_run DOUBLE PRECISION) AS $$
+        BEGIN
+            -- Hand back shards this worker no longer wants, keeping their last run
+            UPDATE scheduler_leases
+            SET expires_at = NOW()
+            WHERE owner = p_owner AND expires_at > NOW() AND NOT (lease_key = ANY(p_keys));
+
+            -- Renew our leases and take over free or expired ones
+            INSERT INTO scheduler_leases (lease_key, owner, expires_at, acquired_at)
+            SELECT k, p_owner, NOW() + make_interval(secs => p_ttl_seconds), NOW()
+            FROM unnest(p_keys) AS k
+            ON CONFLICT (lease_key) DO UPDATE
+                SET owner = EXCLUDED.owner,
+                    expires_at = EXCLUDED.expires_at,
+                    acquired_at = CASE
+                        WHEN scheduler_leases.owner = EXCLUDED.owner THEN scheduler_leases.acquired_at
+                        ELSE NOW()
+                    END
+                WHERE scheduler_leases.owner = EXCLUDED.owner
+                   OR scheduler_leases.expires_at < NOW();
+
+            RETURN QUERY
+            SELECT l.lease_key, EXTRACT(EPOCH FROM NOW() - l.last_run_at)::DOUBLE PRECISION
+            FROM scheduler_leases l
+            WHERE l.owner = p_owner AND l.expires_at > NOW();
+        END;
+        $$ LANGUAGE plpgsql;
+    ''')
+
+    op.execute('''
+        CREATE OR REPLACE FUNCTION record_scheduler_runs(p_owner TEXT, p_keys TEXT[])
+        RETURNS VOID AS $$
+            UPDATE scheduler_leases
+            SET last_run_at = NOW()
+            WHERE owner = p_owner AND lease_key = ANY(p_keys);
+        $$ LANGUAGE sql;
+    ''')
+
+    op.execute('''
+        CREATE OR REPLACE FUNCTION scheduler_leave(p_worker_id TEXT)
+        RETURNS VOID AS $$
+        BEGIN
+            UPDATE scheduler_leases SET expires_at = NOW()
+            WHERE owner = p_worker_id AND expires_at > NOW();
+            DELETE FROM scheduler_workers WHERE worker_id = p_worker_id;
+        END;
+        $$ LANGUAGE plpgsql;
+    ''')
+
+
+def downgrade() -> None:
+    op.execute('''
+        CREATE OR REPLACE FUNCTION scheduler_leave(p_worker_id TEXT)
+        RETURNS VOID AS $$
+        BEGIN
+            DELETE FROM scheduler_leases WHERE owner = p_worker_id;
+            DELETE FROM scheduler_workers WHERE worker_id = p_worker_id;
+        END;
+        $$ LANGUAGE plpgsql;
+    ''')
+    op.execute('DROP FUNCTION IF EXISTS record_scheduler_runs(TEXT, TEXT[]);')
+    op.execute('''
+        DROP FUNCTION IF EXISTS claim_scheduler_leases(TEXT, TEXT[], INTEGER);
+
+        CREATE FUNCTION claim_scheduler_leases(p_owner TEXT, p_keys TEXT[], p_ttl_seconds INTEGER)
+        RETURNS SETOF TEXT AS $$
+        BEGIN
+            DELETE FROM scheduler_leases
+            WHERE owner = p_owner AND NOT (lease_key = ANY(p_keys));
+
+            INSERT INTO scheduler_leases (lease_key, owner, expires_at, acquired_at)
+            SELECT k, p_owner, NOW() + make_interval(secs => p_ttl_seconds), NOW()
+            FROM unnest(p_keys) AS k
+            ON CONFLICT (lease_key) DO UPDATE
+                SET owner = EXCLUDED.owner,
+                    expires_at = EXCLUDED.expires_at,
+                    acquired_at = CASE
+                        WHEN scheduler_leases.owner = EXCLUDED.owner THEN scheduler_leases.acquired_at
+                        ELSE NOW()
+                    END
+                WHERE scheduler_leases.owner = EXCLUDED.owner
+                   OR scheduler_leases.expires_at < NOW();
+
+            RETURN QUERY
+            SELECT lease_key FROM scheduler_leases
+            WHERE owner = p_owner AND expires_at > NOW();
+        END;
+        $$ LANGUAGE plpgsql;
+    ''')
+    op.execute('ALTER TABLE scheduler_leases DROP COLUMN IF EXISTS last_run_at;')
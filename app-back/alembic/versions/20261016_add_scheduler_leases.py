@@ -0,0 +1,101 @@
+"""add_scheduler_leases
+
+Revision ID: 20261016_scheduler_leases
+Revises: 20261016_execution_sync_cursor
+Create Date: 2026-10-16 12:00:00
+
+Adds worker membership and shard leases for the background scheduler runtime:
+- scheduler_workers: API workers running schedulers, with their last heartbeat
+- scheduler_leases: which worker owns each job shard, and until when
+- scheduler_heartbeat / claim_scheduler_leases / scheduler_leave RPCs, so each
+  lease operation is one atomic round-trip evaluated with the database clock
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20261016_scheduler_leases'
+down_revision = '20261016_execution_sync_cursor'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('''
+        CREATE TABLE IF NOT EXISTS scheduler_workers (
+            worker_id TEXT PRIMARY KEY,
+            heartbeat_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        );
+
+        CREATE TABLE IF NOT EXISTS scheduler_leases (
+            lease_key TEXT PRIMARY KEY,
+            owner TEXT NOT NULL,
+            expires_at TIMESTAMPTZ NOT NULL,
+            acquired_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_scheduler_leases_owner ON scheduler_leases (owner);
+    ''')
+
+    op.execute('''
+        CREATE OR REPLACE FUNCTION scheduler_heartbeat(p_worker_id TEXT, p_ttl_seconds INTEGER)
+        RETURNS SETOF TEXT AS $$
+        BEGIN
+            INSERT INTO scheduler_workers (worker_id, heartbeat_at)
+            VALUES (p_worker_id, NOW())
+            ON CONFLICT (worker_id) DO UPDATE SET heartbeat_at = NOW();
+
+            DELETE FROM scheduler_workers
+            WHERE heartbeat_at < NOW() - make_interval(secs => p_ttl_seconds);
+
+            RETURN QUERY SELECT worker_id FROM scheduler_workers ORDER BY worker_id;
+        END;
+        $$ LANGUAGE plpgsql;
+    ''')
+
+    op.execute('''
+        CREATE OR REPLACE FUNCTION claim_scheduler_leases(p_owner TEXT, p_keys TEXT[], p_ttl_seconds INTEGER)
+        RETURNS SETOF TEXT AS $$
+        BEGIN
+            -- Hand back shards this worker no longer wants
+            DELETE FROM scheduler_leases
+            WHERE owner = p_owner AND NOT (lease_key = ANY(p_keys));
+
+            -- Renew our leases and take over free or expired ones
+            INSERT INTO scheduler_leases (lease_key, owner, expires_at, acquired_at)
+            SELECT k, p_owner, NOW() + make_interval(secs => p_ttl_seconds), NOW()
+            FROM unnest(p_keys) AS k
+            ON CONFLICT (lease_key) DO UPDATE
+                SET owner = EXCLUDED.owner,
+                    expires_at = EXCLUDED.expires_at,
+                    acquired_at = CASE
+                        WHEN scheduler_leases.owner = EXCLUDED.owner THEN scheduler_leases.acquired_at
+                        ELSE NOW()
+                    END
+                WHERE scheduler_leases.owner = EXCLUDED.owner
+                   OR scheduler_leases.expires_at < NOW();
+
+            RETURN QUERY
+            SELECT lease_key FROM scheduler_leases
+            WHERE owner = p_owner AND expires_at > NOW();
+        END;
+        $$ LANGUAGE plpgsql;
+    ''')
+
+    op.execute('''
+        CREATE OR REPLACE FUNCTION scheduler_leave(p_worker_id TEXT)
+        RETURNS VOID AS $$
+        BEGIN
+            DELETE FROM scheduler_leases WHERE owner = p_worker_id;
+            DELETE FROM scheduler_workers WHERE worker_id = p_worker_id;
+        END;
+        $$ LANGUAGE plpgsql;
+    ''')
+
+
+def downgrade() -> None:
+    op.execute('DROP FUNCTION IF EXISTS scheduler_leave(TEXT);')
+    op.execute('DROP FUNCTION IF EXISTS claim_scheduler_leases(TEXT, TEXT[], INTEGER);')
+    op.execute('DROP FUNCTION IF EXISTS scheduler_heartbeat(TEXT, INTEGER);')
+    op.execute('DROP TABLE IF EXISTS scheduler_leases;')
+    op.execute('DROP TABLE IF EXISTS scheduler_workers;')
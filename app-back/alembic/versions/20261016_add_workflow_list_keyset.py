@@ -0,0 +1,169 @@
+"""add_workflow_list_keyset
+
+Revision ID: 20261016_workflow_list_keyset
+Revises: 20261016_alert_execution_window
+Create Date: 2026-10-16 16:00:00
+
+Server-side pagination for the workflows page:
+- workflow_tag_names(): tag names of a workflow_data->'tags' array (object
+  tags by name, plain string tags as-is), GIN-indexed so tag filters are
+  answered by the index instead of in Python
+- expression indexes on (tenant_id, environment_id, sort key, id) for the
+  updatedAt and name sorts, so keyset pages are index range scans
+- get_workflow_list_page(): filters, sorts and pages workflow_env_map in the
+  database and returns only the list-view projection (never workflow_data).
+  Pages after the first use a keyset cursor (p_after_value, p_after_id);
+  p_offset remains for jumping straight to a page number.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20261016_workflow_list_keyset'
+down_revision = '20261016_alert_execution_window'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('''
+        CREATE OR REPLACE FUNCTION workflow_tag_names(p_tags JSONB)
+        RETURNS TEXT[] AS $$
+            SELECT COALESCE(ARRAY_AGG(names.tag_name), ARRAY[]::TEXT[])
+            FROM (
+                SELECT CASE jsonb_typeof(t)
+                           WHEN 'object' THEN t->>'name'
+                           WHEN 'string' THEN t #>> '{}'
+                       END AS tag_name
+                FROM jsonb_array_elements(
+                    CASE WHEN jsonb_typeof(p_tags) = 'array' THEN p_tags ELSE '[]'::JSONB END
+                ) AS t
+            ) names
+            WHERE names.tag_name IS NOT NULL;
+        $$ LANGUAGE sql IMMUTABLE;
+    ''')
+
+    op.execute('''
+        CREATE INDEX IF NOT EXISTS idx_workflow_env_map_tag_names
+        ON workflow_env_map USING GIN (workflow_tag_names(workflow_data->'tags'));
+    ''')
+
+    op.execute('''
+        CREATE INDEX IF NOT EXISTS idx_workflow_env_map_list_updated_at
+        ON workflow_env_map (tenant_id, environment_id, (COALESCE(workflow_data->>'updatedAt', '')), id);
+    ''')
+
+    op.execute('''
+        CREATE INDEX IF NOT EXISTS idx_workflow_env_map_list_name
+        ON workflow_env_map (tenant_id, environment_id, (COALESCE(workflow_data->>'name', '')), id);
+    ''')
+
+    op.execute('''
+        CREATE OR REPLACE FUNCTION get_workflow_list_page(
+            p_tenant_id UUID,
+            p_environment_id UUID,
+            p_page_size INTEGER DEFAULT 50,
+            p_sort_field TEXT DEFAULT 'updatedAt',
+            p_sort_desc BOOLEAN DEFAULT TRUE,
+            p_after_value TEXT DEFAULT NULL,
+            p_after_id UUID DEFAULT NULL,
+            p_offset INTEGER DEFAULT 0,
+            p_search TEXT DEFAULT NULL,
+            p_tags TEXT[] DEFAULT NULL,
+            p_active TEXT DEFAULT NULL,
+            p_excluded_statuses TEXT[] DEFAULT ARRAY['missing', 'deleted', 'ignored'],
+            p_include_total BOOLEAN DEFAULT TRUE
+        )
+        RETURNS TABLE(
+            id UUID,
+            canonical_id UUID,
+            n8n_workflow_id TEXT,
+            last_env_sync_at TIMESTAMPTZ,
+            linked_at TIMESTAMPTZ,
+            status TEXT,
+            workflow_name TEXT,
+            workflow_description TEXT,
+            workflow_active TEXT,
+            workflow_tags JSONB,
+            workflow_created_at TEXT,
+            workflow_updated_at TEXT,
+            sort_value TEXT,
+            total_count BIGINT
+        ) AS $$
+        DECLARE
+            v_sort_key TEXT;
+            v_direction TEXT := CASE WHEN p_sort_desc THEN 'DESC' ELSE 'ASC' END;
+            v_comparison TEXT := CASE WHEN p_sort_desc THEN '<' ELSE '>' END;
+            v_filters TEXT := $f$
+                m.tenant_id = $1
+                AND m.environment_id = $2
+                AND m.n8n_workflow_id IS NOT NULL
+                AND (m.status IS NULL OR m.status <> ALL($3))
+                AND ($4::TEXT IS NULL
+                     OR m.workflow_data->>'name' ILIKE '%' || $4 || '%'
+                     OR m.workflow_data->>'description' ILIKE '%' || $4 || '%')
+                AND ($5::TEXT[] IS NULL OR workflow_tag_names(m.workflow_data->'tags') && $5)
+                AND ($6::TEXT IS NULL OR m.workflow_data->>'active' = $6)
+            $f$;
+            v_total BIGINT;
+        BEGIN
+            -- Sort keys match the expression indexes; COALESCE keeps NULLs keyset-comparable
+            v_sort_key := format(
+                'COALESCE(m.workflow_data->>%L, %L)',
+                CASE p_sort_field
+                    WHEN 'name' THEN 'name'
+                    WHEN 'createdAt' THEN 'createdAt'
+                    WHEN 'active' THEN 'active'
+                    ELSE 'updatedAt'
+                END,
+                ''
+            );
+
+            IF p_include_total THEN
+                EXECUTE format('SELECT COUNT(*) FROM workflow_env_map m WHERE %s', v_filters)
+                INTO v_total
+                USING p_tenant_id, p_environment_id, p_excluded_statuses, p_search, p_tags, p_active;
+            END IF;
+
+            RETURN QUERY EXECUTE format(
+                $q$
+                SELECT
+                    m.id,
+                    m.canonical_id,
+                    m.n8n_workflow_id,
+                    m.last_env_sync_at,
+                    m.linked_at,
+                    m.status,
+                    m.workflow_data->>'name',
+                    m.workflow_data->>'description',
+                    m.workflow_data->>'active',
+                    m.workflow_data->'tags',
+                    m.workflow_data->>'createdAt',
+                    m.workflow_data->>'updatedAt',
+                    %2$s,
+                    $7
+                FROM workflow_env_map m
+                WHERE %1$s
+                  AND ($8::TEXT IS NULL OR (%2$s, m.id) %3$s ($8, $9))
+                ORDER BY %2$s %4$s, m.id %4$s
+                OFFSET $10
+                LIMIT $11
+                $q$,
+                v_filters, v_sort_key, v_comparison, v_direction
+            )
+            USING p_tenant_id, p_environment_id, p_excluded_statuses, p_search, p_tags, p_active,
+                  v_total, p_after_value, p_after_id, GREATEST(p_offset, 0), p_page_size;
+        END;
+        $$ LANGUAGE plpgsql STABLE;
+    ''')
+
+
+def downgrade() -> None:
+    op.execute(
+        'DROP FUNCTION IF EXISTS get_workflow_list_page('
+        'UUID, UUID, INTEGER, TEXT, BOOLEAN, TEXT, UUID, INTEGER, TEXT, TEXT[], TEXT, TEXT[], BOOLEAN);'
+    )
+    op.execute('DROP INDEX IF EXISTS idx_workflow_env_map_list_name;')
+    op.execute('DROP INDEX IF EXISTS idx_workflow_env_map_list_updated_at;')
+    op.execute('DROP INDEX IF EXISTS idx_workflow_env_map_tag_names;')
+    op.execute('DROP FUNCTION IF EXISTS workflow_tag_names(JSONB);')
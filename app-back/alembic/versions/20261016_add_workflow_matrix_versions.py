@@ -0,0 +1,146 @@
+"""add_workflow_matrix_versions
+
+Revision ID: 20261016_workflow_matrix_versions
+Revises: 20261016_workflow_list_keyset
+Create Date: 2026-10-16 18:00:00
+
+Change log for the workflow × environment matrix projection:
+- workflow_matrix_versions holds one row per (tenant, canonical workflow) whose
+  version is bumped from a shared sequence whenever an input of that matrix row
+  changes. The nil canonical_id marks tenant-wide changes (environments).
+- Row triggers on workflow_env_map, canonical_workflow_git_state and
+  canonical_workflows bump the affected canonical workflows; UPDATE triggers
+  only fire when a column the matrix reads changes, so routine sync timestamps
+  do not invalidate anything.
+- A trigger on environments bumps the tenant-wide row when a column shown in
+  the matrix changes. Environment columns are compared through to_jsonb since
+  not every deployment has all of them.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20261016_workflow_matrix_versions'
+down_revision = '20261016_workflow_list_keyset'
+branch_labels = None
+depends_on = None
+
+
+# (table, columns whose change alters the matrix)
+CANONICAL_TABLES = [
+    ('workflow_env_map', ['canonical_id', 'environment_id', 'status', 'env_content_hash', 'n8n_workflow_id', 'n8n_updated_at']),
+    ('canonical_workflow_git_state', ['git_content_hash', 'last_repo_sync_at']),
+    ('canonical_workflows', ['display_name', 'created_at', 'deleted_at']),
+]
+
+
+def upgrade() -> None:
+    op.execute('''
+        CREATE SEQUENCE IF NOT EXISTS workflow_matrix_version_seq;
+
+        CREATE TABLE IF NOT EXISTS workflow_matrix_versions (
+            tenant_id UUID NOT NULL,
+            canonical_id UUID NOT NULL,
+            version BIGINT NOT NULL,
+            PRIMARY KEY (tenant_id, canonical_id)
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_workflow_matrix_versions_tenant_version
+        ON workflow_matrix_versions (tenant_id, version);
+    ''')
+
+    op.execute('''
+        CREATE OR REPLACE FUNCTION touch_workflow_matrix(p_tenant_id UUID, p_canonical_id UUID)
+        RETURNS VOID AS $$
+            INSERT INTO workflow_matrix_versions (tenant_id, canonical_id, version)
+            VALUES (p_tenant_id, p_canonical_id, nextval('workflow_matrix_version_seq'))
+            ON CONFLICT (tenant_id, canonical_id) DO UPDATE SET version = EXCLUDED.version;
+        $$ LANGUAGE sql;
+    ''')
+
+    op.execute('''
+        CREATE OR REPLACE FUNCTION bump_workflow_matrix_version()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.canonical_id IS NOT NULL THEN
+                PERFORM touch_workflow_matrix(OLD.tenant_id, OLD.canonical_id);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.canonical_id IS NOT NULL THEN
+                IF TG_OP = 'INSERT' THEN
+                    PERFORM touch_workflow_matrix(NEW.tenant_id, NEW.canonical_id);
+                ELSIF NEW.canonical_id IS DISTINCT FROM OLD.canonical_id THEN
+                    PERFORM touch_workflow_matrix(NEW.tenant_id, NEW.canonical_id);
+                END IF;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    ''')
+
+    op.execute('''
+        CREATE OR REPLACE FUNCTION bump_workflow_matrix_tenant_version()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            v_old JSONB := CASE WHEN TG_OP <> 'INSERT' THEN to_jsonb(OLD) END;
+            v_new JSONB := CASE WHEN TG_OP <> 'DELETE' THEN to_jsonb(NEW) END;
+            v_column TEXT;
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                FOREACH v_column IN ARRAY TG_ARGV LOOP
+                    IF v_old->v_column IS DISTINCT FROM v_new->v_column THEN
+                        PERFORM touch_workflow_matrix(
+                            (v_new->>'tenant_id')::UUID, '00000000-0000-0000-0000-000000000000'
+                        );
+                        RETURN NULL;
+                    END IF;
+                END LOOP;
+                RETURN NULL;
+            END IF;
+
+            PERFORM touch_workflow_matrix(
+                (COALESCE(v_new, v_old)->>'tenant_id')::UUID, '00000000-0000-0000-0000-000000000000'
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    ''')
+
+    for table, columns in CANONICAL_TABLES:
+        old_columns = ', '.join(f'OLD.{column}' for column in columns)
+        new_columns = ', '.join(f'NEW.{column}' for column in columns)
+        op.execute(f'''
+            DROP TRIGGER IF EXISTS {table}_matrix_version_write ON {table};
+            CREATE TRIGGER {table}_matrix_version_write
+                AFTER INSERT OR DELETE ON {table}
+                FOR EACH ROW
+                EXECUTE FUNCTION bump_workflow_matrix_version();
+
+            DROP TRIGGER IF EXISTS {table}_matrix_version_update ON {table};
+            CREATE TRIGGER {table}_matrix_version_update
+                AFTER UPDATE ON {table}
+                FOR EACH ROW
+                WHEN (({old_columns}) IS DISTINCT FROM ({new_columns}))
+                EXECUTE FUNCTION bump_workflow_matrix_version();
+        ''')
+
+    op.execute('''
+        DROP TRIGGER IF EXISTS environments_matrix_version ON environments;
+        CREATE TRIGGER environments_matrix_version
+            AFTER INSERT OR UPDATE OR DELETE ON environments
+            FOR EACH ROW
+            EXECUTE FUNCTION bump_workflow_matrix_tenant_version(
+                'is_active', 'n8n_name', 'n8n_type', 'environment_class'
+            );
+    ''')
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS environments_matrix_version ON environments;')
+    for table, _ in reversed(CANONICAL_TABLES):
+        op.execute(f'DROP TRIGGER IF EXISTS {table}_matrix_version_update ON {table};')
+        op.execute(f'DROP TRIGGER IF EXISTS {table}_matrix_version_write ON {table};')
+    op.execute('DROP FUNCTION IF EXISTS bump_workflow_matrix_tenant_version();')
+    op.execute('DROP FUNCTION IF EXISTS bump_workflow_matrix_version();')
+    op.execute('DROP FUNCTION IF EXISTS touch_workflow_matrix(UUID, UUID);')
+    op.execute('DROP TABLE IF EXISTS workflow_matrix_versions;')
+    op.execute('DROP SEQUENCE IF EXISTS workflow_matrix_version_seq;')
@@ -7,6 +7,7 @@ from enum import Enum
 import stripe
 
 from app.services.database import db_service
+from app.services.auth_service import principal_cache
 from app.services.stripe_service import stripe_service
 from app.core.config import settings
 from app.api.endpoints.admin_audit import create_audit_log
@@ -411,6 +412,7 @@ async def change_tenant_plan(
         db_service.client.table("tenants").update({
             "subscription_tier": new_plan
         }).eq("id", tenant_id).execute()
+        principal_cache.invalidate_tenant(tenant_id)
 
         # Create audit log
         await create_audit_log(
@@ -531,6 +533,7 @@ async def cancel_tenant_subscription(
                 "subscription_tier": "free",
                 "status": "cancelled"
             }).eq("id", tenant_id).execute()
+            principal_cache.invalidate_tenant(tenant_id)
 
         # Audit log
         await create_audit_log(
@@ -662,6 +662,7 @@ async def update_plan_metadata(
         if update_data:
             update_data["updated_at"] = datetime.utcnow().isoformat()
             db_service.client.table("plans").update(update_data).eq("id", plan_id).execute()
+            entitlements_service.clear_cache()
         
         # Fetch updated plan
         updated = db_service.client.table("plans").select(
@@ -788,6 +789,7 @@ async def update_plan_feature_requirement(
         if update_data:
             update_data["updated_at"] = datetime.utcnow().isoformat()
             db_service.client.table("plan_feature_requirements").update(update_data).eq("feature_name", feature_name).execute()
+            entitlements_service.clear_cache()
         
         # Fetch updated requirement
         updated = db_service.client.table("plan_feature_requirements").select("*").eq("feature_name", feature_name).single().execute()
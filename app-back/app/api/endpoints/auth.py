@@ -7,7 +7,8 @@ from app.services.auth_service import (
     supabase_auth_service,
     get_current_user,
     get_current_user_optional,
-    create_impersonation_token
+    create_impersonation_token,
+    principal_cache,
 )
 from app.services.database import db_service
 from app.services.feature_service import feature_service
@@ -445,6 +446,7 @@ async def onboarding_select_plan(
     db_service.client.table("tenants").update({
         "subscription_tier": request.plan_name
     }).eq("id", tenant["id"]).execute()
+    principal_cache.invalidate_tenant(tenant["id"])
     
     return {
         "success": True,
@@ -488,6 +490,7 @@ async def onboarding_payment(
         db_service.client.table("tenants").update({
             "status": "active"
         }).eq("id", tenant["id"]).execute()
+        principal_cache.invalidate_tenant(tenant["id"])
         
         return {
             "success": True,
@@ -699,12 +702,14 @@ async def onboarding_complete(
         db_service.client.table("tenants").update({
             "status": "active"
         }).eq("id", tenant["id"]).execute()
+        principal_cache.invalidate_tenant(tenant["id"])
 
     # Mark user onboarding as complete (optional - column may not exist)
     try:
         db_service.client.table("users").update({
             "onboarding_completed": True
         }).eq("id", user["id"]).execute()
+        principal_cache.invalidate_user(user["id"])
     except Exception:
         # Column may not exist in older schemas - that's OK
         pass
@@ -972,6 +977,7 @@ async def update_current_user(
         response = db_service.client.table("users").update(update_data).eq(
             "id", user["id"]
         ).eq("tenant_id", tenant["id"]).execute()
+        principal_cache.invalidate_user(user["id"])
 
         if not response.data or len(response.data) == 0:
             raise HTTPException(
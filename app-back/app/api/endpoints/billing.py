@@ -24,7 +24,7 @@ from app.schemas.billing import (
 from app.services.database import db_service
 from app.services.stripe_service import stripe_service
 from app.services.tenant_plan_service import set_tenant_plan
-from app.services.auth_service import get_current_user
+from app.services.auth_service import get_current_user, principal_cache
 from app.services.agency_billing_service import upsert_subscription_items
 from app.services.entitlements_service import entitlements_service
 from app.services.feature_service import feature_service
@@ -1047,6 +1047,7 @@ async def handle_checkout_completed(session):
             db_service.client.table("tenants").update({
                 "status": "active"
             }).eq("id", tenant_id).execute()
+            principal_cache.invalidate_tenant(tenant_id)
 
         logger.info(f"Successfully processed checkout.session.completed for tenant {tenant_id}, plan: {next_plan}")
 
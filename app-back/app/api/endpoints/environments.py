@@ -23,6 +23,7 @@ from app.services.background_job_service import (
     BackgroundJobType
 )
 from app.services.sync_orchestrator_service import sync_orchestrator
+from app.services.execution_ingestion_service import execution_ingestion_service
 from app.api.endpoints.sse import emit_sync_progress
 from app.services.environment_action_guard import (
     environment_action_guard,
@@ -1005,13 +1006,16 @@ async def _sync_environment_background(
                 message="Syncing executions...",
                 tenant_id=tenant_id
             )
-            executions = await adapter.get_executions(limit=250)
-            synced_executions = await db_service.sync_executions_from_n8n(
+            ingestion = await execution_ingestion_service.ingest_environment(
                 tenant_id,
                 environment_id,
-                executions
+                environment,
+                adapter
+            )
+            sync_results["executions"]["synced"] = ingestion["synced"] + ingestion["refreshed"]
+            sync_results["executions"]["errors"].extend(
+                f"Execution {f['key']}: {f['error']}" for f in ingestion["failed"]
             )
-            sync_results["executions"]["synced"] = len(synced_executions)
         except Exception as e:
             logger.error(f"Failed to sync executions: {str(e)}")
             sync_results["executions"]["errors"].append(str(e))
@@ -1457,18 +1461,15 @@ async def sync_executions_only(
                 tenant_id=tenant_id
             )
 
-            # N8N enforces a max limit (commonly 250). Use a safe upper bound.
-            # NOTE: With pagination support, this will now fetch multiple pages if needed.
-            executions = await adapter.get_executions(limit=250)
-
-            if not executions:
-                logger.warning(f"No executions returned from N8N for environment {environment_id}")
-
-            synced_executions = await db_service.sync_executions_from_n8n(
+            # Incremental: only executions newer than the environment's cursor are read,
+            # and each page is stored as it arrives.
+            ingestion = await execution_ingestion_service.ingest_environment(
                 tenant_id,
                 environment_id,
-                executions
+                environment,
+                adapter
             )
+            synced_count = ingestion["synced"] + ingestion["refreshed"]
 
             # Emit completion progress
             await emit_sync_progress(
@@ -1478,14 +1479,14 @@ async def sync_executions_only(
                 current_step="executions",
                 current=1,
                 total=1,
-                message=f"Synced {len(synced_executions)} executions successfully",
+                message=f"Synced {synced_count} executions successfully",
                 tenant_id=tenant_id
             )
 
             return {
                 "success": True,
                 "message": "Executions synced successfully",
-                "synced": len(synced_executions),
+                "synced": synced_count,
                 "job_id": job_id  # Include job_id for progress tracking
             }
         except Exception as e:
@@ -1659,11 +1660,12 @@ async def refresh_environment_drift(
                 detail="Environment not found"
             )
 
-        # Run drift detection
+        # Run a full drift detection (ignores results saved by scheduled checks)
         summary = await drift_detection_service.detect_drift(
             tenant_id=tenant_id,
             environment_id=environment_id,
-            update_status=True
+            update_status=True,
+            force_full=True
         )
 
         return {
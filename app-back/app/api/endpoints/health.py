@@ -13,6 +13,13 @@ from typing import Dict, Any
 import logging
 
 from app.services.database import db_service
+from app.services.n8n_client import n8n_connection_pool
+from app.services.canonical_workflow_service import get_registry_stats
+from app.services.git_blob_cache import git_blob_cache
+from app.services.sse_pubsub_service import sse_pubsub
+from app.services.auth_service import principal_cache
+from app.services.entitlements_service import entitlements_service
+from app.services.scheduler_runtime import scheduler_runtime
 
 logger = logging.getLogger(__name__)
 
@@ -72,6 +79,16 @@ async def health_check() -> JSONResponse:
         }
         checks["status"] = "degraded"
 
+    # Cross-worker SSE fan-out; a dead listener means other workers' events are missed
+    fanout_status = sse_pubsub.get_metrics()["fanout_status"]
+    if fanout_status is not None:
+        checks["services"]["sse_fanout"] = {
+            "status": "healthy" if fanout_status["connected"] else "unhealthy",
+            **fanout_status,
+        }
+        if not fanout_status["connected"]:
+            checks["status"] = "degraded"
+
     # Check if all services are unhealthy
     all_unhealthy = all(
         svc.get("status") == "unhealthy"
@@ -80,6 +97,14 @@ async def health_check() -> JSONResponse:
     if all_unhealthy and checks["services"]:
         checks["status"] = "unhealthy"
 
+    checks["n8n_http_pool"] = n8n_connection_pool.get_metrics()
+    checks["hash_registry"] = get_registry_stats()
+    checks["git_blob_cache"] = git_blob_cache.get_metrics()
+    checks["sse_pubsub"] = sse_pubsub.get_metrics()
+    checks["auth_principal_cache"] = principal_cache.get_metrics()
+    checks["entitlements_cache"] = entitlements_service.get_cache_metrics()
+    checks["scheduler"] = scheduler_runtime.get_metrics()
+
     # Return appropriate status code
     status_code = 200 if checks["status"] == "healthy" else 503
 
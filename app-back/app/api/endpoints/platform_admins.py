@@ -4,6 +4,7 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 
 from app.services.database import db_service
+from app.services.auth_service import principal_cache
 from app.api.endpoints.admin_audit import create_audit_log
 from app.core.platform_admin import require_platform_admin, is_platform_admin
 
@@ -113,6 +114,7 @@ async def add_platform_admin(body: PlatformAdminCreateRequest, user_info: dict =
             .execute()
         )
         inserted = (insert_resp.data or [None])[0] or {}
+        principal_cache.invalidate_user(target_id)
 
         await create_audit_log(
             action_type="platform_admin.grant",
@@ -160,6 +162,7 @@ async def remove_platform_admin(user_id: str, user_info: dict = Depends(require_
 
         # delete
         db_service.client.table("platform_admins").delete().eq("user_id", user_id).execute()
+        principal_cache.invalidate_user(user_id)
 
         await create_audit_log(
             action_type="platform_admin.revoke",
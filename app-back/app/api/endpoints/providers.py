@@ -22,6 +22,7 @@ from app.services.database import db_service
 from app.services.stripe_service import stripe_service
 from app.services.feature_service import feature_service
 from app.api.endpoints.auth import get_current_user
+from app.services.auth_service import principal_cache
 
 router = APIRouter()
 
@@ -282,6 +283,7 @@ async def create_provider_checkout(
             db_service.client.table("tenants").update({
                 "stripe_customer_id": customer_id
             }).eq("id", tenant_id).execute()
+            principal_cache.invalidate_tenant(tenant_id)
 
         # Create checkout session
         session = await stripe_service.create_checkout_session(
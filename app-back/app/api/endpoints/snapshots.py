@@ -235,41 +235,31 @@ async def create_manual_snapshot(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Environment type is required for GitHub workflow operations. Set the environment type and try again.",
             )
-        commit_sha = None
-        workflows_synced = 0
         reason = request.reason or "Manual backup"
+        full_workflows = []
 
         for workflow in workflows:
             try:
                 workflow_id = workflow.get("id")
                 full_workflow = await adapter.get_workflow(workflow_id)
-
-                await github_service.sync_workflow_to_github(
-                    workflow_id=workflow_id,
-                    workflow_name=full_workflow.get("name"),
-                    workflow_data=full_workflow,
-                    commit_message=f"Manual snapshot: {reason}",
-                    environment_type=env_type
-                )
-                workflows_synced += 1
+                full_workflows.append({**full_workflow, "id": workflow_id})
             except Exception as e:
-                logger.error(f"Failed to sync workflow {workflow.get('id')}: {str(e)}")
+                logger.error(f"Failed to export workflow {workflow.get('id')}: {str(e)}")
                 continue
 
-        if workflows_synced == 0:
+        if not full_workflows:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to sync any workflows to GitHub",
             )
 
-        # Get the latest commit SHA (use sanitized environment type folder)
-        sanitized_folder = github_service._sanitize_foldername(env_type)
-        try:
-            commits = github_service.repo.get_commits(path=f"workflows/{sanitized_folder}", sha=github_service.branch)
-            if commits:
-                commit_sha = commits[0].sha
-        except Exception as e:
-            logger.warning(f"Could not get commit SHA: {str(e)}")
+        # Write all workflows to GitHub as one commit
+        commit_sha = await github_service.sync_workflows_to_github(
+            full_workflows,
+            commit_message=f"Manual snapshot: {reason}",
+            environment_type=env_type
+        )
+        workflows_synced = len(full_workflows)
 
         # Create snapshot record
         snapshot_id = str(uuid4())
@@ -39,7 +39,7 @@ router = APIRouter()
 
 # SSE constants
 KEEPALIVE_INTERVAL = 15  # seconds
-EVENT_WAIT_TIMEOUT = 5  # seconds
+EVENT_BATCH_MAX = 50  # events coalesced into a single write
 
 
 def get_tenant_id(user_info: dict) -> str:
@@ -241,6 +241,38 @@ def _format_keepalive() -> str:
     return ": keepalive\n\n"
 
 
+async def _stream_subscription_events(subscription_id: str):
+    """
+    Yield SSE chunks for a subscription until it is removed.
+
+    Sleeps on the subscription queue rather than polling: each wakeup drains
+    every queued event (up to EVENT_BATCH_MAX) into a single write, and a
+    keepalive is sent only after KEEPALIVE_INTERVAL without any traffic.
+    Client disconnects are detected by StreamingResponse, which listens for
+    http.disconnect alongside the stream and cancels this generator.
+    """
+    loop = asyncio.get_running_loop()
+    keepalive_due = loop.time() + KEEPALIVE_INTERVAL
+
+    while True:
+        batch = await sse_pubsub.next_batch(
+            subscription_id,
+            timeout=max(keepalive_due - loop.time(), 0),
+            max_events=EVENT_BATCH_MAX,
+        )
+        if batch is None:
+            break
+
+        if batch:
+            yield "".join(
+                _format_sse_message(event.type, event.payload, event.event_id)
+                for event in batch
+            )
+        else:
+            yield _format_keepalive()
+        keepalive_due = loop.time() + KEEPALIVE_INTERVAL
+
+
 @router.get("/deployments")
 async def sse_deployments_stream(
     request: Request,
@@ -274,45 +306,9 @@ async def sse_deployments_stream(
             )
             yield _format_sse_message("snapshot", snapshot, snapshot_event.event_id)
 
-            # Stream incremental events
-            last_keepalive = datetime.now(UTC)
-
-            while True:
-                # Check if client disconnected
-                if await request.is_disconnected():
-                    logger.info(f"SSE client disconnected: {subscription_id}")
-                    break
-
-                # Try to get next event
-                try:
-                    async for event in sse_pubsub.get_events(subscription_id):
-                        if await request.is_disconnected():
-                            break
-
-                        # Send the event
-                        yield _format_sse_message(
-                            event.type,
-                            event.payload,
-                            event.event_id
-                        )
-
-                        # Update keepalive timer
-                        last_keepalive = datetime.now(UTC)
-
-                        # Only process one event per iteration to check disconnect
-                        break
-
-                except asyncio.TimeoutError:
-                    pass
-
-                # Send keepalive if needed
-                elapsed = (datetime.now(UTC) - last_keepalive).total_seconds()
-                if elapsed >= KEEPALIVE_INTERVAL:
-                    yield _format_keepalive()
-                    last_keepalive = datetime.now(UTC)
-
-                # Small sleep to prevent tight loop
-                await asyncio.sleep(0.1)
+            # Stream events as they arrive
+            async for chunk in _stream_subscription_events(subscription_id):
+                yield chunk
 
         except asyncio.CancelledError:
             logger.info(f"SSE stream cancelled: {subscription_id}")
@@ -377,45 +373,9 @@ async def sse_deployment_detail_stream(
             )
             yield _format_sse_message("snapshot", snapshot, snapshot_event.event_id)
 
-            # Stream incremental events
-            last_keepalive = datetime.now(UTC)
-
-            while True:
-                # Check if client disconnected
-                if await request.is_disconnected():
-                    logger.info(f"SSE client disconnected: {subscription_id}")
-                    break
-
-                # Try to get next event
-                try:
-                    async for event in sse_pubsub.get_events(subscription_id):
-                        if await request.is_disconnected():
-                            break
-
-                        # Send the event
-                        yield _format_sse_message(
-                            event.type,
-                            event.payload,
-                            event.event_id
-                        )
-
-                        # Update keepalive timer
-                        last_keepalive = datetime.now(UTC)
-
-                        # Only process one event per iteration to check disconnect
-                        break
-
-                except asyncio.TimeoutError:
-                    pass
-
-                # Send keepalive if needed
-                elapsed = (datetime.now(UTC) - last_keepalive).total_seconds()
-                if elapsed >= KEEPALIVE_INTERVAL:
-                    yield _format_keepalive()
-                    last_keepalive = datetime.now(UTC)
-
-                # Small sleep to prevent tight loop
-                await asyncio.sleep(0.1)
+            # Stream events as they arrive
+            async for chunk in _stream_subscription_events(subscription_id):
+                yield chunk
 
         except asyncio.CancelledError:
             logger.info(f"SSE stream cancelled: {subscription_id}")
@@ -730,7 +690,7 @@ async def sse_background_jobs_stream(
     
     # Validate user
     try:
-        user_info = await get_current_user(credentials)
+        user_info = await get_current_user(credentials, request)
         # Check entitlement
         from app.services.entitlements_service import entitlements_service
         tenant = user_info.get("tenant")
@@ -768,45 +728,9 @@ async def sse_background_jobs_stream(
             subscription_id = await sse_pubsub.subscribe(tenant_id, scope)
             logger.info(f"SSE client connected for background jobs: {subscription_id} (scope={scope})")
 
-            # Stream events
-            last_keepalive = datetime.now(UTC)
-
-            while True:
-                # Check if client disconnected
-                if await request.is_disconnected():
-                    logger.info(f"SSE client disconnected: {subscription_id}")
-                    break
-
-                # Try to get next event
-                try:
-                    async for event in sse_pubsub.get_events(subscription_id):
-                        if await request.is_disconnected():
-                            break
-
-                        # Send the event
-                        yield _format_sse_message(
-                            event.type,
-                            event.payload,
-                            event.event_id
-                        )
-
-                        # Update keepalive timer
-                        last_keepalive = datetime.now(UTC)
-
-                        # Only process one event per iteration to check disconnect
-                        break
-
-                except asyncio.TimeoutError:
-                    pass
-
-                # Send keepalive if needed
-                elapsed = (datetime.now(UTC) - last_keepalive).total_seconds()
-                if elapsed >= KEEPALIVE_INTERVAL:
-                    yield _format_keepalive()
-                    last_keepalive = datetime.now(UTC)
-
-                # Small sleep to prevent tight loop
-                await asyncio.sleep(0.1)
+            # Stream events as they arrive
+            async for chunk in _stream_subscription_events(subscription_id):
+                yield chunk
 
         except asyncio.CancelledError:
             logger.info(f"SSE stream cancelled: {subscription_id}")
@@ -13,7 +13,7 @@ from app.schemas.pagination import PaginatedResponse
 from app.services.database import db_service
 from app.core.entitlements_gate import require_entitlement
 from app.services.email_service import email_service
-from app.services.auth_service import get_current_user
+from app.services.auth_service import get_current_user, principal_cache
 from app.services.feature_service import feature_service
 from app.services.entitlements_service import entitlements_service
 
@@ -275,6 +275,7 @@ async def update_team_member(
         response = db_service.client.table("users").update(update_data).eq(
             "id", member_id
         ).eq("tenant_id", tenant_id).execute()
+        principal_cache.invalidate_user(member_id)
 
         if not response.data or len(response.data) == 0:
             raise HTTPException(
@@ -329,6 +330,7 @@ async def delete_team_member(
         db_service.client.table("users").delete().eq(
             "id", member_id
         ).eq("tenant_id", tenant_id).execute()
+        principal_cache.invalidate_user(member_id)
 
         return None
 
@@ -26,6 +26,7 @@ from app.schemas.entitlements import (
     AuditAction,
 )
 from app.services.database import db_service
+from app.services.auth_service import principal_cache
 from app.services.audit_service import audit_service
 from app.services.entitlements_service import entitlements_service
 from app.services.stripe_service import stripe_service
@@ -434,6 +435,7 @@ async def update_tenant(tenant_id: str, tenant: TenantUpdate, user_info: dict =
         response = db_service.client.table("tenants").update(update_data).eq(
             "id", tenant_id
         ).execute()
+        principal_cache.invalidate_tenant(tenant_id)
 
         if not response.data or len(response.data) == 0:
             raise HTTPException(
@@ -562,6 +564,7 @@ async def delete_tenant(tenant_id: str, user_info: dict = Depends(require_platfo
 
         # Finally delete the tenant
         db_service.client.table("tenants").delete().eq("id", tenant_id).execute()
+        principal_cache.invalidate_tenant(tenant_id)
 
         return None
 
@@ -963,6 +966,7 @@ async def suspend_tenant(tenant_id: str, reason: Optional[str] = None, user_info
         db_service.client.table("tenants").update({
             "status": "suspended"
         }).eq("id", tenant_id).execute()
+        principal_cache.invalidate_tenant(tenant_id)
 
         # Create audit log
         try:
@@ -1014,6 +1018,7 @@ async def reactivate_tenant(tenant_id: str, reason: Optional[str] = None, user_i
         db_service.client.table("tenants").update({
             "status": "active"
         }).eq("id", tenant_id).execute()
+        principal_cache.invalidate_tenant(tenant_id)
 
         # Create audit log
         try:
@@ -1070,6 +1075,7 @@ async def schedule_tenant_deletion(
             "status": "archived",
             "scheduled_deletion_at": deletion_date.isoformat()
         }).eq("id", tenant_id).execute()
+        principal_cache.invalidate_tenant(tenant_id)
 
         # Create audit log
         try:
@@ -1128,6 +1134,7 @@ async def cancel_tenant_deletion(tenant_id: str, user_info: dict = Depends(requi
             "status": "active",
             "scheduled_deletion_at": None
         }).eq("id", tenant_id).execute()
+        principal_cache.invalidate_tenant(tenant_id)
 
         return {"success": True, "message": "Deletion cancelled"}
 
@@ -1680,6 +1687,7 @@ async def suspend_tenant_user(
 
         # Update status
         db_service.client.table("users").update({"status": "inactive"}).eq("id", user_id).execute()
+        principal_cache.invalidate_user(user_id)
 
         # Audit log
         from app.api.endpoints.admin_audit import create_audit_log
@@ -1739,6 +1747,7 @@ async def unsuspend_tenant_user(
 
         # Update status
         db_service.client.table("users").update({"status": "active"}).eq("id", user_id).execute()
+        principal_cache.invalidate_user(user_id)
 
         # Audit log
         from app.api.endpoints.admin_audit import create_audit_log
@@ -1807,6 +1816,7 @@ async def change_tenant_user_role(
 
         # Update role
         db_service.client.table("users").update({"role": new_role}).eq("id", user_id).execute()
+        principal_cache.invalidate_user(user_id)
 
         # Audit log
         from app.api.endpoints.admin_audit import create_audit_log
@@ -1862,6 +1872,7 @@ async def remove_tenant_user(
 
         # Delete user
         db_service.client.table("users").delete().eq("id", user_id).execute()
+        principal_cache.invalidate_user(user_id)
 
         # Audit log
         from app.api.endpoints.admin_audit import create_audit_log
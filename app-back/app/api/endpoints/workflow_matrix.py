@@ -22,20 +22,24 @@ Cell status is computed using a two-tier approach:
    - OUT_OF_DATE: Linked but git is ahead of env (git updated after env sync)
 
 The UI must not compute or override these statuses - all logic is server-side.
+
+Cells are served from a per-tenant projection kept current by
+workflow_matrix_service; responses carry an ETag so unchanged pages can be
+revalidated with If-None-Match and answered with 304 Not Modified.
 """
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Request, Response
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel, Field
-from enum import Enum
 from datetime import datetime
 import logging
+import math
 
-from app.services.database import db_service
 from app.core.entitlements_gate import require_entitlement
 from app.services.auth_service import get_current_user
 from app.schemas.environment import EnvironmentClass
 from app.services.canonical_workflow_service import compute_workflow_mapping_status
 from app.schemas.canonical_workflow import WorkflowMappingStatus
+from app.services.workflow_matrix_service import WorkflowEnvironmentStatus, workflow_matrix_service
 
 logger = logging.getLogger(__name__)
 
@@ -44,28 +48,6 @@ router = APIRouter()
 
 # Response Models
 
-class WorkflowEnvironmentStatus(str, Enum):
-    """
-    Display status of a canonical workflow in a specific environment.
-
-    These statuses are computed for the workflow matrix UI based on:
-    1. The persisted mapping status (from WorkflowMappingStatus with precedence rules)
-    2. Content hash comparisons to detect drift/out-of-date conditions
-
-    Display Statuses:
-    - LINKED: Workflow is canonically mapped and in sync (env hash == git hash)
-    - UNMAPPED: Workflow exists in n8n but has no canonical mapping
-    - DRIFT: Workflow is linked but has local changes not yet pushed to git
-    - OUT_OF_DATE: Workflow is linked but git has newer version not deployed to env
-
-    Note: Workflows with DELETED, IGNORED, or MISSING status are not shown in the matrix.
-    """
-    LINKED = "linked"
-    UNMAPPED = "unmapped"
-    DRIFT = "drift"
-    OUT_OF_DATE = "out_of_date"
-
-
 class WorkflowMatrixCell(BaseModel):
     """Represents a single cell in the workflow × environment matrix."""
     status: WorkflowEnvironmentStatus
@@ -134,109 +116,18 @@ def get_tenant_id(user_info: dict) -> str:
     return tenant_id
 
 
-async def _compute_cell_status(
-    mapping: Optional[Dict[str, Any]],
-    git_state: Optional[Dict[str, Any]]
-) -> tuple[WorkflowEnvironmentStatus, bool]:
-    """
-    Compute the display status for a workflow in an environment.
-
-    Returns tuple of (status, can_sync).
-
-    This function computes display statuses for the workflow matrix UI based on:
-    1. The persisted mapping status (using precedence rules from compute_workflow_mapping_status)
-    2. Content hash comparisons to determine DRIFT or OUT_OF_DATE display states
-
-    Status Precedence (from WorkflowMappingStatus):
-    1. DELETED - Workflow/mapping is soft-deleted (not shown in matrix)
-    2. IGNORED - User explicitly ignored (not shown in matrix)
-    3. MISSING - Was mapped but disappeared from n8n (not shown in matrix)
-    4. UNMAPPED - Exists in n8n but no canonical_id (shown as "unmapped")
-    5. LINKED - Normal operational state (shown as "linked", "drift", or "out_of_date")
-
-    Display Status Logic:
-    - UNMAPPED: Workflow exists but no canonical mapping (mapping status = "unmapped")
-    - LINKED: Mapping status is "linked" and env_content_hash == git_content_hash
-    - DRIFT: Mapping status is "linked" but env has changes not in git
-    - OUT_OF_DATE: Mapping status is "linked" but git is ahead of env
-
-    Args:
-        mapping: The workflow_env_map record for this workflow in this environment
-        git_state: The canonical_workflow_git_state record (if exists)
-
-    Returns:
-        Tuple of (WorkflowEnvironmentStatus | None, can_sync: bool)
-        Returns (None, False) if workflow should not be displayed in matrix
-    """
-    if not mapping:
-        # No mapping means the workflow doesn't exist in this environment
-        return None, False
-
-    # Get the persisted mapping status
-    mapping_status = mapping.get("status")
-
-    # Apply status precedence rules: DELETED, IGNORED, and MISSING are not shown in matrix
-    # These statuses indicate the workflow should not be displayed as an active cell
-    if mapping_status in ("deleted", "ignored", "missing"):
-        return None, False
-
-    # UNMAPPED: workflow exists in n8n but has no canonical mapping
-    if mapping_status == "unmapped":
-        return WorkflowEnvironmentStatus.UNMAPPED, False
-
-    # LINKED: workflow has canonical mapping - now check for drift/out-of-date
-    if mapping_status == "linked":
-        env_content_hash = mapping.get("env_content_hash")
-        git_content_hash = git_state.get("git_content_hash") if git_state else None
-
-        # If no git state exists yet, the workflow is linked but not synced to git
-        if not git_content_hash:
-            return WorkflowEnvironmentStatus.LINKED, False
-
-        # Compare content hashes to determine if in sync, drifted, or out-of-date
-        if env_content_hash and git_content_hash:
-            if env_content_hash == git_content_hash:
-                # Fully in sync
-                return WorkflowEnvironmentStatus.LINKED, False
-            else:
-                # Hashes differ - determine if drift or out-of-date
-                # DRIFT: Environment has local changes not yet pushed to git
-                # OUT_OF_DATE: Git has newer version not yet deployed to environment
-                #
-                # For MVP, we use a simplified heuristic:
-                # - Compare timestamps: if env was updated after git sync, it's DRIFT
-                # - Otherwise, if git is different, it's OUT_OF_DATE
-                #
-                # Future enhancement: Track bidirectional sync timestamps for precise detection
-                env_updated_at = mapping.get("n8n_updated_at")
-                git_synced_at = git_state.get("last_repo_sync_at")
-
-                if env_updated_at and git_synced_at:
-                    # Parse timestamps for comparison
-                    try:
-                        from dateutil import parser
-                        env_dt = parser.parse(env_updated_at) if isinstance(env_updated_at, str) else env_updated_at
-                        git_dt = parser.parse(git_synced_at) if isinstance(git_synced_at, str) else git_synced_at
-
-                        if env_dt > git_dt:
-                            # Environment was updated after git sync - local changes (DRIFT)
-                            return WorkflowEnvironmentStatus.DRIFT, True
-                    except Exception as e:
-                        logger.warning(f"Error comparing timestamps: {e}")
-
-                # Default: git is ahead of environment (OUT_OF_DATE)
-                return WorkflowEnvironmentStatus.OUT_OF_DATE, True
-        else:
-            # Missing hash - treat as out of date
-            return WorkflowEnvironmentStatus.OUT_OF_DATE, True
-
-    # Fallback for unknown status - should not happen with proper data
-    logger.warning(f"Unexpected mapping status in matrix: {mapping_status}")
-    return None, False
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches etag (weak comparison)."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in (candidate.removeprefix("W/") for candidate in candidates)
 
 
 @router.get("/matrix", response_model=WorkflowMatrixResponse)
 async def get_workflow_matrix(
+    request: Request,
+    response: Response,
     page: int = 1,
     page_size: int = 50,
     user_info: dict = Depends(get_current_user),
@@ -254,6 +145,10 @@ async def get_workflow_matrix(
     - page: Page number (1-indexed, default: 1)
     - page_size: Items per page (default: 50, max: 100)
 
+    Caching:
+    - The response carries an ETag; a request whose If-None-Match matches it
+      gets 304 Not Modified with no body.
+
     All status logic is computed server-side. The UI must not infer or compute status logic.
     """
     tenant_id = get_tenant_id(user_info)
@@ -263,80 +158,18 @@ async def get_workflow_matrix(
     page = max(1, page)  # Ensure page is at least 1
 
     try:
-        # Get total count for pagination metadata (run in parallel with data fetch)
-        import asyncio
-        total_workflows_task = asyncio.create_task(
-            db_service.count_canonical_workflows(
-                tenant_id=tenant_id,
-                include_deleted=False
-            )
-        )
+        matrix_page = await workflow_matrix_service.get_page(tenant_id, page, page_size)
 
-        # Fetch paginated workflows and environments in parallel
-        canonical_workflows = await db_service.get_canonical_workflows(
-            tenant_id=tenant_id,
-            include_deleted=False,
-            page=page,
-            page_size=page_size
-        )
-
-        environments = await db_service.get_environments(tenant_id)
-        # Filter to only active environments
-        active_environments = [env for env in environments if env.get("is_active", True)]
-
-        # Get all workflow mappings for this tenant
-        all_mappings = await db_service.get_workflow_mappings(tenant_id=tenant_id)
-
-        # Build lookup structures for efficient access
-        # mappings_by_canonical_env[canonical_id][environment_id] = mapping
-        mappings_by_canonical_env: Dict[str, Dict[str, Dict[str, Any]]] = {}
-        for mapping in all_mappings:
-            canonical_id = mapping.get("canonical_id")
-            env_id = mapping.get("environment_id")
-            if canonical_id and env_id:
-                if canonical_id not in mappings_by_canonical_env:
-                    mappings_by_canonical_env[canonical_id] = {}
-                mappings_by_canonical_env[canonical_id][env_id] = mapping
-
-        # Fetch all git states for the tenant
-        # We need to query the canonical_workflow_git_state table
-        git_states_response = db_service.client.table("canonical_workflow_git_state").select("*").eq("tenant_id", tenant_id).execute()
-        git_states = git_states_response.data or []
-
-        # Build lookup for git states
-        # git_states_by_canonical_env[canonical_id][environment_id] = git_state
-        git_states_by_canonical_env: Dict[str, Dict[str, Dict[str, Any]]] = {}
-        for gs in git_states:
-            canonical_id = gs.get("canonical_id")
-            env_id = gs.get("environment_id")
-            if canonical_id and env_id:
-                if canonical_id not in git_states_by_canonical_env:
-                    git_states_by_canonical_env[canonical_id] = {}
-                git_states_by_canonical_env[canonical_id][env_id] = gs
-
-        # Build hash collision detection map per environment
-        # Map of environment_id -> content_hash -> list of canonical_ids
-        hash_to_canonical_map: Dict[str, Dict[str, List[str]]] = {}
-        for mapping in all_mappings:
-            env_id = mapping.get("environment_id")
-            content_hash = mapping.get("env_content_hash")
-            canonical_id = mapping.get("canonical_id")
-
-            if env_id and content_hash and canonical_id:
-                if env_id not in hash_to_canonical_map:
-                    hash_to_canonical_map[env_id] = {}
-                if content_hash not in hash_to_canonical_map[env_id]:
-                    hash_to_canonical_map[env_id][content_hash] = []
-                hash_to_canonical_map[env_id][content_hash].append(canonical_id)
-
-        # Build the response
-        workflow_rows: List[WorkflowMatrixRow] = []
-        environment_cols: List[WorkflowMatrixEnvironment] = []
-        matrix: Dict[str, Dict[str, Optional[WorkflowMatrixCell]]] = {}
+        etag = matrix_page["etag"]
+        cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+        response.headers.update(cache_headers)
 
         # Build environment columns
-        for env in active_environments:
-            env_class = env.get("environment_class", "dev")
+        environment_cols: List[WorkflowMatrixEnvironment] = []
+        for env in matrix_page["environments"]:
+            env_class = env["environment_class"]
             # Handle string or enum values
             if isinstance(env_class, str):
                 try:
@@ -346,71 +179,23 @@ async def get_workflow_matrix(
 
             environment_cols.append(WorkflowMatrixEnvironment(
                 id=env["id"],
-                name=env.get("n8n_name", env.get("name", "Unknown")),
-                type=env.get("n8n_type"),
+                name=env["name"],
+                type=env["type"],
                 environment_class=env_class
             ))
 
         # Build workflow rows and matrix data
-        for workflow in canonical_workflows:
-            canonical_id = workflow.get("canonical_id")
-            if not canonical_id:
-                continue
-
-            # Add workflow row
-            workflow_rows.append(WorkflowMatrixRow(
-                canonical_id=canonical_id,
-                display_name=workflow.get("display_name") or canonical_id,
-                created_at=workflow.get("created_at")
-            ))
-
-            # Initialize matrix row
-            matrix[canonical_id] = {}
-
-            # Compute status for each environment
-            for env in active_environments:
-                env_id = env["id"]
-
-                # Get mapping and git state for this workflow in this environment
-                mapping = mappings_by_canonical_env.get(canonical_id, {}).get(env_id)
-                git_state = git_states_by_canonical_env.get(canonical_id, {}).get(env_id)
-
-                # Compute status
-                status_result = await _compute_cell_status(mapping, git_state)
-                computed_status, can_sync = status_result
-
-                if computed_status is None:
-                    # Workflow doesn't exist in this environment
-                    matrix[canonical_id][env_id] = None
-                else:
-                    # Check for hash collision in this environment
-                    collision_warning = None
-                    if mapping:
-                        content_hash = mapping.get("env_content_hash")
-                        if content_hash and env_id in hash_to_canonical_map:
-                            canonical_ids_with_hash = hash_to_canonical_map[env_id].get(content_hash, [])
-                            if len(canonical_ids_with_hash) > 1:
-                                # Collision detected: multiple canonical workflows share the same hash
-                                other_workflows = [cid for cid in canonical_ids_with_hash if cid != canonical_id]
-                                collision_warning = (
-                                    f"Hash collision detected: Content hash '{content_hash[:12]}...' "
-                                    f"is shared with {len(other_workflows)} other workflow(s). "
-                                    f"This may indicate identical workflow content or a hash collision."
-                                )
-
-                    matrix[canonical_id][env_id] = WorkflowMatrixCell(
-                        status=computed_status,
-                        can_sync=can_sync,
-                        n8n_workflow_id=mapping.get("n8n_workflow_id") if mapping else None,
-                        content_hash=mapping.get("env_content_hash") if mapping else None,
-                        collision_warning=collision_warning
-                    )
-
-        # Await the total count
-        total_workflows = await total_workflows_task
+        workflow_rows = [WorkflowMatrixRow(**workflow) for workflow in matrix_page["workflows"]]
+        matrix: Dict[str, Dict[str, Optional[WorkflowMatrixCell]]] = {
+            canonical_id: {
+                env_id: WorkflowMatrixCell(**cell) if cell else None
+                for env_id, cell in cells.items()
+            }
+            for canonical_id, cells in matrix_page["matrix"].items()
+        }
 
         # Calculate pagination metadata
-        import math
+        total_workflows = matrix_page["total_workflows"]
         total_pages = math.ceil(total_workflows / page_size) if page_size > 0 else 0
         has_more = page < total_pages
 
@@ -366,6 +366,7 @@ async def get_workflows_paginated(
     status_filter: Optional[str] = None,
     sort_field: str = "updatedAt",
     sort_direction: str = "desc",
+    cursor: Optional[str] = None,
     user_info: dict = Depends(get_current_user),
     _: dict = Depends(require_entitlement("workflow_read"))
 ):
@@ -386,6 +387,7 @@ async def get_workflows_paginated(
         status_filter: 'active' or 'inactive'
         sort_field: Field to sort by (name, updatedAt, createdAt, active)
         sort_direction: 'asc' or 'desc'
+        cursor: next_cursor from the previous page, for keyset paging (same sort)
 
     Returns:
         {
@@ -393,7 +395,8 @@ async def get_workflows_paginated(
             "total": int,
             "page": int,
             "page_size": int,
-            "total_pages": int
+            "total_pages": int,
+            "next_cursor": Optional[str]
         }
     """
     try:
@@ -418,13 +421,19 @@ async def get_workflows_paginated(
             sort_field=sort_field,
             sort_direction=sort_direction,
             include_deleted=False,
-            include_ignored=False
+            include_ignored=False,
+            cursor=cursor
         )
 
         return result
 
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Failed to get paginated workflows: {str(e)}")
         raise HTTPException(
@@ -6,6 +6,12 @@ class Settings(BaseSettings):
     # N8N Configuration
     N8N_API_URL: str = "https://ns8i839t.rpcld.net"
     N8N_API_KEY: str = "123"
+    # Pooled HTTP transport (one keep-alive client per N8N base URL)
+    N8N_HTTP2_ENABLED: bool = False
+    N8N_HTTP_MAX_CONNECTIONS: int = 20
+    N8N_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    N8N_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    N8N_MAX_CONCURRENT_REQUESTS_PER_HOST: int = 10
 
     # Supabase Configuration
     SUPABASE_URL: str
@@ -14,12 +20,29 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    # Threads available for blocking PostgREST calls (bounds in-flight queries per worker)
+    DB_EXECUTOR_MAX_WORKERS: int = 32
+    # Per-query timeout in seconds
+    DB_QUERY_TIMEOUT_SECONDS: float = 30.0
+    # Rows per multi-row upsert/update round-trip in bulk sync paths
+    DB_BULK_CHUNK_SIZE: int = 200
+    # Rows per range-paged read of a whole table slice (at most PostgREST's max-rows)
+    DB_SELECT_PAGE_SIZE: int = 1000
 
     # GitHub Configuration
     GITHUB_TOKEN: str = ""
     GITHUB_REPO_OWNER: str = ""
     GITHUB_REPO_NAME: str = ""
     GITHUB_BRANCH: str = "main"
+    GITHUB_API_URL: str = "https://api.github.com"
+    GITHUB_BLOB_FETCH_CONCURRENCY: int = 8  # Parallel blob downloads per bulk tree read
+    GITHUB_BLOB_UPLOAD_CONCURRENCY: int = 4  # Parallel blob uploads per single-commit write
+    GITHUB_REF_UPDATE_ATTEMPTS: int = 3  # Rebuilds of a bulk commit when the branch moves underneath it
+    GITHUB_HTTP_TIMEOUT_SECONDS: float = 30.0
+    # Content-addressed cache of Git workflow blobs (empty dir = system temp dir, 0 disk bytes = memory only)
+    GIT_BLOB_CACHE_DIR: str = ""
+    GIT_BLOB_CACHE_MAX_MEMORY_BYTES: int = 64 * 1024 * 1024
+    GIT_BLOB_CACHE_MAX_DISK_BYTES: int = 512 * 1024 * 1024
 
     # API Configuration
     API_V1_PREFIX: str = "/api/v1"
@@ -35,6 +58,31 @@ class Settings(BaseSettings):
     RETENTION_JOB_BATCH_SIZE: int = 1000
     RETENTION_JOB_SCHEDULE_CRON: str = "0 2 * * *"  # Daily at 2 AM
 
+    # SSE Cross-Worker Fan-out Configuration
+    SSE_FANOUT_BACKEND: str = "none"  # none | loopback | postgres (LISTEN/NOTIFY)
+    SSE_FANOUT_DATABASE_URL: str = ""  # Defaults to DATABASE_URL for the postgres backend
+    SSE_FANOUT_CHANNEL: str = "sse_events"
+    SSE_FANOUT_FLUSH_INTERVAL_MS: int = 50  # Batching window; progress events are coalesced per window
+    SSE_FANOUT_RECONNECT_INITIAL_SECONDS: float = 1.0  # First retry delay after the listener connection drops
+    SSE_FANOUT_RECONNECT_MAX_SECONDS: float = 30.0  # Backoff ceiling for listener reconnects
+
+    # Workflow Hash Collision Registry Configuration
+    HASH_REGISTRY_MAX_ENTRIES: int = 50000  # LRU bound on tracked content hashes per worker
+    HASH_REGISTRY_TTL_SECONDS: float = 86400.0  # Entries unused for this long are dropped
+    WORKFLOW_HASH_CACHE_MAX_ENTRIES: int = 20000  # LRU bound on memoized per-version workflow hashes
+
+    # Workflow Matrix Projection Configuration
+    WORKFLOW_MATRIX_CACHE_MAX_ENTRIES: int = 1000  # Tenants whose computed matrix is kept per worker
+    WORKFLOW_MATRIX_CACHE_TTL_SECONDS: float = 300.0  # Forces a full rebuild, even when no change was logged
+    WORKFLOW_MATRIX_INCREMENTAL_MAX_CHANGES: int = 200  # More changed workflows than this triggers a full rebuild
+
+    # Incremental Execution Sync Configuration
+    EXECUTION_SYNC_PAGE_SIZE: int = 250  # N8N max per-page limit
+    EXECUTION_SYNC_INITIAL_LIMIT: int = 250  # Executions read on an environment's first sync
+    EXECUTION_SYNC_MAX_PER_RUN: int = 20000  # Cap on executions read per incremental sync
+    EXECUTION_SYNC_REFRESH_LIMIT: int = 100  # Max in-flight executions re-fetched per sync
+    EXECUTION_SYNC_PENDING_GRACE_SECONDS: float = 3600.0  # Unseen/unfinished executions younger than this hold the cursor back
+
     # Downgrade Enforcement Configuration
     DOWNGRADE_ENFORCEMENT_INTERVAL_SECONDS: int = 3600  # Default: 1 hour
 
@@ -42,6 +90,20 @@ class Settings(BaseSettings):
     # Disabled by default for MVP - set to true to enable automatic sync
     SYNC_SCHEDULER_ENABLED: bool = False
 
+    # Background Scheduler Runtime Configuration
+    SCHEDULER_LEASE_BACKEND: str = "database"  # database (scheduler_leases table) | local (single worker)
+    SCHEDULER_LEASE_TTL_SECONDS: float = 60.0  # Leases are renewed every third of this
+    SCHEDULER_SHARD_COUNT: int = 32  # Environment shards per job, spread across workers
+    SCHEDULER_SHARD_CONCURRENCY: int = 4  # Environments processed in parallel per job run
+
+    # Alert Rule Evaluation Configuration
+    ALERT_RULES_SCHEDULER_ENABLED: bool = False  # Evaluate every tenant's alert rules periodically
+    ALERT_RULES_EVALUATION_INTERVAL_SECONDS: int = 300
+    ALERT_EVALUATION_TENANT_CONCURRENCY: int = 8  # Tenants evaluated in parallel per cycle
+
+    # Promotion Execution Configuration
+    PROMOTION_DEPLOY_CONCURRENCY: int = 4  # Workflows written to the target in parallel per promotion
+
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
@@ -71,6 +133,16 @@ class Settings(BaseSettings):
     RATE_LIMIT_PER_USER_MINUTE: int = 60  # requests per minute per user
     RATE_LIMIT_PER_TENANT_MINUTE: int = 300  # requests per minute per tenant
 
+    # Auth Principal Cache Configuration
+    AUTH_PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000  # Resolved users cached per worker, keyed by token subject
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0  # Bounds staleness of changes made by other workers
+
+    # Entitlements Cache Configuration
+    ENTITLEMENTS_CACHE_MAX_ENTRIES: int = 10000  # Tenants whose effective entitlements are cached per worker
+    ENTITLEMENTS_CACHE_TTL_SECONDS: float = 300.0  # Hard bound on entry age, even when the version is unchanged
+    ENTITLEMENTS_VERSION_CHECK_SECONDS: float = 15.0  # Entries younger than this are served without a version poll
+    PLAN_METADATA_CACHE_TTL_SECONDS: float = 600.0  # Plan precedence and feature requirement rows
+
     # Sparkline Aggregation Safety Limits
     # Maximum number of executions to process client-side for sparklines
     SPARKLINE_MAX_EXECUTIONS: int = 50000
@@ -102,6 +102,13 @@ app.include_router(
     tags=["environments"]
 )
 
+# Registered before workflows.router so /workflows/matrix is not captured by /workflows/{workflow_id}
+app.include_router(
+    workflow_matrix.router,
+    prefix=f"{settings.API_V1_PREFIX}/workflows",
+    tags=["workflow-matrix"]
+)
+
 app.include_router(
     workflows.router,
     prefix=f"{settings.API_V1_PREFIX}/workflows",
@@ -372,12 +379,6 @@ app.include_router(
     tags=["canonical-workflows"]
 )
 
-app.include_router(
-    workflow_matrix.router,
-    prefix=f"{settings.API_V1_PREFIX}/workflows",
-    tags=["workflow-matrix"]
-)
-
 app.include_router(
     github_webhooks.router,
     prefix=f"{settings.API_V1_PREFIX}",
@@ -454,6 +455,16 @@ async def startup_event():
             f"{cleanup_result['stale_running']} running, {cleanup_result['stale_pending']} pending)"
         )
 
+        # Relay SSE events between API workers when a fan-out backend is configured
+        try:
+            from app.services.sse_fanout_backend import create_fanout_backend
+            from app.services.sse_pubsub_service import sse_pubsub
+            fanout_backend = create_fanout_backend()
+            if fanout_backend is not None:
+                await sse_pubsub.start_fanout(fanout_backend)
+        except Exception as fanout_error:
+            logger.error(f"Failed to start SSE fan-out, live updates stay worker-local: {str(fanout_error)}")
+
         # Start periodic job cleanup task
         import asyncio
         cleanup_task = asyncio.create_task(periodic_job_cleanup())
@@ -486,6 +497,10 @@ async def startup_event():
         start_rollup_scheduler()
         logger.info("Rollup scheduler started")
 
+        # Start alert rule evaluation scheduler (disabled unless ALERT_RULES_SCHEDULER_ENABLED)
+        from app.services.alert_rules_scheduler import start_alert_rules_scheduler
+        await start_alert_rules_scheduler()
+
         # Start retention enforcement scheduler
         from app.services.background_jobs.retention_job import start_retention_scheduler
         start_retention_scheduler()
@@ -570,6 +585,15 @@ async def shutdown_event():
         await stop_health_check_scheduler()
         logger.info("Health check scheduler stopped")
 
+        # Stop rollup scheduler
+        from app.services.rollup_scheduler import stop_rollup_scheduler
+        await stop_rollup_scheduler()
+        logger.info("Rollup scheduler stopped")
+
+        # Stop alert rule evaluation scheduler
+        from app.services.alert_rules_scheduler import stop_alert_rules_scheduler
+        await stop_alert_rules_scheduler()
+
         # Stop retention scheduler
         from app.services.background_jobs.retention_job import stop_retention_scheduler
         await stop_retention_scheduler()
@@ -582,6 +606,22 @@ async def shutdown_event():
     except Exception as e:
         logger.error(f"Error stopping schedulers: {str(e)}")
 
+    try:
+        from app.services.sse_pubsub_service import sse_pubsub
+        await sse_pubsub.stop_fanout()
+    except Exception as e:
+        logger.error(f"Error stopping SSE fan-out: {str(e)}")
+
+    try:
+        from app.services.n8n_client import n8n_connection_pool
+        await n8n_connection_pool.aclose()
+        logger.info("N8N connection pool closed")
+    except Exception as e:
+        logger.error(f"Error closing N8N connection pool: {str(e)}")
+
+    db_service.close()
+    logger.info("Database query pool closed")
+
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -3,7 +3,7 @@
 This adapter implements the ProviderAdapter protocol for the n8n workflow
 automation platform by delegating to the existing N8NClient implementation.
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, AsyncIterator
 from app.services.n8n_client import N8NClient
 
 
@@ -73,6 +73,25 @@ class N8NProviderAdapter:
         """Fetch recent workflow executions from n8n."""
         return await self._client.get_executions(limit=limit)
 
+    async def get_execution(self, execution_id: str) -> Dict[str, Any]:
+        """Get a specific execution by ID."""
+        return await self._client.get_execution(execution_id)
+
+    def iter_executions(
+        self,
+        since_id: Optional[str] = None,
+        page_size: int = 250,
+        max_executions: Optional[int] = None,
+        before_id: Optional[str] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield pages of executions between since_id and before_id, newest first."""
+        return self._client.iter_executions(
+            since_id=since_id,
+            page_size=page_size,
+            max_executions=max_executions,
+            before_id=before_id
+        )
+
     # =========================================================================
     # Credential Operations
     # =========================================================================
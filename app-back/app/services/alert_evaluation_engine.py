@@ -0,0 +1,204 @@
+"""
+Alert Evaluation Engine - shared execution windows for batched rule evaluation.
+
+Evaluating rules one at a time issues the same executions queries over and
+over (a tenant with 50 rules can generate hundreds per cycle). The engine
+groups a tenant's rules by (environment, time window), loads each window's
+per-workflow execution aggregates once via get_alert_execution_window, and
+lets every rule in the group read from the in-memory ExecutionWindow.
+"""
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.services.database import db_service
+from app.schemas.notification import AlertRuleType
+
+logger = logging.getLogger(__name__)
+
+# Windows used by rule types that have no configurable time window
+RECENT_FAILURE_WINDOW_MINUTES = 60
+EXECUTION_DURATION_WINDOW_MINUTES = 60
+CONSECUTIVE_FAILURE_WINDOW_MINUTES = 24 * 60
+
+WindowKey = Tuple[Optional[str], int]
+
+
+def rule_window_minutes(rule: Dict[str, Any]) -> int:
+    """The execution window (in minutes) a rule is evaluated over."""
+    config = rule.get("threshold_config") or {}
+    rule_type = rule.get("rule_type")
+    if rule_type in (AlertRuleType.ERROR_RATE.value, AlertRuleType.ERROR_TYPE.value):
+        return int(config.get("time_window_minutes", 60))
+    if rule_type == AlertRuleType.CONSECUTIVE_FAILURES.value:
+        return CONSECUTIVE_FAILURE_WINDOW_MINUTES
+    if rule_type == AlertRuleType.EXECUTION_DURATION.value:
+        return EXECUTION_DURATION_WINDOW_MINUTES
+    return RECENT_FAILURE_WINDOW_MINUTES
+
+
+def window_key(rule: Dict[str, Any]) -> WindowKey:
+    return (rule.get("environment_id"), rule_window_minutes(rule))
+
+
+@dataclass
+class WindowRequest:
+    """Everything the rules in one (environment, window) group need loaded."""
+
+    environment_id: Optional[str]
+    window_minutes: int
+    duration_threshold_ms: Optional[int] = None
+    duration_thresholds_ms: Set[int] = field(default_factory=set)
+    include_streaks: bool = False
+    streak_workflow_ids: Set[str] = field(default_factory=set)
+    include_error_types: bool = False
+
+    def add_rule(self, rule: Dict[str, Any]) -> None:
+        config = rule.get("threshold_config") or {}
+        rule_type = rule.get("rule_type")
+        if rule_type == AlertRuleType.EXECUTION_DURATION.value:
+            threshold = int(config.get("max_duration_ms", 60000))
+            self.duration_thresholds_ms.add(threshold)
+            if self.duration_threshold_ms is None or threshold < self.duration_threshold_ms:
+                self.duration_threshold_ms = threshold
+        elif rule_type == AlertRuleType.CONSECUTIVE_FAILURES.value:
+            self.include_streaks = True
+            self.streak_workflow_ids.update(config.get("workflow_ids") or [])
+        elif rule_type == AlertRuleType.ERROR_TYPE.value:
+            self.include_error_types = True
+
+
+def plan_windows(rules: List[Dict[str, Any]]) -> Dict[WindowKey, WindowRequest]:
+    """Group rules by (environment, window) and merge what each group must load."""
+    requests: Dict[WindowKey, WindowRequest] = {}
+    for rule in rules:
+        key = window_key(rule)
+        if key not in requests:
+            requests[key] = WindowRequest(environment_id=key[0], window_minutes=key[1])
+        requests[key].add_rule(rule)
+    return requests
+
+
+@dataclass
+class WorkflowWindowStats:
+    """Execution aggregates for one workflow within a window."""
+
+    workflow_id: str
+    workflow_name: Optional[str]
+    total_executions: int
+    error_count: int
+    last_error_at: Optional[str] = None
+    long_running_ms: List[int] = field(default_factory=list)
+    long_running_counts: Dict[int, int] = field(default_factory=dict)
+    consecutive_failures: Optional[int] = None
+
+
+@dataclass
+class ExecutionWindow:
+    """Execution aggregates for one (environment, window), shared by its rules."""
+
+    environment_id: Optional[str]
+    window_minutes: int
+    workflows: Dict[str, WorkflowWindowStats]
+    error_types: List[Dict[str, Any]] = field(default_factory=list)
+
+    def error_rate_metrics(self) -> Dict[str, Any]:
+        total = sum(wf.total_executions for wf in self.workflows.values())
+        errors = sum(wf.error_count for wf in self.workflows.values())
+        return {
+            "total_executions": total,
+            "error_count": errors,
+            "error_rate": (errors / total * 100) if total > 0 else 0,
+        }
+
+    def _matching(self, workflow_ids: Optional[List[str]]) -> List[WorkflowWindowStats]:
+        if not workflow_ids:
+            return list(self.workflows.values())
+        return [self.workflows[wf_id] for wf_id in workflow_ids if wf_id in self.workflows]
+
+    def failures(self, workflow_ids: Optional[List[str]], any_workflow: bool) -> List[Dict[str, Any]]:
+        """Workflows with failures in the window, most recent first."""
+        matching = self._matching(None if any_workflow else workflow_ids)
+        failing = [
+            {
+                "workflow_id": wf.workflow_id,
+                "workflow_name": wf.workflow_name,
+                "error_count": wf.error_count,
+                "last_error_at": wf.last_error_at,
+            }
+            for wf in matching
+            if wf.error_count > 0
+        ]
+        failing.sort(key=lambda f: f["last_error_at"] or "", reverse=True)
+        return failing
+
+    def long_running(self, max_duration_ms: int, workflow_ids: Optional[List[str]]) -> List[Dict[str, Any]]:
+        """Executions in the window that ran longer than max_duration_ms, longest first."""
+        executions = [
+            {"workflow_id": wf.workflow_id, "workflow_name": wf.workflow_name, "duration_ms": duration}
+            for wf in self._matching(workflow_ids)
+            for duration in wf.long_running_ms
+            if duration > max_duration_ms
+        ]
+        executions.sort(key=lambda e: e["duration_ms"], reverse=True)
+        return executions
+
+    def long_running_count(self, max_duration_ms: int, workflow_ids: Optional[List[str]]) -> int:
+        """How many executions ran longer than max_duration_ms (long_running returns a capped sample)."""
+        return sum(
+            wf.long_running_counts.get(
+                max_duration_ms,
+                sum(1 for duration in wf.long_running_ms if duration > max_duration_ms),
+            )
+            for wf in self._matching(workflow_ids)
+        )
+
+    def max_consecutive_failures(self, workflow_ids: Optional[List[str]]) -> Tuple[int, Optional[str]]:
+        """The longest current failure streak among the given (or all) workflows."""
+        max_consecutive = 0
+        failing_workflow = None
+        for wf in self._matching(workflow_ids):
+            if (wf.consecutive_failures or 0) > max_consecutive:
+                max_consecutive = wf.consecutive_failures
+                failing_workflow = wf.workflow_id
+        return max_consecutive, failing_workflow
+
+
+async def load_execution_window(tenant_id: str, request: WindowRequest) -> ExecutionWindow:
+    """Load one window's aggregates (one RPC, plus one for error types if needed)."""
+    rows = await db_service.get_alert_execution_window(
+        tenant_id,
+        request.environment_id,
+        request.window_minutes,
+        duration_threshold_ms=request.duration_threshold_ms,
+        count_thresholds_ms=sorted(request.duration_thresholds_ms),
+        include_streaks=request.include_streaks,
+        streak_workflow_ids=sorted(request.streak_workflow_ids),
+    )
+    count_thresholds = sorted(request.duration_thresholds_ms)
+    workflows = {}
+    for row in rows:
+        workflow_id = row.get("workflow_id")
+        workflows[workflow_id] = WorkflowWindowStats(
+            workflow_id=workflow_id,
+            workflow_name=row.get("workflow_name"),
+            total_executions=int(row.get("total_executions") or 0),
+            error_count=int(row.get("error_count") or 0),
+            last_error_at=row.get("last_error_at"),
+            long_running_ms=[int(ms) for ms in row.get("long_running_ms") or []],
+            long_running_counts=dict(zip(count_thresholds, (int(n) for n in row.get("long_running_counts") or []))),
+            consecutive_failures=row.get("consecutive_failures"),
+        )
+
+    error_types = []
+    if request.include_error_types:
+        error_types = await db_service.get_error_intelligence_for_alert(
+            tenant_id, request.environment_id, request.window_minutes
+        )
+
+    return ExecutionWindow(
+        environment_id=request.environment_id,
+        window_minutes=request.window_minutes,
+        workflows=workflows,
+        error_types=error_types,
+    )
@@ -0,0 +1,51 @@
+"""
+Alert Rules Scheduler Service
+
+Periodically evaluates every tenant's enabled alert rules so alerts fire
+without someone calling the evaluate endpoint. Runs on one worker at a time
+via the scheduler runtime.
+
+Disabled by default. Set ALERT_RULES_SCHEDULER_ENABLED=true to enable.
+"""
+import logging
+
+from app.core.config import settings
+from app.services.alert_rules_service import alert_rules_service
+from app.services.scheduler_runtime import ScheduledJob, ShardContext, scheduler_runtime
+
+logger = logging.getLogger(__name__)
+
+# Scheduler job name
+ALERT_RULES_JOB = "alert_rule_evaluation"
+
+
+async def _run_alert_rule_evaluation(ctx: ShardContext) -> int:
+    """Evaluate all tenants' alert rules; returns the number of rules evaluated."""
+    results = await alert_rules_service.evaluate_all_tenants()
+    evaluated = sum(len(tenant_results) for tenant_results in results.values())
+    triggered = sum(1 for tenant_results in results.values() for r in tenant_results if r.is_triggered)
+    logger.info(
+        f"Evaluated {evaluated} alert rule(s) for {len(results)} tenant(s), {triggered} triggered"
+    )
+    return evaluated
+
+
+async def start_alert_rules_scheduler():
+    """Start the alert rules scheduler"""
+    if not settings.ALERT_RULES_SCHEDULER_ENABLED:
+        logger.info("Alert rules scheduler DISABLED (set ALERT_RULES_SCHEDULER_ENABLED=true to enable)")
+        return
+
+    scheduler_runtime.start_job(ScheduledJob(
+        name=ALERT_RULES_JOB,
+        interval_seconds=settings.ALERT_RULES_EVALUATION_INTERVAL_SECONDS,
+        run=_run_alert_rule_evaluation,
+    ))
+    logger.info(
+        f"Alert rules scheduler started (interval: {settings.ALERT_RULES_EVALUATION_INTERVAL_SECONDS}s)"
+    )
+
+
+async def stop_alert_rules_scheduler():
+    """Stop the alert rules scheduler"""
+    await scheduler_runtime.stop_job(ALERT_RULES_JOB)
@@ -7,9 +7,19 @@ escalation policies for critical errors that remain unresolved.
 """
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
+import asyncio
 import logging
 
+from app.core.config import settings
 from app.services.database import db_service
+from app.services.alert_evaluation_engine import (
+    ExecutionWindow,
+    WindowKey,
+    WindowRequest,
+    load_execution_window,
+    plan_windows,
+    window_key,
+)
 from app.services.notification_service import notification_service
 from app.schemas.notification import (
     AlertRuleCreate,
@@ -254,6 +264,47 @@ class AlertRulesService:
     async def evaluate_all_rules(self, tenant_id: str) -> List[AlertRuleEvaluationResult]:
         """Evaluate all enabled alert rules for a tenant"""
         rules = await db_service.get_alert_rules(tenant_id, include_disabled=False)
+        return await self._evaluate_rules_batched(tenant_id, rules)
+
+    async def evaluate_all_tenants(self) -> Dict[str, List[AlertRuleEvaluationResult]]:
+        """
+        Evaluate every tenant's enabled alert rules.
+
+        Rules are loaded in one query; tenants are evaluated concurrently, at
+        most ALERT_EVALUATION_TENANT_CONCURRENCY at a time.
+        """
+        rules_by_tenant: Dict[str, List[Dict[str, Any]]] = {}
+        for rule in await db_service.get_enabled_alert_rules_for_all_tenants():
+            rules_by_tenant.setdefault(rule["tenant_id"], []).append(rule)
+
+        semaphore = asyncio.Semaphore(max(1, settings.ALERT_EVALUATION_TENANT_CONCURRENCY))
+
+        async def evaluate_tenant(tenant_id: str, rules: List[Dict[str, Any]]):
+            async with semaphore:
+                try:
+                    return tenant_id, await self._evaluate_rules_batched(tenant_id, rules)
+                except Exception as e:
+                    logger.error(f"Error evaluating alert rules for tenant {tenant_id}: {e}")
+                    return tenant_id, []
+
+        results = await asyncio.gather(*(
+            evaluate_tenant(tenant_id, rules) for tenant_id, rules in rules_by_tenant.items()
+        ))
+        return dict(results)
+
+    async def _evaluate_rules_batched(
+        self,
+        tenant_id: str,
+        rules: List[Dict[str, Any]]
+    ) -> List[AlertRuleEvaluationResult]:
+        """
+        Evaluate and process a tenant's rules over shared execution windows.
+
+        Rules whose window could not be loaded fall back to per-rule queries.
+        """
+        windows = await self._load_execution_windows(
+            tenant_id, [rule for rule in rules if not self._is_muted(rule)]
+        )
         results = []
 
         for rule in rules:
@@ -264,7 +315,11 @@ class AlertRulesService:
                     if muted_until > datetime.utcnow().replace(tzinfo=None):
                         continue
 
-                result = await self._evaluate_single_rule(rule)
+                window = windows.get(window_key(rule))
+                if window is not None:
+                    result = self._evaluate_rule_in_window(rule, window)
+                else:
+                    result = await self._evaluate_single_rule(rule)
                 results.append(result)
 
                 # Process the result (trigger/resolve alerts, handle escalation)
@@ -282,6 +337,66 @@ class AlertRulesService:
 
         return results
 
+    def _is_muted(self, rule: Dict[str, Any]) -> bool:
+        """Whether a rule is currently muted (unparseable values count as not muted)"""
+        if not rule.get("muted_until"):
+            return False
+        try:
+            muted_until = datetime.fromisoformat(str(rule["muted_until"]).replace("Z", "+00:00"))
+            return muted_until > datetime.utcnow().replace(tzinfo=None)
+        except Exception:
+            return False
+
+    async def _load_execution_windows(
+        self,
+        tenant_id: str,
+        rules: List[Dict[str, Any]]
+    ) -> Dict[WindowKey, ExecutionWindow]:
+        """Load one ExecutionWindow per (environment, window) group; failed loads are omitted"""
+
+        async def load(key: WindowKey, request: WindowRequest):
+            try:
+                return key, await load_execution_window(tenant_id, request)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to load alert execution window {key} for tenant {tenant_id}, "
+                    f"evaluating its rules individually: {e}"
+                )
+                return key, None
+
+        loaded = await asyncio.gather(*(load(key, request) for key, request in plan_windows(rules).items()))
+        return {key: window for key, window in loaded if window is not None}
+
+    def _evaluate_rule_in_window(
+        self,
+        rule: Dict[str, Any],
+        window: ExecutionWindow
+    ) -> AlertRuleEvaluationResult:
+        """Evaluate a rule against its preloaded execution window"""
+        rule_type = rule.get("rule_type")
+        config = rule.get("threshold_config", {})
+        now = datetime.utcnow()
+
+        if rule_type == AlertRuleType.ERROR_RATE.value:
+            return self._error_rate_result(rule, config, window.error_rate_metrics(), now)
+        elif rule_type == AlertRuleType.ERROR_TYPE.value:
+            return self._error_type_result(rule, config, window.error_types, now)
+        elif rule_type == AlertRuleType.WORKFLOW_FAILURE.value:
+            failures = window.failures(config.get("workflow_ids", []), config.get("any_workflow", False))
+            total_failures = sum(f["error_count"] for f in failures)
+            return self._workflow_failure_result(rule, failures, total_failures, now)
+        elif rule_type == AlertRuleType.CONSECUTIVE_FAILURES.value:
+            max_consecutive, failing_workflow = window.max_consecutive_failures(config.get("workflow_ids", []))
+            return self._consecutive_failures_result(rule, config, max_consecutive, failing_workflow, now)
+        elif rule_type == AlertRuleType.EXECUTION_DURATION.value:
+            max_duration_ms = config.get("max_duration_ms", 60000)
+            workflow_ids = config.get("workflow_ids", [])
+            long_running = window.long_running(max_duration_ms, workflow_ids)
+            total_count = window.long_running_count(max_duration_ms, workflow_ids)
+            return self._execution_duration_result(rule, config, long_running, now, total_count)
+        else:
+            return self._unknown_rule_type_result(rule, now)
+
     async def _evaluate_single_rule(
         self,
         rule: Dict[str, Any]
@@ -305,13 +420,16 @@ class AlertRulesService:
         elif rule_type == AlertRuleType.EXECUTION_DURATION.value:
             return await self._evaluate_execution_duration(rule, threshold_config, tenant_id, environment_id, now)
         else:
-            return AlertRuleEvaluationResult(
-                rule_id=rule["id"],
-                rule_name=rule.get("name", "Unknown"),
-                is_triggered=False,
-                message=f"Unknown rule type: {rule_type}",
-                evaluated_at=now
-            )
+            return self._unknown_rule_type_result(rule, now)
+
+    def _unknown_rule_type_result(self, rule: Dict[str, Any], now: datetime) -> AlertRuleEvaluationResult:
+        return AlertRuleEvaluationResult(
+            rule_id=rule["id"],
+            rule_name=rule.get("name", "Unknown"),
+            is_triggered=False,
+            message=f"Unknown rule type: {rule.get('rule_type')}",
+            evaluated_at=now
+        )
 
     async def _evaluate_error_rate(
         self,
@@ -322,14 +440,24 @@ class AlertRulesService:
         now: datetime
     ) -> AlertRuleEvaluationResult:
         """Evaluate error rate threshold"""
-        threshold_percent = config.get("threshold_percent", 10)
         time_window_minutes = config.get("time_window_minutes", 60)
-        min_executions = config.get("min_executions", 10)
 
         # Get error rate from database
         metrics = await db_service.evaluate_error_rate(
             tenant_id, environment_id, time_window_minutes
         )
+        return self._error_rate_result(rule, config, metrics, now)
+
+    def _error_rate_result(
+        self,
+        rule: Dict[str, Any],
+        config: Dict[str, Any],
+        metrics: Dict[str, Any],
+        now: datetime
+    ) -> AlertRuleEvaluationResult:
+        threshold_percent = config.get("threshold_percent", 10)
+        time_window_minutes = config.get("time_window_minutes", 60)
+        min_executions = config.get("min_executions", 10)
 
         total_executions = metrics.get("total_executions", 0)
         error_count = metrics.get("error_count", 0)
@@ -373,14 +501,24 @@ class AlertRulesService:
         now: datetime
     ) -> AlertRuleEvaluationResult:
         """Evaluate error type matching"""
-        error_types = config.get("error_types", [])
         time_window_minutes = config.get("time_window_minutes", 60)
-        min_occurrences = config.get("min_occurrences", 1)
 
         # Get error intelligence from database
         errors = await db_service.get_error_intelligence_for_alert(
             tenant_id, environment_id, time_window_minutes
         )
+        return self._error_type_result(rule, config, errors, now)
+
+    def _error_type_result(
+        self,
+        rule: Dict[str, Any],
+        config: Dict[str, Any],
+        errors: List[Dict[str, Any]],
+        now: datetime
+    ) -> AlertRuleEvaluationResult:
+        error_types = config.get("error_types", [])
+        time_window_minutes = config.get("time_window_minutes", 60)
+        min_occurrences = config.get("min_occurrences", 1)
 
         matching_errors = [
             e for e in errors
@@ -427,8 +565,16 @@ class AlertRulesService:
         failures = await db_service.get_recent_workflow_failures(
             tenant_id, environment_id, workflow_ids, canonical_ids, any_workflow
         )
+        return self._workflow_failure_result(rule, failures, len(failures), now)
 
-        is_triggered = len(failures) > 0
+    def _workflow_failure_result(
+        self,
+        rule: Dict[str, Any],
+        failures: List[Dict[str, Any]],
+        total_failures: int,
+        now: datetime
+    ) -> AlertRuleEvaluationResult:
+        is_triggered = total_failures > 0
 
         if is_triggered:
             failure_names = [f.get("workflow_name", f.get("workflow_id", "Unknown")) for f in failures[:5]]
@@ -442,12 +588,12 @@ class AlertRulesService:
             rule_id=rule["id"],
             rule_name=rule.get("name", "Unknown"),
             is_triggered=is_triggered,
-            current_value=float(len(failures)),
+            current_value=float(total_failures),
             threshold_value=1.0,
             message=message,
             details={
                 "failures": failures[:10],  # Limit details
-                "total_failures": len(failures)
+                "total_failures": total_failures
             },
             evaluated_at=now
         )
@@ -461,7 +607,6 @@ class AlertRulesService:
         now: datetime
     ) -> AlertRuleEvaluationResult:
         """Evaluate consecutive failure count"""
-        failure_count_threshold = config.get("failure_count", 3)
         workflow_ids = config.get("workflow_ids", [])
 
         # Get consecutive failure counts
@@ -482,6 +627,17 @@ class AlertRulesService:
             max_consecutive = result.get("max_consecutive", 0)
             failing_workflow = result.get("workflow_id")
 
+        return self._consecutive_failures_result(rule, config, max_consecutive, failing_workflow, now)
+
+    def _consecutive_failures_result(
+        self,
+        rule: Dict[str, Any],
+        config: Dict[str, Any],
+        max_consecutive: int,
+        failing_workflow: Optional[str],
+        now: datetime
+    ) -> AlertRuleEvaluationResult:
+        failure_count_threshold = config.get("failure_count", 3)
         is_triggered = max_consecutive >= failure_count_threshold
 
         message = (
@@ -521,13 +677,25 @@ class AlertRulesService:
         long_running = await db_service.get_long_running_executions(
             tenant_id, environment_id, max_duration_ms, workflow_ids
         )
+        return self._execution_duration_result(rule, config, long_running, now)
 
+    def _execution_duration_result(
+        self,
+        rule: Dict[str, Any],
+        config: Dict[str, Any],
+        long_running: List[Dict[str, Any]],
+        now: datetime,
+        total_count: Optional[int] = None
+    ) -> AlertRuleEvaluationResult:
+        max_duration_ms = config.get("max_duration_ms", 60000)
+        if total_count is None:
+            total_count = len(long_running)
         is_triggered = len(long_running) > 0
 
         if is_triggered:
             max_duration = max(e.get("duration_ms", 0) for e in long_running)
             message = (
-                f"Found {len(long_running)} executions exceeding {max_duration_ms}ms "
+                f"Found {total_count} executions exceeding {max_duration_ms}ms "
                 f"(max: {max_duration}ms)"
             )
         else:
@@ -542,7 +710,7 @@ class AlertRulesService:
             message=message,
             details={
                 "long_running_executions": long_running[:10],
-                "total_count": len(long_running)
+                "total_count": total_count
             },
             evaluated_at=now
         )
@@ -1,12 +1,15 @@
 """Supabase authentication service for verifying JWT tokens and managing user sessions."""
-from typing import Optional, Dict, Any
+import copy
+import threading
+from typing import Optional, Dict, Any, Set
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
-from fastapi import HTTPException, status, Depends
+from fastapi import HTTPException, status, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from app.core.config import settings
 from app.services.database import db_service
+from app.services.ttl_cache import TTLCache
 
 security = HTTPBearer(auto_error=False)
 
@@ -68,6 +71,7 @@ class SupabaseAuthService:
             db_service.client.table("users").update({
                 "supabase_auth_id": supabase_user_id
             }).eq("id", user["id"]).execute()
+            principal_cache.invalidate_user(user["id"])
 
             return {
                 "user": user,
@@ -109,6 +113,7 @@ class SupabaseAuthService:
                 db_service.client.table("tenants").update({
                     "name": organization_name
                 }).eq("id", tenant["id"]).execute()
+                principal_cache.invalidate_tenant(tenant["id"])
                 tenant["name"] = organization_name
         else:
             # Create new tenant
@@ -143,6 +148,7 @@ class SupabaseAuthService:
                 "supabase_auth_id": supabase_auth_id,
                 "name": name
             }).eq("id", user["id"]).execute()
+            principal_cache.invalidate_user(user["id"])
             user["supabase_auth_id"] = supabase_auth_id
             user["name"] = name
         else:
@@ -222,8 +228,167 @@ def verify_impersonation_token(token: str) -> Dict[str, Any]:
 supabase_auth_service = SupabaseAuthService()
 
 
+class PrincipalCache:
+    """
+    Short-lived, size-bounded cache of resolved principals keyed by Supabase `sub`.
+
+    A principal is the app user row, its tenant row and the Platform Admin flag.
+    Entries expire after a short TTL so changes made by other workers are picked
+    up quickly; writes in this process call invalidate_user/invalidate_tenant so
+    they take effect immediately.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = TTLCache(max_entries, ttl_seconds)
+        self._subs_by_user: Dict[str, Set[str]] = {}
+        self._subs_by_tenant: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._invalidations = 0
+
+    def get(self, sub: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached principal for a token subject, if still fresh."""
+        principal = self._entries.get(sub)
+        return copy.deepcopy(principal) if principal is not None else None
+
+    def set(self, sub: str, principal: Dict[str, Any]) -> None:
+        """Cache a resolved principal for a token subject."""
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        principal = copy.deepcopy(principal)
+        user_id = str((principal.get("user") or {}).get("id") or "")
+        tenant_id = str((principal.get("user") or {}).get("tenant_id") or "")
+        with self._lock:
+            self._entries.set(sub, principal)
+            if user_id:
+                self._subs_by_user.setdefault(user_id, set()).add(sub)
+            if tenant_id:
+                self._subs_by_tenant.setdefault(tenant_id, set()).add(sub)
+            # Evicted and expired subs linger in the indexes; prune them once they outgrow the cache
+            if len(self._subs_by_user) + len(self._subs_by_tenant) > 4 * self.max_entries:
+                self._prune(self._subs_by_user)
+                self._prune(self._subs_by_tenant)
+
+    def _prune(self, index: Dict[str, Set[str]]) -> None:
+        for key in list(index):
+            live = {sub for sub in index[key] if sub in self._entries}
+            if live:
+                index[key] = live
+            else:
+                del index[key]
+
+    def _invalidate(self, index: Dict[str, Set[str]], key: Optional[str]) -> None:
+        if not key:
+            return
+        with self._lock:
+            for sub in index.pop(str(key), ()):
+                if sub in self._entries:
+                    self._invalidations += 1
+                self._entries.pop(sub)
+
+    def invalidate_user(self, user_id: Optional[str]) -> None:
+        """Forget every cached principal for an app user."""
+        self._invalidate(self._subs_by_user, user_id)
+
+    def invalidate_tenant(self, tenant_id: Optional[str]) -> None:
+        """Forget every cached principal belonging to a tenant."""
+        self._invalidate(self._subs_by_tenant, tenant_id)
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self._subs_by_user.clear()
+            self._subs_by_tenant.clear()
+            self._invalidations = 0
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get cache size and hit/eviction counters."""
+        return {**self._entries.get_metrics(), "invalidations": self._invalidations}
+
+
+principal_cache = PrincipalCache(
+    max_entries=settings.AUTH_PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+async def resolve_principal(supabase_user_id: str, email: str) -> Dict[str, Any]:
+    """
+    Resolve the app user, tenant and Platform Admin flag for a Supabase identity.
+
+    Returns the get_or_create_user result for users who still need onboarding;
+    only fully resolved principals are cached.
+    """
+    cached = principal_cache.get(supabase_user_id)
+    if cached is not None:
+        return cached
+
+    user_info = await supabase_auth_service.get_or_create_user(supabase_user_id, email)
+    user = user_info.get("user")
+    if not user:
+        return user_info
+
+    tenant = user_info.get("tenant")
+    # If join didn't return tenant, fetch it separately
+    if not tenant and user.get("tenant_id"):
+        tenant_response = db_service.client.table("tenants").select("*").eq(
+            "id", user["tenant_id"]
+        ).execute()
+        if tenant_response.data and len(tenant_response.data) > 0:
+            tenant = tenant_response.data[0]
+
+    # Migration: 9ed964cd8ba3 - create_platform_impersonation_sessions
+    # See: alembic/versions/9ed964cd8ba3_create_platform_impersonation_sessions.py
+    is_platform_admin = False
+    try:
+        pa_resp = db_service.client.table("platform_admins").select("user_id").eq("user_id", user["id"]).maybe_single().execute()
+        is_platform_admin = bool(pa_resp.data)
+    except Exception:
+        is_platform_admin = False
+
+    principal = {
+        "user": user,
+        "tenant": tenant,
+        "is_new": False,
+        "is_platform_admin": is_platform_admin,
+    }
+    principal_cache.set(supabase_user_id, principal)
+    return principal
+
+
+async def resolve_request_principal(token: str, request: Optional[Request] = None) -> Dict[str, Any]:
+    """
+    Verify a Supabase token and resolve its principal once per request.
+
+    The result is stashed on request.state so the rate limiter and the auth
+    dependencies share a single resolution.
+    """
+    if request is not None:
+        resolved = getattr(request.state, "auth_principal", None)
+        if resolved is not None and resolved[0] == token:
+            return resolved[1]
+
+    payload = await supabase_auth_service.verify_token(token)
+    supabase_user_id = payload.get("sub")
+    email = payload.get("email")
+
+    if not supabase_user_id or not email:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token payload"
+        )
+
+    principal = await resolve_principal(supabase_user_id, email)
+    if request is not None:
+        request.state.auth_principal = (token, principal)
+    return principal
+
+
 async def get_current_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    request: Request = None,
 ) -> Dict[str, Any]:
     """Dependency to get the current authenticated user."""
     if not credentials:
@@ -306,19 +471,8 @@ async def get_current_user(
             "admin_id": admin_user_id  # Keep for backward compatibility
         }
 
-    # Verify Supabase JWT
-    payload = await supabase_auth_service.verify_token(token)
-    supabase_user_id = payload.get("sub")
-    email = payload.get("email")
-
-    if not supabase_user_id or not email:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload"
-        )
-
-    # Get or create app user
-    user_info = await supabase_auth_service.get_or_create_user(supabase_user_id, email)
+    # Verify Supabase JWT and resolve the app user (shared with the rate limiter via request.state)
+    user_info = await resolve_request_principal(token, request)
 
     if user_info.get("is_new") and user_info.get("user") is None:
         raise HTTPException(
@@ -330,25 +484,8 @@ async def get_current_user(
     user = user_info["user"]
     tenant = user_info["tenant"]
 
-    # If join didn't return tenant, fetch it separately
-    if not tenant and user.get("tenant_id"):
-        tenant_response = db_service.client.table("tenants").select("*").eq(
-            "id", user["tenant_id"]
-        ).execute()
-        if tenant_response.data and len(tenant_response.data) > 0:
-            tenant = tenant_response.data[0]
-
     # If the caller is a Platform Admin with an active impersonation session, return impersonated context.
-    # Migration: 9ed964cd8ba3 - create_platform_impersonation_sessions
-    # See: alembic/versions/9ed964cd8ba3_create_platform_impersonation_sessions.py
-    is_platform_admin = False
-    try:
-        pa_resp = db_service.client.table("platform_admins").select("user_id").eq("user_id", user["id"]).maybe_single().execute()
-        is_platform_admin = bool(pa_resp.data)
-    except Exception:
-        is_platform_admin = False
-
-    if is_platform_admin:
+    if user_info.get("is_platform_admin"):
         sess_resp = (
             db_service.client.table("platform_impersonation_sessions")
             .select("id, impersonated_user_id, ended_at")
@@ -434,7 +571,8 @@ def is_user_admin(user: Dict[str, Any]) -> bool:
 
 
 async def get_current_user_optional(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    request: Request = None,
 ) -> Dict[str, Any]:
     """Dependency to get the current user, allowing new users for onboarding."""
     if not credentials:
@@ -449,42 +587,20 @@ async def get_current_user_optional(
 
     # Handle impersonation tokens
     if token.startswith(IMPERSONATION_TOKEN_PREFIX):
-        return await get_current_user(credentials)
+        return await get_current_user(credentials, request)
 
     try:
-        # Verify Supabase JWT
-        payload = await supabase_auth_service.verify_token(token)
-        supabase_user_id = payload.get("sub")
-        email = payload.get("email")
-
-        if not supabase_user_id or not email:
-            return {
-                "user": None,
-                "tenant": None,
-                "is_new": False,
-                "no_credentials": True
-            }
+        # Verify Supabase JWT and resolve the app user (shared with the rate limiter via request.state)
+        user_info = await resolve_request_principal(token, request)
 
-        # Get or create app user
-        user_info = await supabase_auth_service.get_or_create_user(supabase_user_id, email)
-        
         user = user_info.get("user")
         tenant = user_info.get("tenant")
-        
+
         if not user:
             return user_info
 
         # If the caller is a Platform Admin with an active impersonation session, return impersonated context.
-        # Migration: 9ed964cd8ba3 - create_platform_impersonation_sessions
-        # See: alembic/versions/9ed964cd8ba3_create_platform_impersonation_sessions.py
-        is_platform_admin = False
-        try:
-            pa_resp = db_service.client.table("platform_admins").select("user_id").eq("user_id", user["id"]).maybe_single().execute()
-            is_platform_admin = bool(pa_resp.data)
-        except Exception:
-            is_platform_admin = False
-
-        if is_platform_admin:
+        if user_info.get("is_platform_admin"):
             sess_resp = (
                 db_service.client.table("platform_impersonation_sessions")
                 .select("id, impersonated_user_id, ended_at")
@@ -5,8 +5,9 @@ Greenfield Sync Model:
 - DEV: n8n is source of truth. Full sync: workflow_data + env_content_hash + n8n_updated_at
 - Non-DEV: Git is source of truth. Observational sync: env_content_hash + n8n_updated_at only (not workflow_data)
 """
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
 from app.services.database import db_service
@@ -14,20 +15,58 @@ from app.services.provider_registry import ProviderRegistry
 from app.services.canonical_workflow_service import (
     CanonicalWorkflowService,
     compute_workflow_hash,
-    get_registered_payload
+    get_registered_fingerprint,
+    workflow_content_digest,
 )
-from app.services.promotion_service import normalize_workflow_for_comparison
 from app.schemas.canonical_workflow import WorkflowMappingStatus
 
 logger = logging.getLogger(__name__)
 
 BATCH_SIZE = 25  # Process 25-30 workflows per batch (checkpoint after each)
+FETCH_CONCURRENCY = 8  # Max concurrent full-workflow fetches per environment
+
+# Per-environment fetch semaphores, bound to the event loop that created them
+_env_fetch_semaphores: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = {}
+
+
+def _get_env_fetch_semaphore(environment_id: str) -> asyncio.Semaphore:
+    """Get the semaphore bounding full-workflow fetches against one environment."""
+    loop = asyncio.get_running_loop()
+    entry = _env_fetch_semaphores.get(environment_id)
+    if entry is None or entry[0] is not loop:
+        entry = (loop, asyncio.Semaphore(FETCH_CONCURRENCY))
+        _env_fetch_semaphores[environment_id] = entry
+    return entry[1]
+
+
+async def _fetch_full_workflows(
+    adapter: Any,
+    summaries: List[Dict[str, Any]],
+    semaphore: asyncio.Semaphore
+) -> List[Dict[str, Any]]:
+    """
+    Fetch full workflow JSON for a batch of summaries concurrently.
+
+    Order matches the input summaries (summaries without an id are dropped).
+    A failed fetch falls back to the summary.
+    """
+    async def fetch_one(summary: Dict[str, Any]) -> Dict[str, Any]:
+        workflow_id = summary.get("id")
+        async with semaphore:
+            try:
+                return await adapter.get_workflow(workflow_id)
+            except Exception as e:
+                logger.warning(f"Failed to fetch full workflow {workflow_id}: {str(e)}, using summary")
+                return summary
+
+    return list(await asyncio.gather(*(fetch_one(s) for s in summaries if s.get("id"))))
 
 
 def _detect_hash_collision(
     workflow: Dict[str, Any],
     content_hash: str,
-    canonical_id: Optional[str] = None
+    canonical_id: Optional[str] = None,
+    memoize: bool = False
 ) -> Optional[Dict[str, Any]]:
     """
     Detect if a hash collision occurred for a workflow.
@@ -40,6 +79,7 @@ def _detect_hash_collision(
         workflow: The workflow payload
         content_hash: The computed hash
         canonical_id: Optional canonical ID for the workflow
+        memoize: Reuse the digest memoized for this n8n workflow version
 
     Returns:
         Collision warning dict if collision detected, None otherwise
@@ -51,10 +91,11 @@ def _detect_hash_collision(
             "message": str
         }
     """
-    normalized = normalize_workflow_for_comparison(workflow)
-    registered_payload = get_registered_payload(content_hash)
+    registered_fingerprint = get_registered_fingerprint(content_hash)
 
-    if registered_payload is not None and registered_payload != normalized:
+    if registered_fingerprint is not None and registered_fingerprint != workflow_content_digest(
+        workflow, memoize=memoize
+    )[1]:
         # Collision detected: same hash, different payload
         workflow_name = workflow.get("name", "unknown")
         n8n_workflow_id = workflow.get("id", "unknown")
@@ -113,8 +154,6 @@ class CanonicalEnvSyncService:
         Returns:
             Sync result with counts and errors
         """
-        from app.services.background_job_service import background_job_service, BackgroundJobStatus
-        
         adapter = ProviderRegistry.get_adapter_for_environment(environment)
         
         results = {
@@ -176,114 +215,46 @@ class CanonicalEnvSyncService:
             # - Individual workflow failures within a batch are isolated (caught per-workflow)
             # - Batch checkpoint ensures resumability after partial completion
             # - Database upserts provide atomicity for each workflow mapping
-            for batch_start in range(start_index, total_workflows, BATCH_SIZE):
-                batch_end = min(batch_start + BATCH_SIZE, total_workflows)
-                batch_summaries = n8n_workflow_summaries[batch_start:batch_end]
-
-                # Fetch full workflow data for this batch
-                batch_workflows = []
-                for summary in batch_summaries:
-                    workflow_id = summary.get("id")
-                    if workflow_id:
-                        try:
-                            full_workflow = await adapter.get_workflow(workflow_id)
-                            batch_workflows.append(full_workflow)
-                        except Exception as e:
-                            logger.warning(f"Failed to fetch full workflow {workflow_id}: {str(e)}, using summary")
-                            # Fallback to summary if full fetch fails
-                            batch_workflows.append(summary)
-
-                # Update progress if job_id provided (phase: updating_environment_state)
-                if job_id:
-                    await background_job_service.update_job_status(
-                        job_id=job_id,
-                        status=BackgroundJobStatus.RUNNING,
-                        progress={
-                            "current": batch_start,
-                            "total": total_workflows,
-                            "percentage": int((batch_start / total_workflows) * 100) if total_workflows > 0 else 0,
-                            "message": f"Updating environment state: {batch_start} / {total_workflows} workflows processed",
-                            "current_step": "updating_environment_state"
-                        }
+            #
+            # Full workflow JSON is fetched concurrently (bounded per environment),
+            # and the next batch is prefetched while the current one is processed.
+            # Checkpoints still only advance after a batch has been processed.
+            fetch_semaphore = _get_env_fetch_semaphore(environment_id)
+            batch_starts = list(range(start_index, total_workflows, BATCH_SIZE))
+
+            def start_fetch(batch_start: int) -> "asyncio.Task[List[Dict[str, Any]]]":
+                summaries = n8n_workflow_summaries[batch_start:batch_start + BATCH_SIZE]
+                return asyncio.create_task(_fetch_full_workflows(adapter, summaries, fetch_semaphore))
+
+            next_fetch = start_fetch(batch_starts[0]) if batch_starts else None
+            try:
+                for position, batch_start in enumerate(batch_starts):
+                    batch_end = min(batch_start + BATCH_SIZE, total_workflows)
+
+                    # Wait for this batch's fetch, then start prefetching the next one
+                    batch_workflows = await next_fetch
+                    next_fetch = (
+                        start_fetch(batch_starts[position + 1])
+                        if position + 1 < len(batch_starts)
+                        else None
                     )
 
-                    # Emit SSE event for real-time updates (phase-based, not batch-based)
-                    if tenant_id_for_sse:
-                        try:
-                            from app.api.endpoints.sse import emit_sync_progress
-                            await emit_sync_progress(
-                                job_id=job_id,
-                                environment_id=environment_id,
-                                status="running",
-                                current_step="updating_environment_state",
-                                current=batch_start,
-                                total=total_workflows,
-                                message=f"{batch_start} / {total_workflows} workflows processed",
-                                tenant_id=tenant_id_for_sse
-                            )
-                        except Exception as sse_err:
-                            logger.warning(f"Failed to emit SSE progress event: {str(sse_err)}")
-
-                # Determine environment class for sync behavior
-                env_class = environment.get("environment_class", "dev").lower()
-                is_dev = env_class == "dev"
-
-                # Process batch with transaction safety
-                # Each workflow in batch has error isolation via try-catch in _process_workflow_batch
-                batch_results = await CanonicalEnvSyncService._process_workflow_batch(
-                    tenant_id,
-                    environment_id,
-                    batch_workflows,
-                    is_dev=is_dev
-                )
-
-                # Aggregate results
-                results["workflows_synced"] += batch_results["synced"]
-                results["workflows_skipped"] += batch_results.get("skipped", 0)
-                results["workflows_linked"] += batch_results["linked"]
-                results["workflows_unmapped"] += batch_results["unmapped"]
-                results["errors"].extend(batch_results["errors"])
-                results["observed_workflow_ids"].extend(batch_results.get("observed_workflow_ids", []))
-                results["created_workflow_ids"].extend(batch_results.get("created_workflow_ids", []))
-                results["collision_warnings"].extend(batch_results.get("collision_warnings", []))
-                
-                # Checkpoint after batch (store in job progress for resumability)
-                if job_id:
-                    checkpoint_data = {
-                        "last_processed_index": batch_end,
-                        "last_batch_end": batch_end,
-                        "total_workflows": total_workflows
-                    }
-                    await background_job_service.update_job_status(
+                    await CanonicalEnvSyncService._sync_fetched_batch(
+                        tenant_id,
+                        environment_id,
+                        environment,
+                        batch_workflows,
+                        batch_start,
+                        batch_end,
+                        total_workflows,
+                        results,
                         job_id=job_id,
-                        status=BackgroundJobStatus.RUNNING,
-                        progress={
-                            "current": batch_end,
-                            "total": total_workflows,
-                            "percentage": int((batch_end / total_workflows) * 100) if total_workflows > 0 else 100,
-                            "message": f"Updating environment state: {batch_end} / {total_workflows} workflows processed",
-                            "current_step": "updating_environment_state",
-                            "checkpoint": checkpoint_data
-                        }
+                        tenant_id_for_sse=tenant_id_for_sse
                     )
-                    
-                    # Emit SSE event after batch completion (phase-based, not batch-based)
-                    if tenant_id_for_sse:
-                        try:
-                            from app.api.endpoints.sse import emit_sync_progress
-                            await emit_sync_progress(
-                                job_id=job_id,
-                                environment_id=environment_id,
-                                status="running",
-                                current_step="updating_environment_state",
-                                current=batch_end,
-                                total=total_workflows,
-                                message=f"{batch_end} / {total_workflows} workflows processed",
-                                tenant_id=tenant_id_for_sse
-                            )
-                        except Exception as sse_err:
-                            logger.warning(f"Failed to emit SSE progress event: {str(sse_err)}")
-            
+            finally:
+                if next_fetch is not None and not next_fetch.done():
+                    next_fetch.cancel()
+
             # Mark workflows as missing if they no longer exist in n8n
             n8n_workflow_ids = {w.get("id") for w in n8n_workflow_summaries}
             missing_count = await CanonicalEnvSyncService._mark_missing_workflows_missing(
@@ -307,7 +278,117 @@ class CanonicalEnvSyncService:
             logger.error(error_msg)
             results["errors"].append(error_msg)
             raise
-    
+
+    @staticmethod
+    async def _sync_fetched_batch(
+        tenant_id: str,
+        environment_id: str,
+        environment: Dict[str, Any],
+        batch_workflows: List[Dict[str, Any]],
+        batch_start: int,
+        batch_end: int,
+        total_workflows: int,
+        results: Dict[str, Any],
+        job_id: Optional[str] = None,
+        tenant_id_for_sse: Optional[str] = None
+    ) -> None:
+        """
+        Process one fetched batch: report progress, sync it, aggregate into
+        results and checkpoint (last_processed_index = batch_end).
+        """
+        from app.services.background_job_service import background_job_service, BackgroundJobStatus
+
+        # Update progress if job_id provided (phase: updating_environment_state)
+        if job_id:
+            await background_job_service.update_job_status(
+                job_id=job_id,
+                status=BackgroundJobStatus.RUNNING,
+                progress={
+                    "current": batch_start,
+                    "total": total_workflows,
+                    "percentage": int((batch_start / total_workflows) * 100) if total_workflows > 0 else 0,
+                    "message": f"Updating environment state: {batch_start} / {total_workflows} workflows processed",
+                    "current_step": "updating_environment_state"
+                }
+            )
+
+            # Emit SSE event for real-time updates (phase-based, not batch-based)
+            if tenant_id_for_sse:
+                try:
+                    from app.api.endpoints.sse import emit_sync_progress
+                    await emit_sync_progress(
+                        job_id=job_id,
+                        environment_id=environment_id,
+                        status="running",
+                        current_step="updating_environment_state",
+                        current=batch_start,
+                        total=total_workflows,
+                        message=f"{batch_start} / {total_workflows} workflows processed",
+                        tenant_id=tenant_id_for_sse
+                    )
+                except Exception as sse_err:
+                    logger.warning(f"Failed to emit SSE progress event: {str(sse_err)}")
+
+        # Determine environment class for sync behavior
+        env_class = environment.get("environment_class", "dev").lower()
+        is_dev = env_class == "dev"
+
+        # Process batch with transaction safety
+        # Each workflow in batch has error isolation via try-catch in _process_workflow_batch
+        batch_results = await CanonicalEnvSyncService._process_workflow_batch(
+            tenant_id,
+            environment_id,
+            batch_workflows,
+            is_dev=is_dev
+        )
+
+        # Aggregate results
+        results["workflows_synced"] += batch_results["synced"]
+        results["workflows_skipped"] += batch_results.get("skipped", 0)
+        results["workflows_linked"] += batch_results["linked"]
+        results["workflows_unmapped"] += batch_results["unmapped"]
+        results["errors"].extend(batch_results["errors"])
+        results["observed_workflow_ids"].extend(batch_results.get("observed_workflow_ids", []))
+        results["created_workflow_ids"].extend(batch_results.get("created_workflow_ids", []))
+        results["collision_warnings"].extend(batch_results.get("collision_warnings", []))
+        
+        # Checkpoint after batch (store in job progress for resumability)
+        if job_id:
+            checkpoint_data = {
+                "last_processed_index": batch_end,
+                "last_batch_end": batch_end,
+                "total_workflows": total_workflows
+            }
+            await background_job_service.update_job_status(
+                job_id=job_id,
+                status=BackgroundJobStatus.RUNNING,
+                progress={
+                    "current": batch_end,
+                    "total": total_workflows,
+                    "percentage": int((batch_end / total_workflows) * 100) if total_workflows > 0 else 100,
+                    "message": f"Updating environment state: {batch_end} / {total_workflows} workflows processed",
+                    "current_step": "updating_environment_state",
+                    "checkpoint": checkpoint_data
+                }
+            )
+            
+            # Emit SSE event after batch completion (phase-based, not batch-based)
+            if tenant_id_for_sse:
+                try:
+                    from app.api.endpoints.sse import emit_sync_progress
+                    await emit_sync_progress(
+                        job_id=job_id,
+                        environment_id=environment_id,
+                        status="running",
+                        current_step="updating_environment_state",
+                        current=batch_end,
+                        total=total_workflows,
+                        message=f"{batch_end} / {total_workflows} workflows processed",
+                        tenant_id=tenant_id_for_sse
+                    )
+                except Exception as sse_err:
+                    logger.warning(f"Failed to emit SSE progress event: {str(sse_err)}")
+
     @staticmethod
     async def _process_workflow_batch(
         tenant_id: str,
@@ -341,6 +422,26 @@ class CanonicalEnvSyncService:
             "collision_warnings": []  # Hash collisions detected in this batch
         }
         
+        # Keyed bulk lookup of this batch's existing mappings (one query per batch)
+        n8n_workflow_ids = [w["id"] for w in workflows if w.get("id")]
+        try:
+            existing_mappings = await CanonicalEnvSyncService._get_mappings_by_n8n_ids(
+                tenant_id,
+                environment_id,
+                n8n_workflow_ids
+            )
+        except Exception as e:
+            logger.error(f"Error loading workflow mappings for batch: {str(e)}")
+            batch_results["observed_workflow_ids"].extend(n8n_workflow_ids)
+            batch_results["errors"].extend(
+                f"Error processing workflow {n8n_workflow_id}: {str(e)}" for n8n_workflow_id in n8n_workflow_ids
+            )
+            return batch_results
+
+        # Decide every workflow in memory; new workflows wait for the auto-link lookup
+        records: List[Dict[str, Any]] = []
+        outcomes: List[Dict[str, Any]] = []
+        new_workflows: List[Tuple[Dict[str, Any], str, Optional[Dict[str, Any]]]] = []
         for workflow in workflows:
             try:
                 n8n_workflow_id = workflow.get("id")
@@ -354,11 +455,7 @@ class CanonicalEnvSyncService:
                 n8n_updated_at = workflow.get("updatedAt")
                 
                 # Check if this n8n workflow is already mapped
-                existing_mapping = await CanonicalEnvSyncService._get_mapping_by_n8n_id(
-                    tenant_id,
-                    environment_id,
-                    n8n_workflow_id
-                )
+                existing_mapping = existing_mappings.get(n8n_workflow_id)
                 
                 if existing_mapping:
                     existing_status = existing_mapping.get("status")
@@ -376,10 +473,14 @@ class CanonicalEnvSyncService:
                             continue
                     
                     # Compute content hash (only if not short-circuited)
-                    content_hash = compute_workflow_hash(workflow, canonical_id=existing_canonical_id)
+                    content_hash = compute_workflow_hash(
+                        workflow, canonical_id=existing_canonical_id, memoize=True
+                    )
 
                     # Check for hash collision and track warning
-                    collision = _detect_hash_collision(workflow, content_hash, existing_canonical_id)
+                    collision = _detect_hash_collision(
+                        workflow, content_hash, existing_canonical_id, memoize=True
+                    )
                     if collision:
                         batch_results["collision_warnings"].append(collision)
 
@@ -395,7 +496,7 @@ class CanonicalEnvSyncService:
                     # Update existing mapping
                     # DEV: update workflow_data + hash
                     # Non-DEV: update hash only (observational)
-                    await CanonicalEnvSyncService._update_workflow_mapping(
+                    records.append(CanonicalEnvSyncService._build_update_record(
                         tenant_id,
                         environment_id,
                         existing_canonical_id,
@@ -404,72 +505,128 @@ class CanonicalEnvSyncService:
                         status=new_status,
                         workflow_data=workflow if is_dev else None,  # Only store workflow_data in DEV
                         n8n_updated_at=n8n_updated_at
-                    )
-                    batch_results["synced"] += 1
-                    if existing_canonical_id or (existing_status == "missing" and existing_canonical_id):
-                        batch_results["linked"] += 1
-                    elif existing_status == "missing" and not existing_canonical_id:
-                        batch_results["unmapped"] += 1
+                    ))
+                    if existing_canonical_id:
+                        outcomes.append({"linked": 1})
+                    elif existing_status == "missing":
+                        outcomes.append({"unmapped": 1})
+                    else:
+                        outcomes.append({})
                 else:
                     # New workflow - compute hash
                     # Note: canonical_id is unknown at this point (will be determined by auto-link)
-                    content_hash = compute_workflow_hash(workflow)
+                    content_hash = compute_workflow_hash(workflow, memoize=True)
 
                     # Check for hash collision and track warning (before auto-link)
-                    collision = _detect_hash_collision(workflow, content_hash, canonical_id=None)
+                    collision = _detect_hash_collision(
+                        workflow, content_hash, canonical_id=None, memoize=True
+                    )
                     if collision:
                         batch_results["collision_warnings"].append(collision)
 
-                    # Try to auto-link by hash
-                    canonical_id = await CanonicalEnvSyncService._try_auto_link_by_hash(
+                    new_workflows.append((workflow, content_hash, collision))
+                
+            except Exception as e:
+                error_msg = f"Error processing workflow {workflow.get('id', 'unknown')}: {str(e)}"
+                logger.error(error_msg)
+                batch_results["errors"].append(error_msg)
+
+        if new_workflows:
+            # Try to auto-link by hash, resolving every new workflow of the batch at once
+            auto_links = await CanonicalEnvSyncService._resolve_auto_links_by_hash(
+                tenant_id,
+                environment_id,
+                [(workflow["id"], content_hash) for workflow, content_hash, _ in new_workflows]
+            )
+
+            for workflow, content_hash, collision in new_workflows:
+                n8n_workflow_id = workflow["id"]
+                n8n_updated_at = workflow.get("updatedAt")
+                canonical_id = auto_links.get(n8n_workflow_id)
+
+                # Update collision warning with canonical_id if auto-linked
+                if canonical_id and collision:
+                    collision["canonical_id"] = canonical_id
+
+                if canonical_id:
+                    # Auto-linked
+                    # DEV: store workflow_data
+                    # Non-DEV: observational only
+                    records.append(CanonicalEnvSyncService._build_mapping_record(
                         tenant_id,
                         environment_id,
+                        canonical_id,
+                        n8n_workflow_id,
                         content_hash,
-                        n8n_workflow_id
-                    )
+                        status=WorkflowMappingStatus.LINKED,
+                        workflow_data=workflow if is_dev else None,
+                        n8n_updated_at=n8n_updated_at
+                    ))
+                    outcomes.append({"linked": 1})
+                else:
+                    # Unmapped - create mapping row with canonical_id=NULL
+                    records.append(CanonicalEnvSyncService._build_mapping_record(
+                        tenant_id,
+                        environment_id,
+                        None,
+                        n8n_workflow_id,
+                        content_hash,
+                        status=WorkflowMappingStatus.UNMAPPED,
+                        workflow_data=workflow if is_dev else None,
+                        n8n_updated_at=n8n_updated_at
+                    ))
+                    # Track newly created (unmapped) workflows
+                    outcomes.append({"unmapped": 1, "created": True})
 
-                    # Update collision warning with canonical_id if auto-linked
-                    if canonical_id and collision:
-                        collision["canonical_id"] = canonical_id
-
-                    if canonical_id:
-                        # Auto-linked
-                        # DEV: store workflow_data
-                        # Non-DEV: observational only
-                        await CanonicalEnvSyncService._create_workflow_mapping(
-                            tenant_id,
-                            environment_id,
-                            canonical_id,
-                            n8n_workflow_id,
-                            content_hash,
-                            status=WorkflowMappingStatus.LINKED,
-                            workflow_data=workflow if is_dev else None,
-                            n8n_updated_at=n8n_updated_at
-                        )
-                        batch_results["synced"] += 1
-                        batch_results["linked"] += 1
-                    else:
-                        # Unmapped - create mapping row with canonical_id=NULL
-                        await CanonicalEnvSyncService._create_unmapped_mapping(
-                            tenant_id,
-                            environment_id,
-                            n8n_workflow_id,
-                            content_hash,
-                            workflow_data=workflow if is_dev else None,
-                            n8n_updated_at=n8n_updated_at
-                        )
-                        batch_results["synced"] += 1
-                        batch_results["unmapped"] += 1
-                        # Track newly created (unmapped) workflows
-                        batch_results["created_workflow_ids"].append(n8n_workflow_id)
-                
-            except Exception as e:
-                error_msg = f"Error processing workflow {workflow.get('id', 'unknown')}: {str(e)}"
+        if not records:
+            return batch_results
+
+        # Write every mapping insert and update of the batch in one bulk upsert;
+        # rows the database rejects are reported individually
+        try:
+            upserted = await db_service.bulk_upsert_workflow_env_mappings(records)
+            failed = {f["key"]: f["error"] for f in upserted["failed"]}
+        except Exception as e:
+            failed = {record["n8n_workflow_id"]: str(e) for record in records}
+
+        for record, outcome in zip(records, outcomes):
+            n8n_workflow_id = record["n8n_workflow_id"]
+            if n8n_workflow_id in failed:
+                error_msg = f"Error processing workflow {n8n_workflow_id}: {failed[n8n_workflow_id]}"
                 logger.error(error_msg)
                 batch_results["errors"].append(error_msg)
+                continue
+            batch_results["synced"] += 1
+            batch_results["linked"] += outcome.get("linked", 0)
+            batch_results["unmapped"] += outcome.get("unmapped", 0)
+            if outcome.get("created"):
+                batch_results["created_workflow_ids"].append(n8n_workflow_id)
         
         return batch_results
     
+    @staticmethod
+    async def _get_mappings_by_n8n_ids(
+        tenant_id: str,
+        environment_id: str,
+        n8n_workflow_ids: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get workflow mappings for a set of n8n workflow IDs, keyed by n8n_workflow_id.
+
+        Selects only the columns batch processing reads (never workflow_data).
+        """
+        if not n8n_workflow_ids:
+            return {}
+        response = (
+            db_service.client.table("workflow_env_map")
+            .select("canonical_id, n8n_workflow_id, status, n8n_updated_at")
+            .eq("tenant_id", tenant_id)
+            .eq("environment_id", environment_id)
+            .in_("n8n_workflow_id", n8n_workflow_ids)
+            .execute()
+        )
+        return {row["n8n_workflow_id"]: row for row in (response.data or []) if row.get("n8n_workflow_id")}
+
     @staticmethod
     async def _get_mapping_by_n8n_id(
         tenant_id: str,
@@ -492,66 +649,86 @@ class CanonicalEnvSyncService:
             return None
     
     @staticmethod
-    async def _try_auto_link_by_hash(
+    async def _resolve_auto_links_by_hash(
         tenant_id: str,
         environment_id: str,
-        content_hash: str,
-        n8n_workflow_id: str
-    ) -> Optional[str]:
+        candidates: List[Tuple[str, str]]
+    ) -> Dict[str, str]:
         """
-        Try to auto-link n8n workflow to canonical workflow by content hash.
+        Try to auto-link new n8n workflows to canonical workflows by content hash.
         
         Only links if:
         - Hash matches exactly
         - Match is unique (one canonical workflow with this hash)
         - canonical_id is not already linked to a different n8n_workflow_id in same environment
+          (including by an earlier workflow in the same batch)
         
-        Returns canonical_id if linked, None otherwise.
+        Args:
+            candidates: (n8n_workflow_id, content_hash) pairs, in processing order
+        
+        Returns {n8n_workflow_id: canonical_id} for the workflows that link.
         """
         try:
-            # Find canonical workflows with matching Git content hash
+            # Find canonical workflows with matching Git content hashes (one query)
             git_state_response = (
                 db_service.client.table("canonical_workflow_git_state")
-                .select("canonical_id")
+                .select("canonical_id, git_content_hash")
                 .eq("tenant_id", tenant_id)
                 .eq("environment_id", environment_id)
-                .eq("git_content_hash", content_hash)
+                .in_("git_content_hash", sorted({content_hash for _, content_hash in candidates}))
                 .execute()
             )
-            
-            matching_canonical_ids = [row["canonical_id"] for row in (git_state_response.data or [])]
-            
+            canonical_ids_by_hash: Dict[str, List[str]] = {}
+            for row in (git_state_response.data or []):
+                canonical_ids_by_hash.setdefault(row["git_content_hash"], []).append(row["canonical_id"])
+
             # Only auto-link if exactly one match
-            if len(matching_canonical_ids) != 1:
-                return None
-            
-            canonical_id = matching_canonical_ids[0]
-            
-            # Check if this canonical_id is already linked to a different n8n_workflow_id in same environment
+            unique_matches = {
+                content_hash: canonical_ids[0]
+                for content_hash, canonical_ids in canonical_ids_by_hash.items()
+                if len(canonical_ids) == 1
+            }
+            if not unique_matches:
+                return {}
+
+            # Existing links of the matched canonical workflows in this environment (one query)
             existing_mapping_response = (
                 db_service.client.table("workflow_env_map")
-                .select("n8n_workflow_id")
+                .select("canonical_id, n8n_workflow_id")
                 .eq("tenant_id", tenant_id)
                 .eq("environment_id", environment_id)
-                .eq("canonical_id", canonical_id)
+                .in_("canonical_id", sorted(set(unique_matches.values())))
                 .neq("status", "missing")
                 .execute()
             )
-            
+            linked_n8n_ids: Dict[str, set] = {}
             for mapping in (existing_mapping_response.data or []):
-                existing_n8n_id = mapping.get("n8n_workflow_id")
-                if existing_n8n_id and existing_n8n_id != n8n_workflow_id:
-                    # Conflict: canonical_id already linked to different n8n_workflow_id
-                    logger.warning(
-                        f"Cannot auto-link {n8n_workflow_id} to canonical {canonical_id}: "
-                        f"already linked to {existing_n8n_id}"
-                    )
-                    return None
-            
-            return canonical_id
+                if mapping.get("n8n_workflow_id"):
+                    linked_n8n_ids.setdefault(mapping["canonical_id"], set()).add(mapping["n8n_workflow_id"])
         except Exception as e:
             logger.warning(f"Error in auto-link by hash: {str(e)}")
-            return None
+            return {}
+
+        auto_links: Dict[str, str] = {}
+        for n8n_workflow_id, content_hash in candidates:
+            canonical_id = unique_matches.get(content_hash)
+            if not canonical_id:
+                continue
+
+            # Check if this canonical_id is already linked to a different n8n_workflow_id in same environment
+            conflicting = linked_n8n_ids.get(canonical_id, set()) - {n8n_workflow_id}
+            if conflicting:
+                # Conflict: canonical_id already linked to different n8n_workflow_id
+                logger.warning(
+                    f"Cannot auto-link {n8n_workflow_id} to canonical {canonical_id}: "
+                    f"already linked to {sorted(conflicting)[0]}"
+                )
+                continue
+
+            auto_links[n8n_workflow_id] = canonical_id
+            linked_n8n_ids.setdefault(canonical_id, set()).add(n8n_workflow_id)
+
+        return auto_links
     
     @staticmethod
     async def _create_workflow_mapping(
@@ -593,28 +770,17 @@ class CanonicalEnvSyncService:
                 f"New: canonical_id={canonical_id}, status={status.value if status else None}"
             )
 
-        mapping_data = {
-            "tenant_id": tenant_id,
-            "environment_id": environment_id,
-            "n8n_workflow_id": n8n_workflow_id,
-            "env_content_hash": content_hash,
-            "last_env_sync_at": datetime.utcnow().isoformat(),
-            "linked_at": datetime.utcnow().isoformat() if status == WorkflowMappingStatus.LINKED else None,
-            "linked_by_user_id": linked_by_user_id,
-            "status": status.value if status else None,
-        }
-
-        # Store workflow_data only if provided (DEV mode)
-        if workflow_data is not None:
-            mapping_data["workflow_data"] = workflow_data
-
-        # Store n8n_updated_at for short-circuit optimization
-        if n8n_updated_at is not None:
-            mapping_data["n8n_updated_at"] = n8n_updated_at
-
-        # Only include canonical_id if it's not None
-        if canonical_id is not None:
-            mapping_data["canonical_id"] = canonical_id
+        mapping_data = CanonicalEnvSyncService._build_mapping_record(
+            tenant_id,
+            environment_id,
+            canonical_id,
+            n8n_workflow_id,
+            content_hash,
+            status=status,
+            linked_by_user_id=linked_by_user_id,
+            workflow_data=workflow_data,
+            n8n_updated_at=n8n_updated_at
+        )
 
         try:
             # Use upsert with unique constraint on (tenant_id, environment_id, n8n_workflow_id)
@@ -645,28 +811,45 @@ class CanonicalEnvSyncService:
             raise
     
     @staticmethod
-    async def _create_unmapped_mapping(
+    def _build_mapping_record(
         tenant_id: str,
         environment_id: str,
+        canonical_id: Optional[str],
         n8n_workflow_id: str,
         content_hash: str,
+        status: Optional[WorkflowMappingStatus] = None,
+        linked_by_user_id: Optional[str] = None,
         workflow_data: Optional[Dict[str, Any]] = None,
         n8n_updated_at: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Create a mapping row for an unmapped workflow (canonical_id=NULL)"""
-        return await CanonicalEnvSyncService._create_workflow_mapping(
-            tenant_id=tenant_id,
-            environment_id=environment_id,
-            canonical_id=None,  # NULL for unmapped
-            n8n_workflow_id=n8n_workflow_id,
-            content_hash=content_hash,
-            status=WorkflowMappingStatus.UNMAPPED,
-            workflow_data=workflow_data,
-            n8n_updated_at=n8n_updated_at
-        )
+        """Build a new workflow environment mapping row for upsert on (tenant_id, environment_id, n8n_workflow_id)"""
+        mapping_data = {
+            "tenant_id": tenant_id,
+            "environment_id": environment_id,
+            "n8n_workflow_id": n8n_workflow_id,
+            "env_content_hash": content_hash,
+            "last_env_sync_at": datetime.utcnow().isoformat(),
+            "linked_at": datetime.utcnow().isoformat() if status == WorkflowMappingStatus.LINKED else None,
+            "linked_by_user_id": linked_by_user_id,
+            "status": status.value if status else None,
+        }
+
+        # Store workflow_data only if provided (DEV mode)
+        if workflow_data is not None:
+            mapping_data["workflow_data"] = workflow_data
+
+        # Store n8n_updated_at for short-circuit optimization
+        if n8n_updated_at is not None:
+            mapping_data["n8n_updated_at"] = n8n_updated_at
+
+        # Only include canonical_id if it's not None
+        if canonical_id is not None:
+            mapping_data["canonical_id"] = canonical_id
+
+        return mapping_data
     
     @staticmethod
-    async def _update_workflow_mapping(
+    def _build_update_record(
         tenant_id: str,
         environment_id: str,
         canonical_id: Optional[str],
@@ -675,53 +858,45 @@ class CanonicalEnvSyncService:
         status: Optional[WorkflowMappingStatus] = None,
         workflow_data: Optional[Dict[str, Any]] = None,
         n8n_updated_at: Optional[str] = None
-    ) -> None:
+    ) -> Dict[str, Any]:
         """
-        Update existing workflow mapping.
+        Build the upsert row updating an existing workflow mapping.
+        
+        Only the columns being changed are included, so the upsert leaves the rest as stored.
         
         Greenfield behavior:
         - DEV: workflow_data is provided - full update
         - Non-DEV: workflow_data is None - only update env_content_hash (observational)
         """
-        try:
-            update_data = {
-                "n8n_workflow_id": n8n_workflow_id,
-                "env_content_hash": content_hash,
-                "last_env_sync_at": datetime.utcnow().isoformat()
-            }
-            
-            # Update canonical_id if provided (handles NULL → value or value → value)
-            if canonical_id is not None:
-                update_data["canonical_id"] = canonical_id
-            
-            # Update status if explicitly provided (for transitions like missing→linked)
-            if status is not None:
-                update_data["status"] = status.value
-                # Update linked_at if transitioning to linked
-                if status == WorkflowMappingStatus.LINKED:
-                    update_data["linked_at"] = datetime.utcnow().isoformat()
-            
-            # Only update workflow_data if provided (DEV mode)
-            # In non-DEV mode, workflow_data=None means don't overwrite existing
-            if workflow_data is not None:
-                update_data["workflow_data"] = workflow_data
-            
-            # Always update n8n_updated_at for short-circuit optimization
-            if n8n_updated_at is not None:
-                update_data["n8n_updated_at"] = n8n_updated_at
-            
-            # Use n8n_workflow_id for update (more reliable than canonical_id which may be NULL)
-            update_query = (
-                db_service.client.table("workflow_env_map")
-                .update(update_data)
-                .eq("tenant_id", tenant_id)
-                .eq("environment_id", environment_id)
-                .eq("n8n_workflow_id", n8n_workflow_id)
-            )
-            update_query.execute()
-        except Exception as e:
-            logger.error(f"Error updating workflow mapping: {str(e)}")
-            raise
+        update_data = {
+            "tenant_id": tenant_id,
+            "environment_id": environment_id,
+            "n8n_workflow_id": n8n_workflow_id,
+            "env_content_hash": content_hash,
+            "last_env_sync_at": datetime.utcnow().isoformat()
+        }
+        
+        # Update canonical_id if provided (handles NULL → value or value → value)
+        if canonical_id is not None:
+            update_data["canonical_id"] = canonical_id
+        
+        # Update status if explicitly provided (for transitions like missing→linked)
+        if status is not None:
+            update_data["status"] = status.value
+            # Update linked_at if transitioning to linked
+            if status == WorkflowMappingStatus.LINKED:
+                update_data["linked_at"] = datetime.utcnow().isoformat()
+        
+        # Only update workflow_data if provided (DEV mode)
+        # In non-DEV mode, workflow_data=None means don't overwrite existing
+        if workflow_data is not None:
+            update_data["workflow_data"] = workflow_data
+        
+        # Always update n8n_updated_at for short-circuit optimization
+        if n8n_updated_at is not None:
+            update_data["n8n_updated_at"] = n8n_updated_at
+        
+        return update_data
     
     @staticmethod
     async def _mark_missing_workflows_missing(
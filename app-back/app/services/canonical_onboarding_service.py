@@ -378,7 +378,7 @@ class CanonicalOnboardingService:
             # Actually, unmapped workflows don't have mappings - we need to find them differently
             # For MVP, we'll check during env sync which already does auto-linking
             
-            # This is handled by CanonicalEnvSyncService._try_auto_link_by_hash
+            # This is handled by CanonicalEnvSyncService._resolve_auto_links_by_hash
             # So we just return the count
             
             return results
@@ -1,6 +1,7 @@
 """
 Canonical Reconciliation Service - DB → DB reconciliation and diff computation
 """
+import asyncio
 import logging
 from typing import Dict, Any, List, Optional, Set
 from datetime import datetime, timedelta
@@ -64,36 +65,38 @@ class CanonicalReconciliationService:
         }
         
         try:
-            # Get all canonical workflows for this tenant
+            # Load every input for the pair in bulk: canonical workflows, Git
+            # states and mappings for both environments, and the existing diffs
             canonical_workflows = await CanonicalReconciliationService._get_canonical_workflows(
                 tenant_id
             )
-            
+            (
+                source_git_states,
+                target_git_states,
+                source_mappings,
+                target_mappings,
+                existing_diffs,
+            ) = await asyncio.gather(
+                CanonicalWorkflowService.list_canonical_workflow_git_states(tenant_id, source_env_id),
+                CanonicalWorkflowService.list_canonical_workflow_git_states(tenant_id, target_env_id),
+                CanonicalReconciliationService._get_workflow_mappings(tenant_id, source_env_id),
+                CanonicalReconciliationService._get_workflow_mappings(tenant_id, target_env_id),
+                CanonicalReconciliationService._get_existing_diffs(tenant_id, source_env_id, target_env_id),
+            )
+
+            diff_rows = []
             for canonical in canonical_workflows:
                 canonical_id = canonical["canonical_id"]
                 
                 try:
-                    # Get Git state for both environments
-                    source_git_state = await CanonicalWorkflowService.get_canonical_workflow_git_state(
-                        tenant_id, source_env_id, canonical_id
-                    )
-                    target_git_state = await CanonicalWorkflowService.get_canonical_workflow_git_state(
-                        tenant_id, target_env_id, canonical_id
-                    )
-                    
-                    # Get environment mappings
-                    source_mapping = await CanonicalReconciliationService._get_workflow_mapping(
-                        tenant_id, source_env_id, canonical_id
-                    )
-                    target_mapping = await CanonicalReconciliationService._get_workflow_mapping(
-                        tenant_id, target_env_id, canonical_id
-                    )
+                    source_git_state = source_git_states.get(canonical_id)
+                    target_git_state = target_git_states.get(canonical_id)
+                    source_mapping = source_mappings.get(canonical_id)
+                    target_mapping = target_mappings.get(canonical_id)
                     
                     # Check if we need to recompute (incremental)
                     if not force:
-                        existing_diff = await CanonicalReconciliationService._get_existing_diff(
-                            tenant_id, source_env_id, target_env_id, canonical_id
-                        )
+                        existing_diff = existing_diffs.get(canonical_id)
                         
                         if existing_diff:
                             # Check if inputs changed
@@ -137,8 +140,7 @@ class CanonicalReconciliationService:
                             target_mapping
                         )
 
-                    # Upsert diff state
-                    await CanonicalReconciliationService._upsert_diff_state(
+                    diff_rows.append(CanonicalReconciliationService._build_diff_row(
                         tenant_id,
                         source_env_id,
                         target_env_id,
@@ -149,21 +151,29 @@ class CanonicalReconciliationService:
                         source_mapping.get("env_content_hash") if source_mapping else None,
                         target_mapping.get("env_content_hash") if target_mapping else None,
                         conflict_metadata=conflict_metadata
-                    )
-                    
-                    results["diffs_computed"] += 1
-                    results["diffs_updated"] += 1
+                    ))
                     
                 except Exception as e:
                     error_msg = f"Error computing diff for {canonical_id}: {str(e)}"
                     logger.error(error_msg)
                     results["errors"].append(error_msg)
+
+            # Write back only the recomputed rows, in bulk
+            if diff_rows:
+                upserted = await db_service.bulk_upsert_workflow_diff_states(diff_rows)
+                results["diffs_computed"] = len(diff_rows) - len(upserted["failed"])
+                results["diffs_updated"] = results["diffs_computed"]
+                for failure in upserted["failed"]:
+                    error_msg = f"Error computing diff for {failure['key']}: {failure['error']}"
+                    logger.error(error_msg)
+                    results["errors"].append(error_msg)
             
             # Mark stale rows (workflows that no longer exist)
             await CanonicalReconciliationService._mark_stale_diffs(
                 tenant_id,
                 source_env_id,
                 target_env_id,
+                set(existing_diffs),
                 {c["canonical_id"] for c in canonical_workflows}
             )
             
@@ -317,66 +327,71 @@ class CanonicalReconciliationService:
 
     @staticmethod
     async def _get_canonical_workflows(tenant_id: str) -> List[Dict[str, Any]]:
-        """Get all canonical workflows for a tenant (not deleted)"""
-        try:
-            response = (
-                db_service.client.table("canonical_workflows")
-                .select("canonical_id")
-                .eq("tenant_id", tenant_id)
-                .is_("deleted_at", "null")
-                .execute()
-            )
-            return response.data or []
-        except Exception as e:
-            logger.error(f"Error fetching canonical workflows: {str(e)}")
-            return []
+        """
+        Get all canonical workflows for a tenant (not deleted).
+
+        Read errors propagate: an empty result would mark every diff stale.
+        """
+        return await db_service._select_all(
+            lambda: db_service.client.table("canonical_workflows")
+            .select("canonical_id")
+            .eq("tenant_id", tenant_id)
+            .is_("deleted_at", "null")
+            .order("canonical_id")
+        )
     
     @staticmethod
-    async def _get_workflow_mapping(
+    async def _get_workflow_mappings(
         tenant_id: str,
-        environment_id: str,
-        canonical_id: str
-    ) -> Optional[Dict[str, Any]]:
-        """Get workflow environment mapping"""
-        try:
-            response = (
-                db_service.client.table("workflow_env_map")
-                .select("*")
-                .eq("tenant_id", tenant_id)
-                .eq("environment_id", environment_id)
-                .eq("canonical_id", canonical_id)
-                .single()
-                .execute()
-            )
-            return response.data if response.data else None
-        except Exception:
-            return None
+        environment_id: str
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get workflow environment mappings for an environment, keyed by canonical_id.
+
+        Only the columns reconciliation reads are selected (never workflow_data).
+        A canonical workflow with more than one mapping in the environment is
+        ambiguous and treated as unmapped. Read errors propagate so the pair is
+        not reconciled against partial inputs.
+        """
+        rows = await db_service._select_all(
+            lambda: db_service.client.table("workflow_env_map")
+            .select("canonical_id, env_content_hash")
+            .eq("tenant_id", tenant_id)
+            .eq("environment_id", environment_id)
+            .not_.is_("canonical_id", "null")
+            .order("id")
+        )
+
+        mappings: Dict[str, Dict[str, Any]] = {}
+        ambiguous: Set[str] = set()
+        for row in rows:
+            canonical_id = row["canonical_id"]
+            if canonical_id in mappings:
+                ambiguous.add(canonical_id)
+            mappings[canonical_id] = row
+        for canonical_id in ambiguous:
+            del mappings[canonical_id]
+        return mappings
     
     @staticmethod
-    async def _get_existing_diff(
+    async def _get_existing_diffs(
         tenant_id: str,
         source_env_id: str,
-        target_env_id: str,
-        canonical_id: str
-    ) -> Optional[Dict[str, Any]]:
-        """Get existing diff state"""
-        try:
-            response = (
-                db_service.client.table("workflow_diff_state")
-                .select("*")
-                .eq("tenant_id", tenant_id)
-                .eq("source_env_id", source_env_id)
-                .eq("target_env_id", target_env_id)
-                .eq("canonical_id", canonical_id)
-                .single()
-                .execute()
-            )
-            return response.data if response.data else None
-        except Exception:
-            return None
+        target_env_id: str
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get existing diff states for an environment pair, keyed by canonical_id"""
+        rows = await db_service._select_all(
+            lambda: db_service.client.table("workflow_diff_state")
+            .select("canonical_id, source_git_hash, target_git_hash, source_env_hash, target_env_hash")
+            .eq("tenant_id", tenant_id)
+            .eq("source_env_id", source_env_id)
+            .eq("target_env_id", target_env_id)
+            .order("canonical_id")
+        )
+        return {row["canonical_id"]: row for row in rows}
     
     @staticmethod
-    async def _upsert_diff_state(
+    def _build_diff_row(
         tenant_id: str,
         source_env_id: str,
         target_env_id: str,
@@ -387,9 +402,9 @@ class CanonicalReconciliationService:
         source_env_hash: Optional[str] = None,
         target_env_hash: Optional[str] = None,
         conflict_metadata: Optional[Dict[str, Any]] = None
-    ) -> None:
+    ) -> Dict[str, Any]:
         """
-        Create or update diff state.
+        Build a diff state row for upsert.
 
         Args:
             tenant_id: Tenant ID
@@ -413,30 +428,23 @@ class CanonicalReconciliationService:
         }
 
         # Store hashes for incremental recomputation (used in reconcile_environment_pair)
-        # These are not in the DB schema but used for change detection
         diff_data["source_git_hash"] = source_git_hash
         diff_data["target_git_hash"] = target_git_hash
         diff_data["source_env_hash"] = source_env_hash
         diff_data["target_env_hash"] = target_env_hash
 
-        # Add conflict metadata if provided
+        # Add conflict metadata if provided (rows without it keep their stored value)
         if conflict_metadata is not None:
             diff_data["conflict_metadata"] = conflict_metadata
 
-        try:
-            db_service.client.table("workflow_diff_state").upsert(
-                diff_data,
-                on_conflict="tenant_id,source_env_id,target_env_id,canonical_id"
-            ).execute()
-        except Exception as e:
-            logger.error(f"Error upserting diff state: {str(e)}")
-            raise
+        return diff_data
     
     @staticmethod
     async def _mark_stale_diffs(
         tenant_id: str,
         source_env_id: str,
         target_env_id: str,
+        existing_canonical_ids: Set[str],
         valid_canonical_ids: Set[str]
     ) -> None:
         """
@@ -444,30 +452,15 @@ class CanonicalReconciliationService:
         
         For MVP, we'll delete stale rows (they can be recomputed if needed).
         """
+        stale_ids = existing_canonical_ids - valid_canonical_ids
+        if not stale_ids:
+            return
+
         try:
-            # Get all diff states for this env pair
-            response = (
-                db_service.client.table("workflow_diff_state")
-                .select("canonical_id")
-                .eq("tenant_id", tenant_id)
-                .eq("source_env_id", source_env_id)
-                .eq("target_env_id", target_env_id)
-                .execute()
+            await db_service.delete_workflow_diff_states(
+                tenant_id, source_env_id, target_env_id, sorted(stale_ids)
             )
-            
-            existing_canonical_ids = {row["canonical_id"] for row in (response.data or [])}
-            stale_ids = existing_canonical_ids - valid_canonical_ids
-            
-            if stale_ids:
-                # Delete stale diff states
-                for canonical_id in stale_ids:
-                    db_service.client.table("workflow_diff_state").delete().eq(
-                        "tenant_id", tenant_id
-                    ).eq("source_env_id", source_env_id).eq(
-                        "target_env_id", target_env_id
-                    ).eq("canonical_id", canonical_id).execute()
-                
-                logger.info(f"Marked {len(stale_ids)} stale diff states for deletion")
+            logger.info(f"Marked {len(stale_ids)} stale diff states for deletion")
         except Exception as e:
             logger.warning(f"Error marking stale diffs: {str(e)}")
     
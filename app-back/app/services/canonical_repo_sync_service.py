@@ -15,9 +15,9 @@ from app.services.github_service import GitHubService
 from app.services.canonical_workflow_service import (
     CanonicalWorkflowService,
     compute_workflow_hash,
-    get_registered_payload
+    get_registered_fingerprint,
+    workflow_content_digest,
 )
-from app.services.promotion_service import normalize_workflow_for_comparison
 
 logger = logging.getLogger(__name__)
 
@@ -51,10 +51,9 @@ def _detect_hash_collision(
             "message": str
         }
     """
-    normalized = normalize_workflow_for_comparison(workflow)
-    registered_payload = get_registered_payload(content_hash)
+    registered_fingerprint = get_registered_fingerprint(content_hash)
 
-    if registered_payload is not None and registered_payload != normalized:
+    if registered_fingerprint is not None and registered_fingerprint != workflow_content_digest(workflow)[1]:
         # Collision detected: same hash, different payload
         workflow_name = workflow.get("name", "unknown")
 
@@ -6,10 +6,9 @@ Scheduled safety sync for repository and environment syncs.
 NOTE: For MVP, automatic sync is DISABLED by default.
 Set SYNC_SCHEDULER_ENABLED=true in environment to enable.
 """
-import asyncio
 import logging
-from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, List
+from datetime import datetime, timezone
+from typing import Dict, Any
 
 from app.core.config import settings
 from app.services.database import db_service
@@ -21,15 +20,13 @@ from app.services.background_job_service import (
     BackgroundJobType,
     BackgroundJobStatus
 )
+from app.services.scheduler_runtime import ScheduledJob, ShardContext, scheduler_runtime
 
 logger = logging.getLogger(__name__)
 
-# Global flags to control schedulers
-_repo_sync_scheduler_running = False
-_repo_sync_scheduler_task = None
-
-_env_sync_scheduler_running = False
-_env_sync_scheduler_task = None
+# Scheduler job names
+REPO_SYNC_JOB = "canonical_repo_sync"
+ENV_SYNC_JOB = "canonical_env_sync"
 
 # Sync intervals (in seconds)
 REPO_SYNC_INTERVAL = 30 * 60  # 30 minutes
@@ -41,194 +38,177 @@ _env_sync_in_progress: Dict[str, datetime] = {}
 SYNC_DEBOUNCE_SECONDS = 60  # Prevent re-triggering same env sync within 60 seconds
 
 
-async def _process_repo_sync_scheduler():
-    """Process scheduled repository syncs"""
-    global _repo_sync_scheduler_running, _repo_sync_in_progress
+async def _run_repo_sync(ctx: ShardContext) -> int:
+    """Process scheduled repository syncs for environments in this worker's shards"""
+    # Get all environments with Git configured
+    all_environments = db_service.client.table("environments").select("*").execute()
+
+    environments = [
+        env for env in (all_environments.data or [])
+        if env.get("git_repo_url") and env.get("git_folder")
+        and env.get("tenant_id") and env.get("id")
+        and ctx.owns(env["id"])
+    ]
+    return await ctx.run_each(environments, _sync_environment_repo)
+
+
+async def _sync_environment_repo(env: Dict[str, Any]) -> None:
+    """Run a scheduled repository sync for one environment if it is due"""
+    tenant_id = env.get("tenant_id")
+    environment_id = env.get("id")
+
+    # Check debounce - skip if sync already in progress or recently completed
+    debounce_key = f"{tenant_id}:{environment_id}"
+    now = datetime.now(timezone.utc)
+    if debounce_key in _repo_sync_in_progress:
+        last_attempt = _repo_sync_in_progress[debounce_key]
+        if (now - last_attempt).total_seconds() < SYNC_DEBOUNCE_SECONDS:
+            logger.debug(f"Skipping repo sync for {environment_id} (debounced)")
+            return
+
+    # Check last sync time from environment record
+    last_sync = await _get_last_repo_sync_time(tenant_id, environment_id)
+
+    # Sync if last sync was more than REPO_SYNC_INTERVAL ago
+    if last_sync and (now - last_sync).total_seconds() <= REPO_SYNC_INTERVAL:
+        return
+
+    # Mark as in progress
+    _repo_sync_in_progress[debounce_key] = now
+    try:
+        # Create background job
+        job = await background_job_service.create_job(
+            tenant_id=tenant_id,
+            job_type=BackgroundJobType.CANONICAL_REPO_SYNC,
+            resource_id=environment_id,
+            resource_type="environment",
+            metadata={"trigger": "scheduled_sync"}
+        )
+
+        # Run sync (repo sync doesn't support job_id/SSE yet)
+        repo_sync_result = await CanonicalRepoSyncService.sync_repository(
+            tenant_id=tenant_id,
+            environment_id=environment_id,
+            environment=env
+        )
+
+        # Trigger reconciliation
+        await CanonicalReconciliationService.reconcile_all_pairs_for_environment(
+            tenant_id=tenant_id,
+            changed_env_id=environment_id
+        )
+
+        # Complete the job successfully
+        await background_job_service.complete_job(
+            job_id=job["id"],
+            result=repo_sync_result
+        )
+
+        logger.info(f"Scheduled repo sync completed for environment {environment_id}")
+    except Exception as e:
+        logger.error(f"Scheduled repo sync failed for environment {environment_id}: {str(e)}")
+        # Fail the job with error details
+        try:
+            await background_job_service.fail_job(
+                job_id=job["id"],
+                error_message=str(e),
+                error_details={"exception_type": type(e).__name__}
+            )
+        except Exception as fail_err:
+            logger.error(f"Failed to mark job as failed: {str(fail_err)}")
+
+
+async def _run_env_sync(ctx: ShardContext) -> int:
+    """Process scheduled environment syncs for environments in this worker's shards"""
+    # Get all environments
+    all_environments = db_service.client.table("environments").select("*").execute()
+
+    environments = [
+        env for env in (all_environments.data or [])
+        if env.get("tenant_id") and env.get("id") and ctx.owns(env["id"])
+    ]
+    return await ctx.run_each(environments, _sync_environment)
+
+
+async def _sync_environment(env: Dict[str, Any]) -> None:
+    """Run a scheduled environment sync for one environment if it is due"""
+    tenant_id = env.get("tenant_id")
+    environment_id = env.get("id")
+
+    # Check debounce - skip if sync already in progress or recently completed
+    debounce_key = f"{tenant_id}:{environment_id}"
+    now = datetime.now(timezone.utc)
+    if debounce_key in _env_sync_in_progress:
+        last_attempt = _env_sync_in_progress[debounce_key]
+        if (now - last_attempt).total_seconds() < SYNC_DEBOUNCE_SECONDS:
+            logger.debug(f"Skipping env sync for {environment_id} (debounced)")
+            return
+
+    # Check last sync time from environment record (not per-workflow)
+    last_sync = await _get_last_env_sync_time(tenant_id, environment_id)
+
+    # Sync if last sync was more than ENV_SYNC_INTERVAL ago
+    if last_sync and (now - last_sync).total_seconds() <= ENV_SYNC_INTERVAL:
+        return
+
+    # Mark as in progress
+    _env_sync_in_progress[debounce_key] = now
+    try:
+        # Create background job
+        job = await background_job_service.create_job(
+            tenant_id=tenant_id,
+            job_type=BackgroundJobType.CANONICAL_ENV_SYNC,
+            resource_id=environment_id,
+            resource_type="environment",
+            metadata={"trigger": "scheduled_sync"}
+        )
+
+        # Run sync with SSE support for live logs
+        sync_result = await CanonicalEnvSyncService.sync_environment(
+            tenant_id=tenant_id,
+            environment_id=environment_id,
+            environment=env,
+            job_id=job["id"],
+            tenant_id_for_sse=tenant_id  # Enable SSE events for live log streaming
+        )
 
-    while _repo_sync_scheduler_running:
+        # Update last_sync_at on successful sync
         try:
-            # Get all environments with Git configured
-            all_environments = db_service.client.table("environments").select("*").execute()
-
-            for env in (all_environments.data or []):
-                if not env.get("git_repo_url") or not env.get("git_folder"):
-                    continue
-
-                tenant_id = env.get("tenant_id")
-                environment_id = env.get("id")
-
-                if not tenant_id or not environment_id:
-                    continue
-
-                # Check debounce - skip if sync already in progress or recently completed
-                debounce_key = f"{tenant_id}:{environment_id}"
-                now = datetime.now(timezone.utc)
-                if debounce_key in _repo_sync_in_progress:
-                    last_attempt = _repo_sync_in_progress[debounce_key]
-                    if (now - last_attempt).total_seconds() < SYNC_DEBOUNCE_SECONDS:
-                        logger.debug(f"Skipping repo sync for {environment_id} (debounced)")
-                        continue
-
-                # Check last sync time from environment record
-                last_sync = await _get_last_repo_sync_time(tenant_id, environment_id)
-
-                # Sync if last sync was more than REPO_SYNC_INTERVAL ago
-                if not last_sync or (now - last_sync).total_seconds() > REPO_SYNC_INTERVAL:
-                    # Mark as in progress
-                    _repo_sync_in_progress[debounce_key] = now
-                    try:
-                        # Create background job
-                        job = await background_job_service.create_job(
-                            tenant_id=tenant_id,
-                            job_type=BackgroundJobType.CANONICAL_REPO_SYNC,
-                            resource_id=environment_id,
-                            resource_type="environment",
-                            metadata={"trigger": "scheduled_sync"}
-                        )
-                        
-                        # Run sync (repo sync doesn't support job_id/SSE yet)
-                        repo_sync_result = await CanonicalRepoSyncService.sync_repository(
-                            tenant_id=tenant_id,
-                            environment_id=environment_id,
-                            environment=env
-                        )
-
-                        # Trigger reconciliation
-                        await CanonicalReconciliationService.reconcile_all_pairs_for_environment(
-                            tenant_id=tenant_id,
-                            changed_env_id=environment_id
-                        )
-
-                        # Complete the job successfully
-                        await background_job_service.complete_job(
-                            job_id=job["id"],
-                            result=repo_sync_result
-                        )
-
-                        logger.info(f"Scheduled repo sync completed for environment {environment_id}")
-                    except Exception as e:
-                        logger.error(f"Scheduled repo sync failed for environment {environment_id}: {str(e)}")
-                        # Fail the job with error details
-                        try:
-                            await background_job_service.fail_job(
-                                job_id=job["id"],
-                                error_message=str(e),
-                                error_details={"exception_type": type(e).__name__}
-                            )
-                        except Exception as fail_err:
-                            logger.error(f"Failed to mark job as failed: {str(fail_err)}")
-                    finally:
-                        # Clear debounce after sync attempt (success or failure)
-                        # Keep debounce for a short time to prevent immediate retry
-                        pass
-            
-            # Wait before next cycle
-            await asyncio.sleep(REPO_SYNC_INTERVAL)
-            
-        except Exception as e:
-            logger.error(f"Error in repo sync scheduler: {str(e)}")
-            await asyncio.sleep(60)  # Wait 1 minute before retrying
-
-
-async def _process_env_sync_scheduler():
-    """Process scheduled environment syncs"""
-    global _env_sync_scheduler_running, _env_sync_in_progress
-
-    while _env_sync_scheduler_running:
+            await db_service.update_environment(
+                environment_id,
+                tenant_id,
+                {"last_sync_at": datetime.utcnow().isoformat()}
+            )
+        except Exception as sync_err:
+            logger.warning(f"Failed to update last_sync_at for scheduled sync: {str(sync_err)}")
+
+        # Trigger reconciliation (with error isolation)
+        try:
+            await CanonicalReconciliationService.reconcile_all_pairs_for_environment(
+                tenant_id=tenant_id,
+                changed_env_id=environment_id
+            )
+        except Exception as recon_err:
+            logger.warning(f"Reconciliation failed after env sync (non-fatal): {str(recon_err)}")
+
+        # Complete the job successfully
+        await background_job_service.complete_job(
+            job_id=job["id"],
+            result=sync_result
+        )
+
+        logger.info(f"Scheduled env sync completed for environment {environment_id}")
+    except Exception as e:
+        logger.error(f"Scheduled env sync failed for environment {environment_id}: {str(e)}")
+        # Fail the job with error details
         try:
-            # Get all environments
-            all_environments = db_service.client.table("environments").select("*").execute()
-
-            for env in (all_environments.data or []):
-                tenant_id = env.get("tenant_id")
-                environment_id = env.get("id")
-
-                if not tenant_id or not environment_id:
-                    continue
-
-                # Check debounce - skip if sync already in progress or recently completed
-                debounce_key = f"{tenant_id}:{environment_id}"
-                now = datetime.now(timezone.utc)
-                if debounce_key in _env_sync_in_progress:
-                    last_attempt = _env_sync_in_progress[debounce_key]
-                    if (now - last_attempt).total_seconds() < SYNC_DEBOUNCE_SECONDS:
-                        logger.debug(f"Skipping env sync for {environment_id} (debounced)")
-                        continue
-
-                # Check last sync time from environment record (not per-workflow)
-                last_sync = await _get_last_env_sync_time(tenant_id, environment_id)
-
-                # Sync if last sync was more than ENV_SYNC_INTERVAL ago
-                if not last_sync or (now - last_sync).total_seconds() > ENV_SYNC_INTERVAL:
-                    # Mark as in progress
-                    _env_sync_in_progress[debounce_key] = now
-                    try:
-                        # Create background job
-                        job = await background_job_service.create_job(
-                            tenant_id=tenant_id,
-                            job_type=BackgroundJobType.CANONICAL_ENV_SYNC,
-                            resource_id=environment_id,
-                            resource_type="environment",
-                            metadata={"trigger": "scheduled_sync"}
-                        )
-                        
-                        # Run sync with SSE support for live logs
-                        sync_result = await CanonicalEnvSyncService.sync_environment(
-                            tenant_id=tenant_id,
-                            environment_id=environment_id,
-                            environment=env,
-                            job_id=job["id"],
-                            tenant_id_for_sse=tenant_id  # Enable SSE events for live log streaming
-                        )
-
-                        # Update last_sync_at on successful sync
-                        try:
-                            await db_service.update_environment(
-                                environment_id,
-                                tenant_id,
-                                {"last_sync_at": datetime.utcnow().isoformat()}
-                            )
-                        except Exception as sync_err:
-                            logger.warning(f"Failed to update last_sync_at for scheduled sync: {str(sync_err)}")
-
-                        # Trigger reconciliation (with error isolation)
-                        try:
-                            await CanonicalReconciliationService.reconcile_all_pairs_for_environment(
-                                tenant_id=tenant_id,
-                                changed_env_id=environment_id
-                            )
-                        except Exception as recon_err:
-                            logger.warning(f"Reconciliation failed after env sync (non-fatal): {str(recon_err)}")
-
-                        # Complete the job successfully
-                        await background_job_service.complete_job(
-                            job_id=job["id"],
-                            result=sync_result
-                        )
-
-                        logger.info(f"Scheduled env sync completed for environment {environment_id}")
-                    except Exception as e:
-                        logger.error(f"Scheduled env sync failed for environment {environment_id}: {str(e)}")
-                        # Fail the job with error details
-                        try:
-                            await background_job_service.fail_job(
-                                job_id=job["id"],
-                                error_message=str(e),
-                                error_details={"exception_type": type(e).__name__}
-                            )
-                        except Exception as fail_err:
-                            logger.error(f"Failed to mark job as failed: {str(fail_err)}")
-                    finally:
-                        # Clear debounce after sync attempt (success or failure)
-                        # Keep debounce for a short time to prevent immediate retry
-                        pass
-            
-            # Wait before next cycle
-            await asyncio.sleep(ENV_SYNC_INTERVAL)
-            
-        except Exception as e:
-            logger.error(f"Error in env sync scheduler: {str(e)}")
-            await asyncio.sleep(60)  # Wait 1 minute before retrying
+            await background_job_service.fail_job(
+                job_id=job["id"],
+                error_message=str(e),
+                error_details={"exception_type": type(e).__name__}
+            )
+        except Exception as fail_err:
+            logger.error(f"Failed to mark job as failed: {str(fail_err)}")
 
 
 async def _get_last_repo_sync_time(tenant_id: str, environment_id: str) -> datetime | None:
@@ -287,51 +267,32 @@ async def start_canonical_sync_schedulers():
     NOTE: For MVP, automatic sync is DISABLED by default.
     Set SYNC_SCHEDULER_ENABLED=true in environment to enable.
     """
-    global _repo_sync_scheduler_running, _repo_sync_scheduler_task
-    global _env_sync_scheduler_running, _env_sync_scheduler_task
-
     # Check if scheduler is enabled via environment variable
     if not settings.SYNC_SCHEDULER_ENABLED:
         logger.info("Canonical sync schedulers DISABLED (set SYNC_SCHEDULER_ENABLED=true to enable)")
         return
 
     # Start repo sync scheduler
-    if not _repo_sync_scheduler_running:
-        _repo_sync_scheduler_running = True
-        _repo_sync_scheduler_task = asyncio.create_task(_process_repo_sync_scheduler())
-        logger.info("Canonical repo sync scheduler started")
+    scheduler_runtime.start_job(ScheduledJob(
+        name=REPO_SYNC_JOB,
+        interval_seconds=REPO_SYNC_INTERVAL,
+        run=_run_repo_sync,
+        sharded=True,
+    ))
+    logger.info("Canonical repo sync scheduler started")
 
     # Start env sync scheduler
-    if not _env_sync_scheduler_running:
-        _env_sync_scheduler_running = True
-        _env_sync_scheduler_task = asyncio.create_task(_process_env_sync_scheduler())
-        logger.info("Canonical env sync scheduler started")
+    scheduler_runtime.start_job(ScheduledJob(
+        name=ENV_SYNC_JOB,
+        interval_seconds=ENV_SYNC_INTERVAL,
+        run=_run_env_sync,
+        sharded=True,
+    ))
+    logger.info("Canonical env sync scheduler started")
 
 
 async def stop_canonical_sync_schedulers():
     """Stop all canonical sync schedulers"""
-    global _repo_sync_scheduler_running, _repo_sync_scheduler_task
-    global _env_sync_scheduler_running, _env_sync_scheduler_task
-    
-    # Stop repo sync scheduler
-    if _repo_sync_scheduler_running:
-        _repo_sync_scheduler_running = False
-        if _repo_sync_scheduler_task:
-            _repo_sync_scheduler_task.cancel()
-            try:
-                await _repo_sync_scheduler_task
-            except asyncio.CancelledError:
-                pass
-        logger.info("Canonical repo sync scheduler stopped")
-    
-    # Stop env sync scheduler
-    if _env_sync_scheduler_running:
-        _env_sync_scheduler_running = False
-        if _env_sync_scheduler_task:
-            _env_sync_scheduler_task.cancel()
-            try:
-                await _env_sync_scheduler_task
-            except asyncio.CancelledError:
-                pass
-        logger.info("Canonical env sync scheduler stopped")
-
+    await scheduler_runtime.stop_job(REPO_SYNC_JOB)
+    await scheduler_runtime.stop_job(ENV_SYNC_JOB)
+    logger.info("Canonical sync schedulers stopped")
@@ -4,10 +4,14 @@ Canonical Workflow Service - Core service for canonical workflow identity manage
 import hashlib
 import json
 import logging
-from typing import Dict, Any, List, Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from uuid import uuid4
 
+from app.core.config import settings
 from app.services.database import db_service
 from app.services.promotion_service import normalize_workflow_for_comparison
 from app.schemas.canonical_workflow import WorkflowMappingStatus
@@ -15,14 +19,165 @@ from app.schemas.canonical_workflow import WorkflowMappingStatus
 logger = logging.getLogger(__name__)
 
 
-# Hash collision registry - tracks hash->payload mappings for collision detection
-# Key: content_hash (str), Value: normalized workflow payload (Dict[str, Any])
-_hash_collision_registry: Dict[str, Dict[str, Any]] = {}
+class _HashFingerprintRegistry:
+    """
+    Bounded hash -> fingerprint store used for collision detection.
+
+    Instead of the full normalized payload, each content hash maps to a
+    compact BLAKE2b digest of the same canonical JSON. Two payloads that
+    share a SHA256 but differ in content will (overwhelmingly) differ in
+    their BLAKE2b fingerprint, which is all collision detection needs.
+
+    Entries are evicted least-recently-used once max_entries is reached and
+    expire after ttl_seconds without being touched. The same store memoizes
+    (content hash, fingerprint) digests keyed by workflow identity.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._evictions = 0
+        self._expirations = 0
+        self._hits = 0
+        self._misses = 0
+
+    def set(self, content_hash: str, fingerprint: Any) -> None:
+        with self._lock:
+            self._entries[content_hash] = (fingerprint, time.monotonic())
+            self._entries.move_to_end(content_hash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def get(self, content_hash: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(content_hash)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            fingerprint, touched_at = entry
+            now = time.monotonic()
+            if self.ttl_seconds and now - touched_at > self.ttl_seconds:
+                del self._entries[content_hash]
+                self._expirations += 1
+                self._misses += 1
+                return None
+
+            self._entries[content_hash] = (fingerprint, now)
+            self._entries.move_to_end(content_hash)
+            self._hits += 1
+            return fingerprint
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._evictions = 0
+            self._expirations = 0
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "total_entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+# Hash collision registry - tracks hash->fingerprint mappings for collision detection
+_hash_collision_registry = _HashFingerprintRegistry(
+    max_entries=settings.HASH_REGISTRY_MAX_ENTRIES,
+    ttl_seconds=settings.HASH_REGISTRY_TTL_SECONDS,
+)
+
+
+# Memoized (content hash, fingerprint) digests keyed by workflow identity
+_workflow_digest_cache = _HashFingerprintRegistry(
+    max_entries=settings.WORKFLOW_HASH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.HASH_REGISTRY_TTL_SECONDS,
+)
+
+
+def _fingerprint_json(json_str: str) -> str:
+    return hashlib.blake2b(json_str.encode(), digest_size=16).hexdigest()
+
+
+def workflow_identity_key(workflow: Dict[str, Any]) -> Optional[str]:
+    """
+    Cheap identity key for an n8n workflow version.
+
+    n8n bumps versionId and updatedAt on every save. The node count is
+    included so a list summary never shares a key with the full workflow.
+    Returns None unless id, versionId and updatedAt are all present.
+    """
+    workflow_id = workflow.get("id")
+    version_id = workflow.get("versionId")
+    updated_at = workflow.get("updatedAt")
+    if not (workflow_id and version_id and updated_at):
+        return None
+    nodes = workflow.get("nodes")
+    node_count = len(nodes) if isinstance(nodes, list) else -1
+    return f"{workflow_id}|{version_id}|{updated_at}|{node_count}"
+
+
+def workflow_content_digest(workflow: Dict[str, Any], memoize: bool = False) -> Tuple[str, str]:
+    """
+    Compute the (content hash, fingerprint) pair of a workflow.
+
+    Both digests are taken from one normalization and one JSON dump. With
+    memoize=True the pair is cached by workflow_identity_key(), so env sync,
+    promotions and collision checks that see the same workflow version
+    hash it once. Only memoize payloads read from n8n: Git files can be
+    edited without their versionId or updatedAt changing.
+
+    Args:
+        workflow: The workflow payload
+        memoize: Reuse/cache the digest by workflow identity
+
+    Returns:
+        Tuple of (SHA256 hex digest, collision-detection fingerprint)
+    """
+    key = workflow_identity_key(workflow) if memoize else None
+    if key is not None:
+        cached = _workflow_digest_cache.get(key)
+        if cached is not None:
+            return cached
+
+    json_str = json.dumps(normalize_workflow_for_comparison(workflow), sort_keys=True)
+    digest = (hashlib.sha256(json_str.encode()).hexdigest(), _fingerprint_json(json_str))
+    if key is not None:
+        _workflow_digest_cache.set(key, digest)
+    return digest
+
+
+def payload_fingerprint(normalized_payload: Dict[str, Any]) -> str:
+    """
+    Compute the collision-detection fingerprint of a normalized payload.
+
+    The fingerprint is a BLAKE2b digest of the same sorted JSON that
+    compute_workflow_hash() feeds to SHA256, so it is independent of the
+    content hash it is stored against.
+
+    Args:
+        normalized_payload: The normalized workflow payload
+
+    Returns:
+        Hex digest fingerprint
+    """
+    return _fingerprint_json(json.dumps(normalized_payload, sort_keys=True))
 
 
 def register_workflow_hash(content_hash: str, normalized_payload: Dict[str, Any]) -> None:
     """
-    Register a workflow hash and its normalized payload in the collision registry.
+    Register a workflow hash and its payload fingerprint in the collision registry.
 
     This registry is used for collision detection during hash computation.
     When a hash collision is detected (same hash, different payload),
@@ -32,20 +187,20 @@ def register_workflow_hash(content_hash: str, normalized_payload: Dict[str, Any]
         content_hash: The SHA256 hash of the normalized workflow
         normalized_payload: The normalized workflow payload that produced this hash
     """
-    _hash_collision_registry[content_hash] = normalized_payload
+    _hash_collision_registry.set(content_hash, payload_fingerprint(normalized_payload))
 
 
-def get_registered_payload(content_hash: str) -> Optional[Dict[str, Any]]:
+def get_registered_fingerprint(content_hash: str) -> Optional[str]:
     """
-    Retrieve the registered payload for a given hash.
+    Retrieve the registered payload fingerprint for a given hash.
 
-    Returns None if the hash hasn't been registered yet.
+    Returns None if the hash hasn't been registered yet or has been evicted.
 
     Args:
         content_hash: The SHA256 hash to lookup
 
     Returns:
-        The normalized workflow payload if registered, None otherwise
+        The payload fingerprint if registered, None otherwise
     """
     return _hash_collision_registry.get(content_hash)
 
@@ -54,25 +209,29 @@ def clear_hash_registry() -> None:
     """
     Clear the hash collision registry.
 
-    Useful for testing or when starting a fresh batch operation.
+    Useful for testing or when starting a fresh batch operation. Memoized
+    workflow digests are cleared as well.
     """
-    global _hash_collision_registry
-    _hash_collision_registry = {}
+    _hash_collision_registry.clear()
+    _workflow_digest_cache.clear()
 
 
-def get_registry_stats() -> Dict[str, int]:
+def get_registry_stats() -> Dict[str, Any]:
     """
     Get statistics about the current hash registry.
 
     Returns:
-        Dictionary with registry statistics (total_entries)
+        Dictionary with registry statistics (total_entries, max_entries,
+        ttl_seconds, evictions, expirations, hits, misses)
     """
-    return {
-        "total_entries": len(_hash_collision_registry)
-    }
+    return _hash_collision_registry.stats()
 
 
-def compute_workflow_hash(workflow: Dict[str, Any], canonical_id: Optional[str] = None) -> str:
+def compute_workflow_hash(
+    workflow: Dict[str, Any],
+    canonical_id: Optional[str] = None,
+    memoize: bool = False,
+) -> str:
     """
     Compute SHA256 hash of normalized workflow content with collision detection.
 
@@ -92,22 +251,22 @@ def compute_workflow_hash(workflow: Dict[str, Any], canonical_id: Optional[str]
         workflow: The workflow payload to hash
         canonical_id: Optional canonical workflow ID (required for deterministic
                      fallback in case of hash collision)
+        memoize: Reuse the digest cached for this workflow version (n8n
+                 payloads only, see workflow_content_digest())
 
     Returns:
         SHA256 hex digest (no prefix). If collision detected and canonical_id
         is provided, returns a deterministic fallback hash. If collision detected
         without canonical_id, returns the original colliding hash.
     """
-    normalized = normalize_workflow_for_comparison(workflow)
-    json_str = json.dumps(normalized, sort_keys=True)
-    content_hash = hashlib.sha256(json_str.encode()).hexdigest()
+    content_hash, fingerprint = workflow_content_digest(workflow, memoize=memoize)
 
     # Check for hash collision
-    registered_payload = get_registered_payload(content_hash)
+    registered_fingerprint = get_registered_fingerprint(content_hash)
 
-    if registered_payload is not None:
+    if registered_fingerprint is not None:
         # Hash already exists - check if payloads are identical
-        if registered_payload != normalized:
+        if registered_fingerprint != fingerprint:
             # COLLISION DETECTED: Same hash, different payload
             logger.warning(
                 f"Hash collision detected! Hash '{content_hash}' maps to different payloads. "
@@ -120,7 +279,7 @@ def compute_workflow_hash(workflow: Dict[str, Any], canonical_id: Optional[str]
                 # Append canonical_id to normalized content and rehash
                 # This creates a deterministic, unique hash for this workflow
                 fallback_content = {
-                    **normalized,
+                    **normalize_workflow_for_comparison(workflow),
                     "__canonical_id__": canonical_id
                 }
                 fallback_json_str = json.dumps(fallback_content, sort_keys=True)
@@ -150,7 +309,7 @@ def compute_workflow_hash(workflow: Dict[str, Any], canonical_id: Optional[str]
             logger.debug(f"Hash '{content_hash}' matches existing payload (duplicate workflow)")
     else:
         # First time seeing this hash - register it
-        register_workflow_hash(content_hash, normalized)
+        _hash_collision_registry.set(content_hash, fingerprint)
         logger.debug(f"Registered new hash '{content_hash}' in collision registry")
 
     return content_hash
@@ -390,7 +549,27 @@ class CanonicalWorkflowService:
         except Exception as e:
             logger.error(f"Error fetching Git state: {str(e)}")
             return None
-    
+
+    @staticmethod
+    async def list_canonical_workflow_git_states(
+        tenant_id: str,
+        environment_id: str
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get Git state for every canonical workflow in an environment, keyed by canonical_id.
+
+        One range-paged read in place of get_canonical_workflow_git_state per
+        workflow. Read errors propagate: an empty result would look like no
+        workflow has Git state.
+        """
+        rows = await db_service._select_all(
+            lambda: db_service.client.table("canonical_workflow_git_state")
+            .select("*")
+            .eq("tenant_id", tenant_id)
+            .eq("environment_id", environment_id)
+            .order("canonical_id")
+        )
+        return {row["canonical_id"]: row for row in rows if row.get("canonical_id")}
+
     @staticmethod
     async def upsert_canonical_workflow_git_state(
         tenant_id: str,
@@ -1,13 +1,49 @@
+import asyncio
+import base64
+import json
 import logging
-from supabase import create_client, Client
+from concurrent.futures import ThreadPoolExecutor
+from supabase import create_client, Client, ClientOptions
 from app.core.config import settings
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from uuid import uuid4
 import numpy as np
+from app.services.execution_aggregation import (
+    GroupedColumns,
+    numeric_column,
+    status_masks,
+    timestamp_column,
+)
 
 logger = logging.getLogger(__name__)
 
+# Sort fields accepted by workflow list views; anything else sorts by updatedAt
+WORKFLOW_LIST_SORT_FIELDS = ("name", "updatedAt", "createdAt", "active")
+
+
+def _encode_list_cursor(sort_field: str, sort_direction: str, sort_value: Optional[str], row_id: str) -> str:
+    """Opaque keyset cursor pointing just past a row in a sorted list."""
+    payload = json.dumps([sort_field, sort_direction, sort_value or "", row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_list_cursor(cursor: str, sort_field: str, sort_direction: str) -> Tuple[str, str]:
+    """
+    Decode a cursor from _encode_list_cursor into (sort_value, row_id).
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for another sort
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        field, direction, sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if (field, direction) != (sort_field, sort_direction):
+        raise ValueError("Cursor was issued for a different sort order")
+    return str(sort_value), str(row_id)
+
 
 class DatabaseService:
     """Service for interacting with Supabase database"""
@@ -15,13 +51,137 @@ class DatabaseService:
     def __init__(self):
         self.client: Client = create_client(
             settings.SUPABASE_URL,
-            settings.SUPABASE_SERVICE_KEY
+            settings.SUPABASE_SERVICE_KEY,
+            options=ClientOptions(postgrest_client_timeout=settings.DB_QUERY_TIMEOUT_SECONDS),
+        )
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.DB_EXECUTOR_MAX_WORKERS,
+                thread_name_prefix="db-query",
+            )
+        return self._executor
+
+    async def _execute(self, query: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Run a PostgREST query builder's blocking ``execute()`` off the event loop.
+
+        The supabase-py client is synchronous, so queries are dispatched to a
+        bounded thread pool. All threads share the client's single HTTP session,
+        which keeps connections alive (HTTP/2) between calls, and the pool size
+        caps how many queries a worker has in flight at once.
+
+        Args:
+            query: A query/filter/rpc builder (anything exposing ``execute()``)
+            timeout: Seconds to wait before raising ``asyncio.TimeoutError``.
+                Defaults to ``DB_QUERY_TIMEOUT_SECONDS``.
+
+        Returns:
+            The builder's API response
+        """
+        loop = asyncio.get_running_loop()
+        return await asyncio.wait_for(
+            loop.run_in_executor(self._get_executor(), query.execute),
+            timeout=timeout or settings.DB_QUERY_TIMEOUT_SECONDS,
         )
 
+    async def _select_all(self, build_query: Callable[[], Any], page_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Read every row of a select, paging with ``.range()`` until a short page.
+
+        PostgREST caps each response (1000 rows by default), so an unpaged
+        select silently drops the rest on large tenants.
+
+        Args:
+            build_query: Returns a fresh, deterministically ordered select
+                builder (builders accumulate range params, so one cannot be
+                re-ranged)
+            page_size: Rows per request; defaults to ``DB_SELECT_PAGE_SIZE``
+
+        Returns:
+            All rows, in the query's order
+        """
+        page_size = page_size or settings.DB_SELECT_PAGE_SIZE
+        rows: List[Dict[str, Any]] = []
+        while True:
+            response = await self._execute(build_query().range(len(rows), len(rows) + page_size - 1))
+            page = response.data or []
+            rows.extend(page)
+            if len(page) < page_size:
+                return rows
+
+    def close(self) -> None:
+        """Release the query thread pool (recreated lazily on next use)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _bulk_upsert(
+        self,
+        table: str,
+        records: List[Dict[str, Any]],
+        on_conflict: str,
+        key_field: str,
+        chunk_size: Optional[int] = None,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Upsert records in multi-row chunks (one round-trip per chunk).
+
+        Records are grouped by their column set first, so a row that omits a
+        column never nulls it out for the others. If a chunk is rejected, its
+        rows are retried one at a time to isolate the failing ones.
+
+        Returns:
+            {"rows": [upserted rows], "failed": [{"key": ..., "error": str}]}
+        """
+        chunk_size = chunk_size or settings.DB_BULK_CHUNK_SIZE
+        result: Dict[str, List[Dict[str, Any]]] = {"rows": [], "failed": []}
+
+        groups: Dict[frozenset, List[Dict[str, Any]]] = {}
+        for record in records:
+            groups.setdefault(frozenset(record.keys()), []).append(record)
+
+        for group in groups.values():
+            for i in range(0, len(group), chunk_size):
+                chunk = group[i:i + chunk_size]
+                try:
+                    response = await self._execute(self.client.table(table).upsert(chunk, on_conflict=on_conflict))
+                    result["rows"].extend(response.data or [])
+                    continue
+                except Exception as e:
+                    if len(chunk) == 1:
+                        result["failed"].append({"key": chunk[0].get(key_field), "error": str(e)})
+                        continue
+                    logger.warning(f"Bulk upsert of {len(chunk)} {table} rows failed, retrying per row: {str(e)}")
+
+                for record in chunk:
+                    try:
+                        response = await self._execute(self.client.table(table).upsert(record, on_conflict=on_conflict))
+                        result["rows"].extend(response.data or [])
+                    except Exception as row_error:
+                        result["failed"].append({"key": record.get(key_field), "error": str(row_error)})
+
+        return result
+
+    @staticmethod
+    def _raise_if_nothing_synced(kind: str, result: Dict[str, List[Dict[str, Any]]]) -> None:
+        """Log per-row failures; raise if every row failed."""
+        failed = result["failed"]
+        if not failed:
+            return
+        logger.warning(
+            f"Failed to sync {len(failed)} {kind}(s): "
+            + ", ".join(f"{f['key']} ({f['error']})" for f in failed[:10])
+        )
+        if not result["rows"]:
+            raise Exception(f"Failed to sync {len(failed)} {kind}(s): {failed[0]['error']}")
+
     # Environment operations
     async def get_environments(self, tenant_id: str) -> List[Dict[str, Any]]:
         """Get all environments for a tenant"""
-        response = self.client.table("environments").select("*").eq("tenant_id", tenant_id).execute()
+        response = await self._execute(self.client.table("environments").select("*").eq("tenant_id", tenant_id))
         environments = response.data or []
 
         # Sort environments based on Environment Types sort order (system-configurable).
@@ -44,17 +204,17 @@ class DatabaseService:
 
     async def get_environment(self, environment_id: str, tenant_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific environment"""
-        response = self.client.table("environments").select("*").eq("id", environment_id).eq("tenant_id", tenant_id).single().execute()
+        response = await self._execute(self.client.table("environments").select("*").eq("id", environment_id).eq("tenant_id", tenant_id).single())
         return response.data
 
     async def get_environment_by_type(self, tenant_id: str, env_type: str) -> Optional[Dict[str, Any]]:
         """Get environment by type for a tenant"""
-        response = self.client.table("environments").select("*").eq("tenant_id", tenant_id).eq("n8n_type", env_type).execute()
+        response = await self._execute(self.client.table("environments").select("*").eq("tenant_id", tenant_id).eq("n8n_type", env_type))
         return response.data[0] if response.data else None
 
     async def create_environment(self, environment_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new environment"""
-        response = self.client.table("environments").insert(environment_data).execute()
+        response = await self._execute(self.client.table("environments").insert(environment_data))
         return response.data[0]
 
     async def update_environment(self, environment_id: str, tenant_id: str, environment_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -66,12 +226,12 @@ class DatabaseService:
         - last_drift_detected_at: Timestamp when drift was last detected
         - Any other environment table fields
         """
-        response = self.client.table("environments").update(environment_data).eq("id", environment_id).eq("tenant_id", tenant_id).execute()
+        response = await self._execute(self.client.table("environments").update(environment_data).eq("id", environment_id).eq("tenant_id", tenant_id))
         return response.data[0] if response.data else None
 
     async def delete_environment(self, environment_id: str, tenant_id: str) -> bool:
         """Delete an environment"""
-        self.client.table("environments").delete().eq("id", environment_id).eq("tenant_id", tenant_id).execute()
+        await self._execute(self.client.table("environments").delete().eq("id", environment_id).eq("tenant_id", tenant_id))
         return True
 
     # Drift Incidents
@@ -87,17 +247,16 @@ class DatabaseService:
             query = query.eq("environment_id", environment_id)
         if status:
             query = query.eq("status", status)
-        response = query.order("created_at", desc=True).limit(limit).execute()
+        response = await self._execute(query.order("created_at", desc=True).limit(limit))
         return response.data or []
 
     async def get_drift_incident(self, tenant_id: str, incident_id: str) -> Optional[Dict[str, Any]]:
-        response = (
+        response = await self._execute(
             self.client.table("drift_incidents")
             .select("*")
             .eq("tenant_id", tenant_id)
             .eq("id", incident_id)
             .single()
-            .execute()
         )
         return response.data
 
@@ -118,20 +277,20 @@ class DatabaseService:
         if created_by:
             payload["created_by"] = created_by
 
-        response = self.client.table("drift_incidents").insert(payload).execute()
+        response = await self._execute(self.client.table("drift_incidents").insert(payload))
         incident = response.data[0] if response.data else None
         if not incident:
             raise Exception("Failed to create incident")
 
         # Set environment drift pointers (best-effort; keeps changes additive)
         try:
-            self.client.table("environments").update(
+            await self._execute(self.client.table("environments").update(
                 {
                     "drift_status": "DRIFT_INCIDENT_ACTIVE",
                     "active_drift_incident_id": incident["id"],
                     "last_drift_detected_at": datetime.utcnow().isoformat(),
                 }
-            ).eq("id", environment_id).eq("tenant_id", tenant_id).execute()
+            ).eq("id", environment_id).eq("tenant_id", tenant_id))
         except Exception:
             pass
 
@@ -140,7 +299,7 @@ class DatabaseService:
     # Environment type operations (system-configurable ordering)
     async def get_environment_types(self, tenant_id: str, ensure_defaults: bool = False) -> List[Dict[str, Any]]:
         """Get environment types for a tenant (sorted by sort_order)."""
-        response = self.client.table("environment_types").select("*").eq("tenant_id", tenant_id).order("sort_order").execute()
+        response = await self._execute(self.client.table("environment_types").select("*").eq("tenant_id", tenant_id).order("sort_order"))
         types = response.data or []
 
         if types or not ensure_defaults:
@@ -153,31 +312,30 @@ class DatabaseService:
             {"tenant_id": tenant_id, "key": "production", "label": "Production", "sort_order": 30, "is_active": True},
         ]
         # Upsert by tenant_id+key (unique constraint in migration)
-        self.client.table("environment_types").upsert(defaults).execute()
-        response2 = self.client.table("environment_types").select("*").eq("tenant_id", tenant_id).order("sort_order").execute()
+        await self._execute(self.client.table("environment_types").upsert(defaults))
+        response2 = await self._execute(self.client.table("environment_types").select("*").eq("tenant_id", tenant_id).order("sort_order"))
         return response2.data or []
 
     async def create_environment_type(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        response = self.client.table("environment_types").insert(data).execute()
+        response = await self._execute(self.client.table("environment_types").insert(data))
         return response.data[0]
 
     async def update_environment_type(self, env_type_id: str, tenant_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        response = (
+        response = await self._execute(
             self.client.table("environment_types")
             .update(data)
             .eq("id", env_type_id)
             .eq("tenant_id", tenant_id)
-            .execute()
         )
         return response.data[0] if response.data else None
 
     async def delete_environment_type(self, env_type_id: str, tenant_id: str) -> bool:
-        self.client.table("environment_types").delete().eq("id", env_type_id).eq("tenant_id", tenant_id).execute()
+        await self._execute(self.client.table("environment_types").delete().eq("id", env_type_id).eq("tenant_id", tenant_id))
         return True
 
     async def reorder_environment_types(self, tenant_id: str, ordered_ids: List[str]) -> List[Dict[str, Any]]:
         # Fetch existing data before update to preserve all fields
-        existing_response = self.client.table("environment_types").select("*").eq("tenant_id", tenant_id).execute()
+        existing_response = await self._execute(self.client.table("environment_types").select("*").eq("tenant_id", tenant_id))
         existing_data = existing_response.data or []
         
         # Create a map of id -> existing data for quick lookup
@@ -197,24 +355,24 @@ class DatabaseService:
                 "label": existing_item.get("label"),
             }
             
-            self.client.table("environment_types").update(
+            await self._execute(self.client.table("environment_types").update(
                 update_payload
-            ).eq("id", env_type_id).eq("tenant_id", tenant_id).execute()
+            ).eq("id", env_type_id).eq("tenant_id", tenant_id))
         
-        response = self.client.table("environment_types").select("*").eq("tenant_id", tenant_id).order("sort_order").execute()
+        response = await self._execute(self.client.table("environment_types").select("*").eq("tenant_id", tenant_id).order("sort_order"))
         return response.data or []
 
     async def update_environment_workflow_count(self, environment_id: str, tenant_id: str, count: int) -> Optional[Dict[str, Any]]:
         """Update the workflow count for an environment"""
-        response = self.client.table("environments").update(
+        response = await self._execute(self.client.table("environments").update(
             {"workflow_count": count}
-        ).eq("id", environment_id).eq("tenant_id", tenant_id).execute()
+        ).eq("id", environment_id).eq("tenant_id", tenant_id))
         return response.data[0] if response.data else None
 
     # Workflow snapshot operations
     async def create_workflow_snapshot(self, snapshot_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a workflow snapshot"""
-        response = self.client.table("workflow_snapshots").insert(snapshot_data).execute()
+        response = await self._execute(self.client.table("workflow_snapshots").insert(snapshot_data))
         return response.data[0]
 
     async def get_workflow_snapshots(self, tenant_id: str, workflow_id: str = None) -> List[Dict[str, Any]]:
@@ -222,41 +380,41 @@ class DatabaseService:
         query = self.client.table("workflow_snapshots").select("*").eq("tenant_id", tenant_id)
         if workflow_id:
             query = query.eq("workflow_id", workflow_id)
-        response = query.order("created_at", desc=True).execute()
+        response = await self._execute(query.order("created_at", desc=True))
         return response.data
 
     # Git config operations
     async def get_git_config(self, tenant_id: str) -> Optional[Dict[str, Any]]:
         """Get git configuration for a tenant"""
-        response = self.client.table("git_configs").select("*").eq("tenant_id", tenant_id).execute()
+        response = await self._execute(self.client.table("git_configs").select("*").eq("tenant_id", tenant_id))
         return response.data[0] if response.data else None
 
     async def upsert_git_config(self, git_config_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create or update git configuration"""
-        response = self.client.table("git_configs").upsert(git_config_data).execute()
+        response = await self._execute(self.client.table("git_configs").upsert(git_config_data))
         return response.data[0]
 
     # Deployment operations
     async def create_deployment(self, deployment_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a deployment record"""
-        response = self.client.table("deployments").insert(deployment_data).execute()
+        response = await self._execute(self.client.table("deployments").insert(deployment_data))
         return response.data[0]
 
     async def update_deployment(self, deployment_id: str, deployment_data: Dict[str, Any]) -> Dict[str, Any]:
         """Update a deployment record - always updates updated_at timestamp"""
         # Always set updated_at to current time
         deployment_data["updated_at"] = datetime.utcnow().isoformat()
-        response = self.client.table("deployments").update(deployment_data).eq("id", deployment_id).execute()
+        response = await self._execute(self.client.table("deployments").update(deployment_data).eq("id", deployment_id))
         return response.data[0]
 
     async def get_deployments(self, tenant_id: str) -> List[Dict[str, Any]]:
         """Get all deployments for a tenant"""
-        response = self.client.table("deployments").select("*").eq("tenant_id", tenant_id).order("started_at", desc=True).execute()
+        response = await self._execute(self.client.table("deployments").select("*").eq("tenant_id", tenant_id).order("started_at", desc=True))
         return response.data
 
     async def get_deployment(self, deployment_id: str, tenant_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific deployment"""
-        response = self.client.table("deployments").select("*").eq("id", deployment_id).eq("tenant_id", tenant_id).single().execute()
+        response = await self._execute(self.client.table("deployments").select("*").eq("id", deployment_id).eq("tenant_id", tenant_id).single())
         return response.data
 
     async def delete_deployment(self, deployment_id: str, tenant_id: str, deleted_by_user_id: str) -> Dict[str, Any]:
@@ -265,18 +423,18 @@ class DatabaseService:
             "deleted_at": datetime.utcnow().isoformat(),
             "deleted_by_user_id": deleted_by_user_id
         }
-        response = self.client.table("deployments").update(update_data).eq("id", deployment_id).eq("tenant_id", tenant_id).execute()
+        response = await self._execute(self.client.table("deployments").update(update_data).eq("id", deployment_id).eq("tenant_id", tenant_id))
         return response.data[0] if response.data else None
 
     # Snapshot operations (new Git-backed snapshots)
     async def create_snapshot(self, snapshot_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a snapshot record"""
-        response = self.client.table("snapshots").insert(snapshot_data).execute()
+        response = await self._execute(self.client.table("snapshots").insert(snapshot_data))
         return response.data[0]
 
     async def get_snapshot(self, snapshot_id: str, tenant_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific snapshot"""
-        response = self.client.table("snapshots").select("*").eq("id", snapshot_id).eq("tenant_id", tenant_id).single().execute()
+        response = await self._execute(self.client.table("snapshots").select("*").eq("id", snapshot_id).eq("tenant_id", tenant_id).single())
         return response.data
 
     async def get_snapshots(
@@ -291,38 +449,38 @@ class DatabaseService:
             query = query.eq("environment_id", environment_id)
         if snapshot_type:
             query = query.eq("type", snapshot_type)
-        response = query.order("created_at", desc=True).execute()
+        response = await self._execute(query.order("created_at", desc=True))
         return response.data
 
     # Deployment workflow operations
     async def create_deployment_workflow(self, workflow_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a deployment workflow record"""
-        response = self.client.table("deployment_workflows").insert(workflow_data).execute()
+        response = await self._execute(self.client.table("deployment_workflows").insert(workflow_data))
         return response.data[0]
 
     async def get_deployment_workflows(self, deployment_id: str) -> List[Dict[str, Any]]:
         """Get all workflows for a deployment"""
-        response = self.client.table("deployment_workflows").select("*").eq("deployment_id", deployment_id).execute()
+        response = await self._execute(self.client.table("deployment_workflows").select("*").eq("deployment_id", deployment_id))
         return response.data
 
     async def update_deployment_workflow(self, deployment_id: str, workflow_id: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
         """Update a deployment workflow record by deployment_id and workflow_id"""
-        response = self.client.table("deployment_workflows").update(update_data).eq(
+        response = await self._execute(self.client.table("deployment_workflows").update(update_data).eq(
             "deployment_id", deployment_id
-        ).eq("workflow_id", workflow_id).execute()
+        ).eq("workflow_id", workflow_id))
         return response.data[0] if response.data else None
 
     async def create_deployment_workflows_batch(self, workflows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Create multiple deployment workflow records in a batch"""
         if not workflows:
             return []
-        response = self.client.table("deployment_workflows").insert(workflows).execute()
+        response = await self._execute(self.client.table("deployment_workflows").insert(workflows))
         return response.data
 
     # Execution operations
     async def create_execution(self, execution_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create an execution record"""
-        response = self.client.table("executions").insert(execution_data).execute()
+        response = await self._execute(self.client.table("executions").insert(execution_data))
         return response.data[0]
 
     async def get_executions(self, tenant_id: str, environment_id: str = None, workflow_id: str = None, limit: int = None) -> List[Dict[str, Any]]:
@@ -352,7 +510,7 @@ class DatabaseService:
         if limit is not None:
             query = query.limit(limit)
 
-        response = query.execute()
+        response = await self._execute(query)
 
         # Enrich executions with workflow names from canonical workflow system
         executions = response.data
@@ -364,25 +522,23 @@ class DatabaseService:
                 exec_env_id = execution.get("environment_id")
                 if exec_env_id and exec_env_id not in env_workflow_map:
                     # Fetch all workflow mappings for this environment from canonical system
-                    mappings_response = (
+                    mappings_response = await self._execute(
                         self.client.table("workflow_env_map")
                         .select("n8n_workflow_id, workflow_data, canonical_id")
                         .eq("tenant_id", tenant_id)
                         .eq("environment_id", exec_env_id)
                         .not_.is_("n8n_workflow_id", "null")
-                        .execute()
                     )
 
                     # Get canonical IDs to fetch display names
                     canonical_ids = [m.get("canonical_id") for m in (mappings_response.data or []) if m.get("canonical_id")]
                     canonical_map = {}
                     if canonical_ids:
-                        canonical_response = (
+                        canonical_response = await self._execute(
                             self.client.table("canonical_workflows")
                             .select("canonical_id, display_name")
                             .eq("tenant_id", tenant_id)
                             .in_("canonical_id", canonical_ids)
-                            .execute()
                         )
                         for canonical in (canonical_response.data or []):
                             canonical_map[canonical.get("canonical_id")] = canonical
@@ -486,7 +642,7 @@ class DatabaseService:
         query = query.order(sort_col, desc=(sort_direction == "desc"))
 
         # Execute query to get total count
-        count_response = query.execute()
+        count_response = await self._execute(query)
         all_executions = count_response.data or []
         
         # Apply search filter client-side (workflow_name requires JOIN)
@@ -501,24 +657,22 @@ class DatabaseService:
         
         if workflow_ids:
             # Get workflow names from canonical system
-            mappings_response = (
+            mappings_response = await self._execute(
                 self.client.table("workflow_env_map")
                 .select("n8n_workflow_id, workflow_data, canonical_id")
                 .eq("tenant_id", tenant_id)
                 .eq("environment_id", environment_id)
                 .in_("n8n_workflow_id", workflow_ids)
-                .execute()
             )
 
             canonical_ids = [m.get("canonical_id") for m in (mappings_response.data or []) if m.get("canonical_id")]
             canonical_map = {}
             if canonical_ids:
-                canonical_response = (
+                canonical_response = await self._execute(
                     self.client.table("canonical_workflows")
                     .select("canonical_id, display_name")
                     .eq("tenant_id", tenant_id)
                     .in_("canonical_id", canonical_ids)
-                    .execute()
                 )
                 for canonical in (canonical_response.data or []):
                     canonical_map[canonical.get("canonical_id")] = canonical
@@ -564,21 +718,20 @@ class DatabaseService:
 
     async def get_execution(self, execution_id: str, tenant_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific execution"""
-        response = self.client.table("executions").select("*").eq("id", execution_id).eq("tenant_id", tenant_id).single().execute()
+        response = await self._execute(self.client.table("executions").select("*").eq("id", execution_id).eq("tenant_id", tenant_id).single())
         execution = response.data
 
         # Enrich with workflow name from canonical workflow system
         if execution and execution.get("workflow_id") and execution.get("environment_id"):
             # Get workflow name from canonical system
             try:
-                mapping_response = (
+                mapping_response = await self._execute(
                     self.client.table("workflow_env_map")
                     .select("workflow_data, canonical_id")
                     .eq("tenant_id", tenant_id)
                     .eq("environment_id", execution["environment_id"])
                     .eq("n8n_workflow_id", execution["workflow_id"])
                     .single()
-                    .execute()
                 )
                 
                 if mapping_response.data:
@@ -588,13 +741,12 @@ class DatabaseService:
                     # Get canonical workflow display name if needed
                     display_name = None
                     if canonical_id:
-                        canonical_response = (
+                        canonical_response = await self._execute(
                             self.client.table("canonical_workflows")
                             .select("display_name")
                             .eq("tenant_id", tenant_id)
                             .eq("canonical_id", canonical_id)
                             .single()
-                            .execute()
                         )
                         if canonical_response.data:
                             display_name = canonical_response.data.get("display_name")
@@ -612,12 +764,12 @@ class DatabaseService:
 
     async def update_execution(self, execution_id: str, tenant_id: str, execution_data: Dict[str, Any]) -> Dict[str, Any]:
         """Update an execution record"""
-        response = self.client.table("executions").update(execution_data).eq("id", execution_id).eq("tenant_id", tenant_id).execute()
+        response = await self._execute(self.client.table("executions").update(execution_data).eq("id", execution_id).eq("tenant_id", tenant_id))
         return response.data[0] if response.data else None
 
     async def delete_execution(self, execution_id: str, tenant_id: str) -> bool:
         """Delete an execution record"""
-        self.client.table("executions").delete().eq("id", execution_id).eq("tenant_id", tenant_id).execute()
+        await self._execute(self.client.table("executions").delete().eq("id", execution_id).eq("tenant_id", tenant_id))
         return True
 
     async def get_execution_counts(
@@ -646,13 +798,13 @@ class DatabaseService:
         try:
             # Try using RPC function for efficient GROUP BY aggregation
             if environment_id:
-                response = self.client.rpc(
+                response = await self._execute(self.client.rpc(
                     'get_execution_counts_by_workflow',
                     {
                         'p_tenant_id': tenant_id,
                         'p_environment_id': environment_id
                     }
-                ).execute()
+                ))
 
                 counts = {}
                 for row in (response.data or []):
@@ -674,7 +826,7 @@ class DatabaseService:
             if workflow_ids:
                 query = query.in_("workflow_id", workflow_ids)
 
-            response = query.execute()
+            response = await self._execute(query)
             counts = {}
             for execution in (response.data or []):
                 workflow_id = execution.get("workflow_id")
@@ -705,7 +857,7 @@ class DatabaseService:
         query = query.gte("started_at", since).lte("started_at", until)
         query = query.order("started_at", desc=True).limit(500)
 
-        response = query.execute()
+        response = await self._execute(query)
         return response.data
 
     async def get_error_intelligence_aggregated(
@@ -732,7 +884,7 @@ class DatabaseService:
             if environment_id:
                 params['p_environment_id'] = environment_id
 
-            response = self.client.rpc('get_error_intelligence', params).execute()
+            response = await self._execute(self.client.rpc('get_error_intelligence', params))
             return response.data or []
         except Exception as e:
             logger.warning(f"RPC get_error_intelligence not available, returning empty: {e}")
@@ -754,7 +906,7 @@ class DatabaseService:
 
         query = query.order("started_at", desc=True).limit(1)
 
-        response = query.execute()
+        response = await self._execute(query)
         return response.data[0] if response.data else None
 
     async def get_last_workflow_failures_batch(
@@ -795,7 +947,7 @@ class DatabaseService:
         # Order by started_at descending to get most recent first
         query = query.order("started_at", desc=True)
 
-        response = query.execute()
+        response = await self._execute(query)
         executions = response.data or []
 
         # Group by workflow_id and keep only the most recent failure for each
@@ -810,7 +962,7 @@ class DatabaseService:
     # Tag operations
     async def create_tag(self, tag_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a tag record"""
-        response = self.client.table("tags").insert(tag_data).execute()
+        response = await self._execute(self.client.table("tags").insert(tag_data))
         return response.data[0]
 
     async def get_tags(self, tenant_id: str, environment_id: str = None) -> List[Dict[str, Any]]:
@@ -818,22 +970,22 @@ class DatabaseService:
         query = self.client.table("tags").select("*").eq("tenant_id", tenant_id)
         if environment_id:
             query = query.eq("environment_id", environment_id)
-        response = query.order("name").execute()
+        response = await self._execute(query.order("name"))
         return response.data
 
     async def get_tag(self, tag_id: str, tenant_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific tag"""
-        response = self.client.table("tags").select("*").eq("id", tag_id).eq("tenant_id", tenant_id).single().execute()
+        response = await self._execute(self.client.table("tags").select("*").eq("id", tag_id).eq("tenant_id", tenant_id).single())
         return response.data
 
     async def update_tag(self, tag_id: str, tenant_id: str, tag_data: Dict[str, Any]) -> Dict[str, Any]:
         """Update a tag record"""
-        response = self.client.table("tags").update(tag_data).eq("id", tag_id).eq("tenant_id", tenant_id).execute()
+        response = await self._execute(self.client.table("tags").update(tag_data).eq("id", tag_id).eq("tenant_id", tenant_id))
         return response.data[0] if response.data else None
 
     async def delete_tag(self, tag_id: str, tenant_id: str) -> bool:
         """Delete a tag record"""
-        self.client.table("tags").delete().eq("id", tag_id).eq("tenant_id", tenant_id).execute()
+        await self._execute(self.client.table("tags").delete().eq("id", tag_id).eq("tenant_id", tenant_id))
         return True
 
     async def upsert_tag(self, tenant_id: str, environment_id: str, tag_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -851,7 +1003,7 @@ class DatabaseService:
             "last_synced_at": datetime.utcnow().isoformat()
         }
 
-        response = self.client.table("tags").upsert(tag_record, on_conflict="tenant_id,environment_id,tag_id").execute()
+        response = await self._execute(self.client.table("tags").upsert(tag_record, on_conflict="tenant_id,environment_id,tag_id"))
         return response.data[0] if response.data else None
 
     async def sync_tags_from_n8n(self, tenant_id: str, environment_id: str, n8n_tags: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -905,14 +1057,13 @@ class DatabaseService:
         """
         # Query workflow_env_map
         try:
-            mapping_response = (
+            mapping_response = await self._execute(
                 self.client.table("workflow_env_map")
                 .select("*")
                 .eq("tenant_id", tenant_id)
                 .eq("environment_id", environment_id)
                 .eq("n8n_workflow_id", n8n_workflow_id)
                 .single()
-                .execute()
             )
         except Exception:
             # If no mapping found, return None
@@ -929,13 +1080,12 @@ class DatabaseService:
         display_name = None
         if canonical_id:
             try:
-                canonical_response = (
+                canonical_response = await self._execute(
                     self.client.table("canonical_workflows")
                     .select("display_name")
                     .eq("tenant_id", tenant_id)
                     .eq("canonical_id", canonical_id)
                     .single()
-                    .execute()
                 )
                 if canonical_response.data:
                     display_name = canonical_response.data.get("display_name")
@@ -958,7 +1108,13 @@ class DatabaseService:
 
     async def upsert_workflow(self, tenant_id: str, environment_id: str, workflow_data: Dict[str, Any], analysis: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Insert or update a workflow in the cache"""
-        from datetime import datetime
+        workflow_record = self._build_workflow_record(tenant_id, environment_id, workflow_data, analysis)
+        response = await self._execute(self.client.table("workflows").upsert(workflow_record, on_conflict="tenant_id,environment_id,n8n_workflow_id"))
+        return response.data[0] if response.data else None
+
+    @staticmethod
+    def _build_workflow_record(tenant_id: str, environment_id: str, workflow_data: Dict[str, Any], analysis: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Build a workflows cache row from N8N workflow data"""
         import json
 
         # Transform tags from objects to strings (N8N returns tag objects with id and name)
@@ -1000,8 +1156,7 @@ class DatabaseService:
         if analysis is not None:
             workflow_record["analysis"] = analysis
 
-        response = self.client.table("workflows").upsert(workflow_record, on_conflict="tenant_id,environment_id,n8n_workflow_id").execute()
-        return response.data[0] if response.data else None
+        return workflow_record
 
     async def update_workflow_sync_status(
         self,
@@ -1019,33 +1174,37 @@ class DatabaseService:
         logger.debug(f"update_workflow_sync_status called (deprecated) for workflow {n8n_workflow_id}")
         return True
 
-    async def sync_workflows_from_n8n(self, tenant_id: str, environment_id: str, n8n_workflows: List[Dict[str, Any]], workflows_with_analysis: Optional[Dict[str, Dict[str, Any]]] = None, provider: str = "n8n") -> List[Dict[str, Any]]:
+    async def sync_workflows_from_n8n(self, tenant_id: str, environment_id: str, n8n_workflows: List[Dict[str, Any]], workflows_with_analysis: Optional[Dict[str, Dict[str, Any]]] = None, provider: str = "n8n", chunk_size: Optional[int] = None) -> List[Dict[str, Any]]:
         """Sync workflows from N8N API to database cache (batch operation)"""
         from datetime import datetime
 
+        chunk_size = chunk_size or settings.DB_BULK_CHUNK_SIZE
+
         # Get current workflow IDs from N8N
         n8n_workflow_ids = {workflow.get("id") for workflow in n8n_workflows}
 
-        # Mark workflows as deleted if they no longer exist in N8N
+        # Mark workflows as deleted if they no longer exist in N8N (one update per chunk)
         existing_workflows = await self.get_workflows_from_canonical(tenant_id, environment_id)
-        for existing in existing_workflows:
-            if existing["id"] not in n8n_workflow_ids:
-                self.client.table("workflows").update({
-                    "is_deleted": True,
-                    "last_synced_at": datetime.utcnow().isoformat()
-                }).eq("id", existing["id"]).execute()
+        deleted_ids = [existing["id"] for existing in existing_workflows if existing["id"] not in n8n_workflow_ids]
+        for i in range(0, len(deleted_ids), chunk_size):
+            await self._execute(self.client.table("workflows").update({
+                "is_deleted": True,
+                "last_synced_at": datetime.utcnow().isoformat()
+            }).in_("id", deleted_ids[i:i + chunk_size]))
 
         # Upsert all workflows from N8N
-        results = []
-        for workflow_data in n8n_workflows:
-            workflow_id = workflow_data.get("id")
-            analysis = None
-            if workflows_with_analysis and workflow_id in workflows_with_analysis:
-                analysis = workflows_with_analysis[workflow_id]
-            
-            result = await self.upsert_workflow(tenant_id, environment_id, workflow_data, analysis=analysis)
-            if result:
-                results.append(result)
+        records = [
+            self._build_workflow_record(
+                tenant_id,
+                environment_id,
+                workflow_data,
+                analysis=(workflows_with_analysis or {}).get(workflow_data.get("id")),
+            )
+            for workflow_data in n8n_workflows
+        ]
+        result = await self.bulk_upsert_workflows(records, chunk_size=chunk_size)
+        self._raise_if_nothing_synced("workflow", result)
+        results = result["rows"]
 
         # Refresh dependency index
         try:
@@ -1056,6 +1215,20 @@ class DatabaseService:
 
         return results
 
+    async def bulk_upsert_workflows(self, records: List[Dict[str, Any]], chunk_size: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Upsert prepared workflows cache rows in chunks.
+
+        Returns {"rows": [...], "failed": [{"key": n8n_workflow_id, "error": str}]}
+        """
+        return await self._bulk_upsert(
+            "workflows",
+            records,
+            on_conflict="tenant_id,environment_id,n8n_workflow_id",
+            key_field="n8n_workflow_id",
+            chunk_size=chunk_size,
+        )
+
     async def delete_workflow_from_cache(self, tenant_id: str, environment_id: str, n8n_workflow_id: str) -> bool:
         """
         DEPRECATED: Use canonical workflow system instead.
@@ -1063,7 +1236,7 @@ class DatabaseService:
         """
         try:
             # Find mapping by n8n_workflow_id and mark as deleted
-            response = (
+            response = await self._execute(
                 self.client.table("workflow_env_map")
                 .update({
                     "status": "deleted",
@@ -1072,7 +1245,6 @@ class DatabaseService:
                 .eq("tenant_id", tenant_id)
                 .eq("environment_id", environment_id)
                 .eq("n8n_workflow_id", n8n_workflow_id)
-                .execute()
             )
             return bool(response.data)
         except Exception as e:
@@ -1103,7 +1275,7 @@ class DatabaseService:
         """
         try:
             # Find mapping and mark as ignored (equivalent to archived)
-            response = (
+            response = await self._execute(
                 self.client.table("workflow_env_map")
                 .update({
                     "status": "ignored"
@@ -1111,7 +1283,6 @@ class DatabaseService:
                 .eq("tenant_id", tenant_id)
                 .eq("environment_id", environment_id)
                 .eq("n8n_workflow_id", workflow_id)
-                .execute()
             )
             
             if response.data:
@@ -1148,7 +1319,7 @@ class DatabaseService:
         """
         try:
             # Find mapping and mark as linked (unarchive)
-            response = (
+            response = await self._execute(
                 self.client.table("workflow_env_map")
                 .update({
                     "status": "linked"
@@ -1156,7 +1327,6 @@ class DatabaseService:
                 .eq("tenant_id", tenant_id)
                 .eq("environment_id", environment_id)
                 .eq("n8n_workflow_id", workflow_id)
-                .execute()
             )
             
             if response.data:
@@ -1180,14 +1350,13 @@ class DatabaseService:
         """
         try:
             # Find mapping by n8n_workflow_id
-            mapping_response = (
+            mapping_response = await self._execute(
                 self.client.table("workflow_env_map")
                 .select("canonical_id")
                 .eq("tenant_id", tenant_id)
                 .eq("environment_id", environment_id)
                 .eq("n8n_workflow_id", n8n_workflow_id)
                 .single()
-                .execute()
             )
             
             if not mapping_response.data:
@@ -1199,7 +1368,7 @@ class DatabaseService:
             from app.services.canonical_workflow_service import compute_workflow_hash
             content_hash = compute_workflow_hash(workflow_data)
             
-            update_response = (
+            update_response = await self._execute(
                 self.client.table("workflow_env_map")
                 .update({
                     "workflow_data": workflow_data,
@@ -1209,7 +1378,6 @@ class DatabaseService:
                 .eq("tenant_id", tenant_id)
                 .eq("environment_id", environment_id)
                 .eq("canonical_id", canonical_id)
-                .execute()
             )
             
             if update_response.data:
@@ -1260,7 +1428,13 @@ class DatabaseService:
     # Execution cache operations
     async def upsert_execution(self, tenant_id: str, environment_id: str, execution_data: Dict[str, Any]) -> Dict[str, Any]:
         """Insert or update an execution in the cache"""
-        from datetime import datetime
+        execution_record = self._build_execution_record(tenant_id, environment_id, execution_data)
+        response = await self._execute(self.client.table("executions").upsert(execution_record, on_conflict="tenant_id,environment_id,execution_id"))
+        return response.data[0] if response.data else None
+
+    @staticmethod
+    def _build_execution_record(tenant_id: str, environment_id: str, execution_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build an executions cache row from N8N execution data"""
 
         # Calculate execution time as milliseconds difference between startedAt and finishedAt
         execution_time = None
@@ -1362,22 +1536,49 @@ class DatabaseService:
             "last_synced_at": datetime.utcnow().isoformat()
         }
 
-        response = self.client.table("executions").upsert(execution_record, on_conflict="tenant_id,environment_id,execution_id").execute()
-        return response.data[0] if response.data else None
+        return execution_record
 
-    async def sync_executions_from_n8n(self, tenant_id: str, environment_id: str, n8n_executions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Sync executions from N8N API to database cache"""
-        results = []
-        for execution_data in n8n_executions:
-            result = await self.upsert_execution(tenant_id, environment_id, execution_data)
-            if result:
-                results.append(result)
-        return results
+    async def bulk_upsert_executions(self, tenant_id: str, environment_id: str, n8n_executions: List[Dict[str, Any]], chunk_size: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Upsert N8N executions into the cache in chunks.
+
+        Returns {"rows": [...], "failed": [{"key": execution_id, "error": str}]}
+        """
+        records = [
+            self._build_execution_record(tenant_id, environment_id, execution_data)
+            for execution_data in n8n_executions
+        ]
+        return await self._bulk_upsert(
+            "executions",
+            records,
+            on_conflict="tenant_id,environment_id,execution_id",
+            key_field="execution_id",
+            chunk_size=chunk_size,
+        )
+
+    async def get_unfinished_execution_ids(self, tenant_id: str, environment_id: str, limit: int = 100) -> List[str]:
+        """Get IDs of cached executions that had not finished when last synced"""
+        response = await self._execute(
+            self.client.table("executions")
+            .select("execution_id")
+            .eq("tenant_id", tenant_id)
+            .eq("environment_id", environment_id)
+            .in_("status", ["new", "running", "waiting"])
+            .order("started_at", desc=True)
+            .limit(limit)
+        )
+        return [row["execution_id"] for row in (response.data or []) if row.get("execution_id")]
+
+    async def sync_executions_from_n8n(self, tenant_id: str, environment_id: str, n8n_executions: List[Dict[str, Any]], chunk_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Sync executions from N8N API to database cache (chunked multi-row upserts)"""
+        result = await self.bulk_upsert_executions(tenant_id, environment_id, n8n_executions, chunk_size=chunk_size)
+        self._raise_if_nothing_synced("execution", result)
+        return result["rows"]
 
     # Credential cache operations
     async def get_credentials(self, tenant_id: str, environment_id: str) -> List[Dict[str, Any]]:
         """Get all cached credentials for a tenant and environment"""
-        response = self.client.table("credentials").select("*").eq("tenant_id", tenant_id).eq("environment_id", environment_id).eq("is_deleted", False).order("name").execute()
+        response = await self._execute(self.client.table("credentials").select("*").eq("tenant_id", tenant_id).eq("environment_id", environment_id).eq("is_deleted", False).order("name"))
         return response.data
 
     async def upsert_credential(self, tenant_id: str, environment_id: str, credential_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -1414,7 +1615,7 @@ class DatabaseService:
             "is_deleted": False
         }
 
-        response = self.client.table("credentials").upsert(credential_record, on_conflict="tenant_id,environment_id,n8n_credential_id").execute()
+        response = await self._execute(self.client.table("credentials").upsert(credential_record, on_conflict="tenant_id,environment_id,n8n_credential_id"))
         return response.data[0] if response.data else None
 
     async def sync_credentials_from_n8n(self, tenant_id: str, environment_id: str, n8n_credentials: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -1438,10 +1639,10 @@ class DatabaseService:
         existing_credentials = await self.get_credentials(tenant_id, environment_id)
         for existing in existing_credentials:
             if existing["n8n_credential_id"] not in n8n_credential_keys:
-                self.client.table("credentials").update({
+                await self._execute(self.client.table("credentials").update({
                     "is_deleted": True,
                     "last_synced_at": datetime.utcnow().isoformat()
-                }).eq("id", existing["id"]).execute()
+                }).eq("id", existing["id"]))
 
         # Upsert all credentials from N8N workflows
         results = []
@@ -1455,7 +1656,7 @@ class DatabaseService:
     # N8N User cache operations
     async def get_n8n_users(self, tenant_id: str, environment_id: str) -> List[Dict[str, Any]]:
         """Get all cached N8N users for a tenant and environment"""
-        response = self.client.table("n8n_users").select("*").eq("tenant_id", tenant_id).eq("environment_id", environment_id).eq("is_deleted", False).order("email").execute()
+        response = await self._execute(self.client.table("n8n_users").select("*").eq("tenant_id", tenant_id).eq("environment_id", environment_id).eq("is_deleted", False).order("email"))
         return response.data
 
     async def upsert_n8n_user(self, tenant_id: str, environment_id: str, user_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -1480,7 +1681,7 @@ class DatabaseService:
             "is_deleted": False
         }
 
-        response = self.client.table("n8n_users").upsert(user_record, on_conflict="tenant_id,environment_id,n8n_user_id").execute()
+        response = await self._execute(self.client.table("n8n_users").upsert(user_record, on_conflict="tenant_id,environment_id,n8n_user_id"))
         return response.data[0] if response.data else None
 
     async def sync_n8n_users_from_n8n(self, tenant_id: str, environment_id: str, n8n_users: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -1494,10 +1695,10 @@ class DatabaseService:
         existing_users = await self.get_n8n_users(tenant_id, environment_id)
         for existing in existing_users:
             if existing["n8n_user_id"] not in n8n_user_ids:
-                self.client.table("n8n_users").update({
+                await self._execute(self.client.table("n8n_users").update({
                     "is_deleted": True,
                     "last_synced_at": datetime.utcnow().isoformat()
-                }).eq("id", existing["id"]).execute()
+                }).eq("id", existing["id"]))
 
         # Upsert all users from N8N
         results = []
@@ -1530,7 +1731,7 @@ class DatabaseService:
         else:
             logger.debug("No filter applied - returning all pipelines")
         
-        response = query.order("created_at", desc=True).execute()
+        response = await self._execute(query.order("created_at", desc=True))
         result_count = len(response.data) if response.data else 0
         logger.info(f"Database query returned {result_count} pipelines (include_inactive={include_inactive})")
         
@@ -1544,35 +1745,35 @@ class DatabaseService:
 
     async def get_pipeline(self, pipeline_id: str, tenant_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific pipeline"""
-        response = self.client.table("pipelines").select("*").eq("id", pipeline_id).eq("tenant_id", tenant_id).execute()
+        response = await self._execute(self.client.table("pipelines").select("*").eq("id", pipeline_id).eq("tenant_id", tenant_id))
         return response.data[0] if response.data else None
 
     async def create_pipeline(self, pipeline_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new pipeline"""
-        response = self.client.table("pipelines").insert(pipeline_data).execute()
+        response = await self._execute(self.client.table("pipelines").insert(pipeline_data))
         return response.data[0]
 
     async def update_pipeline(self, pipeline_id: str, tenant_id: str, pipeline_data: Dict[str, Any]) -> Dict[str, Any]:
         """Update a pipeline"""
         from datetime import datetime
         pipeline_data["updated_at"] = datetime.utcnow().isoformat()
-        response = self.client.table("pipelines").update(pipeline_data).eq("id", pipeline_id).eq("tenant_id", tenant_id).execute()
+        response = await self._execute(self.client.table("pipelines").update(pipeline_data).eq("id", pipeline_id).eq("tenant_id", tenant_id))
         return response.data[0] if response.data else None
 
     async def delete_pipeline(self, pipeline_id: str, tenant_id: str) -> bool:
         """Delete a pipeline (hard delete)"""
-        response = self.client.table("pipelines").delete().eq("id", pipeline_id).eq("tenant_id", tenant_id).execute()
+        response = await self._execute(self.client.table("pipelines").delete().eq("id", pipeline_id).eq("tenant_id", tenant_id))
         return True
 
     # Promotion operations
     async def create_promotion(self, promotion_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a promotion record"""
-        response = self.client.table("promotions").insert(promotion_data).execute()
+        response = await self._execute(self.client.table("promotions").insert(promotion_data))
         return response.data[0]
 
     async def get_promotion(self, promotion_id: str, tenant_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific promotion"""
-        response = self.client.table("promotions").select("*").eq("id", promotion_id).eq("tenant_id", tenant_id).single().execute()
+        response = await self._execute(self.client.table("promotions").select("*").eq("id", promotion_id).eq("tenant_id", tenant_id).single())
         return response.data
 
     async def get_promotions(self, tenant_id: str, status: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
@@ -1580,14 +1781,14 @@ class DatabaseService:
         query = self.client.table("promotions").select("*").eq("tenant_id", tenant_id)
         if status:
             query = query.eq("status", status)
-        response = query.order("created_at", desc=True).limit(limit).execute()
+        response = await self._execute(query.order("created_at", desc=True).limit(limit))
         return response.data
 
     async def update_promotion(self, promotion_id: str, tenant_id: str, promotion_data: Dict[str, Any]) -> Dict[str, Any]:
         """Update a promotion"""
         from datetime import datetime
         promotion_data["updated_at"] = datetime.utcnow().isoformat()
-        response = self.client.table("promotions").update(promotion_data).eq("id", promotion_id).eq("tenant_id", tenant_id).execute()
+        response = await self._execute(self.client.table("promotions").update(promotion_data).eq("id", promotion_id).eq("tenant_id", tenant_id))
         return response.data[0] if response.data else None
 
     async def get_active_promotion_for_environment(
@@ -1608,19 +1809,19 @@ class DatabaseService:
         Returns:
             The active promotion record if one exists, None otherwise
         """
-        response = self.client.table("promotions").select("*").eq(
+        response = await self._execute(self.client.table("promotions").select("*").eq(
             "tenant_id", tenant_id
         ).eq(
             "target_environment_id", target_environment_id
         ).eq(
             "status", "running"
-        ).limit(1).execute()
+        ).limit(1))
         return response.data[0] if response.data else None
 
     # Health check operations
     async def create_health_check(self, health_check_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a health check record"""
-        response = self.client.table("health_checks").insert(health_check_data).execute()
+        response = await self._execute(self.client.table("health_checks").insert(health_check_data))
         return response.data[0] if response.data else None
 
     async def get_recent_health_checks(
@@ -1630,11 +1831,11 @@ class DatabaseService:
         limit: int = 100
     ) -> List[Dict[str, Any]]:
         """Get recent health checks for an environment"""
-        response = self.client.table("health_checks").select("*").eq(
+        response = await self._execute(self.client.table("health_checks").select("*").eq(
             "tenant_id", tenant_id
         ).eq(
             "environment_id", environment_id
-        ).order("checked_at", desc=True).limit(limit).execute()
+        ).order("checked_at", desc=True).limit(limit))
         return response.data
 
     async def get_latest_health_check(
@@ -1643,11 +1844,11 @@ class DatabaseService:
         environment_id: str
     ) -> Optional[Dict[str, Any]]:
         """Get the most recent health check for an environment"""
-        response = self.client.table("health_checks").select("*").eq(
+        response = await self._execute(self.client.table("health_checks").select("*").eq(
             "tenant_id", tenant_id
         ).eq(
             "environment_id", environment_id
-        ).order("checked_at", desc=True).limit(1).execute()
+        ).order("checked_at", desc=True).limit(1))
         return response.data[0] if response.data else None
 
     async def get_uptime_stats(
@@ -1657,11 +1858,11 @@ class DatabaseService:
         since: str
     ) -> Dict[str, Any]:
         """Calculate uptime stats for an environment since a given time"""
-        response = self.client.table("health_checks").select("status").eq(
+        response = await self._execute(self.client.table("health_checks").select("status").eq(
             "tenant_id", tenant_id
         ).eq(
             "environment_id", environment_id
-        ).gte("checked_at", since).execute()
+        ).gte("checked_at", since))
 
         checks = response.data
         total = len(checks)
@@ -1676,14 +1877,14 @@ class DatabaseService:
     # Notification channel operations
     async def create_notification_channel(self, channel_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a notification channel"""
-        response = self.client.table("notification_channels").insert(channel_data).execute()
+        response = await self._execute(self.client.table("notification_channels").insert(channel_data))
         return response.data[0] if response.data else None
 
     async def get_notification_channels(self, tenant_id: str) -> List[Dict[str, Any]]:
         """Get all notification channels for a tenant"""
-        response = self.client.table("notification_channels").select("*").eq(
+        response = await self._execute(self.client.table("notification_channels").select("*").eq(
             "tenant_id", tenant_id
-        ).order("created_at", desc=True).execute()
+        ).order("created_at", desc=True))
         return response.data
 
     async def get_notification_channel(
@@ -1692,9 +1893,9 @@ class DatabaseService:
         tenant_id: str
     ) -> Optional[Dict[str, Any]]:
         """Get a specific notification channel"""
-        response = self.client.table("notification_channels").select("*").eq(
+        response = await self._execute(self.client.table("notification_channels").select("*").eq(
             "id", channel_id
-        ).eq("tenant_id", tenant_id).single().execute()
+        ).eq("tenant_id", tenant_id).single())
         return response.data
 
     async def update_notification_channel(
@@ -1706,29 +1907,29 @@ class DatabaseService:
         """Update a notification channel"""
         from datetime import datetime
         channel_data["updated_at"] = datetime.utcnow().isoformat()
-        response = self.client.table("notification_channels").update(channel_data).eq(
+        response = await self._execute(self.client.table("notification_channels").update(channel_data).eq(
             "id", channel_id
-        ).eq("tenant_id", tenant_id).execute()
+        ).eq("tenant_id", tenant_id))
         return response.data[0] if response.data else None
 
     async def delete_notification_channel(self, channel_id: str, tenant_id: str) -> bool:
         """Delete a notification channel"""
-        self.client.table("notification_channels").delete().eq(
+        await self._execute(self.client.table("notification_channels").delete().eq(
             "id", channel_id
-        ).eq("tenant_id", tenant_id).execute()
+        ).eq("tenant_id", tenant_id))
         return True
 
     # Notification rule operations
     async def create_notification_rule(self, rule_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a notification rule"""
-        response = self.client.table("notification_rules").insert(rule_data).execute()
+        response = await self._execute(self.client.table("notification_rules").insert(rule_data))
         return response.data[0] if response.data else None
 
     async def get_notification_rules(self, tenant_id: str) -> List[Dict[str, Any]]:
         """Get all notification rules for a tenant"""
-        response = self.client.table("notification_rules").select("*").eq(
+        response = await self._execute(self.client.table("notification_rules").select("*").eq(
             "tenant_id", tenant_id
-        ).order("event_type").execute()
+        ).order("event_type"))
         return response.data
 
     async def get_notification_rule_by_event(
@@ -1737,9 +1938,9 @@ class DatabaseService:
         event_type: str
     ) -> Optional[Dict[str, Any]]:
         """Get a notification rule by event type"""
-        response = self.client.table("notification_rules").select("*").eq(
+        response = await self._execute(self.client.table("notification_rules").select("*").eq(
             "tenant_id", tenant_id
-        ).eq("event_type", event_type).execute()
+        ).eq("event_type", event_type))
         return response.data[0] if response.data else None
 
     async def update_notification_rule(
@@ -1751,22 +1952,22 @@ class DatabaseService:
         """Update a notification rule"""
         from datetime import datetime
         rule_data["updated_at"] = datetime.utcnow().isoformat()
-        response = self.client.table("notification_rules").update(rule_data).eq(
+        response = await self._execute(self.client.table("notification_rules").update(rule_data).eq(
             "id", rule_id
-        ).eq("tenant_id", tenant_id).execute()
+        ).eq("tenant_id", tenant_id))
         return response.data[0] if response.data else None
 
     async def delete_notification_rule(self, rule_id: str, tenant_id: str) -> bool:
         """Delete a notification rule"""
-        self.client.table("notification_rules").delete().eq(
+        await self._execute(self.client.table("notification_rules").delete().eq(
             "id", rule_id
-        ).eq("tenant_id", tenant_id).execute()
+        ).eq("tenant_id", tenant_id))
         return True
 
     # Event operations
     async def create_event(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create an event record"""
-        response = self.client.table("events").insert(event_data).execute()
+        response = await self._execute(self.client.table("events").insert(event_data))
         return response.data[0] if response.data else None
 
     async def get_events(
@@ -1782,7 +1983,7 @@ class DatabaseService:
             query = query.eq("event_type", event_type)
         if environment_id:
             query = query.eq("environment_id", environment_id)
-        response = query.order("timestamp", desc=True).limit(limit).execute()
+        response = await self._execute(query.order("timestamp", desc=True).limit(limit))
         return response.data
 
     async def update_event_notification_status(
@@ -1792,10 +1993,10 @@ class DatabaseService:
         channels: List[str]
     ) -> Optional[Dict[str, Any]]:
         """Update event notification status"""
-        response = self.client.table("events").update({
+        response = await self._execute(self.client.table("events").update({
             "notification_status": status,
             "channels_notified": channels
-        }).eq("id", event_id).execute()
+        }).eq("id", event_id))
         return response.data[0] if response.data else None
 
     # Execution stats for observability
@@ -1819,7 +2020,7 @@ class DatabaseService:
             logger.info(f"get_execution_stats: Filtering by environment_id={environment_id}")
 
         logger.info(f"get_execution_stats: Query params - tenant_id={tenant_id}, since={since}, until={until}, environment_id={environment_id}")
-        response = query.execute()
+        response = await self._execute(query)
         executions = response.data
         logger.info(f"get_execution_stats: Found {len(executions)} executions")
 
@@ -1868,35 +2069,31 @@ class DatabaseService:
         if environment_id:
             query = query.eq("environment_id", environment_id)
 
-        response = query.execute()
+        response = await self._execute(query)
         executions = response.data
 
-        # Group by workflow
-        workflow_stats = {}
-        for e in executions:
-            wf_id = e.get("workflow_id")
-            if not wf_id:
-                continue
-
-            if wf_id not in workflow_stats:
-                workflow_stats[wf_id] = {
-                    "workflow_id": wf_id,
-                    "workflow_name": e.get("workflow_name"),  # May be None, we'll look it up later
-                    "execution_count": 0,
-                    "success_count": 0,
-                    "failure_count": 0,
-                    "durations": []
-                }
-
-            stats = workflow_stats[wf_id]
-            stats["execution_count"] += 1
-            if e.get("status") == "success":
-                stats["success_count"] += 1
-            elif e.get("status") == "error":
-                stats["failure_count"] += 1
+        # Group by workflow (columnar reductions instead of per-row dict updates)
+        groups = GroupedColumns([e.get("workflow_id") for e in executions])
+        statuses = status_masks([e.get("status") for e in executions])
+        execution_counts = groups.count()
+        success_counts = groups.count(statuses["success"])
+        failure_counts = groups.count(statuses["error"])
+        durations = groups.durations(
+            numeric_column([e.get("execution_time") for e in executions]), percentiles=(95,)
+        )
 
-            if e.get("execution_time") is not None:
-                stats["durations"].append(e["execution_time"])
+        workflow_stats = {}
+        for i, wf_id in enumerate(groups.keys):
+            workflow_stats[wf_id] = {
+                "workflow_id": wf_id,
+                # May be None, we'll look it up later
+                "workflow_name": executions[groups.first_rows[i]].get("workflow_name"),
+                "execution_count": int(execution_counts[i]),
+                "success_count": int(success_counts[i]),
+                "failure_count": int(failure_counts[i]),
+                "avg_duration_ms": durations["avg"][i],
+                "p95_duration_ms": durations["p95"][i],
+            }
 
         # Look up workflow names from canonical system for any missing names
         missing_name_ids = [wf_id for wf_id, stats in workflow_stats.items() if not stats["workflow_name"]]
@@ -1913,18 +2110,17 @@ class DatabaseService:
                 if environment_id:
                     query = query.eq("environment_id", environment_id)
 
-                mappings_response = query.execute()
+                mappings_response = await self._execute(query)
                 
                 # Get canonical IDs to fetch display names separately (Supabase doesn't support nested joins)
                 canonical_ids = [m.get("canonical_id") for m in (mappings_response.data or []) if m.get("canonical_id")]
                 canonical_map = {}
                 if canonical_ids:
-                    canonical_response = (
+                    canonical_response = await self._execute(
                         self.client.table("canonical_workflows")
                         .select("canonical_id, display_name")
                         .eq("tenant_id", tenant_id)
                         .in_("canonical_id", canonical_ids)
-                        .execute()
                     )
                     for canonical in (canonical_response.data or []):
                         canonical_map[canonical.get("canonical_id")] = canonical
@@ -1959,13 +2155,11 @@ class DatabaseService:
         # Calculate final stats and sort
         result = []
         for wf_id, stats in workflow_stats.items():
-            avg_duration = sum(stats["durations"]) / len(stats["durations"]) if stats["durations"] else 0
+            avg_duration = stats["avg_duration_ms"] if stats["avg_duration_ms"] is not None else 0
 
-            # Calculate p95 using PERCENTILE_CONT equivalent (linear interpolation)
+            # p95 uses PERCENTILE_CONT-equivalent linear interpolation
             # This matches PostgreSQL's PERCENTILE_CONT behavior for consistency
-            p95_duration = None
-            if stats["durations"]:
-                p95_duration = float(np.percentile(stats["durations"], 95))
+            p95_duration = stats["p95_duration_ms"]
 
             # Calculate success rate correctly: only count completed executions (success + error)
             # Exclude running, waiting, or other intermediate states from denominator
@@ -2018,8 +2212,6 @@ class DatabaseService:
         Returns:
             List of workflow analytics dicts with aggregated metrics
         """
-        from collections import defaultdict
-
         logger = logging.getLogger(__name__)
 
         # Build query to fetch all relevant executions
@@ -2037,7 +2229,7 @@ class DatabaseService:
 
         # Apply search filter if provided and >= 3 chars
         # Note: Supabase doesn't support COALESCE in filters, so we'll filter in Python
-        response = query.execute()
+        response = await self._execute(query)
         executions = response.data or []
 
         # Filter by search in Python if needed
@@ -2048,89 +2240,49 @@ class DatabaseService:
                 if search_lower in (e.get("workflow_name") or e.get("workflow_id") or "").lower()
             ]
 
-        # Aggregate by workflow
-        workflow_stats = defaultdict(lambda: {
-            "workflow_id": None,
-            "workflow_name": None,
-            "total_runs": 0,
-            "success_runs": 0,
-            "failure_runs": 0,
-            "durations": [],
-            "last_failure": None
-        })
-
-        for execution in executions:
-            wf_id = execution.get("workflow_id")
-            if not wf_id:
-                continue
-
-            stats = workflow_stats[wf_id]
-
-            # Set workflow identifiers
-            if stats["workflow_id"] is None:
-                stats["workflow_id"] = wf_id
-                stats["workflow_name"] = execution.get("workflow_name") or wf_id
-
-            # Count runs by status
-            stats["total_runs"] += 1
-            if execution.get("normalized_status") == "success":
-                stats["success_runs"] += 1
-            elif execution.get("normalized_status") == "error":
-                stats["failure_runs"] += 1
-
-                # Track last failure
-                started_at = execution.get("started_at")
-                if started_at and (stats["last_failure"] is None or started_at > stats["last_failure"]["started_at"]):
-                    stats["last_failure"] = {
-                        "started_at": started_at,
-                        "error_message": execution.get("error_message"),
-                        "error_node": execution.get("error_node")
-                    }
-
-            # Collect execution times
-            exec_time = execution.get("execution_time")
-            if exec_time is not None:
-                stats["durations"].append(exec_time)
+        # Aggregate by workflow with columnar reductions
+        groups = GroupedColumns([e.get("workflow_id") for e in executions])
+        statuses = status_masks([e.get("normalized_status") for e in executions])
+        total_runs = groups.count()
+        success_runs = groups.count(statuses["success"])
+        failure_runs = groups.count(statuses["error"])
+        durations = groups.durations(
+            numeric_column([e.get("execution_time") for e in executions]), percentiles=(50, 95)
+        )
+        last_failure_rows = groups.latest_rows(
+            timestamp_column([e.get("started_at") for e in executions]), mask=statuses["error"]
+        )
 
-        # Calculate final metrics and format results
+        # Format results
         results = []
-        for wf_id, stats in workflow_stats.items():
-            # Calculate percentiles using numpy
-            p50_duration_ms = None
-            p95_duration_ms = None
-            avg_duration_ms = None
-
-            if stats["durations"]:
-                avg_duration_ms = sum(stats["durations"]) / len(stats["durations"])
-                p50_duration_ms = float(np.percentile(stats["durations"], 50))
-                p95_duration_ms = float(np.percentile(stats["durations"], 95))
-
+        for i, wf_id in enumerate(groups.keys):
             # Calculate success rate
             success_rate = None
-            if stats["total_runs"] > 0:
-                success_rate = stats["success_runs"] / stats["total_runs"]
+            if total_runs[i] > 0:
+                success_rate = success_runs[i] / total_runs[i]
 
             # Format last failure info
             last_failure_at = None
             last_failure_error = None
             last_failure_node = None
-            if stats["last_failure"]:
-                last_failure_at = stats["last_failure"]["started_at"]
-                last_failure_error = stats["last_failure"]["error_message"]
+            if last_failure_rows[i] is not None:
+                last_failure = executions[last_failure_rows[i]]
+                last_failure_at = last_failure.get("started_at")
+                last_failure_error = last_failure.get("error_message")
                 if last_failure_error and len(last_failure_error) > 300:
                     last_failure_error = last_failure_error[:300]
-                last_failure_node = stats["last_failure"]["error_node"]
+                last_failure_node = last_failure.get("error_node")
 
             results.append({
-                "workflow_id": stats["workflow_id"],
-                "workflow_name": stats["workflow_name"],
-                "total_runs": stats["total_runs"],
-                "success_runs": stats["success_runs"],
-                "failure_runs": stats["failure_runs"],
-                "success_rate": success_rate,
-                "avg_duration_ms": avg_duration_ms,
-                "p50_duration_ms": p50_duration_ms,
-                "p95_duration_ms": p95_duration_ms,
+                "workflow_id": wf_id,
+                "workflow_name": executions[groups.first_rows[i]].get("workflow_name") or wf_id,
+                "total_runs": int(total_runs[i]),
+                "success_runs": int(success_runs[i]),
+                "failure_runs": int(failure_runs[i]),
+                "success_rate": float(success_rate) if success_rate is not None else None,
+                "avg_duration_ms": durations["avg"][i],
+                "p50_duration_ms": durations["p50"][i],
+                "p95_duration_ms": durations["p95"][i],
                 "last_failure_at": last_failure_at,
                 "last_failure_error": last_failure_error,
                 "last_failure_node": last_failure_node
@@ -2152,9 +2304,9 @@ class DatabaseService:
         since: str
     ) -> Dict[str, Any]:
         """Get deployment statistics since a given time"""
-        response = self.client.table("deployments").select("status").eq(
+        response = await self._execute(self.client.table("deployments").select("status").eq(
             "tenant_id", tenant_id
-        ).gte("started_at", since).execute()
+        ).gte("started_at", since))
 
         deployments = response.data
         total = len(deployments)
@@ -2175,9 +2327,9 @@ class DatabaseService:
         limit: int = 5
     ) -> List[Dict[str, Any]]:
         """Get recent deployments with environment names"""
-        response = self.client.table("deployments").select("*").eq(
+        response = await self._execute(self.client.table("deployments").select("*").eq(
             "tenant_id", tenant_id
-        ).order("started_at", desc=True).limit(limit).execute()
+        ).order("started_at", desc=True).limit(limit))
 
         deployments = response.data
 
@@ -2191,18 +2343,18 @@ class DatabaseService:
 
         env_names = {}
         if env_ids:
-            env_response = self.client.table("environments").select("id, n8n_name").in_(
+            env_response = await self._execute(self.client.table("environments").select("id, n8n_name").in_(
                 "id", list(env_ids)
-            ).execute()
+            ))
             env_names = {e["id"]: e["n8n_name"] for e in env_response.data}
 
         # Get pipeline names
         pipeline_ids = [d.get("pipeline_id") for d in deployments if d.get("pipeline_id")]
         pipeline_names = {}
         if pipeline_ids:
-            pipeline_response = self.client.table("pipelines").select("id, name").in_(
+            pipeline_response = await self._execute(self.client.table("pipelines").select("id, name").in_(
                 "id", pipeline_ids
-            ).execute()
+            ))
             pipeline_names = {p["id"]: p["name"] for p in pipeline_response.data}
 
         # Enrich deployments
@@ -2220,9 +2372,9 @@ class DatabaseService:
         since: str
     ) -> Dict[str, Any]:
         """Get snapshot statistics since a given time"""
-        response = self.client.table("snapshots").select("type").eq(
+        response = await self._execute(self.client.table("snapshots").select("type").eq(
             "tenant_id", tenant_id
-        ).gte("created_at", since).execute()
+        ).gte("created_at", since))
 
         snapshots = response.data
         created = len(snapshots)
@@ -2238,57 +2390,53 @@ class DatabaseService:
     # ---------- Logical Credentials, Mappings, Dependencies ----------
 
     async def create_logical_credential(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        response = self.client.table("logical_credentials").insert(data).execute()
+        response = await self._execute(self.client.table("logical_credentials").insert(data))
         return response.data[0]
 
     async def list_logical_credentials(self, tenant_id: str) -> List[Dict[str, Any]]:
-        response = (
+        response = await self._execute(
             self.client.table("logical_credentials")
             .select("*")
             .eq("tenant_id", tenant_id)
             .order("name")
-            .execute()
         )
         return response.data or []
 
     async def find_logical_credential_by_name(self, tenant_id: str, name: str) -> Optional[Dict[str, Any]]:
-        response = (
+        response = await self._execute(
             self.client.table("logical_credentials")
             .select("*")
             .eq("tenant_id", tenant_id)
             .eq("name", name)
             .single()
-            .execute()
         )
         return response.data
 
     async def get_logical_credential(self, tenant_id: str, logical_id: str) -> Optional[Dict[str, Any]]:
-        response = (
+        response = await self._execute(
             self.client.table("logical_credentials")
             .select("*")
             .eq("tenant_id", tenant_id)
             .eq("id", logical_id)
             .single()
-            .execute()
         )
         return response.data
 
     async def update_logical_credential(self, tenant_id: str, logical_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        response = (
+        response = await self._execute(
             self.client.table("logical_credentials")
             .update(data)
             .eq("tenant_id", tenant_id)
             .eq("id", logical_id)
-            .execute()
         )
         return response.data[0] if response.data else None
 
     async def delete_logical_credential(self, tenant_id: str, logical_id: str) -> bool:
-        self.client.table("logical_credentials").delete().eq("tenant_id", tenant_id).eq("id", logical_id).execute()
+        await self._execute(self.client.table("logical_credentials").delete().eq("tenant_id", tenant_id).eq("id", logical_id))
         return True
 
     async def create_credential_mapping(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        response = self.client.table("credential_mappings").insert(data).execute()
+        response = await self._execute(self.client.table("credential_mappings").insert(data))
         return response.data[0]
 
     async def list_credential_mappings(
@@ -2302,32 +2450,30 @@ class DatabaseService:
             query = query.eq("environment_id", environment_id)
         if provider:
             query = query.eq("provider", provider)
-        response = query.order("created_at", desc=True).execute()
+        response = await self._execute(query.order("created_at", desc=True))
         return response.data or []
 
     async def get_credential_mapping(self, tenant_id: str, mapping_id: str) -> Optional[Dict[str, Any]]:
-        response = (
+        response = await self._execute(
             self.client.table("credential_mappings")
             .select("*")
             .eq("tenant_id", tenant_id)
             .eq("id", mapping_id)
             .single()
-            .execute()
         )
         return response.data
 
     async def update_credential_mapping(self, tenant_id: str, mapping_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        response = (
+        response = await self._execute(
             self.client.table("credential_mappings")
             .update(data)
             .eq("tenant_id", tenant_id)
             .eq("id", mapping_id)
-            .execute()
         )
         return response.data[0] if response.data else None
 
     async def delete_credential_mapping(self, tenant_id: str, mapping_id: str) -> bool:
-        self.client.table("credential_mappings").delete().eq("tenant_id", tenant_id).eq("id", mapping_id).execute()
+        await self._execute(self.client.table("credential_mappings").delete().eq("tenant_id", tenant_id).eq("id", mapping_id))
         return True
 
     async def update_mapping_health(
@@ -2357,7 +2503,7 @@ class DatabaseService:
         provider: str,
         logical_credential_id: str,
     ) -> Optional[Dict[str, Any]]:
-        response = (
+        response = await self._execute(
             self.client.table("credential_mappings")
             .select("*")
             .eq("tenant_id", tenant_id)
@@ -2365,7 +2511,6 @@ class DatabaseService:
             .eq("provider", provider)
             .eq("logical_credential_id", logical_credential_id)
             .single()
-            .execute()
         )
         return response.data
 
@@ -2383,20 +2528,19 @@ class DatabaseService:
             "logical_credential_ids": logical_credential_ids,
             "updated_at": datetime.utcnow().isoformat(),
         }
-        response = self.client.table("workflow_credential_dependencies").upsert(
+        response = await self._execute(self.client.table("workflow_credential_dependencies").upsert(
             record,
             on_conflict="workflow_id,provider",
-        ).execute()
+        ))
         return response.data[0] if response.data else record
 
     async def get_workflow_dependencies(self, workflow_id: str, provider: str) -> Optional[Dict[str, Any]]:
-        response = (
+        response = await self._execute(
             self.client.table("workflow_credential_dependencies")
             .select("*")
             .eq("workflow_id", workflow_id)
             .eq("provider", provider)
             .single()
-            .execute()
         )
         return response.data
 
@@ -2405,12 +2549,11 @@ class DatabaseService:
     async def get_support_config(self, tenant_id: str) -> Optional[Dict[str, Any]]:
         """Get support configuration for a tenant"""
         try:
-            response = (
+            response = await self._execute(
                 self.client.table("support_config")
                 .select("*")
                 .eq("tenant_id", tenant_id)
                 .single()
-                .execute()
             )
             return response.data
         except Exception:
@@ -2419,27 +2562,27 @@ class DatabaseService:
     async def upsert_support_config(self, tenant_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Create or update support configuration for a tenant"""
         data["tenant_id"] = tenant_id
-        response = self.client.table("support_config").upsert(
+        response = await self._execute(self.client.table("support_config").upsert(
             data,
             on_conflict="tenant_id"
-        ).execute()
+        ))
         return response.data[0] if response.data else data
 
     # Background job operations
     async def create_background_job(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a background job record"""
-        response = self.client.table("background_jobs").insert(job_data).execute()
+        response = await self._execute(self.client.table("background_jobs").insert(job_data))
         return response.data[0] if response.data else None
 
     async def update_background_job(self, job_id: str, job_data: Dict[str, Any]) -> Dict[str, Any]:
         """Update a background job record"""
-        response = self.client.table("background_jobs").update(job_data).eq("id", job_id).execute()
+        response = await self._execute(self.client.table("background_jobs").update(job_data).eq("id", job_id))
         return response.data[0] if response.data else None
 
     async def get_background_job(self, job_id: str) -> Optional[Dict[str, Any]]:
         """Get a background job by ID"""
         try:
-            response = self.client.table("background_jobs").select("*").eq("id", job_id).single().execute()
+            response = await self._execute(self.client.table("background_jobs").select("*").eq("id", job_id).single())
             return response.data
         except Exception:
             return None
@@ -2455,7 +2598,7 @@ class DatabaseService:
         query = self.client.table("background_jobs").select("*").eq("resource_type", resource_type).eq("resource_id", resource_id)
         if tenant_id:
             query = query.eq("tenant_id", tenant_id)
-        response = query.order("created_at", desc=True).limit(limit).execute()
+        response = await self._execute(query.order("created_at", desc=True).limit(limit))
         return response.data
 
     async def mark_stale_promotion_jobs(
@@ -2505,7 +2648,7 @@ class DatabaseService:
             query = query.eq("tenant_id", tenant_id)
 
         try:
-            result = query.execute()
+            result = await self._execute(query)
             stale_jobs = result.data or []
 
             for job in stale_jobs:
@@ -2577,13 +2720,13 @@ class DatabaseService:
         query = self.client.table("providers").select("*")
         if active_only:
             query = query.eq("is_active", True)
-        response = query.order("name").execute()
+        response = await self._execute(query.order("name"))
         return response.data or []
 
     async def get_provider(self, provider_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific provider by ID"""
         try:
-            response = self.client.table("providers").select("*").eq("id", provider_id).single().execute()
+            response = await self._execute(self.client.table("providers").select("*").eq("id", provider_id).single())
             return response.data
         except Exception:
             return None
@@ -2591,7 +2734,7 @@ class DatabaseService:
     async def get_provider_by_name(self, name: str) -> Optional[Dict[str, Any]]:
         """Get a provider by name"""
         try:
-            response = self.client.table("providers").select("*").eq("name", name).single().execute()
+            response = await self._execute(self.client.table("providers").select("*").eq("name", name).single())
             return response.data
         except Exception:
             return None
@@ -2601,13 +2744,13 @@ class DatabaseService:
         query = self.client.table("provider_plans").select("*").eq("provider_id", provider_id)
         if active_only:
             query = query.eq("is_active", True)
-        response = query.order("sort_order").execute()
+        response = await self._execute(query.order("sort_order"))
         return response.data or []
 
     async def get_provider_plan(self, plan_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific plan by ID"""
         try:
-            response = self.client.table("provider_plans").select("*").eq("id", plan_id).single().execute()
+            response = await self._execute(self.client.table("provider_plans").select("*").eq("id", plan_id).single())
             return response.data
         except Exception:
             return None
@@ -2622,7 +2765,7 @@ class DatabaseService:
     # Tenant Provider Subscription operations
     async def get_tenant_provider_subscriptions(self, tenant_id: str) -> List[Dict[str, Any]]:
         """Get all provider subscriptions for a tenant"""
-        response = self.client.table("tenant_provider_subscriptions").select("*").eq("tenant_id", tenant_id).execute()
+        response = await self._execute(self.client.table("tenant_provider_subscriptions").select("*").eq("tenant_id", tenant_id))
         subscriptions = response.data or []
 
         # Enrich with provider and plan details
@@ -2639,13 +2782,12 @@ class DatabaseService:
     ) -> Optional[Dict[str, Any]]:
         """Get a specific provider subscription for a tenant"""
         try:
-            response = (
+            response = await self._execute(
                 self.client.table("tenant_provider_subscriptions")
                 .select("*")
                 .eq("tenant_id", tenant_id)
                 .eq("provider_id", provider_id)
                 .single()
-                .execute()
             )
             sub = response.data
             if sub:
@@ -2661,12 +2803,11 @@ class DatabaseService:
     ) -> Optional[Dict[str, Any]]:
         """Get a subscription by its Stripe subscription ID"""
         try:
-            response = (
+            response = await self._execute(
                 self.client.table("tenant_provider_subscriptions")
                 .select("*")
                 .eq("stripe_subscription_id", stripe_subscription_id)
                 .single()
-                .execute()
             )
             return response.data
         except Exception:
@@ -2679,7 +2820,7 @@ class DatabaseService:
         """Create a provider subscription for a tenant"""
         subscription_data["created_at"] = datetime.utcnow().isoformat()
         subscription_data["updated_at"] = datetime.utcnow().isoformat()
-        response = self.client.table("tenant_provider_subscriptions").insert(subscription_data).execute()
+        response = await self._execute(self.client.table("tenant_provider_subscriptions").insert(subscription_data))
         return response.data[0]
 
     async def update_tenant_provider_subscription(
@@ -2690,12 +2831,11 @@ class DatabaseService:
     ) -> Optional[Dict[str, Any]]:
         """Update a provider subscription"""
         subscription_data["updated_at"] = datetime.utcnow().isoformat()
-        response = (
+        response = await self._execute(
             self.client.table("tenant_provider_subscriptions")
             .update(subscription_data)
             .eq("id", subscription_id)
             .eq("tenant_id", tenant_id)
-            .execute()
         )
         return response.data[0] if response.data else None
 
@@ -2707,12 +2847,11 @@ class DatabaseService:
     ) -> Optional[Dict[str, Any]]:
         """Update a provider subscription by provider ID"""
         subscription_data["updated_at"] = datetime.utcnow().isoformat()
-        response = (
+        response = await self._execute(
             self.client.table("tenant_provider_subscriptions")
             .update(subscription_data)
             .eq("tenant_id", tenant_id)
             .eq("provider_id", provider_id)
-            .execute()
         )
         return response.data[0] if response.data else None
 
@@ -2722,17 +2861,16 @@ class DatabaseService:
         tenant_id: str
     ) -> bool:
         """Delete a provider subscription"""
-        self.client.table("tenant_provider_subscriptions").delete().eq("id", subscription_id).eq("tenant_id", tenant_id).execute()
+        await self._execute(self.client.table("tenant_provider_subscriptions").delete().eq("id", subscription_id).eq("tenant_id", tenant_id))
         return True
 
     async def get_active_provider_subscriptions(self, tenant_id: str) -> List[Dict[str, Any]]:
         """Get only active provider subscriptions for a tenant"""
-        response = (
+        response = await self._execute(
             self.client.table("tenant_provider_subscriptions")
             .select("*")
             .eq("tenant_id", tenant_id)
             .eq("status", "active")
-            .execute()
         )
         subscriptions = response.data or []
 
@@ -2746,51 +2884,48 @@ class DatabaseService:
     # Admin Provider Management
     async def update_provider(self, provider_id: str, update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Update a provider"""
-        response = (
+        response = await self._execute(
             self.client.table("providers")
             .update(update_data)
             .eq("id", provider_id)
-            .execute()
         )
         return response.data[0] if response.data else None
 
     async def get_all_provider_plans(self, provider_id: str) -> List[Dict[str, Any]]:
         """Get all plans for a provider (including inactive)"""
-        response = (
+        response = await self._execute(
             self.client.table("provider_plans")
             .select("*")
             .eq("provider_id", provider_id)
             .order("sort_order")
-            .execute()
         )
         return response.data or []
 
     async def create_provider_plan(self, plan_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new provider plan"""
         plan_data["created_at"] = datetime.utcnow().isoformat()
-        response = self.client.table("provider_plans").insert(plan_data).execute()
+        response = await self._execute(self.client.table("provider_plans").insert(plan_data))
         return response.data[0]
 
     async def update_provider_plan(self, plan_id: str, update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Update a provider plan"""
-        response = (
+        response = await self._execute(
             self.client.table("provider_plans")
             .update(update_data)
             .eq("id", plan_id)
-            .execute()
         )
         return response.data[0] if response.data else None
 
     async def delete_provider_plan(self, plan_id: str) -> bool:
         """Delete a provider plan"""
-        self.client.table("provider_plans").delete().eq("id", plan_id).execute()
+        await self._execute(self.client.table("provider_plans").delete().eq("id", plan_id))
         return True
 
     # Canonical Workflow Operations
     
     async def get_tenant(self, tenant_id: str) -> Optional[Dict[str, Any]]:
         """Get tenant by ID"""
-        response = self.client.table("tenants").select("*").eq("id", tenant_id).single().execute()
+        response = await self._execute(self.client.table("tenants").select("*").eq("id", tenant_id).single())
         return response.data if response.data else None
     
     async def update_tenant_onboarding(
@@ -2812,7 +2947,10 @@ class DatabaseService:
         if not update_data:
             return None
         
-        response = self.client.table("tenants").update(update_data).eq("id", tenant_id).execute()
+        response = await self._execute(self.client.table("tenants").update(update_data).eq("id", tenant_id))
+        # Cached principals carry the tenant row; imported here to avoid a circular import
+        from app.services.auth_service import principal_cache
+        principal_cache.invalidate_tenant(tenant_id)
         return response.data[0] if response.data else None
     
     async def get_canonical_workflows(
@@ -2846,7 +2984,7 @@ class DatabaseService:
             offset = (page - 1) * page_size
             query = query.range(offset, offset + page_size - 1)
 
-        response = query.execute()
+        response = await self._execute(query)
         return response.data or []
 
     async def count_canonical_workflows(
@@ -2867,7 +3005,7 @@ class DatabaseService:
         query = self.client.table("canonical_workflows").select("id", count="exact").eq("tenant_id", tenant_id)
         if not include_deleted:
             query = query.is_("deleted_at", "null")
-        response = query.execute()
+        response = await self._execute(query)
         return response.count or 0
     
     async def get_workflow_mappings(
@@ -2885,9 +3023,104 @@ class DatabaseService:
             query = query.eq("canonical_id", canonical_id)
         if status:
             query = query.eq("status", status)
-        response = query.execute()
+        response = await self._execute(query)
         return response.data or []
-    
+
+    async def bulk_upsert_workflow_env_mappings(self, records: List[Dict[str, Any]], chunk_size: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Upsert workflow_env_map rows in chunks, keyed by (tenant_id, environment_id, n8n_workflow_id).
+
+        Returns {"rows": [...], "failed": [{"key": n8n_workflow_id, "error": str}]}
+        """
+        return await self._bulk_upsert(
+            "workflow_env_map",
+            records,
+            on_conflict="tenant_id,environment_id,n8n_workflow_id",
+            key_field="n8n_workflow_id",
+            chunk_size=chunk_size,
+        )
+
+    async def get_workflow_matrix_version(self, tenant_id: str) -> int:
+        """Latest workflow_matrix_versions entry for a tenant (0 if nothing has been recorded)."""
+        response = await self._execute(
+            self.client.table("workflow_matrix_versions")
+            .select("version")
+            .eq("tenant_id", tenant_id)
+            .order("version", desc=True)
+            .limit(1)
+        )
+        rows = response.data or []
+        return rows[0]["version"] if rows else 0
+
+    async def get_workflow_matrix_changes(self, tenant_id: str, since_version: int) -> List[Dict[str, Any]]:
+        """Canonical workflows whose matrix inputs changed after since_version, as {canonical_id, version} rows."""
+        response = await self._execute(
+            self.client.table("workflow_matrix_versions")
+            .select("canonical_id, version")
+            .eq("tenant_id", tenant_id)
+            .gt("version", since_version)
+        )
+        return response.data or []
+
+    async def get_workflow_matrix_inputs(
+        self,
+        tenant_id: str,
+        canonical_ids: Optional[List[str]] = None,
+        chunk_size: Optional[int] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Load the rows the workflow matrix is computed from, projected to the columns it reads.
+
+        Returns {"canonical_workflows": [...], "mappings": [...], "git_states": [...]} for the
+        whole tenant, or only for canonical_ids (queried in chunks) when given. Every
+        read is range-paged, so tenants past PostgREST's row cap are loaded in full.
+        """
+        chunk_size = chunk_size or settings.DB_BULK_CHUNK_SIZE
+        queries = {
+            "canonical_workflows": lambda: (
+                self.client.table("canonical_workflows")
+                .select("canonical_id, display_name, created_at")
+                .eq("tenant_id", tenant_id)
+                .is_("deleted_at", "null")
+            ),
+            "mappings": lambda: (
+                self.client.table("workflow_env_map")
+                .select("canonical_id, environment_id, status, env_content_hash, n8n_workflow_id, n8n_updated_at")
+                .eq("tenant_id", tenant_id)
+                .not_.is_("canonical_id", "null")
+            ),
+            "git_states": lambda: (
+                self.client.table("canonical_workflow_git_state")
+                .select("canonical_id, environment_id, git_content_hash, last_repo_sync_at")
+                .eq("tenant_id", tenant_id)
+            ),
+        }
+        # Stable orders, so range pages neither skip nor repeat rows
+        orders = {
+            "canonical_workflows": ("canonical_id",),
+            "mappings": ("id",),
+            "git_states": ("canonical_id", "environment_id"),
+        }
+
+        def ordered(name: str, build_query: Callable[[], Any], ids: Optional[List[str]] = None) -> Callable[[], Any]:
+            def build() -> Any:
+                query = build_query() if ids is None else build_query().in_("canonical_id", ids)
+                for column in orders[name]:
+                    query = query.order(column)
+                return query
+            return build
+
+        async def load(name: str, build_query: Callable[[], Any]) -> List[Dict[str, Any]]:
+            if canonical_ids is None:
+                return await self._select_all(ordered(name, build_query))
+            rows: List[Dict[str, Any]] = []
+            for i in range(0, len(canonical_ids), chunk_size):
+                rows.extend(await self._select_all(ordered(name, build_query, canonical_ids[i:i + chunk_size])))
+            return rows
+
+        results = await asyncio.gather(*(load(name, build_query) for name, build_query in queries.items()))
+        return dict(zip(queries, results))
+
     async def get_workflows_from_canonical(
         self,
         tenant_id: str,
@@ -2973,7 +3206,7 @@ class DatabaseService:
             offset = (page - 1) * limit
             query = query.range(offset, offset + limit - 1)
 
-        response = query.execute()
+        response = await self._execute(query)
         mappings = response.data or []
         total_count = response.count if hasattr(response, 'count') else len(mappings)
         
@@ -2981,12 +3214,11 @@ class DatabaseService:
         canonical_ids = [m.get("canonical_id") for m in mappings if m.get("canonical_id")]
         canonical_map = {}
         if canonical_ids:
-            canonical_response = (
+            canonical_response = await self._execute(
                 self.client.table("canonical_workflows")
                 .select("*")
                 .eq("tenant_id", tenant_id)
                 .in_("canonical_id", canonical_ids)
-                .execute()
             )
             for canonical in (canonical_response.data or []):
                 canonical_map[canonical.get("canonical_id")] = canonical
@@ -3067,13 +3299,17 @@ class DatabaseService:
         sort_field: str = "updatedAt",
         sort_direction: str = "desc",
         include_deleted: bool = False,
-        include_ignored: bool = False
+        include_ignored: bool = False,
+        cursor: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Get workflows with server-side pagination, filtering, and sorting.
 
-        This is the optimized replacement for client-side filtering in WorkflowsPage.
-        Uses database-level filtering to minimize payload size.
+        Filtering (including tags), sorting and paging all happen in the
+        database via get_workflow_list_page, which returns only the list-view
+        projection of each mapping, never the full workflow_data. Pass the
+        returned next_cursor to fetch the following page with a keyset seek;
+        without a cursor the page number is used as an offset.
 
         Args:
             tenant_id: Tenant ID
@@ -3081,12 +3317,13 @@ class DatabaseService:
             page: Page number (1-indexed)
             page_size: Items per page (max 100)
             search_query: Search in name/description
-            tag_filter: List of tag names to filter by
+            tag_filter: List of tag names to filter by (matches any)
             status_filter: 'active' or 'inactive'
             sort_field: Field to sort by
             sort_direction: 'asc' or 'desc'
             include_deleted: Include deleted workflows
             include_ignored: Include ignored workflows
+            cursor: next_cursor from the previous page (same sort)
 
         Returns:
             {
@@ -3094,120 +3331,77 @@ class DatabaseService:
                 "total": int,
                 "page": int,
                 "page_size": int,
-                "total_pages": int
+                "total_pages": int,
+                "next_cursor": Optional[str]
             }
+
+        Raises:
+            ValueError: If cursor is invalid or was issued for another sort
         """
         import math
-        import json
 
+        page = max(page, 1)
         page_size = min(page_size, 100)
+        if sort_field not in WORKFLOW_LIST_SORT_FIELDS:
+            sort_field = "updatedAt"
+        sort_direction = "desc" if sort_direction == "desc" else "asc"
+        after_value, after_id = _decode_list_cursor(cursor, sort_field, sort_direction) if cursor else (None, None)
 
-        # Optimized select - only fetch needed fields to reduce payload
-        select_fields = """
-            id,
-            tenant_id,
-            environment_id,
-            canonical_id,
-            n8n_workflow_id,
-            last_env_sync_at,
-            linked_at,
-            status,
-            workflow_data->>'name' as workflow_name,
-            workflow_data->>'description' as workflow_description,
-            workflow_data->>'active' as workflow_active,
-            workflow_data->'tags' as workflow_tags,
-            workflow_data->>'createdAt' as workflow_created_at,
-            workflow_data->>'updatedAt' as workflow_updated_at
-        """
-
-        # Build base query
-        query = (
-            self.client.table("workflow_env_map")
-            .select(select_fields, count="exact")
-            .eq("tenant_id", tenant_id)
-            .eq("environment_id", environment_id)
-        )
-
-        # Filter by status
-        status_conditions = []
+        excluded_statuses = ["missing"]
         if not include_deleted:
-            status_conditions.append("status.neq.deleted")
-        status_conditions.append("status.neq.missing")
+            excluded_statuses.append("deleted")
         if not include_ignored:
-            status_conditions.append("status.neq.ignored")
-        status_conditions.append("status.is.null")
-        if status_conditions:
-            query = query.or_(",".join(status_conditions))
-
-        # Only get workflows that exist in n8n
-        query = query.not_.is_("n8n_workflow_id", "null")
+            excluded_statuses.append("ignored")
+        is_active = None
+        if status_filter:
+            is_active = "true" if status_filter == "active" else "false"
+        tags = list(tag_filter) if tag_filter else None
 
-        # Server-side search filtering using ILIKE
-        if search_query:
-            search_lower = search_query.lower()
-            query = query.or_(
-                f"workflow_data->>name.ilike.%{search_lower}%,"
-                f"workflow_data->>description.ilike.%{search_lower}%"
+        try:
+            response = await self._execute(self.client.rpc("get_workflow_list_page", {
+                "p_tenant_id": tenant_id,
+                "p_environment_id": environment_id,
+                "p_page_size": page_size,
+                "p_sort_field": sort_field,
+                "p_sort_desc": sort_direction == "desc",
+                "p_after_value": after_value,
+                "p_after_id": after_id,
+                "p_offset": 0 if cursor else (page - 1) * page_size,
+                "p_search": search_query or None,
+                "p_tags": tags,
+                "p_active": is_active,
+                "p_excluded_statuses": excluded_statuses,
+                "p_include_total": True,
+            }))
+            mappings = response.data or []
+            total_count = int(mappings[0].get("total_count") or 0) if mappings else None
+        except Exception as rpc_error:
+            if cursor:
+                raise
+            logger.debug(f"RPC function not available, falling back to offset pagination: {rpc_error}")
+            mappings, total_count = await self._get_workflow_list_page_fallback(
+                tenant_id, environment_id, page, page_size, search_query, tags,
+                is_active, sort_field, sort_direction, excluded_statuses
             )
 
-        # Status filter (active/inactive)
-        if status_filter:
-            is_active = "true" if status_filter == "active" else "false"
-            query = query.eq("workflow_data->>active", is_active)
+        if total_count is None:
+            # Empty page: count without fetching rows (page past the end)
+            count_response = await self._execute(
+                self._workflow_list_query(
+                    tenant_id, environment_id, "id", search_query, tags, is_active, excluded_statuses
+                ).limit(1)
+            )
+            total_count = count_response.count or 0
 
-        # Note: Tag filtering with JSONB arrays is complex in PostgREST
-        # We'll do it client-side after fetching (less impactful than search)
-        
-        # Determine sort column
-        sort_column_map = {
-            "name": "workflow_data->>name",
-            "updatedAt": "workflow_data->>updatedAt",
-            "createdAt": "workflow_data->>createdAt",
-            "active": "workflow_data->>active"
-        }
-        sort_col = sort_column_map.get(sort_field, "workflow_data->>updatedAt")
-        
-        # Apply sorting and pagination
-        query = query.order(sort_col, desc=(sort_direction == "desc"))
-        
-        # Execute query to get total count first
-        count_response = query.execute()
-        all_mappings = count_response.data or []
-        
-        # Apply tag filter client-side if needed (before pagination)
-        if tag_filter and len(tag_filter) > 0:
-            def has_matching_tag(mapping):
-                tags = mapping.get("workflow_tags")
-                if not tags:
-                    return False
-                if isinstance(tags, str):
-                    try:
-                        tags = json.loads(tags)
-                    except:
-                        return False
-                for tag in tags:
-                    tag_name = tag.get("name") if isinstance(tag, dict) else tag
-                    if tag_name in tag_filter:
-                        return True
-                return False
-            all_mappings = [m for m in all_mappings if has_matching_tag(m)]
-
-        total_count = len(all_mappings)
-        
-        # Apply pagination
-        offset = (page - 1) * page_size
-        mappings = all_mappings[offset:offset + page_size]
-        
         # Get canonical workflows for display names (batch fetch)
         canonical_ids = [m.get("canonical_id") for m in mappings if m.get("canonical_id")]
         canonical_map = {}
         if canonical_ids:
-            canonical_response = (
+            canonical_response = await self._execute(
                 self.client.table("canonical_workflows")
                 .select("canonical_id, display_name")
                 .eq("tenant_id", tenant_id)
                 .in_("canonical_id", canonical_ids)
-                .execute()
             )
             for canonical in (canonical_response.data or []):
                 canonical_map[canonical.get("canonical_id")] = canonical
@@ -3246,14 +3440,96 @@ class DatabaseService:
 
         total_pages = math.ceil(total_count / page_size) if page_size > 0 else 0
 
+        next_cursor = None
+        if len(mappings) == page_size and page < total_pages and "sort_value" in mappings[-1]:
+            last = mappings[-1]
+            next_cursor = _encode_list_cursor(sort_field, sort_direction, last.get("sort_value"), last.get("id"))
+
         return {
             "workflows": workflows,
             "total": total_count,
             "page": page,
             "page_size": page_size,
-            "total_pages": total_pages
+            "total_pages": total_pages,
+            "next_cursor": next_cursor
         }
-    
+
+    def _workflow_list_query(
+        self,
+        tenant_id: str,
+        environment_id: str,
+        select_fields: str,
+        search_query: Optional[str],
+        tags: Optional[List[str]],
+        is_active: Optional[str],
+        excluded_statuses: List[str]
+    ) -> Any:
+        """PostgREST equivalent of the get_workflow_list_page filters, with an exact count."""
+        query = (
+            self.client.table("workflow_env_map")
+            .select(select_fields, count="exact")
+            .eq("tenant_id", tenant_id)
+            .eq("environment_id", environment_id)
+            .or_(f"status.is.null,status.not.in.({','.join(excluded_statuses)})")
+            .not_.is_("n8n_workflow_id", "null")
+        )
+        if search_query:
+            search_lower = search_query.lower()
+            query = query.or_(
+                f"workflow_data->>name.ilike.%{search_lower}%,"
+                f"workflow_data->>description.ilike.%{search_lower}%"
+            )
+        if is_active is not None:
+            query = query.eq("workflow_data->>active", is_active)
+        if tags:
+            # JSONB containment per tag name, for object tags and plain string tags
+            query = query.or_(",".join(
+                f"workflow_data->tags.cs.{json.dumps([candidate], separators=(',', ':'))}"
+                for tag in tags
+                for candidate in ({"name": tag}, tag)
+            ))
+        return query
+
+    async def _get_workflow_list_page_fallback(
+        self,
+        tenant_id: str,
+        environment_id: str,
+        page: int,
+        page_size: int,
+        search_query: Optional[str],
+        tags: Optional[List[str]],
+        is_active: Optional[str],
+        sort_field: str,
+        sort_direction: str,
+        excluded_statuses: List[str]
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Offset-paginated list page for databases without get_workflow_list_page."""
+        select_fields = """
+            id,
+            canonical_id,
+            n8n_workflow_id,
+            last_env_sync_at,
+            linked_at,
+            status,
+            workflow_data->>'name' as workflow_name,
+            workflow_data->>'description' as workflow_description,
+            workflow_data->>'active' as workflow_active,
+            workflow_data->'tags' as workflow_tags,
+            workflow_data->>'createdAt' as workflow_created_at,
+            workflow_data->>'updatedAt' as workflow_updated_at
+        """
+        offset = (page - 1) * page_size
+        query = (
+            self._workflow_list_query(
+                tenant_id, environment_id, select_fields, search_query, tags, is_active, excluded_statuses
+            )
+            .order(f"workflow_data->>{sort_field}", desc=(sort_direction == "desc"))
+            .order("id", desc=(sort_direction == "desc"))
+            .range(offset, offset + page_size - 1)
+        )
+        response = await self._execute(query)
+        return response.data or [], response.count or 0
+
     async def get_workflow_diff_states(
         self,
         tenant_id: str,
@@ -3269,8 +3545,41 @@ class DatabaseService:
             query = query.eq("target_env_id", target_env_id)
         if canonical_id:
             query = query.eq("canonical_id", canonical_id)
-        response = query.order("computed_at", desc=True).execute()
+        response = await self._execute(query.order("computed_at", desc=True))
         return response.data or []
+
+    async def bulk_upsert_workflow_diff_states(self, records: List[Dict[str, Any]], chunk_size: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Upsert computed workflow diff state rows in chunks.
+
+        Returns {"rows": [...], "failed": [{"key": canonical_id, "error": str}]}
+        """
+        return await self._bulk_upsert(
+            "workflow_diff_state",
+            records,
+            on_conflict="tenant_id,source_env_id,target_env_id,canonical_id",
+            key_field="canonical_id",
+            chunk_size=chunk_size,
+        )
+
+    async def delete_workflow_diff_states(
+        self,
+        tenant_id: str,
+        source_env_id: str,
+        target_env_id: str,
+        canonical_ids: List[str],
+        chunk_size: Optional[int] = None
+    ) -> None:
+        """Delete diff states of an environment pair for the given canonical workflows, in chunks."""
+        chunk_size = chunk_size or settings.DB_BULK_CHUNK_SIZE
+        for i in range(0, len(canonical_ids), chunk_size):
+            await self._execute(
+                self.client.table("workflow_diff_state").delete()
+                .eq("tenant_id", tenant_id)
+                .eq("source_env_id", source_env_id)
+                .eq("target_env_id", target_env_id)
+                .in_("canonical_id", canonical_ids[i:i + chunk_size])
+            )
     
     async def get_workflow_link_suggestions(
         self,
@@ -3284,7 +3593,7 @@ class DatabaseService:
             query = query.eq("environment_id", environment_id)
         if status:
             query = query.eq("status", status)
-        response = query.order("created_at", desc=True).execute()
+        response = await self._execute(query.order("created_at", desc=True))
         return response.data or []
     
     async def update_workflow_link_suggestion(
@@ -3300,12 +3609,11 @@ class DatabaseService:
             "resolved_at": datetime.utcnow().isoformat(),
             "resolved_by_user_id": resolved_by_user_id
         }
-        response = (
+        response = await self._execute(
             self.client.table("workflow_link_suggestions")
             .update(update_data)
             .eq("id", suggestion_id)
             .eq("tenant_id", tenant_id)
-            .execute()
         )
         return response.data[0] if response.data else None
     
@@ -3384,7 +3692,7 @@ class DatabaseService:
             "created_by_user_id": created_by_user_id,
             "created_at": now
         }
-        canonical_response = self.client.table("canonical_workflows").insert(canonical_data).execute()
+        canonical_response = await self._execute(self.client.table("canonical_workflows").insert(canonical_data))
         if not canonical_response.data:
             raise Exception("Failed to create canonical workflow")
 
@@ -3412,17 +3720,17 @@ class DatabaseService:
             mapping_data["n8n_updated_at"] = workflow_data.get("updatedAt")
 
         # Upsert the mapping
-        mapping_response = self.client.table("workflow_env_map").upsert(
+        mapping_response = await self._execute(self.client.table("workflow_env_map").upsert(
             mapping_data,
             on_conflict="tenant_id,environment_id,n8n_workflow_id"
-        ).execute()
+        ))
 
         if not mapping_response.data:
             # Rollback: delete the canonical workflow we just created
             try:
-                self.client.table("canonical_workflows").delete().eq(
+                await self._execute(self.client.table("canonical_workflows").delete().eq(
                     "tenant_id", tenant_id
-                ).eq("canonical_id", canonical_id).execute()
+                ).eq("canonical_id", canonical_id))
             except Exception:
                 pass
             raise Exception("Failed to create workflow mapping")
@@ -3458,7 +3766,7 @@ class DatabaseService:
             # Order by risk: errors in last 24h descending
             query = query.order("errors_24h", desc=True).limit(limit)
 
-            response = query.execute()
+            response = await self._execute(query)
             return response.data or []
 
         except Exception as e:
@@ -3476,11 +3784,10 @@ class DatabaseService:
         health metrics without expensive joins and subqueries.
         """
         try:
-            response = (
+            response = await self._execute(
                 self.client.table("environment_health_summary")
                 .select("*")
                 .eq("tenant_id", tenant_id)
-                .execute()
             )
             return response.data or []
 
@@ -3499,7 +3806,7 @@ class DatabaseService:
         """
         try:
             # Call the PostgreSQL function that refreshes all views
-            result = self.client.rpc("refresh_all_materialized_views").execute()
+            result = await self._execute(self.client.rpc("refresh_all_materialized_views"))
 
             logger.info(f"Materialized views refreshed successfully: {result.data}")
             return {
@@ -3522,7 +3829,7 @@ class DatabaseService:
         including whether the view is stale or has consecutive failures.
         """
         try:
-            result = self.client.rpc("get_materialized_view_refresh_status").execute()
+            result = await self._execute(self.client.rpc("get_materialized_view_refresh_status"))
             return result.data or []
 
         except Exception as e:
@@ -3554,7 +3861,7 @@ class DatabaseService:
             if view_name:
                 query = query.eq("view_name", view_name)
 
-            response = query.execute()
+            response = await self._execute(query)
             return response.data or []
 
         except Exception as e:
@@ -3568,7 +3875,7 @@ class DatabaseService:
         Returns the number of deleted records.
         """
         try:
-            result = self.client.rpc("cleanup_old_refresh_logs").execute()
+            result = await self._execute(self.client.rpc("cleanup_old_refresh_logs"))
             deleted_count = result.data if isinstance(result.data, int) else 0
             logger.info(f"Cleaned up {deleted_count} old refresh log entries")
             return deleted_count
@@ -3611,7 +3918,7 @@ class DatabaseService:
                 "p_workflow_id": workflow_id
             }
 
-            result = self.client.rpc("get_execution_rollups", params).execute()
+            result = await self._execute(self.client.rpc("get_execution_rollups", params))
             return result.data or []
 
         except Exception as e:
@@ -3642,7 +3949,7 @@ class DatabaseService:
                 "p_tenant_id": tenant_id
             }
 
-            result = self.client.rpc("compute_execution_rollup_for_date", params).execute()
+            result = await self._execute(self.client.rpc("compute_execution_rollup_for_date", params))
             rows_affected = result.data if isinstance(result.data, int) else 0
 
             logger.info(f"Computed rollup for {rollup_date}: {rows_affected} rows affected")
@@ -3658,7 +3965,7 @@ class DatabaseService:
 
     async def create_alert_rule(self, rule_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create an alert rule"""
-        response = self.client.table("alert_rules").insert(rule_data).execute()
+        response = await self._execute(self.client.table("alert_rules").insert(rule_data))
         return response.data[0] if response.data else None
 
     async def get_alert_rules(
@@ -3670,18 +3977,25 @@ class DatabaseService:
         query = self.client.table("alert_rules").select("*").eq("tenant_id", tenant_id)
         if not include_disabled:
             query = query.eq("is_enabled", True)
-        response = query.order("created_at", desc=True).execute()
+        response = await self._execute(query.order("created_at", desc=True))
         return response.data
 
+    async def get_enabled_alert_rules_for_all_tenants(self) -> List[Dict[str, Any]]:
+        """Get every enabled alert rule across tenants (for scheduled evaluation)"""
+        response = await self._execute(
+            self.client.table("alert_rules").select("*").eq("is_enabled", True).order("tenant_id")
+        )
+        return response.data or []
+
     async def get_alert_rule(
         self,
         rule_id: str,
         tenant_id: str
     ) -> Optional[Dict[str, Any]]:
         """Get a specific alert rule"""
-        response = self.client.table("alert_rules").select("*").eq(
+        response = await self._execute(self.client.table("alert_rules").select("*").eq(
             "id", rule_id
-        ).eq("tenant_id", tenant_id).single().execute()
+        ).eq("tenant_id", tenant_id).single())
         return response.data
 
     async def update_alert_rule(
@@ -3693,22 +4007,22 @@ class DatabaseService:
         """Update an alert rule"""
         from datetime import datetime
         rule_data["updated_at"] = datetime.utcnow().isoformat()
-        response = self.client.table("alert_rules").update(rule_data).eq(
+        response = await self._execute(self.client.table("alert_rules").update(rule_data).eq(
             "id", rule_id
-        ).eq("tenant_id", tenant_id).execute()
+        ).eq("tenant_id", tenant_id))
         return response.data[0] if response.data else None
 
     async def delete_alert_rule(self, rule_id: str, tenant_id: str) -> bool:
         """Delete an alert rule"""
-        self.client.table("alert_rules").delete().eq(
+        await self._execute(self.client.table("alert_rules").delete().eq(
             "id", rule_id
-        ).eq("tenant_id", tenant_id).execute()
+        ).eq("tenant_id", tenant_id))
         return True
 
     # Alert rule history operations
     async def create_alert_rule_history(self, history_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create an alert rule history entry"""
-        response = self.client.table("alert_rule_history").insert(history_data).execute()
+        response = await self._execute(self.client.table("alert_rule_history").insert(history_data))
         return response.data[0] if response.data else None
 
     async def get_alert_rule_history(
@@ -3720,17 +4034,17 @@ class DatabaseService:
     ) -> tuple[List[Dict[str, Any]], int]:
         """Get history for an alert rule with total count"""
         # Get count
-        count_response = self.client.table("alert_rule_history").select(
+        count_response = await self._execute(self.client.table("alert_rule_history").select(
             "id", count="exact"
-        ).eq("alert_rule_id", rule_id).eq("tenant_id", tenant_id).execute()
+        ).eq("alert_rule_id", rule_id).eq("tenant_id", tenant_id))
         total = count_response.count or 0
 
         # Get items
-        response = self.client.table("alert_rule_history").select("*").eq(
+        response = await self._execute(self.client.table("alert_rule_history").select("*").eq(
             "alert_rule_id", rule_id
         ).eq("tenant_id", tenant_id).order(
             "created_at", desc=True
-        ).range(offset, offset + limit - 1).execute()
+        ).range(offset, offset + limit - 1))
 
         return response.data, total
 
@@ -3749,7 +4063,7 @@ class DatabaseService:
                 "p_environment_id": environment_id,
                 "p_time_window_minutes": time_window_minutes
             }
-            response = self.client.rpc("evaluate_error_rate", params).execute()
+            response = await self._execute(self.client.rpc("evaluate_error_rate", params))
             if response.data and len(response.data) > 0:
                 row = response.data[0]
                 return {
@@ -3771,7 +4085,7 @@ class DatabaseService:
         if environment_id:
             query = query.eq("environment_id", environment_id)
 
-        response = query.execute()
+        response = await self._execute(query)
         executions = response.data or []
 
         total = len(executions)
@@ -3802,7 +4116,7 @@ class DatabaseService:
                 "p_since": since,
                 "p_until": datetime.utcnow().isoformat()
             }
-            response = self.client.rpc("get_error_intelligence", params).execute()
+            response = await self._execute(self.client.rpc("get_error_intelligence", params))
             if response.data:
                 return [
                     {
@@ -3841,7 +4155,7 @@ class DatabaseService:
         if workflow_ids and not any_workflow:
             query = query.in_("workflow_id", workflow_ids)
 
-        response = query.order("started_at", desc=True).limit(100).execute()
+        response = await self._execute(query.order("started_at", desc=True).limit(100))
         return response.data or []
 
     async def count_consecutive_failures(
@@ -3858,7 +4172,7 @@ class DatabaseService:
                 "p_workflow_id": workflow_id,
                 "p_environment_id": environment_id
             }
-            response = self.client.rpc("count_consecutive_failures", params).execute()
+            response = await self._execute(self.client.rpc("count_consecutive_failures", params))
             if response.data is not None:
                 return int(response.data)
         except Exception as e:
@@ -3872,7 +4186,7 @@ class DatabaseService:
         if environment_id:
             query = query.eq("environment_id", environment_id)
 
-        response = query.order("started_at", desc=True).limit(100).execute()
+        response = await self._execute(query.order("started_at", desc=True).limit(100))
 
         consecutive = 0
         for exec_data in response.data or []:
@@ -3900,7 +4214,7 @@ class DatabaseService:
         if environment_id:
             query = query.eq("environment_id", environment_id)
 
-        response = query.execute()
+        response = await self._execute(query)
         workflow_ids = list(set(e.get("workflow_id") for e in response.data or []))
 
         max_consecutive = 0
@@ -3917,6 +4231,37 @@ class DatabaseService:
             "workflow_id": failing_workflow
         }
 
+    async def get_alert_execution_window(
+        self,
+        tenant_id: str,
+        environment_id: Optional[str] = None,
+        time_window_minutes: int = 60,
+        duration_threshold_ms: Optional[int] = None,
+        include_streaks: bool = False,
+        streak_workflow_ids: Optional[List[str]] = None,
+        count_thresholds_ms: Optional[List[int]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get per-workflow execution aggregates for one alert evaluation window.
+
+        One row per workflow with executions in the window (plus any
+        streak_workflow_ids): execution and error counts, last error time,
+        durations above duration_threshold_ms (longest 100), uncapped counts
+        of durations above each of count_thresholds_ms and, when
+        include_streaks is set, the current consecutive-failure streak.
+        """
+        params = {
+            "p_tenant_id": tenant_id,
+            "p_environment_id": environment_id,
+            "p_time_window_minutes": time_window_minutes,
+            "p_duration_threshold_ms": duration_threshold_ms,
+            "p_include_streaks": include_streaks,
+            "p_streak_workflow_ids": streak_workflow_ids or None,
+            "p_count_thresholds_ms": count_thresholds_ms or None
+        }
+        response = await self._execute(self.client.rpc("get_alert_execution_window", params))
+        return response.data or []
+
     async def get_long_running_executions(
         self,
         tenant_id: str,
@@ -3938,7 +4283,7 @@ class DatabaseService:
         if workflow_ids:
             query = query.in_("workflow_id", workflow_ids)
 
-        response = query.execute()
+        response = await self._execute(query)
 
         # Filter by duration
         long_running = []
@@ -3997,7 +4342,7 @@ class DatabaseService:
             if environment_id:
                 params["p_environment_id"] = environment_id
 
-            response = self.client.rpc("get_sparkline_buckets", params).execute()
+            response = await self._execute(self.client.rpc("get_sparkline_buckets", params))
 
             if response.data:
                 # SQL aggregation succeeded
@@ -4035,7 +4380,7 @@ class DatabaseService:
                 query = query.eq("environment_id", environment_id)
 
             # Limit to 1 row since we only need the count
-            response = query.limit(1).execute()
+            response = await self._execute(query.limit(1))
             return response.count or 0
         except Exception as e:
             logger.warning(f"Failed to get execution count: {e}")
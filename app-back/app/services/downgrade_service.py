@@ -16,6 +16,7 @@ from datetime import datetime, timezone, timedelta
 from uuid import uuid4
 
 from app.services.database import db_service
+from app.services.auth_service import principal_cache
 from app.services.entitlements_service import entitlements_service
 from app.core.downgrade_policy import (
     ResourceType,
@@ -769,6 +770,7 @@ class DowngradeService:
                 "status": "inactive",
                 "updated_at": now.isoformat(),
             }).eq("id", member_id).eq("tenant_id", tenant_id).execute()
+            principal_cache.invalidate_user(member_id)
 
             logger.info(f"Disabled team member {member_id}")
             return bool(response.data)
@@ -779,6 +781,7 @@ class DowngradeService:
                 "status": "inactive",
                 "updated_at": now.isoformat(),
             }).eq("id", member_id).eq("tenant_id", tenant_id).execute()
+            principal_cache.invalidate_user(member_id)
 
             logger.info(f"Removed team member {member_id}")
             return bool(response.data)
@@ -945,6 +948,7 @@ class DowngradeService:
                 "status": "active",
                 "updated_at": now.isoformat(),
             }).eq("id", member_id).eq("tenant_id", tenant_id).execute()
+            principal_cache.invalidate_user(member_id)
 
             if response.data:
                 logger.info(
@@ -18,6 +18,29 @@ from app.services.diff_service import compare_workflows, DriftResult
 
 logger = logging.getLogger(__name__)
 
+# Bump when the shape of saved per-workflow drift results changes
+DRIFT_STATE_VERSION = 1
+
+
+def workflow_fingerprint(runtime_wf: Dict[str, Any]) -> Optional[str]:
+    """
+    Cheap change marker for a runtime workflow.
+
+    n8n bumps versionId and updatedAt on every save; active and name are
+    included because they appear in drift results. Returns None when the
+    provider reports neither, so the workflow is always fully compared.
+    """
+    version_id = runtime_wf.get("versionId")
+    updated_at = runtime_wf.get("updatedAt")
+    if not version_id and not updated_at:
+        return None
+    return "|".join([
+        str(version_id or ""),
+        str(updated_at or ""),
+        str(bool(runtime_wf.get("active", False))),
+        runtime_wf.get("name", ""),
+    ])
+
 
 class DriftStatus:
     """Drift status constants — Authoritative Environment State Reference.
@@ -126,15 +149,21 @@ class DriftDetectionService:
         self,
         tenant_id: str,
         environment_id: str,
-        update_status: bool = True
+        update_status: bool = True,
+        force_full: bool = False
     ) -> EnvironmentDriftSummary:
         """
         Detect drift for all workflows in an environment.
 
+        Runs incrementally: results saved by the previous check are reused for
+        workflows whose n8n versionId/updatedAt are unchanged while the Git
+        branch head is unchanged, so only changed workflows are re-diffed.
+
         Args:
             tenant_id: The tenant ID
             environment_id: The environment to check
             update_status: Whether to update the environment's drift_status in DB
+            force_full: Ignore saved results and compare every workflow
 
         Returns:
             EnvironmentDriftSummary with detailed drift information
@@ -299,8 +328,39 @@ class DriftDetectionService:
 
                 return summary
 
+            # P0 DELTA FIX: Get LINKED workflow mappings for this environment
+            # Only LINKED workflows participate in drift detection
+            linked_workflow_ids = await self._get_linked_workflow_ids(
+                tenant_id, environment_id
+            )
+            # If no mappings exist yet, treat all runtime workflows as candidates
+            # (backward compatibility for environments without mapping data)
+            has_mapping_data = linked_workflow_ids is not None
+            linked_set = set(linked_workflow_ids) if linked_workflow_ids else None
+
+            # Incremental mode: while the branch head is unchanged, LINKED workflows
+            # whose n8n fingerprint is unchanged keep their previous result, and Git
+            # is only read when at least one of them needs a full comparison
+            git_ref = f"{github_service.branch}:{env_type}"
+            git_head_sha = await self._get_git_head_sha(github_service)
+            drift_state = None if force_full else await self._load_drift_state(tenant_id, environment_id)
+            git_unchanged = bool(
+                git_head_sha
+                and drift_state
+                and drift_state.get("git_ref") == git_ref
+                and drift_state.get("git_head_sha") == git_head_sha
+            )
+            reusable_results = self._get_reusable_results(runtime_workflows, drift_state) if git_unchanged else {}
+            needs_git_fetch = not git_unchanged or any(
+                ((not has_mapping_data) or (wf.get("id", "") in linked_set))
+                and wf.get("id", "") not in reusable_results
+                for wf in runtime_workflows
+            )
+
+            git_workflows_map: Dict[str, Dict[str, Any]] = {}
             try:
-                git_workflows_map = await github_service.get_all_workflows_from_github(environment_type=env_type)
+                if needs_git_fetch:
+                    git_workflows_map = await github_service.get_all_workflows_from_github(environment_type=env_type)
             except GithubException as e:
                 # P1 FIX: Distinguish GIT_UNAVAILABLE from generic ERROR
                 is_unavailable = e.status in (403, 404, 401)
@@ -354,16 +414,10 @@ class DriftDetectionService:
                 name = gw.get("name", "")
                 if name:
                     git_by_name[name] = gw
-
-            # P0 DELTA FIX: Get LINKED workflow mappings for this environment
-            # Only LINKED workflows participate in drift detection
-            linked_workflow_ids = await self._get_linked_workflow_ids(
-                tenant_id, environment_id
-            )
-            # If no mappings exist yet, treat all runtime workflows as candidates
-            # (backward compatibility for environments without mapping data)
-            has_mapping_data = linked_workflow_ids is not None
-            linked_set = set(linked_workflow_ids) if linked_workflow_ids else None
+            if needs_git_fetch:
+                git_paths = {name: gw.get("path", "") for name, gw in git_by_name.items()}
+            else:
+                git_paths = drift_state.get("git_workflows") or {}
 
             # Compare each runtime workflow
             affected_workflows = []
@@ -371,6 +425,8 @@ class DriftDetectionService:
             in_sync_count = 0
             with_drift_count = 0
             not_in_git_count = 0  # Only counts LINKED workflows not in Git
+            workflow_results: Dict[str, Dict[str, Any]] = {}
+            compared_count = 0
 
             for runtime_wf in runtime_workflows:
                 wf_name = runtime_wf.get("name", "")
@@ -381,8 +437,6 @@ class DriftDetectionService:
                 # If has_mapping_data is True but workflow not in linked_set, it's UNMAPPED
                 is_linked = (not has_mapping_data) or (wf_id in linked_set)
 
-                git_entry = git_by_name.get(wf_name)
-
                 if not is_linked:
                     # UNMAPPED workflow - track separately, does NOT influence drift
                     unmanaged_workflows.append({
@@ -390,59 +444,38 @@ class DriftDetectionService:
                         "name": wf_name,
                         "active": active,
                         "hasDrift": False,
-                        "notInGit": git_entry is None,
+                        "notInGit": wf_name not in git_paths,
                         "driftType": "unmapped",
                         "mappingStatus": "unmapped"
                     })
                     continue  # Skip drift calculation for unmapped workflows
 
                 # LINKED workflow - participates in drift detection
-                if git_entry is None:
+                if wf_id in reusable_results:
+                    entry = reusable_results[wf_id]["result"]
+                else:
+                    entry = self._compare_linked_workflow(runtime_wf, git_by_name.get(wf_name))
+                    compared_count += 1
+
+                fingerprint = workflow_fingerprint(runtime_wf)
+                if fingerprint and wf_id:
+                    workflow_results[wf_id] = {"fingerprint": fingerprint, "result": entry}
+
+                if entry is None:
+                    in_sync_count += 1
+                elif entry.get("notInGit"):
                     # LINKED but not in Git - this is drift (added locally)
                     not_in_git_count += 1
-                    affected_workflows.append({
-                        "id": wf_id,
-                        "name": wf_name,
-                        "active": active,
-                        "hasDrift": False,
-                        "notInGit": True,
-                        "driftType": "added_in_runtime",
-                        "mappingStatus": "linked"
-                    })
+                    affected_workflows.append(entry)
                 else:
-                    # Compare workflows
-                    drift_result = compare_workflows(
-                        git_workflow=git_entry,
-                        runtime_workflow=runtime_wf
-                    )
-
-                    if drift_result.has_drift:
-                        with_drift_count += 1
-                        affected_workflows.append({
-                            "id": wf_id,
-                            "name": wf_name,
-                            "active": active,
-                            "hasDrift": True,
-                            "notInGit": False,
-                            "driftType": "modified",
-                            "mappingStatus": "linked",
-                            "summary": {
-                                "nodesAdded": drift_result.summary.nodes_added,
-                                "nodesRemoved": drift_result.summary.nodes_removed,
-                                "nodesModified": drift_result.summary.nodes_modified,
-                                "connectionsChanged": drift_result.summary.connections_changed,
-                                "settingsChanged": drift_result.summary.settings_changed
-                            },
-                            "differenceCount": len(drift_result.differences)
-                        })
-                    else:
-                        in_sync_count += 1
+                    with_drift_count += 1
+                    affected_workflows.append(entry)
 
             # P0 FIX: Detect LINKED workflows in Git but missing from n8n runtime
             # This catches workflows that were deployed but later deleted from n8n
             runtime_names = {wf.get("name", "") for wf in runtime_workflows}
             missing_from_runtime_count = 0
-            for git_name, git_wf in git_by_name.items():
+            for git_name, git_path in git_paths.items():
                 if git_name and git_name not in runtime_names:
                     # Workflow exists in Git baseline but not in n8n runtime
                     missing_from_runtime_count += 1
@@ -454,9 +487,18 @@ class DriftDetectionService:
                         "notInGit": False,
                         "driftType": "missing_from_runtime",
                         "mappingStatus": "linked",  # If in Git baseline, it was managed
-                        "gitPath": git_wf.get("path", "")
+                        "gitPath": git_path
                     })
 
+            logger.debug(
+                f"Drift check for environment {environment_id}: compared {compared_count}, "
+                f"reused {len(reusable_results)}, git fetched={needs_git_fetch}"
+            )
+            if needs_git_fetch or compared_count or workflow_results.keys() != reusable_results.keys():
+                await self._save_drift_state(
+                    tenant_id, environment_id, git_ref, git_head_sha, git_paths, workflow_results
+                )
+
             # Determine overall status based on drift detection
             # (NEW environments are already short-circuited above)
 
@@ -598,6 +640,126 @@ class DriftDetectionService:
             # On error, return None to allow drift detection to proceed
             return None
 
+    def _compare_linked_workflow(
+        self,
+        runtime_wf: Dict[str, Any],
+        git_entry: Optional[Dict[str, Any]],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Fully compare a LINKED runtime workflow against its Git version.
+
+        Returns:
+            The affected-workflow entry, or None if the workflow is in sync
+        """
+        wf_id = runtime_wf.get("id", "")
+        wf_name = runtime_wf.get("name", "")
+        active = runtime_wf.get("active", False)
+
+        if git_entry is None:
+            return {
+                "id": wf_id,
+                "name": wf_name,
+                "active": active,
+                "hasDrift": False,
+                "notInGit": True,
+                "driftType": "added_in_runtime",
+                "mappingStatus": "linked"
+            }
+
+        drift_result = compare_workflows(
+            git_workflow=git_entry,
+            runtime_workflow=runtime_wf
+        )
+        if not drift_result.has_drift:
+            return None
+
+        return {
+            "id": wf_id,
+            "name": wf_name,
+            "active": active,
+            "hasDrift": True,
+            "notInGit": False,
+            "driftType": "modified",
+            "mappingStatus": "linked",
+            "summary": {
+                "nodesAdded": drift_result.summary.nodes_added,
+                "nodesRemoved": drift_result.summary.nodes_removed,
+                "nodesModified": drift_result.summary.nodes_modified,
+                "connectionsChanged": drift_result.summary.connections_changed,
+                "settingsChanged": drift_result.summary.settings_changed
+            },
+            "differenceCount": len(drift_result.differences)
+        }
+
+    async def _get_git_head_sha(self, github_service: GitHubService) -> Optional[str]:
+        """Get the branch head commit SHA, or None to force a full Git comparison."""
+        try:
+            return await github_service.get_branch_head_sha()
+        except Exception as e:
+            logger.warning(f"Failed to resolve Git branch head: {e}")
+            return None
+
+    async def _load_drift_state(
+        self,
+        tenant_id: str,
+        environment_id: str,
+    ) -> Optional[Dict[str, Any]]:
+        """Load the fingerprints and results saved by the previous drift check."""
+        try:
+            result = db_service.client.table("environment_drift_state").select(
+                "*"
+            ).eq("tenant_id", tenant_id).eq(
+                "environment_id", environment_id
+            ).limit(1).execute()
+        except Exception as e:
+            logger.warning(f"Failed to load drift state for {environment_id}: {e}")
+            return None
+
+        rows = result.data or []
+        if not rows or rows[0].get("state_version") != DRIFT_STATE_VERSION:
+            return None
+        return rows[0]
+
+    def _get_reusable_results(
+        self,
+        runtime_workflows: List[Dict[str, Any]],
+        drift_state: Optional[Dict[str, Any]],
+    ) -> Dict[str, Dict[str, Any]]:
+        """Saved per-workflow results whose runtime fingerprint still matches."""
+        saved = (drift_state or {}).get("workflow_results") or {}
+        reusable = {}
+        for runtime_wf in runtime_workflows:
+            wf_id = runtime_wf.get("id", "")
+            previous = saved.get(wf_id)
+            fingerprint = workflow_fingerprint(runtime_wf)
+            if previous and fingerprint and previous.get("fingerprint") == fingerprint:
+                reusable[wf_id] = previous
+        return reusable
+
+    async def _save_drift_state(
+        self,
+        tenant_id: str,
+        environment_id: str,
+        git_ref: str,
+        git_head_sha: Optional[str],
+        git_workflows: Dict[str, str],
+        workflow_results: Dict[str, Dict[str, Any]],
+    ) -> None:
+        """Persist fingerprints and results for the next incremental check."""
+        try:
+            db_service.client.table("environment_drift_state").upsert({
+                "environment_id": environment_id,
+                "tenant_id": tenant_id,
+                "state_version": DRIFT_STATE_VERSION,
+                "git_ref": git_ref,
+                "git_head_sha": git_head_sha,
+                "git_workflows": git_workflows,
+                "workflow_results": workflow_results,
+                "checked_at": datetime.utcnow().isoformat(),
+            }, on_conflict="environment_id").execute()
+        except Exception as e:
+            logger.warning(f"Failed to save drift state for {environment_id}: {e}")
+
     async def _update_environment_drift_status(
         self,
         tenant_id: str,
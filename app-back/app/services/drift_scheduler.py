@@ -3,8 +3,10 @@ Drift Detection Scheduler Service
 
 Periodically runs drift detection for environments with Git configured,
 checks for TTL expirations, and handles automated incident creation.
+
+Jobs run on the shared scheduler runtime, so each environment is checked by
+one worker per interval regardless of how many API workers are running.
 """
-import asyncio
 import logging
 from datetime import datetime, timezone, timedelta
 from typing import Optional, Dict, Any, List
@@ -13,16 +15,14 @@ from app.services.database import db_service
 from app.services.drift_detection_service import drift_detection_service, DriftStatus
 from app.services.feature_service import feature_service
 from app.services.notification_service import notification_service
+from app.services.scheduler_runtime import ScheduledJob, ShardContext, scheduler_runtime
 
 logger = logging.getLogger(__name__)
 
-# Global flags to control schedulers
-_drift_scheduler_running = False
-_drift_scheduler_task: Optional[asyncio.Task] = None
-_ttl_checker_running = False
-_ttl_checker_task: Optional[asyncio.Task] = None
-_retention_cleanup_running = False
-_retention_cleanup_task: Optional[asyncio.Task] = None
+# Scheduler job names
+DRIFT_DETECTION_JOB = "drift_detection"
+TTL_CHECK_JOB = "drift_ttl_check"
+RETENTION_CLEANUP_JOB = "drift_retention_cleanup"
 
 # Configuration
 DRIFT_CHECK_INTERVAL_SECONDS = 300  # 5 minutes
@@ -30,10 +30,11 @@ TTL_CHECK_INTERVAL_SECONDS = 60  # 1 minute
 RETENTION_CLEANUP_INTERVAL_SECONDS = 86400  # 24 hours (daily)
 
 
-async def _get_environments_for_drift_check() -> List[Dict[str, Any]]:
+async def _get_environments_for_drift_check(ctx: Optional[ShardContext] = None) -> List[Dict[str, Any]]:
     """
     Get all non-DEV environments that have Git configured and belong to tenants
-    with drift detection enabled.
+    with drift detection enabled. With a ShardContext, only environments in the
+    caller's shards are returned.
 
     DEV environments are excluded because n8n is the source of truth for DEV,
     so there's no concept of "drift" - changes in n8n ARE the canonical state.
@@ -55,6 +56,8 @@ async def _get_environments_for_drift_check() -> List[Dict[str, Any]]:
             tenant_id = env.get("tenant_id")
             if not tenant_id:
                 continue
+            if ctx is not None and not ctx.owns(env.get("id")):
+                continue
 
             can_use, _ = await feature_service.can_use_feature(tenant_id, "drift_detection")
             if can_use:
@@ -67,53 +70,46 @@ async def _get_environments_for_drift_check() -> List[Dict[str, Any]]:
         return []
 
 
-async def _process_drift_detection():
+async def _run_drift_detection(ctx: ShardContext) -> int:
     """
-    Periodically run drift detection for all eligible environments.
+    Run drift detection for the eligible environments in this worker's shards.
     Runs every 5 minutes.
     """
-    global _drift_scheduler_running
-
-    while _drift_scheduler_running:
-        try:
-            logger.debug("Running scheduled drift detection...")
+    logger.debug("Running scheduled drift detection...")
 
-            environments = await _get_environments_for_drift_check()
+    environments = await _get_environments_for_drift_check(ctx)
 
-            if environments:
-                logger.info(f"Checking drift for {len(environments)} environment(s)")
+    if environments:
+        logger.info(f"Checking drift for {len(environments)} environment(s)")
 
-            for env in environments:
-                env_id = env.get("id")
-                tenant_id = env.get("tenant_id")
-                env_name = env.get("n8n_name", "Unknown")
+    return await ctx.run_each(environments, _check_environment_drift)
 
-                try:
-                    # Run drift detection
-                    summary = await drift_detection_service.detect_drift(
-                        tenant_id=tenant_id,
-                        environment_id=env_id,
-                        update_status=True
-                    )
 
-                    # Check if drift was detected and auto-incident creation is enabled
-                    if summary.with_drift > 0 or summary.not_in_git > 0:
-                        await _handle_drift_detected(
-                            tenant_id=tenant_id,
-                            environment_id=env_id,
-                            environment_name=env_name,
-                            summary=summary.to_dict()
-                        )
+async def _check_environment_drift(env: Dict[str, Any]) -> None:
+    """Run drift detection for one environment and handle any drift found."""
+    env_id = env.get("id")
+    tenant_id = env.get("tenant_id")
+    env_name = env.get("n8n_name", "Unknown")
 
-                except Exception as e:
-                    logger.error(f"Drift detection failed for environment {env_id}: {e}")
+    try:
+        # Run drift detection
+        summary = await drift_detection_service.detect_drift(
+            tenant_id=tenant_id,
+            environment_id=env_id,
+            update_status=True
+        )
 
-            # Wait before next check
-            await asyncio.sleep(DRIFT_CHECK_INTERVAL_SECONDS)
+        # Check if drift was detected and auto-incident creation is enabled
+        if summary.with_drift > 0 or summary.not_in_git > 0:
+            await _handle_drift_detected(
+                tenant_id=tenant_id,
+                environment_id=env_id,
+                environment_name=env_name,
+                summary=summary.to_dict()
+            )
 
-        except Exception as e:
-            logger.error(f"Error in drift scheduler: {e}", exc_info=True)
-            await asyncio.sleep(DRIFT_CHECK_INTERVAL_SECONDS)
+    except Exception as e:
+        logger.error(f"Drift detection failed for environment {env_id}: {e}")
 
 
 async def _handle_drift_detected(
@@ -316,68 +312,57 @@ async def _create_drift_incident(
         logger.error(f"Failed to create drift incident: {e}")
 
 
-async def _process_ttl_checks():
+async def _run_ttl_checks(ctx: ShardContext) -> int:
     """
-    Periodically check for TTL expirations and warnings.
+    Check for TTL expirations and warnings.
     Runs every minute.
     """
-    global _ttl_checker_running
+    logger.debug("Running TTL expiration check...")
 
-    while _ttl_checker_running:
-        try:
-            logger.debug("Running TTL expiration check...")
-
-            now = datetime.now(timezone.utc)
-            now_iso = now.isoformat()
-
-            # Get all active incidents with TTL that haven't expired yet
-            response = db_service.client.table("drift_incidents").select(
-                "id, tenant_id, environment_id, severity, expires_at, status"
-            ).in_(
-                "status", ["detected", "acknowledged", "stabilized"]
-            ).not_.is_("expires_at", "null").execute()
+    now = datetime.now(timezone.utc)
 
-            incidents = response.data or []
+    # Get all active incidents with TTL that haven't expired yet
+    response = db_service.client.table("drift_incidents").select(
+        "id, tenant_id, environment_id, severity, expires_at, status"
+    ).in_(
+        "status", ["detected", "acknowledged", "stabilized"]
+    ).not_.is_("expires_at", "null").execute()
 
-            for incident in incidents:
-                incident_id = incident.get("id")
-                tenant_id = incident.get("tenant_id")
-                environment_id = incident.get("environment_id")
-                expires_at_str = incident.get("expires_at")
+    incidents = response.data or []
 
-                if not expires_at_str:
-                    continue
-
-                try:
-                    expires_at = datetime.fromisoformat(
-                        expires_at_str.replace('Z', '+00:00')
-                    )
-                    if expires_at.tzinfo is None:
-                        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    for incident in incidents:
+        incident_id = incident.get("id")
+        tenant_id = incident.get("tenant_id")
+        expires_at_str = incident.get("expires_at")
 
-                    # Check if expired
-                    if now >= expires_at:
-                        await _handle_ttl_expired(incident)
-                        continue
+        if not expires_at_str:
+            continue
 
-                    # Check for warning
-                    policy = await _get_drift_policy(tenant_id)
-                    if policy and policy.get("notify_on_expiration_warning", True):
-                        warning_hours = policy.get("expiration_warning_hours", 24)
-                        warning_time = expires_at - timedelta(hours=warning_hours)
+        try:
+            expires_at = datetime.fromisoformat(
+                expires_at_str.replace('Z', '+00:00')
+            )
+            if expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
 
-                        if now >= warning_time:
-                            await _send_expiration_warning(incident, policy)
+            # Check if expired
+            if now >= expires_at:
+                await _handle_ttl_expired(incident)
+                continue
 
-                except Exception as e:
-                    logger.error(f"TTL check failed for incident {incident_id}: {e}")
+            # Check for warning
+            policy = await _get_drift_policy(tenant_id)
+            if policy and policy.get("notify_on_expiration_warning", True):
+                warning_hours = policy.get("expiration_warning_hours", 24)
+                warning_time = expires_at - timedelta(hours=warning_hours)
 
-            # Wait before next check
-            await asyncio.sleep(TTL_CHECK_INTERVAL_SECONDS)
+                if now >= warning_time:
+                    await _send_expiration_warning(incident, policy)
 
         except Exception as e:
-            logger.error(f"Error in TTL checker: {e}", exc_info=True)
-            await asyncio.sleep(TTL_CHECK_INTERVAL_SECONDS)
+            logger.error(f"TTL check failed for incident {incident_id}: {e}")
+
+    return len(incidents)
 
 
 async def _handle_ttl_expired(incident: Dict[str, Any]) -> None:
@@ -464,122 +449,65 @@ async def _send_expiration_warning(
 
 
 async def start_drift_scheduler():
-    """Start the drift detection scheduler background task."""
-    global _drift_scheduler_running, _drift_scheduler_task
-
-    if _drift_scheduler_running:
-        logger.warning("Drift scheduler is already running")
-        return
-
-    _drift_scheduler_running = True
-    _drift_scheduler_task = asyncio.create_task(_process_drift_detection())
-    logger.info("Drift detection scheduler started")
+    """Start the drift detection scheduler job."""
+    scheduler_runtime.start_job(ScheduledJob(
+        name=DRIFT_DETECTION_JOB,
+        interval_seconds=DRIFT_CHECK_INTERVAL_SECONDS,
+        run=_run_drift_detection,
+        sharded=True,
+    ))
 
 
 async def stop_drift_scheduler():
-    """Stop the drift detection scheduler background task."""
-    global _drift_scheduler_running, _drift_scheduler_task
-
-    if not _drift_scheduler_running:
-        return
-
-    _drift_scheduler_running = False
-    if _drift_scheduler_task:
-        _drift_scheduler_task.cancel()
-        try:
-            await _drift_scheduler_task
-        except asyncio.CancelledError:
-            pass
-    logger.info("Drift detection scheduler stopped")
+    """Stop the drift detection scheduler job."""
+    await scheduler_runtime.stop_job(DRIFT_DETECTION_JOB)
 
 
 async def start_ttl_checker():
-    """Start the TTL checker background task."""
-    global _ttl_checker_running, _ttl_checker_task
-
-    if _ttl_checker_running:
-        logger.warning("TTL checker is already running")
-        return
-
-    _ttl_checker_running = True
-    _ttl_checker_task = asyncio.create_task(_process_ttl_checks())
-    logger.info("TTL expiration checker started")
+    """Start the TTL checker job."""
+    scheduler_runtime.start_job(ScheduledJob(
+        name=TTL_CHECK_JOB,
+        interval_seconds=TTL_CHECK_INTERVAL_SECONDS,
+        run=_run_ttl_checks,
+    ))
 
 
 async def stop_ttl_checker():
-    """Stop the TTL checker background task."""
-    global _ttl_checker_running, _ttl_checker_task
+    """Stop the TTL checker job."""
+    await scheduler_runtime.stop_job(TTL_CHECK_JOB)
 
-    if not _ttl_checker_running:
-        return
 
-    _ttl_checker_running = False
-    if _ttl_checker_task:
-        _ttl_checker_task.cancel()
-        try:
-            await _ttl_checker_task
-        except asyncio.CancelledError:
-            pass
-    logger.info("TTL expiration checker stopped")
-
-
-async def _process_retention_cleanup():
+async def _run_retention_cleanup(ctx: ShardContext) -> int:
     """
-    Periodically run retention cleanup for all tenants.
+    Run retention cleanup for all tenants.
     Runs daily.
     """
-    global _retention_cleanup_running
-
-    while _retention_cleanup_running:
-        try:
-            logger.debug("Running retention cleanup...")
-            from app.services.drift_retention_service import drift_retention_service
+    logger.debug("Running retention cleanup...")
+    from app.services.drift_retention_service import drift_retention_service
 
-            results = await drift_retention_service.cleanup_all_tenants()
+    results = await drift_retention_service.cleanup_all_tenants()
 
-            if results.get("tenants_with_deletions", 0) > 0:
-                logger.info(
-                    f"Retention cleanup completed: {results['closed_incidents_deleted']} incidents, "
-                    f"{results['reconciliation_artifacts_deleted']} artifacts, "
-                    f"{results['approvals_deleted']} approvals deleted"
-                )
-
-            # Wait before next check (daily)
-            await asyncio.sleep(RETENTION_CLEANUP_INTERVAL_SECONDS)
-
-        except Exception as e:
-            logger.error(f"Error in retention cleanup scheduler: {e}", exc_info=True)
-            await asyncio.sleep(RETENTION_CLEANUP_INTERVAL_SECONDS)
+    if results.get("tenants_with_deletions", 0) > 0:
+        logger.info(
+            f"Retention cleanup completed: {results['closed_incidents_deleted']} incidents, "
+            f"{results['reconciliation_artifacts_deleted']} artifacts, "
+            f"{results['approvals_deleted']} approvals deleted"
+        )
+    return results.get("tenants_with_deletions", 0)
 
 
 async def start_retention_cleanup():
-    """Start the retention cleanup scheduler background task."""
-    global _retention_cleanup_running, _retention_cleanup_task
-
-    if _retention_cleanup_running:
-        logger.warning("Retention cleanup scheduler is already running")
-        return
-
-    _retention_cleanup_running = True
-    _retention_cleanup_task = asyncio.create_task(_process_retention_cleanup())
-    logger.info("Retention cleanup scheduler started")
+    """Start the retention cleanup scheduler job."""
+    scheduler_runtime.start_job(ScheduledJob(
+        name=RETENTION_CLEANUP_JOB,
+        interval_seconds=RETENTION_CLEANUP_INTERVAL_SECONDS,
+        run=_run_retention_cleanup,
+    ))
 
 
 async def stop_retention_cleanup():
-    """Stop the retention cleanup scheduler background task."""
-    global _retention_cleanup_running, _retention_cleanup_task
-
-    if not _retention_cleanup_running:
-        return
-
-    _retention_cleanup_running = False
-    if _retention_cleanup_task:
-        _retention_cleanup_task.cancel()
-        try:
-            await _retention_cleanup_task
-        except asyncio.CancelledError:
-            pass
-    logger.info("Retention cleanup scheduler stopped")
+    """Stop the retention cleanup scheduler job."""
+    await scheduler_runtime.stop_job(RETENTION_CLEANUP_JOB)
 
 
 async def start_all_drift_schedulers():
@@ -7,10 +7,13 @@ from typing import Any, Dict, List, Optional, Tuple, Union
 from fastapi import HTTPException, status
 from datetime import datetime, timezone
 import logging
+import time
 
+from app.core.config import settings
 from app.services.database import db_service
-from app.services.plan_resolver import resolve_effective_plan
+from app.services.plan_resolver import resolve_effective_plan, clear_plan_precedence_cache
 from app.services.audit_service import audit_service
+from app.services.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -67,14 +70,16 @@ PLAN_ENVIRONMENT_LIMITS = {
 }
 
 # Cache for feature requirements
-_feature_requirements_cache: Dict[str, Optional[str]] = {}
+_feature_requirements_cache = TTLCache(max_entries=1024, ttl_seconds=settings.PLAN_METADATA_CACHE_TTL_SECONDS)
+_NOT_CACHED = object()
 
 
 async def _get_feature_required_plan(feature_name: str) -> Optional[str]:
     """Get required plan for a feature from database."""
-    # Check cache first
-    if feature_name in _feature_requirements_cache:
-        return _feature_requirements_cache[feature_name]
+    # Check cache first (None is a valid cached value)
+    cached = _feature_requirements_cache.get(feature_name, _NOT_CACHED)
+    if cached is not _NOT_CACHED:
+        return cached
     
     # Fetch from database
     try:
@@ -84,13 +89,13 @@ async def _get_feature_required_plan(feature_name: str) -> Optional[str]:
         
         if response.data:
             required_plan = response.data.get("required_plan")
-            _feature_requirements_cache[feature_name] = required_plan
+            _feature_requirements_cache.set(feature_name, required_plan)
             return required_plan
     except Exception:
         pass
     
     # Not found in database, return None
-    _feature_requirements_cache[feature_name] = None
+    _feature_requirements_cache.set(feature_name, None)
     return None
 
 
@@ -102,13 +107,24 @@ class EntitlementsService:
     effective entitlements with has_flag() and get_limit() methods.
     """
 
-    # Cache for tenant entitlements (keyed by tenant_id:version)
-    _cache: Dict[str, Dict[str, Any]] = {}
+    # Cache for tenant entitlements, keyed by tenant_id. Each entry holds the
+    # tenant_plans.entitlements_version it was built from and when that version
+    # was last confirmed, so hot tenants are served without touching the DB.
+    _cache = TTLCache(
+        max_entries=settings.ENTITLEMENTS_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.ENTITLEMENTS_CACHE_TTL_SECONDS,
+    )
 
     async def get_tenant_entitlements(self, tenant_id: str) -> Dict[str, Any]:
         """
         Load and return effective entitlements for a tenant.
-        Uses entitlements_version for cache invalidation.
+
+        Cached entries are served as-is for ENTITLEMENTS_VERSION_CHECK_SECONDS,
+        then revalidated with a single entitlements_version lookup; a version
+        bump (or clear_cache) forces a rebuild. Database triggers bump the
+        version on plan, provider subscription and feature override writes.
+        Tenants without an active tenant_plans row have no version to check,
+        so their entries are rebuilt at every check instead.
 
         Returns:
             {
@@ -124,6 +140,16 @@ class EntitlementsService:
             }
         """
         try:
+            # Check cache
+            entry = self._cache.get(tenant_id)
+            if entry is not None and time.monotonic() - entry["verified_at"] <= settings.ENTITLEMENTS_VERSION_CHECK_SECONDS:
+                return entry["result"]
+
+            version = await self._get_entitlements_version(tenant_id)
+            if entry is not None and (version is None or (version and version == entry["version"])):
+                entry["verified_at"] = time.monotonic()
+                return entry["result"]
+
             # Get tenant's current plan assignment
             tenant_plan = await self._get_tenant_plan(tenant_id)
 
@@ -131,11 +157,6 @@ class EntitlementsService:
                 # Fallback to free plan defaults
                 return await self._get_free_plan_defaults()
 
-            # Check cache
-            cache_key = f"{tenant_id}:{tenant_plan.get('entitlements_version', 1)}"
-            if cache_key in self._cache:
-                return self._cache[cache_key]
-
             # Load plan features
             plan_id = tenant_plan.get("plan_id")
             plan_name = tenant_plan.get("plan_name")
@@ -191,13 +212,17 @@ class EntitlementsService:
             result = {
                 "plan_id": plan_id,
                 "plan_name": plan_name,
-                "entitlements_version": tenant_plan.get("entitlements_version", 1),
+                "entitlements_version": version or tenant_plan.get("entitlements_version", 1),
                 "features": features,
                 "overrides_applied": overrides_applied  # Track which features were overridden
             }
 
             # Cache result
-            self._cache[cache_key] = result
+            self._cache.set(tenant_id, {
+                "result": result,
+                "version": version,
+                "verified_at": time.monotonic(),
+            })
 
             return result
 
@@ -556,6 +581,29 @@ class EntitlementsService:
             logger.error(traceback.format_exc())
             return None
 
+    async def _get_entitlements_version(self, tenant_id: str) -> Optional[int]:
+        """
+        Get the entitlements_version of the tenant's active tenant_plans row.
+
+        Returns 0 when the tenant has no active row and None when the lookup
+        fails, in which case cached entitlements are kept until they expire.
+        """
+        try:
+            response = (
+                db_service.client.table("tenant_plans")
+                .select("entitlements_version")
+                .eq("tenant_id", tenant_id)
+                .eq("is_active", True)
+                .order("entitlements_version", desc=True)
+                .limit(1)
+                .execute()
+            )
+            rows = response.data or []
+            return int(rows[0].get("entitlements_version") or 0) if rows else 0
+        except Exception as e:
+            logger.warning(f"Failed to check entitlements version for tenant {tenant_id}: {e}")
+            return None
+
     async def _get_plan_features(self, plan_id: str) -> list:
         """Get all features for a plan with their values."""
         try:
@@ -681,13 +729,25 @@ class EntitlementsService:
         }
 
     def clear_cache(self, tenant_id: Optional[str] = None) -> None:
-        """Clear entitlements cache."""
+        """
+        Clear entitlements cache.
+
+        With no tenant_id, cached plan precedence and feature requirements are
+        dropped as well, since plan-level edits affect every tenant.
+        """
         if tenant_id:
-            keys_to_remove = [k for k in self._cache if k.startswith(f"{tenant_id}:")]
-            for key in keys_to_remove:
-                del self._cache[key]
+            self._cache.pop(tenant_id)
         else:
             self._cache.clear()
+            _feature_requirements_cache.clear()
+            clear_plan_precedence_cache()
+
+    def get_cache_metrics(self) -> Dict[str, Any]:
+        """Get entitlements and plan metadata cache counters."""
+        return {
+            **self._cache.get_metrics(),
+            "feature_requirements": _feature_requirements_cache.get_metrics(),
+        }
 
 
 # Singleton instance
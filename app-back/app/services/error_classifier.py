@@ -0,0 +1,106 @@
+"""
+Error Classifier - maps execution error messages to error intelligence categories.
+
+Category keywords are compiled into a single prefix-trie regex, so a message
+is scanned in one pass rather than once per category keyword list. When a
+keyword is found, scanning resumes with a matcher restricted to the
+higher-precedence categories, so the result is the highest-precedence
+category present anywhere in the message, the same as the original if/elif
+keyword chain. Results are memoized because failing n8n workflows repeat the
+same error text many times.
+"""
+import itertools
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+UNKNOWN_ERROR = "Unknown Error"
+UNCLASSIFIED_ERROR = "Execution Error"
+
+# (error_type, keywords) in precedence order: the first category with any
+# keyword present in the lowercased message wins
+ERROR_CATEGORIES: List[Tuple[str, Tuple[str, ...]]] = [
+    ("Credential Error", ("credential", "authentication", "unauthorized", "auth", "api key", "token expired", "invalid token")),
+    ("Timeout", ("timeout", "timed out", "deadline exceeded", "request timeout")),
+    ("Connection Error", ("connection", "network", "econnrefused", "econnreset", "enotfound", "dns", "socket", "unreachable")),
+    ("HTTP 5xx", ("500", "502", "503", "504", "internal server error", "bad gateway", "service unavailable")),
+    ("HTTP 404", ("404", "not found", "resource not found")),
+    ("HTTP 400", ("400", "bad request")),
+    ("Rate Limit", ("rate limit", "429", "too many requests", "throttl")),
+    ("Permission Error", ("permission", "forbidden", "403", "access denied")),
+    ("Validation Error", ("validation", "invalid", "required field", "missing field", "schema")),
+    ("Node Error", ("node", "execution failed", "workflow error")),
+    ("Data Error", ("json", "parse", "syntax", "undefined", "null")),
+]
+
+_CLASSIFICATION_CACHE_SIZE = 4096
+
+
+def _compile_matcher(categories: List[Tuple[str, Tuple[str, ...]]]) -> re.Pattern:
+    """
+    Compile keywords into one prefix-trie regex. Each keyword ends in an empty
+    named group ("c<category>_<n>"), so match.lastgroup names its category.
+    """
+    trie: Dict[str, Any] = {}
+    for index, (_, keywords) in enumerate(categories):
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node.setdefault("", index)
+
+    counter = itertools.count()
+
+    def to_regex(node: Dict[str, Any]) -> str:
+        alternatives = [re.escape(char) + to_regex(child) for char, child in node.items() if char]
+        if "" in node:
+            alternatives.append(f"(?P<c{node['']}_{next(counter)}>)")
+        return alternatives[0] if len(alternatives) == 1 else f"(?:{'|'.join(alternatives)})"
+
+    return re.compile(to_regex(trie))
+
+
+# _MATCHERS[n] matches keywords of the first n categories only; once a match
+# of category n is found, only higher-precedence categories can improve on it
+_MATCHERS: List[Optional[re.Pattern]] = [None] + [
+    _compile_matcher(ERROR_CATEGORIES[:n]) for n in range(1, len(ERROR_CATEGORIES) + 1)
+]
+
+
+@lru_cache(maxsize=_CLASSIFICATION_CACHE_SIZE)
+def _classify_lowered(error_lower: str) -> Tuple[str, bool]:
+    best = len(ERROR_CATEGORIES)
+    position = 0
+    while best > 0:
+        match = _MATCHERS[best].search(error_lower, position)
+        if match is None:
+            break
+        best = int(match.lastgroup[1:].split("_", 1)[0])
+        # Rescan from the match start: a higher-precedence keyword may start
+        # at the same position or later
+        position = match.start()
+    if best == len(ERROR_CATEGORIES):
+        # Fallback - mark as unclassified so UI can show sample message
+        return (UNCLASSIFIED_ERROR, False)
+    return (ERROR_CATEGORIES[best][0], True)
+
+
+def classify_error(error_message: Optional[str]) -> Tuple[str, bool]:
+    """Classify an error message into an error type category.
+
+    Returns:
+        tuple: (error_type, is_classified) - is_classified is False if using fallback
+    """
+    if not error_message:
+        return (UNKNOWN_ERROR, False)
+    return _classify_lowered(error_message.lower())
+
+
+def classify_errors(error_messages: Iterable[Optional[str]]) -> List[Tuple[str, bool]]:
+    """Classify many messages at once, classifying each distinct message only once."""
+    messages = list(error_messages)
+    distinct: Dict[Optional[str], Tuple[str, bool]] = {}
+    for message in messages:
+        if message not in distinct:
+            distinct[message] = classify_error(message)
+    return [distinct[message] for message in messages]
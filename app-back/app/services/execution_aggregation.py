@@ -0,0 +1,203 @@
+"""
+Execution Aggregation - columnar reductions over execution rows.
+
+Client-side aggregation paths (sparkline fallback, per-workflow stats,
+execution analytics) receive executions as a list of row dicts. Instead of
+walking every row through per-bucket/per-workflow Python lists, the helpers
+here pull the needed columns out once as numpy arrays and compute bucket
+assignment, counts, sums and percentiles with vector reductions.
+"""
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from dateutil import parser as dateutil_parser
+
+
+def _epoch_seconds(value: Any) -> float:
+    if not value:
+        return math.nan
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            parsed = datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            try:
+                parsed = dateutil_parser.parse(value)
+            except (TypeError, ValueError, OverflowError):
+                return math.nan
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def timestamp_column(values: Sequence[Any]) -> np.ndarray:
+    """
+    Parse ISO-8601 timestamps into UTC epoch seconds (float64).
+
+    Naive timestamps are treated as UTC; missing or unparseable values are NaN.
+    """
+    return np.fromiter((_epoch_seconds(v) for v in values), dtype=np.float64, count=len(values))
+
+
+def numeric_column(values: Sequence[Any]) -> np.ndarray:
+    """Numeric values as float64, with NaN for None and non-numeric values."""
+    return np.fromiter(
+        (
+            float(v) if isinstance(v, (int, float)) and not isinstance(v, bool) else math.nan
+            for v in values
+        ),
+        dtype=np.float64,
+        count=len(values),
+    )
+
+
+def status_masks(statuses: Sequence[Any]) -> Dict[str, np.ndarray]:
+    """Boolean success/error masks for a status column."""
+    column = np.asarray(statuses, dtype=object)
+    return {"success": column == "success", "error": column == "error"}
+
+
+def time_buckets(
+    rows: List[Dict[str, Any]],
+    range_start: datetime,
+    interval_delta: timedelta,
+    intervals: int,
+    timestamp_field: str = "started_at",
+    status_field: str = "status",
+    duration_field: str = "duration_ms",
+) -> List[Dict[str, Any]]:
+    """
+    Bucket rows into fixed-width intervals starting at range_start.
+
+    Returns one bucket per interval in the sparkline bucket format:
+    {"start", "total", "successes", "failures", "avg_duration"}. Rows outside
+    [range_start, range_start + intervals * interval_delta) are ignored.
+    """
+    if range_start.tzinfo is None:
+        range_start = range_start.replace(tzinfo=timezone.utc)
+
+    timestamps = timestamp_column([row.get(timestamp_field) for row in rows])
+    durations = numeric_column([row.get(duration_field) for row in rows])
+    masks = status_masks([row.get(status_field) for row in rows])
+
+    interval_seconds = interval_delta.total_seconds()
+    offsets = (timestamps - range_start.timestamp()) / interval_seconds
+    in_range = np.isfinite(offsets) & (offsets >= 0) & (offsets < intervals)
+    indices = np.floor(offsets[in_range]).astype(np.int64)
+
+    totals = np.bincount(indices, minlength=intervals)
+    successes = np.bincount(indices, weights=masks["success"][in_range], minlength=intervals)
+    failures = np.bincount(indices, weights=masks["error"][in_range], minlength=intervals)
+
+    bucket_durations = durations[in_range]
+    has_duration = ~np.isnan(bucket_durations)
+    duration_counts = np.bincount(indices[has_duration], minlength=intervals)
+    duration_sums = np.bincount(
+        indices[has_duration], weights=bucket_durations[has_duration], minlength=intervals
+    )
+    with np.errstate(invalid="ignore", divide="ignore"):
+        averages = np.where(duration_counts > 0, duration_sums / np.maximum(duration_counts, 1), 0.0)
+
+    return [
+        {
+            "start": range_start + (i * interval_delta),
+            "total": int(totals[i]),
+            "successes": int(successes[i]),
+            "failures": int(failures[i]),
+            "avg_duration": float(averages[i]) if duration_counts[i] else 0,
+        }
+        for i in range(intervals)
+    ]
+
+
+class GroupedColumns:
+    """
+    Rows grouped by a key column, with per-group vector reductions.
+
+    Rows with a falsy key are dropped. Groups are ordered by first appearance,
+    matching the insertion order of the dict-based aggregation it replaces.
+    """
+
+    def __init__(self, keys: Sequence[Any]):
+        key_column = np.asarray(keys, dtype=object)
+        present = np.fromiter((bool(k) for k in keys), dtype=bool, count=len(keys))
+        self.rows = np.nonzero(present)[0]
+
+        if self.rows.size:
+            unique_keys, first_seen, codes = np.unique(
+                key_column[self.rows].astype(str), return_index=True, return_inverse=True
+            )
+            order = np.argsort(first_seen, kind="stable")
+            rank = np.empty_like(order)
+            rank[order] = np.arange(order.size)
+            self.keys: List[Any] = [key_column[self.rows[first_seen[i]]] for i in order]
+            self.first_rows = self.rows[first_seen[order]]
+            self.codes = rank[codes.ravel()]
+        else:
+            self.keys = []
+            self.first_rows = np.empty(0, dtype=np.int64)
+            self.codes = np.empty(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def count(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Per-group row count, optionally restricted to rows where mask is true."""
+        weights = None if mask is None else mask[self.rows]
+        return np.bincount(self.codes, weights=weights, minlength=len(self)).astype(np.int64)
+
+    def durations(
+        self, values: np.ndarray, percentiles: Iterable[float] = ()
+    ) -> Dict[str, List[Optional[float]]]:
+        """
+        Per-group mean and percentiles (linear interpolation, as PERCENTILE_CONT)
+        of a numeric column, ignoring NaN. Groups with no values get None.
+        """
+        column = values[self.rows]
+        valid = ~np.isnan(column)
+        codes = self.codes[valid]
+        column = column[valid]
+
+        counts = np.bincount(codes, minlength=len(self))
+        sums = np.bincount(codes, weights=column, minlength=len(self))
+        result: Dict[str, List[Optional[float]]] = {
+            "avg": [float(sums[i] / counts[i]) if counts[i] else None for i in range(len(self))]
+        }
+
+        percentiles = list(percentiles)
+        if percentiles:
+            order = np.lexsort((column, codes))
+            ends = np.cumsum(counts)
+            starts = ends - counts
+            sorted_values = column[order]
+            for q in percentiles:
+                result[f"p{q:g}"] = [
+                    float(np.percentile(sorted_values[starts[i]:ends[i]], q)) if counts[i] else None
+                    for i in range(len(self))
+                ]
+        return result
+
+    def latest_rows(self, timestamps: np.ndarray, mask: Optional[np.ndarray] = None) -> List[Optional[int]]:
+        """
+        Per-group index of the row with the latest timestamp (first row wins
+        ties), optionally restricted to rows where mask is true.
+        """
+        column = timestamps[self.rows]
+        eligible = ~np.isnan(column)
+        if mask is not None:
+            eligible &= mask[self.rows]
+
+        candidate_rows = self.rows[eligible]
+        candidate_codes = self.codes[eligible]
+        order = np.lexsort((-column[eligible], candidate_codes))
+        sorted_codes = candidate_codes[order]
+        is_first = np.ones(sorted_codes.size, dtype=bool)
+        is_first[1:] = sorted_codes[1:] != sorted_codes[:-1]
+
+        latest: List[Optional[int]] = [None] * len(self)
+        for code, row in zip(sorted_codes[is_first], candidate_rows[order][is_first]):
+            latest[int(code)] = int(row)
+        return latest
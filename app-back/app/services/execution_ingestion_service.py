@@ -0,0 +1,263 @@
+"""
+Execution Ingestion Service - incremental n8n → DB execution sync.
+
+Each environment keeps a low-water mark (execution_sync_cursor on the
+environments row): every execution at or below it has been stored and has
+finished. A sync pages through n8n's executions newest-first down to the
+mark and upserts every page as it arrives instead of accumulating the
+window in memory. The mark then advances only as far as the window is
+contiguously stored, so rows that failed to store are read again next run.
+
+n8n's listing leaves out executions that are still running, and a cached
+execution may still be waiting. While either is younger than
+EXECUTION_SYNC_PENDING_GRACE_SECONDS the mark stays below it (unseen IDs are
+the gaps in n8n's increasing execution IDs), so the next run re-reads it
+once it has finished. Executions cached while unfinished are also re-fetched
+individually.
+
+A run that hits its per-run cap stores the oldest ID it read as
+execution_sync_resume_cursor; the next run continues below it down to the
+mark before reading newer executions again.
+"""
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.services.database import db_service
+
+logger = logging.getLogger(__name__)
+
+UNFINISHED_STATUSES = frozenset({"new", "running", "waiting"})
+
+
+def _started_after(started_at: Optional[str], threshold: datetime) -> bool:
+    """True if started_at is after threshold; unknown start times count as recent."""
+    if not started_at:
+        return True
+    try:
+        started = datetime.fromisoformat(str(started_at).replace("Z", "+00:00"))
+    except ValueError:
+        return True
+    if started.tzinfo is None:
+        started = started.replace(tzinfo=timezone.utc)
+    return started > threshold
+
+
+def _has_unseen_ids_between(lower_id: Optional[str], upper_id: str) -> bool:
+    """True if N8N's increasing integer IDs skip any value between the two executions."""
+    if lower_id is None:
+        return False
+    try:
+        return int(upper_id) - int(lower_id) > 1
+    except (TypeError, ValueError):
+        return False
+
+
+class ExecutionIngestionService:
+    """Service for incremental execution ingestion using per-environment cursors."""
+
+    async def ingest_environment(
+        self,
+        tenant_id: str,
+        environment_id: str,
+        environment: Dict[str, Any],
+        adapter: Any,
+        max_executions: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Ingest executions above the environment's low-water mark.
+
+        Args:
+            tenant_id: Tenant ID
+            environment_id: Environment ID
+            environment: Environment row (provides execution_sync_cursor and
+                execution_sync_resume_cursor)
+            adapter: Provider adapter for the environment
+            max_executions: Cap on executions read this run. Defaults to
+                EXECUTION_SYNC_INITIAL_LIMIT for the first sync and
+                EXECUTION_SYNC_MAX_PER_RUN afterwards.
+
+        Returns:
+            {"synced": int, "refreshed": int, "pages": int, "failed": [...],
+             "cursor": Optional[str], "resume_cursor": Optional[str],
+             "reached_cursor": bool}
+        """
+        cursor = environment.get("execution_sync_cursor")
+        cursor_started_at = environment.get("execution_sync_cursor_started_at")
+        resume_id = environment.get("execution_sync_resume_cursor") if cursor else None
+        if max_executions is None:
+            max_executions = (
+                settings.EXECUTION_SYNC_MAX_PER_RUN if cursor else settings.EXECUTION_SYNC_INITIAL_LIMIT
+            )
+
+        result: Dict[str, Any] = {
+            "synced": 0,
+            "refreshed": 0,
+            "pages": 0,
+            "failed": [],
+            "cursor": cursor,
+            "resume_cursor": resume_id,
+            "reached_cursor": False,
+        }
+
+        # Refresh executions that were still in flight at the last sync
+        # (once below the mark, paging alone would never revisit them)
+        if cursor:
+            result["refreshed"] = await self._refresh_unfinished(tenant_id, environment_id, adapter, result)
+
+        budget = max_executions
+        while budget > 0:
+            window_before_id = resume_id
+            executions, failed_ids, capped = await self._read_window(
+                tenant_id, environment_id, adapter, cursor, window_before_id, budget, result
+            )
+            budget -= len(executions)
+
+            # The first sync only reads the newest executions, so a capped
+            # window is complete for it; later syncs resume below the window.
+            if capped and cursor is not None:
+                resume_id = executions[-1][0]
+                result["reached_cursor"] = False
+                logger.warning(
+                    f"Execution sync for env {environment_id} hit the per-run cap ({max_executions}) "
+                    f"above cursor {cursor}; the next run resumes below {resume_id}"
+                )
+                break
+
+            result["reached_cursor"] = True
+            cursor, started_at = self._low_water(executions, failed_ids, cursor)
+            if cursor != result["cursor"]:
+                cursor_started_at = started_at
+            resume_id = None
+            if window_before_id is None:
+                break
+
+        if cursor != result["cursor"] or resume_id != result["resume_cursor"]:
+            await db_service.update_environment(environment_id, tenant_id, {
+                "execution_sync_cursor": cursor,
+                "execution_sync_cursor_started_at": cursor_started_at,
+                "execution_sync_resume_cursor": resume_id,
+                "last_execution_sync_at": datetime.utcnow().isoformat(),
+            })
+            result["cursor"] = cursor
+            result["resume_cursor"] = resume_id
+
+        if result["failed"]:
+            logger.warning(
+                f"Execution sync for env {environment_id}: {len(result['failed'])} execution(s) failed to store"
+            )
+
+        logger.info(
+            f"Execution sync for env {environment_id}: {result['synced']} new, "
+            f"{result['refreshed']} refreshed across {result['pages']} page(s); cursor={result['cursor']}"
+        )
+        return result
+
+    async def _read_window(
+        self,
+        tenant_id: str,
+        environment_id: str,
+        adapter: Any,
+        since_id: Optional[str],
+        before_id: Optional[str],
+        budget: int,
+        result: Dict[str, Any]
+    ) -> Tuple[List[Tuple[str, Optional[str], Optional[str]]], Set[str], bool]:
+        """
+        Store up to budget executions between the marks, newest first.
+
+        Returns the (id, startedAt, status) of every execution read, the IDs
+        that failed to store, and whether more executions were left unread.
+        One execution beyond the budget is requested so that a window of
+        exactly budget executions is not reported as capped.
+        """
+        executions: List[Tuple[str, Optional[str], Optional[str]]] = []
+        failed_ids: Set[str] = set()
+        capped = False
+
+        async for page in adapter.iter_executions(
+            since_id=since_id,
+            before_id=before_id,
+            page_size=settings.EXECUTION_SYNC_PAGE_SIZE,
+            max_executions=budget + 1
+        ):
+            if len(executions) + len(page) > budget:
+                page = page[:budget - len(executions)]
+                capped = True
+            if not page:
+                break
+
+            page_result = await db_service.bulk_upsert_executions(tenant_id, environment_id, page)
+            result["synced"] += len(page_result["rows"])
+            result["failed"].extend(page_result["failed"])
+            result["pages"] += 1
+            failed_ids.update(str(f["key"]) for f in page_result["failed"])
+            executions.extend((str(e.get("id")), e.get("startedAt"), e.get("status")) for e in page)
+
+            if capped:
+                break
+
+        return executions, failed_ids, capped
+
+    @staticmethod
+    def _low_water(
+        executions: List[Tuple[str, Optional[str], Optional[str]]],
+        failed_ids: Set[str],
+        cursor: Optional[str]
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Walk a fully read window upwards from the cursor and return the newest
+        (id, startedAt) below which everything is stored and settled.
+
+        The walk stops at an execution that failed to store, and at a recent
+        execution that is unfinished or has unseen IDs below it.
+        """
+        grace_start = datetime.now(timezone.utc) - timedelta(seconds=settings.EXECUTION_SYNC_PENDING_GRACE_SECONDS)
+        mark, mark_started_at = cursor, None
+
+        for execution_id, started_at, status in reversed(executions):
+            if execution_id in failed_ids:
+                break
+            if _started_after(started_at, grace_start) and (
+                status in UNFINISHED_STATUSES or _has_unseen_ids_between(mark, execution_id)
+            ):
+                break
+            mark, mark_started_at = execution_id, started_at
+
+        return mark, mark_started_at
+
+    async def _refresh_unfinished(
+        self,
+        tenant_id: str,
+        environment_id: str,
+        adapter: Any,
+        result: Dict[str, Any]
+    ) -> int:
+        """Re-fetch executions cached as running/waiting and store their latest state."""
+        try:
+            execution_ids = await db_service.get_unfinished_execution_ids(
+                tenant_id,
+                environment_id,
+                limit=settings.EXECUTION_SYNC_REFRESH_LIMIT
+            )
+        except Exception as e:
+            logger.warning(f"Failed to load unfinished executions for env {environment_id}: {str(e)}")
+            return 0
+
+        executions = []
+        for execution_id in execution_ids:
+            try:
+                executions.append(await adapter.get_execution(execution_id))
+            except Exception as e:
+                logger.debug(f"Could not refresh execution {execution_id}: {str(e)}")
+
+        if not executions:
+            return 0
+
+        refresh_result = await db_service.bulk_upsert_executions(tenant_id, environment_id, executions)
+        result["failed"].extend(refresh_result["failed"])
+        return len(refresh_result["rows"])
+
+
+execution_ingestion_service = ExecutionIngestionService()
@@ -0,0 +1,221 @@
+"""
+Git Blob Cache - content-addressed cache of workflow files keyed by git blob SHA.
+
+Blob SHAs are a hash of file content, so a cached entry can never go stale:
+entries are only ever evicted for space, never invalidated. A small in-memory
+LRU sits in front of a size-bounded on-disk store so that repeated drift runs
+and promotions skip re-downloading files that have not changed.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class GitBlobCache:
+    """
+    Two-tier (memory + disk) cache of raw blob bytes keyed by blob SHA.
+
+    Raw bytes are stored rather than parsed objects so every reader gets a
+    freshly parsed dict it is free to mutate. Both tiers evict least recently
+    used entries once their byte budget is exceeded.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str],
+        max_memory_bytes: int,
+        max_disk_bytes: int,
+    ):
+        # A zero disk budget turns the cache into a memory-only LRU
+        self.cache_dir = (cache_dir or None) if max_disk_bytes > 0 else None
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_index: Optional["OrderedDict[str, int]"] = None
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+        }
+
+    def get(self, sha: str) -> Optional[Any]:
+        """
+        Return the parsed JSON for a blob SHA, or None if it is not cached.
+        """
+        raw = self._get_raw(sha)
+        if raw is None:
+            return None
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return None
+
+    def put(self, sha: str, raw: bytes) -> None:
+        """
+        Store the raw content of a blob under its SHA.
+        """
+        with self._lock:
+            self._remember(sha, raw)
+        self._write_disk(sha, raw)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get cache size and hit/eviction counters."""
+        with self._lock:
+            return {
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "max_memory_bytes": self.max_memory_bytes,
+                "disk_entries": len(self._disk_index) if self._disk_index is not None else None,
+                "disk_bytes": self._disk_bytes if self._disk_index is not None else None,
+                "max_disk_bytes": self.max_disk_bytes if self.cache_dir else 0,
+                **self._stats,
+            }
+
+    def clear(self) -> None:
+        """Drop all in-memory entries and reset counters (disk entries are kept)."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            self._disk_index = None
+            self._disk_bytes = 0
+            for key in self._stats:
+                self._stats[key] = 0
+
+    # ------------------------------------------------------------------
+    # Memory tier
+    # ------------------------------------------------------------------
+
+    def _get_raw(self, sha: str) -> Optional[bytes]:
+        with self._lock:
+            raw = self._memory.get(sha)
+            if raw is not None:
+                self._memory.move_to_end(sha)
+                self._stats["memory_hits"] += 1
+                return raw
+
+        raw = self._read_disk(sha)
+        with self._lock:
+            if raw is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["disk_hits"] += 1
+            self._remember(sha, raw)
+            return raw
+
+    def _remember(self, sha: str, raw: bytes) -> None:
+        if len(raw) > self.max_memory_bytes:
+            return
+        previous = self._memory.pop(sha, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[sha] = raw
+        self._memory_bytes += len(raw)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self._stats["memory_evictions"] += 1
+
+    # ------------------------------------------------------------------
+    # Disk tier
+    # ------------------------------------------------------------------
+
+    def _path(self, sha: str) -> str:
+        return os.path.join(self.cache_dir, sha[:2], sha)
+
+    def _load_disk_index(self) -> "OrderedDict[str, int]":
+        """Scan the cache directory once, ordering entries oldest-access first."""
+        if self._disk_index is not None:
+            return self._disk_index
+
+        entries = []
+        if os.path.isdir(self.cache_dir):
+            for root, _, files in os.walk(self.cache_dir):
+                for name in files:
+                    if name.endswith(".tmp"):
+                        continue
+                    try:
+                        stat = os.stat(os.path.join(root, name))
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, name, stat.st_size))
+        entries.sort()
+
+        self._disk_index = OrderedDict((name, size) for _, name, size in entries)
+        self._disk_bytes = sum(self._disk_index.values())
+        return self._disk_index
+
+    def _read_disk(self, sha: str) -> Optional[bytes]:
+        if not self.cache_dir or not _is_valid_sha(sha):
+            return None
+        path = self._path(sha)
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+            # Bump mtime so disk eviction is least-recently-used, not oldest-written
+            os.utime(path)
+        except OSError:
+            return None
+
+        with self._lock:
+            index = self._load_disk_index()
+            if sha in index:
+                index.move_to_end(sha)
+        return raw
+
+    def _write_disk(self, sha: str, raw: bytes) -> None:
+        if not self.cache_dir or not _is_valid_sha(sha) or len(raw) > self.max_disk_bytes:
+            return
+        path = self._path(sha)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(raw)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write blob {sha} to cache: {str(e)}")
+            return
+
+        with self._lock:
+            index = self._load_disk_index()
+            if sha in index:
+                self._disk_bytes -= index.pop(sha)
+            index[sha] = len(raw)
+            self._disk_bytes += len(raw)
+            evicted = []
+            while self._disk_bytes > self.max_disk_bytes and index:
+                old_sha, size = index.popitem(last=False)
+                self._disk_bytes -= size
+                self._stats["disk_evictions"] += 1
+                evicted.append(old_sha)
+
+        for old_sha in evicted:
+            try:
+                os.remove(self._path(old_sha))
+            except OSError:
+                pass
+
+
+def _is_valid_sha(sha: Any) -> bool:
+    """Blob SHAs are hex strings; anything else is never cached on disk."""
+    return isinstance(sha, str) and len(sha) >= 4 and all(c in "0123456789abcdef" for c in sha)
+
+
+git_blob_cache = GitBlobCache(
+    cache_dir=settings.GIT_BLOB_CACHE_DIR or os.path.join(tempfile.gettempdir(), "workflowops-git-blobs"),
+    max_memory_bytes=settings.GIT_BLOB_CACHE_MAX_MEMORY_BYTES,
+    max_disk_bytes=settings.GIT_BLOB_CACHE_MAX_DISK_BYTES,
+)
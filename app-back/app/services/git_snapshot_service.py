@@ -22,6 +22,7 @@ from uuid import uuid4
 from app.services.github_service import GitHubService
 from app.services.provider_registry import ProviderRegistry
 from app.services.database import db_service
+from app.services.promotion_service import normalize_workflow_for_comparison
 from app.schemas.snapshot_manifest import (
     SnapshotKind,
     SnapshotManifest,
@@ -45,66 +46,11 @@ def normalize_workflow_for_hash(workflow: Dict[str, Any]) -> Dict[str, Any]:
     - UI-specific fields (position, pinData, etc.)
 
     This ensures the same workflow logic produces the same hash
-    regardless of which environment it's in.
+    regardless of which environment it's in. The field rules are the
+    same as promotion comparison, so this delegates to the single-pass
+    normalize_workflow_for_comparison() instead of keeping a copy.
     """
-    # Deep copy to avoid modifying original
-    normalized = json.loads(json.dumps(workflow))
-
-    # Fields to completely remove (metadata that varies per-env)
-    remove_fields = [
-        'id', 'createdAt', 'updatedAt', 'versionId',
-        'triggerCount', 'staticData', 'meta', 'hash',
-        'executionOrder', 'homeProject', 'sharedWithProjects',
-        '_comment', 'pinData',
-        'active',  # Active state may differ
-        'tags', 'tagIds',  # Tags have different IDs per env
-        'shared', 'scopes', 'usedCredentials',
-    ]
-
-    for field in remove_fields:
-        normalized.pop(field, None)
-
-    # Normalize settings - remove env-specific settings
-    if 'settings' in normalized and isinstance(normalized['settings'], dict):
-        settings_remove = [
-            'executionOrder', 'saveDataErrorExecution', 'saveDataSuccessExecution',
-            'callerPolicy', 'timezone', 'saveManualExecutions', 'availableInMCP',
-        ]
-        for field in settings_remove:
-            normalized['settings'].pop(field, None)
-        if not normalized['settings']:
-            normalized.pop('settings', None)
-
-    # Normalize nodes - remove UI/runtime data, normalize credentials
-    if 'nodes' in normalized and isinstance(normalized['nodes'], list):
-        for node in normalized['nodes']:
-            # Remove UI/position fields
-            ui_fields = [
-                'position', 'positionAbsolute', 'selected', 'selectedNodes',
-                'executionData', 'typeVersion', 'onError', 'id',
-                'webhookId', 'extendsCredential', 'notesInFlow',
-            ]
-            for field in ui_fields:
-                node.pop(field, None)
-
-            # Normalize credentials - compare by NAME only, not ID
-            if 'credentials' in node and isinstance(node['credentials'], dict):
-                normalized_creds = {}
-                for cred_type, cred_ref in node['credentials'].items():
-                    if isinstance(cred_ref, dict):
-                        # Keep only name for comparison
-                        normalized_creds[cred_type] = {'name': cred_ref.get('name')}
-                    else:
-                        normalized_creds[cred_type] = cred_ref
-                node['credentials'] = normalized_creds
-
-        # Sort nodes by name for consistent ordering
-        normalized['nodes'] = sorted(
-            normalized['nodes'],
-            key=lambda n: n.get('name', '')
-        )
-
-    return normalized
+    return normalize_workflow_for_comparison(workflow)
 
 
 def compute_workflow_hash(workflow: Dict[str, Any]) -> str:
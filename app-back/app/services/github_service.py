@@ -1,11 +1,15 @@
+import asyncio
 import json
 import base64
+import hashlib
 import re
 import logging
 from datetime import datetime, timezone
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+import httpx
 from github import Github, GithubException
 from app.core.config import settings
+from app.services.git_blob_cache import git_blob_cache
 
 logger = logging.getLogger(__name__)
 
@@ -104,19 +108,7 @@ class GitHubService:
             raise ValueError("GitHub is not properly configured")
 
         try:
-            # Use workflow ID as filename (IDs are unique and stable)
-            sanitized_id = self._sanitize_filename(workflow_id)
-            base_path = self._workflows_base_path(environment_type)
-            file_path = f"{base_path}/{sanitized_id}.json"
-
-            # Add workflow name comment to the data (name for human readability, ID is the filename)
-            workflow_with_comment = {
-                "_comment": f"Workflow: {workflow_name} (ID: {workflow_id})",
-                **workflow_data
-            }
-
-            # Convert workflow data to JSON string
-            content = json.dumps(workflow_with_comment, indent=2)
+            file_path, content = self._workflow_file(workflow_id, workflow_name, workflow_data, environment_type)
 
             # Default commit message
             if not commit_message:
@@ -151,6 +143,52 @@ class GitHubService:
             print(f"Error syncing workflow to GitHub: {str(e)}")
             raise
 
+    def _workflow_file(
+        self,
+        workflow_id: str,
+        workflow_name: str,
+        workflow_data: Dict[str, Any],
+        environment_type: str = None,
+    ) -> Tuple[str, str]:
+        """Return the (file_path, JSON content) a workflow is synced to."""
+        # Use workflow ID as filename (IDs are unique and stable)
+        sanitized_id = self._sanitize_filename(workflow_id)
+        base_path = self._workflows_base_path(environment_type)
+        file_path = f"{base_path}/{sanitized_id}.json"
+
+        # Add workflow name comment to the data (name for human readability, ID is the filename)
+        workflow_with_comment = {
+            "_comment": f"Workflow: {workflow_name} (ID: {workflow_id})",
+            **workflow_data
+        }
+
+        return file_path, json.dumps(workflow_with_comment, indent=2)
+
+    async def sync_workflows_to_github(
+        self,
+        workflows: List[Dict[str, Any]],
+        commit_message: str,
+        environment_type: str = None,
+    ) -> str:
+        """Sync many workflows to GitHub as a single commit.
+
+        Files are laid out exactly as sync_workflow_to_github() writes them,
+        but all of them land in one commit via commit_files().
+
+        Args:
+            workflows: Full workflow payloads (each must have an "id")
+            commit_message: Commit message
+            environment_type: Environment type key for folder path
+
+        Returns:
+            SHA of the branch head containing the workflows
+        """
+        files = dict(
+            self._workflow_file(workflow["id"], workflow.get("name"), workflow, environment_type)
+            for workflow in workflows
+        )
+        return await self.commit_files(files, commit_message)
+
     async def get_all_workflows_from_github(
         self,
         environment_type: str = None,
@@ -169,12 +207,21 @@ class GitHubService:
         if not self.is_configured() or not self.repo:
             return {}
 
+        ref = commit_sha or self.branch
+        base_path = self._workflows_base_path(environment_type)
+
+        files = await self._read_json_tree(base_path, ref, max_depth=1)
+        if files is not None:
+            workflows = {}
+            for workflow_data in files.values():
+                workflow_id = workflow_data.get("id") or self._extract_workflow_id(workflow_data)
+                if workflow_id:
+                    workflows[workflow_id] = workflow_data
+            return workflows
+
         try:
             workflows = {}
-            ref = commit_sha or self.branch
 
-            base_path = self._workflows_base_path(environment_type)
-            
             try:
                 contents = self.repo.get_contents(base_path, ref=ref)
             except GithubException as e:
@@ -208,16 +255,281 @@ class GitHubService:
         except GithubException as e:
             print(f"Error fetching workflows from GitHub: {str(e)}")
             return {}
+
+    def _http_client(self) -> httpx.AsyncClient:
+        """Create an async client for the GitHub REST API."""
+        return httpx.AsyncClient(
+            base_url=settings.GITHUB_API_URL,
+            headers={
+                "Authorization": f"Bearer {self.token}",
+                "Accept": "application/vnd.github+json",
+                "X-GitHub-Api-Version": "2022-11-28",
+            },
+            timeout=settings.GITHUB_HTTP_TIMEOUT_SECONDS,
+        )
+
+    async def get_branch_head_sha(self, ref: Optional[str] = None) -> Optional[str]:
+        """
+        Resolve a branch to its head commit SHA with one lightweight API call.
+
+        Returns None when the repository is not configured or the ref cannot
+        be resolved, so callers can fall back to a full read.
+        """
+        if not self.is_configured():
+            return None
+
+        try:
+            async with self._http_client() as client:
+                response = await client.get(
+                    f"/repos/{self.repo_owner}/{self.repo_name}/commits/{ref or self.branch}",
+                    headers={"Accept": "application/vnd.github.sha"},
+                )
+                response.raise_for_status()
+                return response.text.strip() or None
+        except httpx.HTTPError as e:
+            logger.warning(f"Failed to resolve head of {ref or self.branch}: {str(e)}")
+            return None
+
+    async def _read_json_tree(
+        self,
+        base_path: str,
+        ref: str,
+        max_depth: int = 0,
+        exclude_suffixes: tuple = (),
+    ) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Read every JSON file under base_path with one tree call plus parallel blob reads.
+
+        Resolves the whole tree for ref with the recursive Git Trees API, then
+        downloads the matching blobs concurrently, once per distinct blob SHA.
+        This replaces a get_contents call per directory and per file.
+
+        Args:
+            base_path: Folder to read, relative to repo root
+            ref: Branch name or commit SHA
+            max_depth: How many subdirectory levels below base_path to include
+            exclude_suffixes: File name suffixes to skip (e.g. sidecar files)
+
+        Returns:
+            Dict mapping file_path to parsed JSON, or None when the tree could
+            not be read in one call (truncated tree or API error) and the
+            caller should fall back to walking directories.
+        """
+        prefix = f"{base_path.rstrip('/')}/"
+        try:
+            async with self._http_client() as client:
+                response = await client.get(
+                    f"/repos/{self.repo_owner}/{self.repo_name}/git/trees/{ref}",
+                    params={"recursive": "1"},
+                )
+                if response.status_code == 404:
+                    return {}
+                response.raise_for_status()
+                tree = response.json()
+                if tree.get("truncated"):
+                    logger.info(f"Git tree for {ref} is truncated, walking {base_path} instead")
+                    return None
+
+                paths_by_sha: Dict[str, List[str]] = {}
+                for entry in tree.get("tree", []):
+                    path = entry.get("path", "")
+                    if entry.get("type") != "blob" or not path.startswith(prefix):
+                        continue
+                    if path[len(prefix):].count("/") > max_depth:
+                        continue
+                    if not path.endswith(".json") or path.endswith(exclude_suffixes):
+                        continue
+                    paths_by_sha.setdefault(entry["sha"], []).append(path)
+
+                semaphore = asyncio.Semaphore(settings.GITHUB_BLOB_FETCH_CONCURRENCY)
+
+                async def fetch(sha: str) -> Optional[Dict[str, Any]]:
+                    async with semaphore:
+                        return await self._fetch_blob_json(client, sha, paths_by_sha[sha][0])
+
+                shas = list(paths_by_sha)
+                blobs = await asyncio.gather(*(fetch(sha) for sha in shas))
+        except httpx.HTTPError as e:
+            logger.warning(f"Bulk tree read of {base_path}@{ref} failed, walking directories: {str(e)}")
+            return None
+
+        files: Dict[str, Dict[str, Any]] = {}
+        for sha, data in zip(shas, blobs):
+            if not data:
+                continue
+            for path in paths_by_sha[sha]:
+                files[path] = data
+        return files
+
+    async def _fetch_blob_json(
+        self,
+        client: httpx.AsyncClient,
+        sha: str,
+        path: str,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Parse a blob as JSON, reading through the blob cache; None if it is not valid JSON.
+        """
+        cached = git_blob_cache.get(sha)
+        if cached is not None:
+            return cached
+
+        response = await client.get(
+            f"/repos/{self.repo_owner}/{self.repo_name}/git/blobs/{sha}",
+            headers={"Accept": "application/vnd.github.raw+json"},
+        )
+        response.raise_for_status()
+        try:
+            data = json.loads(response.content)
+        except ValueError as e:
+            logger.error(f"Error parsing workflow file {path}: {str(e)}")
+            return None
+        git_blob_cache.put(sha, response.content)
+        return data
+
+    @staticmethod
+    def _git_blob_sha(content: bytes) -> str:
+        """The SHA Git assigns to a blob with this content."""
+        return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+    async def _upload_blobs(
+        self,
+        client: httpx.AsyncClient,
+        blobs: Dict[str, bytes],
+    ) -> None:
+        """Create blobs concurrently, bounded by GITHUB_BLOB_UPLOAD_CONCURRENCY."""
+        semaphore = asyncio.Semaphore(settings.GITHUB_BLOB_UPLOAD_CONCURRENCY)
+
+        async def upload(sha: str, content: bytes) -> None:
+            async with semaphore:
+                response = await client.post(
+                    f"/repos/{self.repo_owner}/{self.repo_name}/git/blobs",
+                    json={"content": base64.b64encode(content).decode("ascii"), "encoding": "base64"},
+                )
+                response.raise_for_status()
+                if response.json().get("sha") != sha:
+                    logger.warning(f"GitHub stored blob {response.json().get('sha')} for expected {sha}")
+
+        await asyncio.gather(*(upload(sha, content) for sha, content in blobs.items()))
+
+    async def commit_files(self, files: Dict[str, str], commit_message: str) -> str:
+        """
+        Write many files to the branch as one commit via the Git Data API.
+
+        Blob SHAs are computed locally, so files whose content is already at
+        the same path are left out of the commit and blobs already in the
+        tree are not uploaded again. The remaining blobs are uploaded
+        concurrently, then one tree, one commit and one non-forced ref update
+        are made. If the branch moved meanwhile (ref update is not a
+        fast-forward), the commit is rebuilt on the new head.
+
+        Args:
+            files: Dict mapping repo-relative file path to file content
+            commit_message: Commit message
+
+        Returns:
+            SHA of the new commit, or of the current head when nothing changed
+
+        Raises:
+            ValueError: If GitHub is not configured
+            httpx.HTTPError: Git Data API failures
+        """
+        if not self.is_configured():
+            raise ValueError("GitHub is not properly configured")
+
+        repo_path = f"/repos/{self.repo_owner}/{self.repo_name}"
+        contents = {path: content.encode("utf-8") for path, content in files.items()}
+        blob_shas = {path: self._git_blob_sha(content) for path, content in contents.items()}
+        uploaded = set()
+
+        async with self._http_client() as client:
+            for attempt in range(1, settings.GITHUB_REF_UPDATE_ATTEMPTS + 1):
+                response = await client.get(f"{repo_path}/git/ref/heads/{self.branch}")
+                response.raise_for_status()
+                head_sha = response.json()["object"]["sha"]
+
+                response = await client.get(f"{repo_path}/git/commits/{head_sha}")
+                response.raise_for_status()
+                base_tree_sha = response.json()["tree"]["sha"]
+
+                # A truncated tree only means some unchanged files are re-sent
+                response = await client.get(f"{repo_path}/git/trees/{base_tree_sha}", params={"recursive": "1"})
+                response.raise_for_status()
+                existing = {
+                    entry["path"]: entry["sha"]
+                    for entry in response.json().get("tree", [])
+                    if entry.get("type") == "blob"
+                }
+
+                changed = [path for path in contents if existing.get(path) != blob_shas[path]]
+                if not changed:
+                    logger.info(f"All {len(contents)} files unchanged on {self.branch}, skipping commit")
+                    return head_sha
+
+                known_blobs = set(existing.values()) | uploaded
+                missing = {
+                    blob_shas[path]: contents[path]
+                    for path in changed
+                    if blob_shas[path] not in known_blobs
+                }
+                await self._upload_blobs(client, missing)
+                uploaded.update(missing)
+
+                response = await client.post(f"{repo_path}/git/trees", json={
+                    "base_tree": base_tree_sha,
+                    "tree": [
+                        {"path": path, "mode": "100644", "type": "blob", "sha": blob_shas[path]}
+                        for path in changed
+                    ],
+                })
+                response.raise_for_status()
+                tree_sha = response.json()["sha"]
+
+                response = await client.post(f"{repo_path}/git/commits", json={
+                    "message": commit_message,
+                    "tree": tree_sha,
+                    "parents": [head_sha],
+                })
+                response.raise_for_status()
+                commit_sha = response.json()["sha"]
+
+                response = await client.patch(
+                    f"{repo_path}/git/refs/heads/{self.branch}",
+                    json={"sha": commit_sha, "force": False},
+                )
+                if response.status_code == 422 and attempt < settings.GITHUB_REF_UPDATE_ATTEMPTS:
+                    logger.info(f"{self.branch} moved while committing, rebuilding on new head (attempt {attempt})")
+                    continue
+                response.raise_for_status()
+                break
+
+        # Blob SHAs are content addresses, so the written files can seed the read cache
+        for path in changed:
+            git_blob_cache.put(blob_shas[path], contents[path])
+
+        logger.info(
+            f"Committed {len(changed)} of {len(contents)} files to {self.branch} "
+            f"({len(uploaded)} blobs uploaded) at {commit_sha}"
+        )
+        return commit_sha
     
     def _parse_workflow_file(self, content_file, ref: str) -> Optional[Dict[str, Any]]:
-        """Parse a workflow JSON file from GitHub."""
+        """Parse a workflow JSON file from GitHub, reading through the blob cache."""
+        sha = getattr(content_file, 'sha', None)
+        if isinstance(sha, str):
+            cached = git_blob_cache.get(sha)
+            if cached is not None:
+                return cached
         try:
             if hasattr(content_file, 'content') and content_file.content:
-                decoded_content = base64.b64decode(content_file.content).decode('utf-8')
+                raw_content = base64.b64decode(content_file.content)
             else:
                 file_content = self.repo.get_contents(content_file.path, ref=ref)
-                decoded_content = base64.b64decode(file_content.content).decode('utf-8')
-            return json.loads(decoded_content)
+                raw_content = base64.b64decode(file_content.content)
+            workflow_data = json.loads(raw_content.decode('utf-8'))
+            if isinstance(sha, str):
+                git_blob_cache.put(sha, raw_content)
+            return workflow_data
         except Exception as e:
             print(f"Error parsing workflow file {content_file.path}: {str(e)}")
             return None
@@ -525,10 +837,15 @@ class GitHubService:
         if not self.is_configured() or not self.repo:
             return {}
         
+        ref = commit_sha or self.branch
+        base_path = self._workflows_base_path(git_folder=git_folder)
+
+        files = await self._read_json_tree(base_path, ref, exclude_suffixes=(".env-map.json",))
+        if files is not None:
+            return files
+
         try:
             workflows = {}
-            ref = commit_sha or self.branch
-            base_path = self._workflows_base_path(git_folder=git_folder)
             
             try:
                 contents = self.repo.get_contents(base_path, ref=ref)
@@ -589,7 +906,70 @@ class GitHubService:
         except Exception as e:
             logger.error(f"Error reading file {file_path}: {str(e)}")
             return None
-    
+
+    async def get_files_content(
+        self,
+        file_paths: List[str],
+        ref: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get several JSON files at one ref with one tree call plus parallel blob reads.
+
+        Falls back to get_file_content per file when the tree cannot be read
+        in one call (truncated tree or API error).
+
+        Args:
+            file_paths: Relative paths from repo root
+            ref: Git ref (branch, commit SHA, etc.)
+
+        Returns:
+            Dict mapping file_path to parsed JSON; missing or invalid files are omitted
+        """
+        if not self.is_configured() or not self.repo or not file_paths:
+            return {}
+
+        ref = ref or self.branch
+        wanted = set(file_paths)
+        try:
+            async with self._http_client() as client:
+                response = await client.get(
+                    f"/repos/{self.repo_owner}/{self.repo_name}/git/trees/{ref}",
+                    params={"recursive": "1"},
+                )
+                if response.status_code == 404:
+                    return {}
+                response.raise_for_status()
+                tree = response.json()
+
+                if not tree.get("truncated"):
+                    sha_by_path = {
+                        entry["path"]: entry["sha"]
+                        for entry in tree.get("tree", [])
+                        if entry.get("type") == "blob" and entry.get("path") in wanted
+                    }
+                    semaphore = asyncio.Semaphore(settings.GITHUB_BLOB_FETCH_CONCURRENCY)
+
+                    async def fetch(path: str) -> Optional[Dict[str, Any]]:
+                        # Parsed per path (blob cache absorbs repeated SHAs) so callers
+                        # never share one dict between files
+                        async with semaphore:
+                            return await self._fetch_blob_json(client, sha_by_path[path], path)
+
+                    paths = list(sha_by_path)
+                    blobs = await asyncio.gather(*(fetch(path) for path in paths))
+                    return {path: data for path, data in zip(paths, blobs) if data}
+
+                logger.info(f"Git tree for {ref} is truncated, reading {len(wanted)} files one by one")
+        except httpx.HTTPError as e:
+            logger.warning(f"Bulk read of {len(wanted)} files at {ref} failed, reading one by one: {str(e)}")
+
+        files = {}
+        for path in file_paths:
+            data = await self.get_file_content(path, ref)
+            if data:
+                files[path] = data
+        return files
+
     async def write_workflow_file(
         self,
         canonical_id: str,
@@ -965,44 +1345,23 @@ class GitHubService:
             kind = manifest.get("kind", "snapshot")
             commit_message = f"Create {kind} snapshot {snapshot_id} for {env_type}"
 
-        try:
-            # Write manifest.json first
-            manifest_path = self._snapshot_manifest_path(env_type, snapshot_id)
-            manifest_content = json.dumps(manifest, indent=2, default=str)
-
-            self.repo.create_file(
-                path=manifest_path,
-                message=f"{commit_message} - manifest",
-                content=manifest_content,
-                branch=self.branch
-            )
-
-            # Write each workflow file
-            for workflow_key, workflow_data in workflows.items():
-                workflow_path = self._snapshot_workflow_path(env_type, snapshot_id, workflow_key)
-                workflow_content = json.dumps(workflow_data, indent=2)
-
-                self.repo.create_file(
-                    path=workflow_path,
-                    message=f"{commit_message} - {workflow_key}",
-                    content=workflow_content,
-                    branch=self.branch
-                )
-
-            # Get the final commit SHA
-            commits = self.repo.get_commits(
-                path=self._snapshot_base_path(env_type, snapshot_id),
-                sha=self.branch
-            )
-            commit_sha = commits[0].sha if commits.totalCount > 0 else None
-
-            logger.info(f"Created snapshot {snapshot_id} in {env_type} at commit {commit_sha}")
-            return commit_sha
+        # Manifest and workflow files land in a single commit
+        files = {
+            self._snapshot_manifest_path(env_type, snapshot_id): json.dumps(manifest, indent=2, default=str)
+        }
+        for workflow_key, workflow_data in workflows.items():
+            workflow_path = self._snapshot_workflow_path(env_type, snapshot_id, workflow_key)
+            files[workflow_path] = json.dumps(workflow_data, indent=2)
 
-        except GithubException as e:
+        try:
+            commit_sha = await self.commit_files(files, commit_message)
+        except httpx.HTTPError as e:
             logger.error(f"Failed to write snapshot {snapshot_id}: {str(e)}")
             raise
 
+        logger.info(f"Created snapshot {snapshot_id} in {env_type} at commit {commit_sha}")
+        return commit_sha
+
     async def read_snapshot_manifest(
         self,
         env_type: str,
@@ -1049,15 +1408,17 @@ class GitHubService:
         if not self.is_configured() or not self.repo:
             return {}
 
-        try:
-            workflows_path = f"{self._snapshot_base_path(env_type, snapshot_id)}/workflows"
+        workflows_path = f"{self._snapshot_base_path(env_type, snapshot_id)}/workflows"
 
-            try:
-                contents = self.repo.get_contents(workflows_path, ref=self.branch)
-            except GithubException as e:
-                if e.status == 404:
-                    return {}
-                raise
+        files = await self._read_json_tree(workflows_path, self.branch)
+        if files is not None:
+            return {
+                path.rsplit("/", 1)[-1].replace('.json', ''): workflow_data
+                for path, workflow_data in files.items()
+            }
+
+        try:
+            contents = self.repo.get_contents(workflows_path, ref=self.branch)
 
             if not isinstance(contents, list):
                 contents = [contents]
@@ -1074,6 +1435,8 @@ class GitHubService:
 
             return workflows
         except GithubException as e:
+            if e.status == 404:
+                return {}
             logger.error(f"Failed to read snapshot workflows: {str(e)}")
             return {}
 
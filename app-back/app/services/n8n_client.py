@@ -1,7 +1,184 @@
+import asyncio
+import base64
+import json
+import logging
 import httpx
-from typing import List, Dict, Any, Optional
+from contextlib import asynccontextmanager
+from typing import List, Dict, Any, Optional, AsyncIterator, Set
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+
+class _PooledSession:
+    """View over a pooled AsyncClient that caps in-flight requests per host."""
+
+    def __init__(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, pool: "N8NConnectionPool", host: str):
+        self._client = client
+        self._semaphore = semaphore
+        self._pool = pool
+        self._host = host
+
+    async def _send(self, method: str, *args, **kwargs) -> httpx.Response:
+        stats = self._pool._host_stats(self._host)
+        if self._semaphore.locked():
+            stats["throttled"] += 1
+        async with self._semaphore:
+            stats["requests"] += 1
+            stats["in_flight"] += 1
+            try:
+                return await getattr(self._client, method)(*args, **kwargs)
+            finally:
+                stats["in_flight"] -= 1
+
+    async def get(self, *args, **kwargs) -> httpx.Response:
+        return await self._send("get", *args, **kwargs)
+
+    async def post(self, *args, **kwargs) -> httpx.Response:
+        return await self._send("post", *args, **kwargs)
+
+    async def put(self, *args, **kwargs) -> httpx.Response:
+        return await self._send("put", *args, **kwargs)
+
+    async def patch(self, *args, **kwargs) -> httpx.Response:
+        return await self._send("patch", *args, **kwargs)
+
+    async def delete(self, *args, **kwargs) -> httpx.Response:
+        return await self._send("delete", *args, **kwargs)
+
+
+class N8NConnectionPool:
+    """
+    Shared keep-alive HTTP clients for N8N instances, one per base URL.
+
+    Every N8NClient talking to the same environment reuses one httpx.AsyncClient
+    (and therefore its TCP/TLS connections) instead of opening a new client per
+    call. Requests to a host are capped by a semaphore so a large sync cannot
+    flood a single N8N instance.
+
+    Clients are bound to the event loop that created them; a lookup from a
+    different loop replaces the stale entry and closes the old client.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._loops: Dict[str, asyncio.AbstractEventLoop] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._closing: Set[asyncio.Task] = set()
+
+    def _host_stats(self, host: str) -> Dict[str, int]:
+        if host not in self._stats:
+            self._stats[host] = {"hits": 0, "misses": 0, "requests": 0, "in_flight": 0, "throttled": 0}
+        return self._stats[host]
+
+    def _create_client(self) -> httpx.AsyncClient:
+        http2 = settings.N8N_HTTP2_ENABLED
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("N8N_HTTP2_ENABLED is set but the 'h2' package is not installed; using HTTP/1.1")
+                http2 = False
+        return httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.N8N_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.N8N_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.N8N_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+
+    def session(self, base_url: str) -> _PooledSession:
+        """Return a session for base_url, creating the pooled client on first use."""
+        host = base_url.rstrip("/")
+        stats = self._host_stats(host)
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(host)
+
+        if client is not None and self._loops.get(host) is loop and not client.is_closed:
+            stats["hits"] += 1
+        else:
+            stats["misses"] += 1
+            if client is not None:
+                self._retire_client(client, self._loops.get(host))
+            client = self._create_client()
+            self._clients[host] = client
+            self._loops[host] = loop
+            self._semaphores[host] = asyncio.Semaphore(settings.N8N_MAX_CONCURRENT_REQUESTS_PER_HOST)
+
+        return _PooledSession(client, self._semaphores[host], self, host)
+
+    def _retire_client(self, client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """Close a replaced client on the loop its connections belong to, where possible."""
+        if client.is_closed:
+            return
+        if loop is None or loop.is_closed():
+            # Its connections cannot be closed without their loop; drop the
+            # transport so the pool and its sockets are released
+            client._transport = None
+            client._mounts = {}
+            return
+        if loop.is_running():
+            asyncio.run_coroutine_threadsafe(self._close_client(client), loop)
+            return
+        task = asyncio.get_running_loop().create_task(self._close_client(client))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close_client(client: httpx.AsyncClient) -> None:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"Error closing stale N8N client: {str(e)}")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Pool hit/miss and request counters, per host and in total."""
+        totals = {"hits": 0, "misses": 0, "requests": 0, "in_flight": 0, "throttled": 0}
+        for stats in self._stats.values():
+            for key in totals:
+                totals[key] += stats[key]
+        return {
+            "open_clients": len(self._clients),
+            "totals": totals,
+            "hosts": {host: dict(stats) for host, stats in self._stats.items()},
+        }
+
+    async def aclose(self) -> None:
+        """Close every pooled client (called on app shutdown)."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self._semaphores.clear()
+        self._loops.clear()
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing pooled N8N client: {str(e)}")
+
+
+n8n_connection_pool = N8NConnectionPool()
+
+
+def _execution_id_after(execution_id: Any, since_id: str) -> bool:
+    """True if execution_id is newer than since_id (N8N ids are increasing integers)."""
+    if execution_id is None:
+        return False
+    try:
+        return int(execution_id) > int(since_id)
+    except (TypeError, ValueError):
+        return str(execution_id) != str(since_id) and str(execution_id) > str(since_id)
+
+
+def _execution_page_cursor(before_id: str, limit: int) -> str:
+    """Build the N8N paging cursor that lists executions older than before_id.
+
+    N8N's ``nextCursor`` is the base64-encoded JSON ``{"lastId", "limit"}`` and
+    selects executions with ``id < lastId``, so a read can resume from any ID.
+    """
+    return base64.b64encode(json.dumps({"lastId": str(before_id), "limit": limit}).encode()).decode()
+
 
 class N8NClient:
     """Client for interacting with N8N API"""
@@ -14,9 +191,14 @@ class N8NClient:
             "Content-Type": "application/json"
         }
 
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[_PooledSession]:
+        """Borrow the pooled connection for this N8N instance."""
+        yield n8n_connection_pool.session(self.base_url)
+
     async def get_workflows(self) -> List[Dict[str, Any]]:
         """Fetch all workflows from N8N"""
-        async with httpx.AsyncClient() as client:
+        async with self._session() as client:
             response = await client.get(
                 f"{self.base_url}/api/v1/workflows",
                 headers=self.headers,
@@ -28,7 +210,7 @@ class N8NClient:
 
     async def get_workflow(self, workflow_id: str) -> Dict[str, Any]:
         """Get a specific workflow by ID"""
-        async with httpx.AsyncClient() as client:
+        async with self._session() as client:
             response = await client.get(
                 f"{self.base_url}/api/v1/workflows/{workflow_id}",
                 headers=self.headers,
@@ -70,7 +252,7 @@ class N8NClient:
             print(f"ERROR: Data keys: {list(cleaned_data.keys())}")
             raise ValueError(error_msg) from json_error
         
-        async with httpx.AsyncClient() as client:
+        async with self._session() as client:
             try:
                 # Use pre-serialized JSON content to avoid Windows errno 22 issues
                 # This bypasses httpx's internal JSON serialization which can fail on Windows
@@ -183,7 +365,7 @@ class N8NClient:
             print(f"ERROR: Data keys: {list(cleaned_data.keys())}")
             raise ValueError(error_msg) from json_error
 
-        async with httpx.AsyncClient() as client:
+        async with self._session() as client:
             try:
                 # Use pre-serialized JSON content to avoid Windows errno 22 issues
                 # This bypasses httpx's internal JSON serialization which can fail on Windows
@@ -249,7 +431,7 @@ class N8NClient:
 
     async def delete_workflow(self, workflow_id: str) -> bool:
         """Delete a workflow"""
-        async with httpx.AsyncClient() as client:
+        async with self._session() as client:
             response = await client.delete(
                 f"{self.base_url}/api/v1/workflows/{workflow_id}",
                 headers=self.headers,
@@ -260,7 +442,7 @@ class N8NClient:
 
     async def update_workflow_tags(self, workflow_id: str, tag_ids: List[str]) -> Dict[str, Any]:
         """Update workflow tags"""
-        async with httpx.AsyncClient() as client:
+        async with self._session() as client:
             tag_objects = [{"id": tag_id} for tag_id in tag_ids]
             response = await client.put(
                 f"{self.base_url}/api/v1/workflows/{workflow_id}/tags",
@@ -273,7 +455,7 @@ class N8NClient:
 
     async def activate_workflow(self, workflow_id: str) -> Dict[str, Any]:
         """Activate a workflow"""
-        async with httpx.AsyncClient() as client:
+        async with self._session() as client:
             response = await client.post(
                 f"{self.base_url}/api/v1/workflows/{workflow_id}/activate",
                 headers=self.headers,
@@ -285,7 +467,7 @@ class N8NClient:
 
     async def deactivate_workflow(self, workflow_id: str) -> Dict[str, Any]:
         """Deactivate a workflow"""
-        async with httpx.AsyncClient() as client:
+        async with self._session() as client:
             response = await client.post(
                 f"{self.base_url}/api/v1/workflows/{workflow_id}/deactivate",
                 headers=self.headers,
@@ -297,7 +479,7 @@ class N8NClient:
     async def test_connection(self) -> bool:
         """Test if the N8N instance is reachable and credentials are valid"""
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._session() as client:
                 response = await client.get(
                     f"{self.base_url}/api/v1/workflows",
                     headers=self.headers,
@@ -328,7 +510,7 @@ class N8NClient:
         cursor = None
         page_num = 0
 
-        async with httpx.AsyncClient() as client:
+        async with self._session() as client:
             # N8N API returns executions sorted by most recent first.
             while len(all_executions) < limit:
                 page_num += 1
@@ -399,6 +581,77 @@ class N8NClient:
             logger.info(f"Total executions fetched: {len(all_executions)} across {page_num} page(s)")
             return all_executions[:limit]  # Trim to requested limit
 
+    async def get_execution(self, execution_id: str) -> Dict[str, Any]:
+        """Get a specific execution by ID"""
+        async with self._session() as client:
+            response = await client.get(
+                f"{self.base_url}/api/v1/executions/{execution_id}",
+                headers=self.headers,
+                timeout=30.0
+            )
+            response.raise_for_status()
+            return response.json()
+
+    async def iter_executions(
+        self,
+        since_id: Optional[str] = None,
+        page_size: int = 250,
+        max_executions: Optional[int] = None,
+        before_id: Optional[str] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield pages of executions newer than since_id, newest first.
+
+        N8N returns executions in descending id order and pages with
+        ``nextCursor``. Paging starts below before_id when given and stops
+        at the first execution at or below since_id, when the cursor runs
+        out, or once max_executions have been yielded. Pages are yielded as
+        they arrive so callers can persist them without holding the whole
+        window in memory.
+        """
+        page_size = min(page_size, 250)  # N8N max per-page limit
+        cursor = _execution_page_cursor(before_id, page_size) if before_id is not None else None
+        yielded = 0
+
+        async with self._session() as client:
+            while True:
+                params: Dict[str, Any] = {"limit": page_size}
+                if cursor:
+                    params["cursor"] = cursor
+
+                response = await client.get(
+                    f"{self.base_url}/api/v1/executions",
+                    headers=self.headers,
+                    params=params,
+                    timeout=30.0
+                )
+                response.raise_for_status()
+                response_data = response.json()
+
+                if isinstance(response_data, dict):
+                    page = response_data.get("data", []) or []
+                    cursor = response_data.get("nextCursor")
+                else:
+                    page = response_data if isinstance(response_data, list) else []
+                    cursor = None
+
+                reached_mark = False
+                if since_id is not None:
+                    newer = [e for e in page if _execution_id_after(e.get("id"), since_id)]
+                    reached_mark = len(newer) < len(page)
+                    page = newer
+
+                if max_executions is not None:
+                    page = page[:max_executions - yielded]
+
+                if page:
+                    yielded += len(page)
+                    yield page
+
+                if reached_mark or not cursor or not page:
+                    break
+                if max_executions is not None and yielded >= max_executions:
+                    break
+
     async def get_credentials(self) -> List[Dict[str, Any]]:
         """Fetch all credentials from N8N via the credentials API.
 
@@ -409,7 +662,7 @@ class N8NClient:
         logger = logging.getLogger(__name__)
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._session() as client:
                 response = await client.get(
                     f"{self.base_url}/api/v1/credentials",
                     headers=self.headers,
@@ -532,7 +785,7 @@ class N8NClient:
 
     async def get_credential(self, credential_id: str) -> Dict[str, Any]:
         """Get a specific credential by ID (metadata only, no secret data)"""
-        async with httpx.AsyncClient() as client:
+        async with self._session() as client:
             response = await client.get(
                 f"{self.base_url}/api/v1/credentials/{credential_id}",
                 headers=self.headers,
@@ -553,7 +806,7 @@ class N8NClient:
         Returns:
             Created credential metadata (without secret data)
         """
-        async with httpx.AsyncClient() as client:
+        async with self._session() as client:
             response = await client.post(
                 f"{self.base_url}/api/v1/credentials",
                 headers=self.headers,
@@ -575,7 +828,7 @@ class N8NClient:
         Returns:
             Updated credential metadata
         """
-        async with httpx.AsyncClient() as client:
+        async with self._session() as client:
             response = await client.patch(
                 f"{self.base_url}/api/v1/credentials/{credential_id}",
                 headers=self.headers,
@@ -594,7 +847,7 @@ class N8NClient:
         Returns:
             True if successful
         """
-        async with httpx.AsyncClient() as client:
+        async with self._session() as client:
             response = await client.delete(
                 f"{self.base_url}/api/v1/credentials/{credential_id}",
                 headers=self.headers,
@@ -610,7 +863,7 @@ class N8NClient:
         build forms for creating new credentials.
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._session() as client:
                 response = await client.get(
                     f"{self.base_url}/api/v1/credentials/schema",
                     headers=self.headers,
@@ -628,7 +881,7 @@ class N8NClient:
         import logging
         logger = logging.getLogger(__name__)
         
-        async with httpx.AsyncClient() as client:
+        async with self._session() as client:
             try:
                 response = await client.get(
                     f"{self.base_url}/api/v1/users",
@@ -672,7 +925,7 @@ class N8NClient:
 
     async def get_tags(self) -> List[Dict[str, Any]]:
         """Fetch all tags from N8N instance"""
-        async with httpx.AsyncClient() as client:
+        async with self._session() as client:
             try:
                 response = await client.get(
                     f"{self.base_url}/api/v1/tags",
@@ -7,6 +7,8 @@ import logging
 import math
 
 from app.services.database import db_service
+from app.services.error_classifier import classify_error, classify_errors
+from app.services.execution_aggregation import time_buckets
 from app.services.provider_registry import ProviderRegistry
 from app.services.notification_service import notification_service
 
@@ -413,10 +415,11 @@ class ObservabilityService:
 
         This is the fallback method when SQL aggregation is not available.
         Supports limiting the number of executions processed for safety.
+        Bucketing is columnar (see execution_aggregation.time_buckets).
         """
         try:
             query = db_service.client.table("executions").select(
-                "id, status, started_at, finished_at, duration_ms"
+                "status, started_at, duration_ms"
             ).eq("tenant_id", tenant_id).gte("started_at", time_range_start.isoformat()).lte("started_at", time_range_end.isoformat())
 
             if environment_id:
@@ -434,58 +437,7 @@ class ObservabilityService:
             logger.error(f"Failed to fetch executions for sparkline: {e}")
             all_executions = []
 
-        # Initialize buckets for each interval
-        buckets = []
-        for i in range(intervals):
-            bucket_start = time_range_start + (i * interval_delta)
-            bucket_end = bucket_start + interval_delta
-            buckets.append({
-                "start": bucket_start,
-                "end": bucket_end,
-                "total": 0,
-                "successes": 0,
-                "failures": 0,
-                "durations": [],
-                "avg_duration": 0
-            })
-
-        # Distribute executions into buckets
-        for execution in all_executions:
-            started_at_str = execution.get("started_at")
-            if not started_at_str:
-                continue
-
-            try:
-                from dateutil import parser
-                exec_time = parser.parse(started_at_str)
-                if exec_time.tzinfo is None:
-                    exec_time = exec_time.replace(tzinfo=timezone.utc)
-            except Exception:
-                continue
-
-            # Find the bucket this execution belongs to
-            for bucket in buckets:
-                if bucket["start"] <= exec_time < bucket["end"]:
-                    bucket["total"] += 1
-                    if execution.get("status") == "success":
-                        bucket["successes"] += 1
-                    elif execution.get("status") == "error":
-                        bucket["failures"] += 1
-
-                    duration = execution.get("duration_ms")
-                    if duration is not None and isinstance(duration, (int, float)):
-                        bucket["durations"].append(duration)
-                    break
-
-        # Calculate average durations
-        for bucket in buckets:
-            durations = bucket.get("durations", [])
-            bucket["avg_duration"] = (sum(durations) / len(durations)) if durations else 0
-            # Remove durations list to match SQL bucket format
-            del bucket["durations"]
-            del bucket["end"]
-
-        return buckets
+        return time_buckets(all_executions, time_range_start, interval_delta, intervals)
 
     async def get_kpi_metrics(
         self,
@@ -686,46 +638,7 @@ class ObservabilityService:
         Returns:
             tuple: (error_type, is_classified) - is_classified is False if using fallback
         """
-        if not error_message:
-            return ("Unknown Error", False)
-
-        error_lower = error_message.lower()
-
-        # Credential / Auth errors
-        if any(kw in error_lower for kw in ["credential", "authentication", "unauthorized", "auth", "api key", "token expired", "invalid token"]):
-            return ("Credential Error", True)
-        # Timeout errors
-        elif any(kw in error_lower for kw in ["timeout", "timed out", "deadline exceeded", "request timeout"]):
-            return ("Timeout", True)
-        # Connection / Network errors
-        elif any(kw in error_lower for kw in ["connection", "network", "econnrefused", "econnreset", "enotfound", "dns", "socket", "unreachable"]):
-            return ("Connection Error", True)
-        # HTTP 5xx errors
-        elif any(kw in error_lower for kw in ["500", "502", "503", "504", "internal server error", "bad gateway", "service unavailable"]):
-            return ("HTTP 5xx", True)
-        # HTTP 4xx errors
-        elif any(kw in error_lower for kw in ["404", "not found", "resource not found"]):
-            return ("HTTP 404", True)
-        elif any(kw in error_lower for kw in ["400", "bad request"]):
-            return ("HTTP 400", True)
-        # Rate limiting
-        elif any(kw in error_lower for kw in ["rate limit", "429", "too many requests", "throttl"]):
-            return ("Rate Limit", True)
-        # Permission errors
-        elif any(kw in error_lower for kw in ["permission", "forbidden", "403", "access denied"]):
-            return ("Permission Error", True)
-        # Validation errors
-        elif any(kw in error_lower for kw in ["validation", "invalid", "required field", "missing field", "schema"]):
-            return ("Validation Error", True)
-        # Node-specific errors
-        elif any(kw in error_lower for kw in ["node", "execution failed", "workflow error"]):
-            return ("Node Error", True)
-        # Data/parsing errors
-        elif any(kw in error_lower for kw in ["json", "parse", "syntax", "undefined", "null"]):
-            return ("Data Error", True)
-        else:
-            # Fallback - mark as unclassified so UI can show sample message
-            return ("Execution Error", False)
+        return classify_error(error_message)
 
     async def get_error_intelligence(
         self,
@@ -824,6 +737,7 @@ class ObservabilityService:
             "is_classified": True
         })
 
+        error_messages = []
         for execution in failed_executions:
             error_data = execution.get("data") or {}
             error_msg = ""
@@ -833,8 +747,13 @@ class ObservabilityService:
                     error_msg = error_obj.get("message", "")
                 elif isinstance(error_obj, str):
                     error_msg = error_obj
+            error_messages.append(error_msg)
+
+        classifications = classify_errors(error_messages)
 
-            error_type, is_classified = self._classify_error(error_msg)
+        for execution, error_msg, (error_type, is_classified) in zip(
+            failed_executions, error_messages, classifications
+        ):
             exec_time = execution.get("started_at") or execution.get("finished_at")
 
             group = error_groups[error_type]
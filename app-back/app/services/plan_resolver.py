@@ -22,14 +22,17 @@ from datetime import datetime, timezone
 from typing import Any, Optional
 from uuid import UUID
 
+from app.core.config import settings
 from app.services.database import db_service
+from app.services.auth_service import principal_cache
+from app.services.ttl_cache import TTLCache
 
 
 # Valid active statuses
 ACTIVE_STATUSES = ("active", "trialing")
 
 # Cache for plan precedence (loaded from database)
-_plan_precedence_cache: dict[str, int] = {}
+_plan_precedence_cache = TTLCache(max_entries=256, ttl_seconds=settings.PLAN_METADATA_CACHE_TTL_SECONDS)
 
 
 def _normalize_plan_name(plan_name: Optional[str]) -> str:
@@ -47,25 +50,31 @@ async def _get_plan_rank(plan_name: str, db: Any = None) -> int:
     normalized = _normalize_plan_name(plan_name)
     
     # Check cache first
-    if normalized in _plan_precedence_cache:
-        return _plan_precedence_cache[normalized]
+    cached = _plan_precedence_cache.get(normalized)
+    if cached is not None:
+        return cached
     
     # Fetch from database
     try:
         response = db.client.table("plans").select("precedence").eq("name", normalized).single().execute()
         if response.data:
             precedence = response.data.get("precedence", 0)
-            _plan_precedence_cache[normalized] = precedence
+            _plan_precedence_cache.set(normalized, precedence)
             return precedence
     except Exception:
         pass
     
     # Fallback to default (0 for free, or unknown plans)
     default = 0 if normalized == "free" else 0
-    _plan_precedence_cache[normalized] = default
+    _plan_precedence_cache.set(normalized, default)
     return default
 
 
+def clear_plan_precedence_cache() -> None:
+    """Forget cached plan precedence values (call after editing plans)."""
+    _plan_precedence_cache.clear()
+
+
 def _is_subscription_active(subscription: dict, now: datetime) -> bool:
     """
     Check if a subscription is currently active.
@@ -223,5 +232,6 @@ async def sync_legacy_fields(tenant_id: UUID | str, plan_name: str) -> None:
         db_service.client.table("tenants").update({
             "subscription_tier": plan_name
         }).eq("id", tenant_id_str).execute()
+        principal_cache.invalidate_tenant(tenant_id_str)
     except Exception:
         pass  # Non-critical, legacy field
@@ -54,8 +54,11 @@ import json
 import logging
 import asyncio
 import httpx
+from dataclasses import dataclass
 from uuid import uuid4
 
+from app.core.config import settings
+
 from app.services.provider_registry import ProviderRegistry
 from app.services.github_service import GitHubService
 from app.services.database import db_service
@@ -87,77 +90,136 @@ from app.services.drift_policy_enforcement import (
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class DeployOutcome:
+    """Result of deploying one prepared workflow during promotion."""
+
+    started: bool = False
+    error: Optional[Exception] = None
+    target_workflow_id: Optional[str] = None
+
+
+class TargetWorkflowInventory:
+    """
+    Target environment workflows, listed once per promotion and indexed by
+    ID and by normalized content hash for idempotency checks.
+    """
+
+    def __init__(self, workflows: List[Dict[str, Any]]):
+        from app.services.canonical_workflow_service import compute_workflow_hash
+
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._hashes = set()
+        for workflow in workflows:
+            if workflow.get("id"):
+                self._by_id[str(workflow["id"])] = workflow
+            self._hashes.add(compute_workflow_hash(workflow, memoize=True))
+
+    @classmethod
+    async def load(cls, target_adapter: Any) -> Optional["TargetWorkflowInventory"]:
+        """List target workflows once; None if the listing fails (checks fall back per workflow)."""
+        try:
+            return cls(await target_adapter.get_workflows() or [])
+        except Exception as e:
+            logger.warning(f"Failed to list target workflows for idempotency checks: {e}")
+            return None
+
+    def get(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        return self._by_id.get(str(workflow_id))
+
+    def has_hash(self, content_hash: str) -> bool:
+        return content_hash in self._hashes
+
+    def record(self, content_hash: str) -> None:
+        """Note content queued for the target so identical workflows later in the same promotion are skipped."""
+        self._hashes.add(content_hash)
+
+
+# Fields to exclude from comparison (metadata that differs between envs)
+_COMPARISON_EXCLUDED_FIELDS = frozenset([
+    'id', 'createdAt', 'updatedAt', 'versionId',
+    'triggerCount', 'staticData', 'meta', 'hash',
+    'executionOrder', 'homeProject', 'sharedWithProjects',
+    # GitHub/sync metadata
+    '_comment', 'pinData',
+    # Additional runtime fields
+    'active',  # Active state may differ between environments
+    # Tags have different IDs per environment
+    'tags', 'tagIds',
+    # Sharing/permission info differs
+    'shared', 'scopes', 'usedCredentials',
+])
+
+# Environment-specific settings
+_COMPARISON_EXCLUDED_SETTINGS = frozenset([
+    'executionOrder', 'saveDataErrorExecution', 'saveDataSuccessExecution',
+    'callerPolicy', 'timezone', 'saveManualExecutions',
+    # n8n settings where null and false are semantically equivalent
+    'availableInMCP',
+])
+
+# Node position and UI/execution-specific fields
+_COMPARISON_EXCLUDED_NODE_FIELDS = frozenset([
+    'position', 'positionAbsolute', 'selected', 'selectedNodes',
+    'executionData', 'typeVersion', 'onError', 'id',
+    'webhookId', 'extendsCredential', 'notesInFlow',
+])
+
+
+def _normalize_node_for_comparison(node: Dict[str, Any]) -> Dict[str, Any]:
+    normalized_node = {
+        key: value for key, value in node.items()
+        if key not in _COMPARISON_EXCLUDED_NODE_FIELDS
+    }
+    credentials = normalized_node.get('credentials')
+    if isinstance(credentials, dict):
+        # Normalize credentials - only compare by name, not ID
+        normalized_node['credentials'] = {
+            cred_type: {'name': cred_ref.get('name')} if isinstance(cred_ref, dict) else cred_ref
+            for cred_type, cred_ref in credentials.items()
+        }
+    return normalized_node
+
+
 def normalize_workflow_for_comparison(workflow: Dict[str, Any]) -> Dict[str, Any]:
     """
     Normalize workflow data for comparison by removing metadata fields
     that differ between environments but don't represent actual changes.
+
+    The normalized structure is built in a single pass instead of
+    deep-copying the workflow first. The input is never modified; the
+    top-level dict, settings, nodes and node credentials are new objects,
+    while untouched nested values (node parameters, connections) are shared
+    with the input, so treat the result as read-only.
     """
-    # Create a deep copy to avoid modifying the original
-    normalized = json.loads(json.dumps(workflow))
-    
-    # Fields to exclude from comparison (metadata that differs between envs)
-    exclude_fields = [
-        'id', 'createdAt', 'updatedAt', 'versionId', 
-        'triggerCount', 'staticData', 'meta', 'hash',
-        'executionOrder', 'homeProject', 'sharedWithProjects',
-        # GitHub/sync metadata
-        '_comment', 'pinData',
-        # Additional runtime fields
-        'active',  # Active state may differ between environments
-        # Tags have different IDs per environment
-        'tags', 'tagIds',
-        # Sharing/permission info differs
-        'shared', 'scopes', 'usedCredentials',
-    ]
-    
-    for field in exclude_fields:
-        normalized.pop(field, None)
-    
+    normalized = {
+        key: value for key, value in workflow.items()
+        if key not in _COMPARISON_EXCLUDED_FIELDS
+    }
+
     # Normalize settings - remove environment-specific settings
-    if 'settings' in normalized and isinstance(normalized['settings'], dict):
-        settings_exclude = [
-            'executionOrder', 'saveDataErrorExecution', 'saveDataSuccessExecution',
-            'callerPolicy', 'timezone', 'saveManualExecutions',
-            # n8n settings where null and false are semantically equivalent
-            'availableInMCP',
-        ]
-        for field in settings_exclude:
-            normalized['settings'].pop(field, None)
+    settings_value = normalized.get('settings')
+    if isinstance(settings_value, dict):
+        kept_settings = {
+            key: value for key, value in settings_value.items()
+            if key not in _COMPARISON_EXCLUDED_SETTINGS
+        }
         # If settings is now empty, remove it entirely
-        if not normalized['settings']:
-            normalized.pop('settings', None)
-    
-    # Normalize nodes to remove UI/execution-specific data
-    if 'nodes' in normalized and isinstance(normalized['nodes'], list):
-        for node in normalized['nodes']:
-            # Remove position and UI-specific fields
-            ui_fields = [
-                'position', 'positionAbsolute', 'selected', 'selectedNodes',
-                'executionData', 'typeVersion', 'onError', 'id',
-                'webhookId', 'extendsCredential', 'notesInFlow',
-            ]
-            for field in ui_fields:
-                node.pop(field, None)
-            
-            # Normalize credentials - only compare by name, not ID
-            if 'credentials' in node and isinstance(node['credentials'], dict):
-                normalized_creds = {}
-                for cred_type, cred_ref in node['credentials'].items():
-                    if isinstance(cred_ref, dict):
-                        # Keep only name for comparison (ID differs between envs)
-                        normalized_creds[cred_type] = {'name': cred_ref.get('name')}
-                    else:
-                        normalized_creds[cred_type] = cred_ref
-                node['credentials'] = normalized_creds
-        
-        # Sort nodes by name for consistent comparison (order may differ)
-        normalized['nodes'] = sorted(normalized['nodes'], key=lambda n: n.get('name', ''))
-    
-    # Normalize connections - sort for consistent comparison
-    if 'connections' in normalized and isinstance(normalized['connections'], dict):
-        # Connections structure should be compared by content, not order
-        pass  # JSON dumps with sort_keys handles this
-    
+        if kept_settings:
+            normalized['settings'] = kept_settings
+        else:
+            normalized.pop('settings')
+
+    # Normalize nodes to remove UI/execution-specific data, then sort by
+    # name for consistent comparison (order may differ)
+    nodes = normalized.get('nodes')
+    if isinstance(nodes, list):
+        normalized['nodes'] = sorted(
+            (_normalize_node_for_comparison(node) for node in nodes),
+            key=lambda n: n.get('name', ''),
+        )
+
+    # Connections are compared by content: JSON dumps with sort_keys handles ordering
     return normalized
 
 
@@ -2085,47 +2147,15 @@ class PromotionService:
         # Get GitHub service for source environment
         source_github = self._get_github_service(source_env)
 
+        # Loaded once here and reused when updating Git state after promotion
+        source_mappings: Optional[List[Dict[str, Any]]] = None
+        source_git_states: Dict[str, Dict[str, Any]] = {}
+
         source_git_folder = source_env.get("git_folder")
         if source_git_folder:
-            from app.services.canonical_workflow_service import CanonicalWorkflowService
-
-            canonical_workflows = await CanonicalWorkflowService.list_canonical_workflows(tenant_id)
-
-            for canonical in canonical_workflows:
-                canonical_id = canonical["canonical_id"]
-
-                # Get Git state for source environment
-                git_state = await CanonicalWorkflowService.get_canonical_workflow_git_state(
-                    tenant_id, source_env_id, canonical_id
-                )
-
-                if not git_state:
-                    continue
-
-                # Load workflow from Git
-                workflow_data = await source_github.get_file_content(
-                    git_state["git_path"],
-                    git_state.get("git_commit_sha") or source_env.get("git_branch", "main")
-                )
-
-                if workflow_data:
-                    # Remove metadata (keep pure n8n format)
-                    workflow_data.pop("_comment", None)
-
-                    # Get mapping to find n8n_workflow_id for matching
-                    mappings = await db_service.get_workflow_mappings(
-                        tenant_id=tenant_id,
-                        environment_id=source_env_id,
-                        canonical_id=canonical_id
-                    )
-
-                    # Use n8n_workflow_id as key for compatibility with existing code
-                    if mappings and mappings[0].get("n8n_workflow_id"):
-                        n8n_id = mappings[0]["n8n_workflow_id"]
-                        source_workflow_map[n8n_id] = workflow_data
-                    else:
-                        # Fallback: use canonical_id as key
-                        source_workflow_map[canonical_id] = workflow_data
+            source_workflow_map, source_mappings, source_git_states = await self._load_canonical_source_workflows(
+                tenant_id, source_env_id, source_env, source_github
+            )
         else:
             source_env_type = source_env.get("n8n_type")
             if not source_env_type:
@@ -2169,17 +2199,28 @@ class PromotionService:
         # ============================================================================
         # INVARIANT: This loop maintains atomic semantics (all-or-nothing)
         #
-        # Atomic promotion behavior: All workflows promoted atomically. On first failure:
-        #   1. Stop further promotions immediately
+        # Atomic promotion behavior: All workflows promoted atomically. Workflows are
+        # first prepared (policy, idempotency, credential rewrite) without touching
+        # the target, then deployed with bounded parallelism. On first failure:
+        #   1. Start no further deploys (in-flight deploys are allowed to settle)
         #   2. Restore all successfully promoted workflows from pre-promotion snapshot
         #   3. Record rollback outcome in audit log
         #   4. Return FAILED status with complete rollback information
         #
-        # Track successfully promoted workflows for rollback
+        # Track successfully promoted workflows for rollback (in selection order)
         successfully_promoted_workflow_ids = []
         # ============================================================================
 
-        # Promote each selected workflow
+        # Target inventory is listed once and shared by every idempotency check
+        target_inventory: Optional[TargetWorkflowInventory] = None
+        if any(selection.selected for selection in workflow_selections):
+            target_inventory = await TargetWorkflowInventory.load(target_adapter)
+
+        # Workflows that passed policy and idempotency checks, in selection order
+        deploy_queue: List[Tuple[WorkflowSelection, Dict[str, Any]]] = []
+        failed_workflow_names: List[str] = []
+
+        # Prepare each selected workflow (no target mutations)
         for selection in workflow_selections:
             if not selection.selected:
                 workflows_skipped += 1
@@ -2271,39 +2312,34 @@ class PromotionService:
                 # Check if target has workflow with same content hash
                 # Two approaches:
                 # 1. Check by workflow ID if it's an update (change_type != NEW)
-                # 2. Check all target workflows if it's a new workflow (more expensive)
+                # 2. Check all target workflows if it's a new workflow (via the inventory hash index)
 
                 skip_due_to_idempotency = False
 
                 if selection.change_type == WorkflowChangeType.NEW:
                     # For new workflows, check if any workflow in target has same content
-                    try:
-                        target_workflows = await target_adapter.get_workflows()
-                        for target_wf in target_workflows:
-                            target_hash = compute_workflow_hash(target_wf)
-                            if target_hash == source_workflow_hash:
-                                skip_due_to_idempotency = True
-                                workflows_skipped += 1
-                                warnings.append(
-                                    f"Workflow {selection.workflow_name} already exists in target "
-                                    f"with identical content (hash: {source_workflow_hash[:12]}...)"
-                                )
-                                logger.info(
-                                    f"Skipping {selection.workflow_name} due to idempotency: "
-                                    f"identical content already exists in target"
-                                )
-                                break
-                    except Exception as e:
-                        logger.warning(f"Failed to check idempotency for {selection.workflow_name}: {e}")
-                        # Don't fail promotion if idempotency check fails, continue with normal flow
+                    if target_inventory and target_inventory.has_hash(source_workflow_hash):
+                        skip_due_to_idempotency = True
+                        workflows_skipped += 1
+                        warnings.append(
+                            f"Workflow {selection.workflow_name} already exists in target "
+                            f"with identical content (hash: {source_workflow_hash[:12]}...)"
+                        )
+                        logger.info(
+                            f"Skipping {selection.workflow_name} due to idempotency: "
+                            f"identical content already exists in target"
+                        )
                 else:
                     # For updates/modifications, check if the specific workflow has same content
                     workflow_id = workflow_data.get("id")
                     if workflow_id:
                         try:
-                            existing_workflow = await target_adapter.get_workflow(workflow_id)
+                            existing_workflow = target_inventory.get(workflow_id) if target_inventory else None
+                            if existing_workflow is None:
+                                # The listing may stop at one page; ask for the workflow directly
+                                existing_workflow = await target_adapter.get_workflow(workflow_id)
                             if existing_workflow:
-                                target_hash = compute_workflow_hash(existing_workflow)
+                                target_hash = compute_workflow_hash(existing_workflow, memoize=True)
                                 if target_hash == source_workflow_hash:
                                     skip_due_to_idempotency = True
                                     workflows_skipped += 1
@@ -2322,6 +2358,8 @@ class PromotionService:
                 # Skip to next workflow if idempotency check passed
                 if skip_due_to_idempotency:
                     continue
+                if target_inventory is not None:
+                    target_inventory.record(source_workflow_hash)
                 # ====================================================================
 
                 # Apply enabled/disabled state
@@ -2382,232 +2420,157 @@ class PromotionService:
                         logger.error(f"Failed to rewrite credentials for {selection.workflow_name}: {e}")
                         errors.append(f"Credential rewrite failed for {selection.workflow_name}: {str(e)}")
 
-                # Write to target provider - check if workflow exists first
-                workflow_id = workflow_data.get("id")
-                
-                # Determine if this is a new workflow or an update
-                is_new_workflow = selection.change_type == WorkflowChangeType.NEW
-                
-                if is_new_workflow:
-                    # Create new workflow in target
-                    logger.info(f"Creating new workflow: {selection.workflow_name}")
-                    await target_adapter.create_workflow(workflow_data)
-                else:
-                    # Try to update existing workflow, fall back to create if not found
-                    try:
-                        await target_adapter.update_workflow(workflow_id, workflow_data)
-                    except Exception as update_error:
-                        # Check if it's a 404 (workflow doesn't exist) or 400 (bad request which could mean not found)
-                        error_str = str(update_error).lower()
-                        if '404' in error_str or '400' in error_str:
-                            logger.info(f"Workflow {selection.workflow_name} not found in target, creating new")
-                            await target_adapter.create_workflow(workflow_data)
-                        else:
-                            raise
-                
-                workflows_promoted += 1
-
-                # Track successfully promoted workflow for rollback (T003)
-                successfully_promoted_workflow_ids.append(selection.workflow_id)
+                deploy_queue.append((selection, workflow_data))
 
-                # Update sidecar file after successful promotion
-                try:
-                    # Find canonical_id for this workflow
-                    # Look up by n8n_workflow_id in source environment
-                    canonical_id = None
-                    source_mappings = await db_service.get_workflow_mappings(
-                        tenant_id=tenant_id,
-                        environment_id=source_env_id
-                    )
-                    for mapping in source_mappings:
-                        if mapping.get("n8n_workflow_id") == selection.workflow_id:
-                            canonical_id = mapping.get("canonical_id")
-                            break
-                    
-                    # If not found, try to find by matching workflow content hash
-                    if not canonical_id:
-                        from app.services.canonical_workflow_service import compute_workflow_hash
-                        workflow_hash = compute_workflow_hash(workflow_data)
-                        
-                        # Check all canonical workflows for matching hash
-                        for canonical in canonical_workflows:
-                            git_state = await CanonicalWorkflowService.get_canonical_workflow_git_state(
-                                tenant_id, source_env_id, canonical["canonical_id"]
-                            )
-                            if git_state and git_state.get("git_content_hash") == workflow_hash:
-                                canonical_id = canonical["canonical_id"]
-                                break
-                    
-                    if canonical_id:
-                        # Get target n8n_workflow_id (from the created/updated workflow)
-                        target_workflow = await target_adapter.get_workflow(workflow_id)
-                        target_n8n_id = target_workflow.get("id") if target_workflow else workflow_id
-                        
-                        # Compute content hash
-                        from app.services.canonical_workflow_service import compute_workflow_hash
-                        content_hash = compute_workflow_hash(workflow_data)
-                        
-                        # Update or create mapping
-                        from app.services.canonical_env_sync_service import CanonicalEnvSyncService
-                        from app.schemas.canonical_workflow import WorkflowMappingStatus
-                        await CanonicalEnvSyncService._create_workflow_mapping(
-                            tenant_id=tenant_id,
-                            environment_id=target_env_id,
-                            canonical_id=canonical_id,
-                            n8n_workflow_id=target_n8n_id,
-                            content_hash=content_hash,
-                            status=WorkflowMappingStatus.LINKED,
-                            linked_by_user_id=None  # TODO: Get from auth
-                        )
-                        
-                        # Update sidecar file in Git
-                        target_git_folder = target_env.get("git_folder")
-                        if target_git_folder:
-                            target_github = self._get_github_service(target_env)
-                            
-                            # Get existing sidecar or create new
-                            git_state = await CanonicalWorkflowService.get_canonical_workflow_git_state(
-                                tenant_id, target_env_id, canonical_id
-                            )
-                            
-                            if git_state:
-                                sidecar_path = git_state["git_path"].replace('.json', '.env-map.json')
-                                
-                                # Get existing sidecar or create new structure
-                                sidecar_data = await target_github.get_file_content(sidecar_path) or {
-                                    "canonical_workflow_id": canonical_id,
-                                    "workflow_name": workflow_data.get("name", "Unknown"),
-                                    "environments": {}
-                                }
-                                
-                                # Update target environment mapping
-                                if "environments" not in sidecar_data:
-                                    sidecar_data["environments"] = {}
-                                
-                                sidecar_data["environments"][target_env_id] = {
-                                    "n8n_workflow_id": target_n8n_id,
-                                    "content_hash": f"sha256:{content_hash}",
-                                    "last_seen_at": datetime.utcnow().isoformat()
-                                }
-                                
-                                # Write sidecar file
-                                await target_github.write_sidecar_file(
-                                    canonical_id=canonical_id,
-                                    sidecar_data=sidecar_data,
-                                    git_folder=target_git_folder,
-                                    commit_message=f"Update sidecar after promotion: {workflow_data.get('name', 'Unknown')}"
-                                )
-                                
-                                # Update canonical_workflow_git_state for target environment
-                                git_path = git_state.get("git_path") or f"workflows/{target_git_folder}/{canonical_id}.json"
-                                db_service.client.table("canonical_workflow_git_state").upsert({
-                                    "tenant_id": tenant_id,
-                                    "environment_id": target_env_id,
-                                    "canonical_id": canonical_id,
-                                    "git_path": git_path,
-                                    "git_content_hash": content_hash,
-                                    "last_repo_sync_at": datetime.utcnow().isoformat()
-                                }, on_conflict="tenant_id,environment_id,canonical_id").execute()
-                                logger.info(f"Updated git_state for {canonical_id} in target env {target_env_id}")
-                            else:
-                                # No existing git_state - create new one
-                                git_path = f"workflows/{target_git_folder}/{canonical_id}.json"
-                                db_service.client.table("canonical_workflow_git_state").upsert({
-                                    "tenant_id": tenant_id,
-                                    "environment_id": target_env_id,
-                                    "canonical_id": canonical_id,
-                                    "git_path": git_path,
-                                    "git_content_hash": content_hash,
-                                    "last_repo_sync_at": datetime.utcnow().isoformat()
-                                }, on_conflict="tenant_id,environment_id,canonical_id").execute()
-                                logger.info(f"Created git_state for {canonical_id} in target env {target_env_id}")
-                except Exception as e:
-                    logger.warning(f"Failed to update sidecar/git_state for {selection.workflow_name}: {str(e)}")
-                    # Don't fail promotion if sidecar/git_state update fails
-            
             except Exception as e:
                 error_msg = f"Failed to promote {selection.workflow_name}: {str(e)}"
                 errors.append(error_msg)
                 logger.error(error_msg)
                 workflows_failed += 1
+                failed_workflow_names.append(selection.workflow_name)
+                # Nothing has been written to the target yet; stop preparing
+                break
+
+        # Write prepared workflows to the target with bounded parallelism
+        promoted_workflows: List[Tuple[WorkflowSelection, Dict[str, Any], Optional[str]]] = []
+        if deploy_queue and not failed_workflow_names:
+            outcomes = await self._deploy_workflows(target_adapter, deploy_queue)
+
+            # Outcomes are merged in selection order, so errors, counts and the
+            # rollback list are deterministic regardless of completion order
+            for (selection, workflow_data), outcome in zip(deploy_queue, outcomes):
+                if not outcome.started:
+                    continue
+                if outcome.error is not None:
+                    error_msg = f"Failed to promote {selection.workflow_name}: {str(outcome.error)}"
+                    errors.append(error_msg)
+                    logger.error(error_msg)
+                    workflows_failed += 1
+                    failed_workflow_names.append(selection.workflow_name)
+                    continue
 
-                # ============================================================================
-                # ATOMIC ROLLBACK ON FIRST FAILURE (T003)
-                # ============================================================================
-                # On first workflow failure, immediately trigger rollback of all
-                # successfully promoted workflows and return with FAILED status
-                # ============================================================================
+                workflows_promoted += 1
 
-                logger.error(f"Promotion failed on workflow {selection.workflow_name}. Triggering atomic rollback.")
-                logger.info(f"Rolling back {len(successfully_promoted_workflow_ids)} successfully promoted workflows")
+                # Track successfully promoted workflow for rollback (T003)
+                successfully_promoted_workflow_ids.append(selection.workflow_id)
+                promoted_workflows.append((selection, workflow_data, outcome.target_workflow_id))
 
-                # Trigger rollback using pre-promotion snapshot
-                # Note: pre_promotion_snapshot_id should be passed to execute_promotion
-                # For now, we'll create a placeholder - caller must provide this
-                rollback_result = None
+        if failed_workflow_names:
+            # ============================================================================
+            # ATOMIC ROLLBACK ON FAILURE (T003)
+            # ============================================================================
+            # On the first workflow failure no further deploys are started; once the
+            # in-flight ones settle, all successfully promoted workflows are rolled
+            # back and FAILED status is returned
+            # ============================================================================
 
-                try:
-                    # Get pre-promotion snapshot ID from source_snapshot_id parameter
-                    # In the promotion flow, this is actually the target_pre_snapshot_id
-                    # which is created by the caller before execute_promotion is called
+            logger.error(f"Promotion failed on workflow {failed_workflow_names[0]}. Triggering atomic rollback.")
+            logger.info(f"Rolling back {len(successfully_promoted_workflow_ids)} successfully promoted workflows")
 
-                    logger.info(f"Attempting to rollback {len(successfully_promoted_workflow_ids)} workflows")
+            rollback_result = None
 
-                    # Use the target_pre_snapshot_id for rollback
-                    # This snapshot was created by the caller before execute_promotion was invoked
-                    rollback_result = await self.rollback_promotion(
-                        tenant_id=tenant_id,
-                        target_env_id=target_env_id,
-                        pre_promotion_snapshot_id=target_pre_snapshot_id,
-                        promoted_workflow_ids=successfully_promoted_workflow_ids,
-                        promotion_id=promotion_id
-                    )
+            try:
+                logger.info(f"Attempting to rollback {len(successfully_promoted_workflow_ids)} workflows")
 
-                    logger.info(f"Rollback completed: {rollback_result.workflows_rolled_back}/{len(successfully_promoted_workflow_ids)} workflows restored")
+                # Use the target_pre_snapshot_id for rollback
+                # This snapshot was created by the caller before execute_promotion was invoked
+                rollback_result = await self.rollback_promotion(
+                    tenant_id=tenant_id,
+                    target_env_id=target_env_id,
+                    pre_promotion_snapshot_id=target_pre_snapshot_id,
+                    promoted_workflow_ids=successfully_promoted_workflow_ids,
+                    promotion_id=promotion_id
+                )
 
-                    if rollback_result.rollback_errors:
-                        logger.error(f"Rollback had {len(rollback_result.rollback_errors)} errors: {rollback_result.rollback_errors}")
+                logger.info(f"Rollback completed: {rollback_result.workflows_rolled_back}/{len(successfully_promoted_workflow_ids)} workflows restored")
 
-                except Exception as rollback_error:
-                    logger.error(f"Rollback failed: {str(rollback_error)}")
-                    errors.append(f"Rollback failed: {str(rollback_error)}")
+                if rollback_result.rollback_errors:
+                    logger.error(f"Rollback had {len(rollback_result.rollback_errors)} errors: {rollback_result.rollback_errors}")
 
-                # Create audit log entry for failed promotion with rollback
-                await self._create_audit_log(
-                    tenant_id=tenant_id,
-                    promotion_id=promotion_id,
-                    action="execute",
-                    result={
-                        "status": "failed_with_rollback",
-                        "workflows_promoted": workflows_promoted,
-                        "workflows_failed": workflows_failed,
-                        "workflows_skipped": workflows_skipped,
-                        "created_placeholders": created_placeholders,
-                        "errors": errors,
-                        "warnings": warnings,
-                        "rollback_triggered": rollback_result is not None,
-                        "rollback_result": {
-                            "workflows_rolled_back": rollback_result.workflows_rolled_back if rollback_result else 0,
-                            "rollback_errors": rollback_result.rollback_errors if rollback_result else []
-                        } if rollback_result else None
-                    },
-                    credential_rewrites=all_credential_rewrites if all_credential_rewrites else None
-                )
+            except Exception as rollback_error:
+                logger.error(f"Rollback failed: {str(rollback_error)}")
+                errors.append(f"Rollback failed: {str(rollback_error)}")
 
-                # Return immediately with FAILED status and rollback information
-                return PromotionExecutionResult(
-                    promotion_id=promotion_id,
-                    status=PromotionStatus.FAILED,
-                    workflows_promoted=workflows_promoted,
-                    workflows_failed=workflows_failed,
-                    workflows_skipped=workflows_skipped,
-                    source_snapshot_id=source_snapshot_id,
-                    target_pre_snapshot_id="",  # Will be set by caller
-                    target_post_snapshot_id="",  # Not created due to failure
-                    errors=errors,
-                    warnings=warnings,
-                    created_placeholders=created_placeholders,
-                    rollback_result=rollback_result
+            # Create audit log entry for failed promotion with rollback
+            await self._create_audit_log(
+                tenant_id=tenant_id,
+                promotion_id=promotion_id,
+                action="execute",
+                result={
+                    "status": "failed_with_rollback",
+                    "workflows_promoted": workflows_promoted,
+                    "workflows_failed": workflows_failed,
+                    "workflows_skipped": workflows_skipped,
+                    "created_placeholders": created_placeholders,
+                    "errors": errors,
+                    "warnings": warnings,
+                    "rollback_triggered": rollback_result is not None,
+                    "rollback_result": {
+                        "workflows_rolled_back": rollback_result.workflows_rolled_back if rollback_result else 0,
+                        "rollback_errors": rollback_result.rollback_errors if rollback_result else []
+                    } if rollback_result else None
+                },
+                credential_rewrites=all_credential_rewrites if all_credential_rewrites else None
+            )
+
+            # Return immediately with FAILED status and rollback information
+            return PromotionExecutionResult(
+                promotion_id=promotion_id,
+                status=PromotionStatus.FAILED,
+                workflows_promoted=workflows_promoted,
+                workflows_failed=workflows_failed,
+                workflows_skipped=workflows_skipped,
+                source_snapshot_id=source_snapshot_id,
+                target_pre_snapshot_id="",  # Will be set by caller
+                target_post_snapshot_id="",  # Not created due to failure
+                errors=errors,
+                warnings=warnings,
+                created_placeholders=created_placeholders,
+                rollback_result=rollback_result
+            )
+
+        # Update workflow mappings, sidecar files and Git state for promoted workflows
+        if promoted_workflows:
+            from app.services.canonical_workflow_service import CanonicalWorkflowService
+
+            if source_mappings is None:
+                try:
+                    source_mappings = await db_service.get_workflow_mappings(
+                        tenant_id=tenant_id,
+                        environment_id=source_env_id
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to load source workflow mappings: {str(e)}")
+                    source_mappings = []
+            canonical_by_n8n_id: Dict[str, str] = {}
+            for mapping in source_mappings:
+                if mapping.get("n8n_workflow_id") and mapping.get("canonical_id"):
+                    canonical_by_n8n_id.setdefault(mapping["n8n_workflow_id"], mapping["canonical_id"])
+
+            target_git_folder = target_env.get("git_folder")
+            target_git_states: Dict[str, Dict[str, Any]] = {}
+            target_github = None
+            if target_git_folder:
+                try:
+                    target_git_states = await CanonicalWorkflowService.list_canonical_workflow_git_states(
+                        tenant_id, target_env_id
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to load target Git states: {str(e)}")
+                target_github = self._get_github_service(target_env)
+
+            for selection, workflow_data, target_n8n_id in promoted_workflows:
+                await self._update_promoted_workflow_git_state(
+                    tenant_id=tenant_id,
+                    target_env_id=target_env_id,
+                    target_git_folder=target_git_folder,
+                    target_github=target_github,
+                    selection=selection,
+                    workflow_data=workflow_data,
+                    target_n8n_id=target_n8n_id,
+                    canonical_by_n8n_id=canonical_by_n8n_id,
+                    source_git_states=source_git_states,
+                    target_git_states=target_git_states,
                 )
 
         # Create audit log entry
@@ -2641,6 +2604,236 @@ class PromotionService:
             rollback_result=None  # No rollback on successful promotion
         )
 
+    async def _load_canonical_source_workflows(
+        self,
+        tenant_id: str,
+        source_env_id: str,
+        source_env: Dict[str, Any],
+        source_github: GitHubService
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """
+        Load promotion source workflows from canonical Git state.
+
+        Canonical workflows, their source Git state and the source workflow
+        mappings are read with one query each; file contents are fetched in
+        bulk per Git ref (refs are read concurrently).
+
+        Returns:
+            Tuple of (workflows keyed by n8n_workflow_id, falling back to
+            canonical_id; source workflow mappings; source Git state by canonical_id)
+        """
+        from app.services.canonical_workflow_service import CanonicalWorkflowService
+
+        canonical_workflows = await CanonicalWorkflowService.list_canonical_workflows(tenant_id)
+        git_states = await CanonicalWorkflowService.list_canonical_workflow_git_states(tenant_id, source_env_id)
+        mappings = await db_service.get_workflow_mappings(tenant_id=tenant_id, environment_id=source_env_id)
+
+        n8n_id_by_canonical: Dict[str, Optional[str]] = {}
+        for mapping in mappings:
+            n8n_id_by_canonical.setdefault(mapping.get("canonical_id"), mapping.get("n8n_workflow_id"))
+
+        default_ref = source_env.get("git_branch", "main")
+        paths_by_ref: Dict[str, List[str]] = {}
+        for canonical in canonical_workflows:
+            git_state = git_states.get(canonical["canonical_id"])
+            if git_state:
+                ref = git_state.get("git_commit_sha") or default_ref
+                paths_by_ref.setdefault(ref, []).append(git_state["git_path"])
+
+        semaphore = asyncio.Semaphore(settings.GITHUB_BLOB_FETCH_CONCURRENCY)
+
+        async def read_ref(ref: str) -> Dict[str, Dict[str, Any]]:
+            async with semaphore:
+                return await source_github.get_files_content(paths_by_ref[ref], ref)
+
+        refs = list(paths_by_ref)
+        files_by_ref = dict(zip(refs, await asyncio.gather(*(read_ref(ref) for ref in refs))))
+
+        source_workflow_map: Dict[str, Any] = {}
+        for canonical in canonical_workflows:
+            canonical_id = canonical["canonical_id"]
+            git_state = git_states.get(canonical_id)
+            if not git_state:
+                continue
+
+            ref = git_state.get("git_commit_sha") or default_ref
+            workflow_data = files_by_ref[ref].get(git_state["git_path"])
+            if not workflow_data:
+                continue
+
+            # Remove metadata (keep pure n8n format)
+            workflow_data.pop("_comment", None)
+
+            # Use n8n_workflow_id as key for compatibility with existing code,
+            # falling back to canonical_id when the workflow is not mapped
+            source_workflow_map[n8n_id_by_canonical.get(canonical_id) or canonical_id] = workflow_data
+
+        return source_workflow_map, mappings, git_states
+
+    async def _deploy_workflow(
+        self,
+        target_adapter: Any,
+        selection: WorkflowSelection,
+        workflow_data: Dict[str, Any]
+    ) -> Optional[str]:
+        """Create or update one prepared workflow in the target; returns its target workflow ID."""
+        workflow_id = workflow_data.get("id")
+
+        if selection.change_type == WorkflowChangeType.NEW:
+            # Create new workflow in target
+            logger.info(f"Creating new workflow: {selection.workflow_name}")
+            created = await target_adapter.create_workflow(workflow_data)
+        else:
+            # Try to update existing workflow, fall back to create if not found
+            try:
+                await target_adapter.update_workflow(workflow_id, workflow_data)
+                return workflow_id
+            except Exception as update_error:
+                # Check if it's a 404 (workflow doesn't exist) or 400 (bad request which could mean not found)
+                error_str = str(update_error).lower()
+                if '404' in error_str or '400' in error_str:
+                    logger.info(f"Workflow {selection.workflow_name} not found in target, creating new")
+                    created = await target_adapter.create_workflow(workflow_data)
+                else:
+                    raise
+
+        if isinstance(created, dict) and created.get("id"):
+            return created["id"]
+        return workflow_id
+
+    async def _deploy_workflows(
+        self,
+        target_adapter: Any,
+        deploy_queue: List[Tuple[WorkflowSelection, Dict[str, Any]]]
+    ) -> List["DeployOutcome"]:
+        """
+        Deploy prepared workflows with at most PROMOTION_DEPLOY_CONCURRENCY in flight.
+
+        Deploys start in queue order. Once one fails no further deploys start,
+        but in-flight deploys are allowed to finish so that every workflow
+        written to the target is known and can be rolled back.
+
+        Returns one DeployOutcome per queue entry, in queue order.
+        """
+        semaphore = asyncio.Semaphore(max(1, settings.PROMOTION_DEPLOY_CONCURRENCY))
+        failed = asyncio.Event()
+
+        async def deploy(selection: WorkflowSelection, workflow_data: Dict[str, Any]) -> DeployOutcome:
+            async with semaphore:
+                if failed.is_set():
+                    return DeployOutcome()
+                try:
+                    target_workflow_id = await self._deploy_workflow(target_adapter, selection, workflow_data)
+                    return DeployOutcome(started=True, target_workflow_id=target_workflow_id)
+                except Exception as e:
+                    failed.set()
+                    return DeployOutcome(started=True, error=e)
+
+        return await asyncio.gather(*(deploy(selection, data) for selection, data in deploy_queue))
+
+    async def _update_promoted_workflow_git_state(
+        self,
+        tenant_id: str,
+        target_env_id: str,
+        target_git_folder: Optional[str],
+        target_github: Optional[GitHubService],
+        selection: WorkflowSelection,
+        workflow_data: Dict[str, Any],
+        target_n8n_id: Optional[str],
+        canonical_by_n8n_id: Dict[str, str],
+        source_git_states: Dict[str, Dict[str, Any]],
+        target_git_states: Dict[str, Dict[str, Any]],
+    ) -> None:
+        """
+        Link a promoted workflow in the target and update its sidecar file and Git state.
+
+        Failures are logged and never fail the promotion.
+        """
+        try:
+            from app.services.canonical_workflow_service import compute_workflow_hash
+            content_hash = compute_workflow_hash(workflow_data)
+
+            # Find canonical_id for this workflow by n8n_workflow_id in the source environment,
+            # falling back to a source Git state with matching content hash
+            canonical_id = canonical_by_n8n_id.get(selection.workflow_id)
+            if not canonical_id:
+                canonical_id = next(
+                    (
+                        state_canonical_id
+                        for state_canonical_id, git_state in source_git_states.items()
+                        if git_state.get("git_content_hash") == content_hash
+                    ),
+                    None
+                )
+            if not canonical_id:
+                return
+
+            # Update or create mapping
+            from app.services.canonical_env_sync_service import CanonicalEnvSyncService
+            from app.schemas.canonical_workflow import WorkflowMappingStatus
+            await CanonicalEnvSyncService._create_workflow_mapping(
+                tenant_id=tenant_id,
+                environment_id=target_env_id,
+                canonical_id=canonical_id,
+                n8n_workflow_id=target_n8n_id,
+                content_hash=content_hash,
+                status=WorkflowMappingStatus.LINKED,
+                linked_by_user_id=None  # TODO: Get from auth
+            )
+
+            if not target_git_folder:
+                return
+
+            git_state = target_git_states.get(canonical_id)
+            if git_state:
+                sidecar_path = git_state["git_path"].replace('.json', '.env-map.json')
+
+                # Get existing sidecar or create new structure
+                sidecar_data = await target_github.get_file_content(sidecar_path) or {
+                    "canonical_workflow_id": canonical_id,
+                    "workflow_name": workflow_data.get("name", "Unknown"),
+                    "environments": {}
+                }
+
+                # Update target environment mapping
+                if "environments" not in sidecar_data:
+                    sidecar_data["environments"] = {}
+
+                sidecar_data["environments"][target_env_id] = {
+                    "n8n_workflow_id": target_n8n_id,
+                    "content_hash": f"sha256:{content_hash}",
+                    "last_seen_at": datetime.utcnow().isoformat()
+                }
+
+                # Write sidecar file
+                await target_github.write_sidecar_file(
+                    canonical_id=canonical_id,
+                    sidecar_data=sidecar_data,
+                    git_folder=target_git_folder,
+                    commit_message=f"Update sidecar after promotion: {workflow_data.get('name', 'Unknown')}"
+                )
+
+                git_path = git_state.get("git_path") or f"workflows/{target_git_folder}/{canonical_id}.json"
+            else:
+                # No existing git_state - create new one
+                git_path = f"workflows/{target_git_folder}/{canonical_id}.json"
+
+            # Update canonical_workflow_git_state for target environment
+            db_service.client.table("canonical_workflow_git_state").upsert({
+                "tenant_id": tenant_id,
+                "environment_id": target_env_id,
+                "canonical_id": canonical_id,
+                "git_path": git_path,
+                "git_content_hash": content_hash,
+                "last_repo_sync_at": datetime.utcnow().isoformat()
+            }, on_conflict="tenant_id,environment_id,canonical_id").execute()
+            logger.info(
+                f"{'Updated' if git_state else 'Created'} git_state for {canonical_id} in target env {target_env_id}"
+            )
+        except Exception as e:
+            logger.warning(f"Failed to update sidecar/git_state for {selection.workflow_name}: {str(e)}")
+            # Don't fail promotion if sidecar/git_state update fails
+
     async def _create_audit_log(
         self,
         tenant_id: str,
@@ -4,7 +4,7 @@ This module defines the ProviderAdapter Protocol that all provider implementatio
 must implement. The protocol ensures consistent behavior across different
 workflow automation platforms.
 """
-from typing import Protocol, List, Dict, Any, runtime_checkable
+from typing import Protocol, List, Dict, Any, Optional, AsyncIterator, runtime_checkable
 
 
 @runtime_checkable
@@ -116,6 +116,37 @@ class ProviderAdapter(Protocol):
         """
         ...
 
+    async def get_execution(self, execution_id: str) -> Dict[str, Any]:
+        """Get a specific execution by ID.
+
+        Args:
+            execution_id: The provider's execution identifier
+
+        Returns:
+            Execution record with status, timing, and metadata
+        """
+        ...
+
+    def iter_executions(
+        self,
+        since_id: Optional[str] = None,
+        page_size: int = 250,
+        max_executions: Optional[int] = None,
+        before_id: Optional[str] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Iterate over executions newer than a high-water mark, page by page.
+
+        Args:
+            since_id: Last execution ID already ingested; None reads down to the oldest
+            page_size: Executions requested per page
+            max_executions: Stop after this many executions have been yielded
+            before_id: Only read executions older than this ID; None reads from the newest
+
+        Returns:
+            Async iterator of execution pages, newest first
+        """
+        ...
+
     # =========================================================================
     # Credential Operations
     # =========================================================================
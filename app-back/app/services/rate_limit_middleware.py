@@ -4,7 +4,7 @@ This middleware enforces per-user and per-tenant rate limits on API v1 endpoints
 Exempts health checks and webhook endpoints from rate limiting.
 """
 from typing import Optional
-from fastapi import Request, Response
+from fastapi import HTTPException, Request, Response
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
@@ -12,8 +12,7 @@ import logging
 
 from app.core.config import settings
 from app.services.rate_limiter import get_rate_limiter
-from app.services.auth_service import supabase_auth_service
-from app.services.database import db_service
+from app.services.auth_service import IMPERSONATION_TOKEN_PREFIX, resolve_request_principal
 
 logger = logging.getLogger(__name__)
 
@@ -153,37 +152,30 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
             token = auth_header.split(" ", 1)[1].strip()
 
-            # Verify token and get user
-            try:
-                payload = await supabase_auth_service.verify_token(token)
-                supabase_user_id = payload.get("sub")
-                if not supabase_user_id:
-                    return None, None
-            except Exception:
-                # Invalid token - let auth middleware handle it
+            # Impersonation tokens are resolved by the auth dependency itself
+            if token.startswith(IMPERSONATION_TOKEN_PREFIX):
                 return None, None
 
-            # Get user and tenant from database
+            # Verify token and resolve the user; the result is stashed on
+            # request.state so get_current_user does not repeat the lookup
             try:
-                user_resp = db_service.client.table("users").select(
-                    "id, tenant_id"
-                ).eq(
-                    "supabase_auth_id", supabase_user_id
-                ).maybe_single().execute()
-
-                if not user_resp.data:
-                    return None, None
-
-                user_data = user_resp.data
-                user_id = user_data.get("id")
-                tenant_id = user_data.get("tenant_id")
-
-                return str(user_id) if user_id else None, str(tenant_id) if tenant_id else None
-
+                principal = await resolve_request_principal(token, request)
+            except HTTPException:
+                # Invalid token - let auth middleware handle it
+                return None, None
             except Exception as e:
                 logger.warning(f"Failed to fetch user/tenant for rate limiting: {e}")
                 return None, None
 
+            user_data = principal.get("user")
+            if not user_data:
+                return None, None
+
+            user_id = user_data.get("id")
+            tenant_id = user_data.get("tenant_id")
+
+            return str(user_id) if user_id else None, str(tenant_id) if tenant_id else None
+
         except Exception as e:
             logger.error(f"Error extracting user/tenant for rate limiting: {e}")
             return None, None
@@ -10,16 +10,19 @@ from datetime import datetime, timezone, timedelta
 from typing import Optional
 
 from app.services.database import db_service
+from app.services.scheduler_runtime import ScheduledJob, ShardContext, scheduler_runtime
 
 logger = logging.getLogger(__name__)
 
-# Global flags to control scheduler
-_rollup_scheduler_running = False
-_rollup_scheduler_task: Optional[asyncio.Task] = None
+# Scheduler job name
+ROLLUP_JOB = "execution_rollups"
+
+# Set once this worker has run the startup backfill
+_initial_backfill_done = False
 
 # Configuration
 ROLLUP_INTERVAL_SECONDS = 3600  # 1 hour - check if rollups needed
-ROLLUP_DAYS_TO_BACKFILL = 7  # On startup, ensure last 7 days are computed
+ROLLUP_DAYS_TO_BACKFILL = 7  # On first run, ensure last 7 days are computed
 
 
 async def _compute_rollups_for_date(rollup_date: datetime) -> int:
@@ -209,55 +212,35 @@ async def _check_and_compute_rollups():
         logger.error(f"Error in rollup computation cycle: {e}")
 
 
-async def _rollup_scheduler_loop():
-    """Main scheduler loop that runs periodically."""
-    global _rollup_scheduler_running
-    
-    logger.info("Rollup scheduler started")
-    
-    # Initial backfill on startup
-    logger.info(f"Starting initial backfill for last {ROLLUP_DAYS_TO_BACKFILL} days")
-    today = datetime.now(timezone.utc).date()
-    for days_ago in range(1, ROLLUP_DAYS_TO_BACKFILL + 1):
-        target_date = today - timedelta(days=days_ago)
-        await _compute_rollups_for_date(datetime.combine(target_date, datetime.min.time()))
-        await asyncio.sleep(0.5)  # Small delay
-    
-    while _rollup_scheduler_running:
-        try:
-            await _check_and_compute_rollups()
-        except Exception as e:
-            logger.error(f"Error in rollup scheduler loop: {e}")
-        
-        # Wait for next interval
-        await asyncio.sleep(ROLLUP_INTERVAL_SECONDS)
-    
-    logger.info("Rollup scheduler stopped")
+async def _run_rollups(ctx: ShardContext) -> None:
+    """Run one rollup cycle, backfilling recent days the first time this worker owns the job."""
+    global _initial_backfill_done
+
+    if not _initial_backfill_done:
+        logger.info(f"Starting initial backfill for last {ROLLUP_DAYS_TO_BACKFILL} days")
+        today = datetime.now(timezone.utc).date()
+        for days_ago in range(1, ROLLUP_DAYS_TO_BACKFILL + 1):
+            target_date = today - timedelta(days=days_ago)
+            await _compute_rollups_for_date(datetime.combine(target_date, datetime.min.time()))
+            await asyncio.sleep(0.5)  # Small delay
+        _initial_backfill_done = True
+
+    await _check_and_compute_rollups()
 
 
 def start_rollup_scheduler():
     """Start the rollup scheduler."""
-    global _rollup_scheduler_running, _rollup_scheduler_task
-    
-    if _rollup_scheduler_running:
-        logger.warning("Rollup scheduler already running")
-        return
-    
-    _rollup_scheduler_running = True
-    _rollup_scheduler_task = asyncio.create_task(_rollup_scheduler_loop())
+    scheduler_runtime.start_job(ScheduledJob(
+        name=ROLLUP_JOB,
+        interval_seconds=ROLLUP_INTERVAL_SECONDS,
+        run=_run_rollups,
+    ))
     logger.info("Rollup scheduler started")
 
 
-def stop_rollup_scheduler():
+async def stop_rollup_scheduler():
     """Stop the rollup scheduler."""
-    global _rollup_scheduler_running, _rollup_scheduler_task
-    
-    _rollup_scheduler_running = False
-    
-    if _rollup_scheduler_task:
-        _rollup_scheduler_task.cancel()
-        _rollup_scheduler_task = None
-    
+    await scheduler_runtime.stop_job(ROLLUP_JOB)
     logger.info("Rollup scheduler stopped")
 
 
@@ -0,0 +1,513 @@
+"""
+Scheduler Runtime - run periodic background jobs once across all API workers.
+
+Every API worker starts the same schedulers. The runtime makes sure each job
+is run by exactly one worker at a time:
+
+- Each job is split into lease-protected shards (one shard for singleton jobs
+  such as rollups, SCHEDULER_SHARD_COUNT for per-environment jobs).
+- Workers heartbeat into a shared membership list and use rendezvous hashing
+  to agree on a preferred owner for every shard, so shards spread across
+  workers and move only when membership changes.
+- A worker only runs shards for which it holds an unexpired lease, so a shard
+  never runs on two workers even while membership is changing.
+- Each lease records when its shard last ran, and a worker that takes over a
+  shard schedules it from that time. Handovers, deploys and restarts
+  therefore do not re-run a shard before its interval has passed.
+
+Per-environment jobs hash environment IDs into shards and process the shard's
+environments with bounded concurrency, so one slow tenant no longer delays
+every other tenant's checks.
+
+Lease backends:
+- database: scheduler_workers / scheduler_leases tables via RPC (default)
+- local: in-process store, for tests and single-worker deployments
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import socket
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, List, Optional, Set
+from uuid import uuid4
+
+from app.core.config import settings
+from app.services.database import db_service
+
+logger = logging.getLogger(__name__)
+
+
+def shard_for(key: str, shard_count: int) -> int:
+    """Map a key (e.g. an environment ID) to a shard number."""
+    return zlib.crc32(str(key).encode()) % shard_count
+
+
+def lease_key(job_name: str, shard: int) -> str:
+    return f"{job_name}:{shard}"
+
+
+def preferred_owner(key: str, workers: Iterable[str]) -> Optional[str]:
+    """Pick the worker that should own a lease key (highest random weight)."""
+    return max(
+        workers,
+        key=lambda worker: hashlib.blake2b(f"{worker}|{key}".encode(), digest_size=8).digest(),
+        default=None,
+    )
+
+
+@dataclass
+class ShardContext:
+    """The slice of a job a worker is responsible for during one run."""
+
+    job_name: str
+    shard_count: int
+    shards: FrozenSet[int]
+    concurrency: int
+
+    def owns(self, key: str) -> bool:
+        """Whether this run is responsible for the given key."""
+        return shard_for(key, self.shard_count) in self.shards
+
+    async def run_each(self, items: Iterable[Any], handler: Callable[[Any], Awaitable[Any]]) -> int:
+        """
+        Run handler for every item with at most `concurrency` in flight.
+
+        Handler errors are logged and do not stop other items. Returns the
+        number of items processed.
+        """
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+
+        async def run_one(item: Any) -> None:
+            async with semaphore:
+                try:
+                    await handler(item)
+                except Exception as e:
+                    logger.error(f"Scheduled job {self.job_name} failed for item: {e}", exc_info=True)
+
+        items = list(items)
+        await asyncio.gather(*(run_one(item) for item in items))
+        return len(items)
+
+
+@dataclass
+class ScheduledJob:
+    """
+    A periodic job.
+
+    run receives the ShardContext for the shards this worker owns and may
+    return the number of items it processed (reported in metrics).
+    """
+
+    name: str
+    interval_seconds: float
+    run: Callable[[ShardContext], Awaitable[Optional[int]]]
+    sharded: bool = False
+
+
+@dataclass
+class _JobState:
+    job: ScheduledJob
+    shard_count: int
+    task: Optional[asyncio.Task] = None
+    running_keys: Set[str] = field(default_factory=set)
+    shard_due: Dict[int, float] = field(default_factory=dict)
+    runs: int = 0
+    failures: int = 0
+    items_processed: Optional[int] = None
+    last_started_at: Optional[datetime] = None
+    last_finished_at: Optional[datetime] = None
+    last_duration_seconds: Optional[float] = None
+    lag_seconds: float = 0.0
+
+
+class LeaseStore:
+    """Base class for shared worker membership and shard leases."""
+
+    name = "base"
+
+    async def heartbeat(self, worker_id: str, ttl_seconds: float) -> List[str]:
+        """Record this worker as alive and return all live worker IDs."""
+        raise NotImplementedError
+
+    async def claim(self, worker_id: str, keys: List[str], ttl_seconds: float) -> Dict[str, Optional[float]]:
+        """
+        Acquire or renew leases on keys, release any other leases held by
+        worker_id, and return the keys it now holds mapped to the seconds
+        since their shard last ran (None if it never ran).
+        """
+        raise NotImplementedError
+
+    async def record_runs(self, worker_id: str, keys: List[str]) -> None:
+        """Record that worker_id is running the shards behind its leases on keys."""
+        raise NotImplementedError
+
+    async def leave(self, worker_id: str) -> None:
+        """Release all of a worker's leases and remove it from membership."""
+        raise NotImplementedError
+
+
+class LocalLeaseStore(LeaseStore):
+    """
+    In-process lease store.
+
+    Runtimes sharing one LocalLeaseStore behave like workers sharing a
+    database, which is how the runtime is exercised in tests.
+    """
+
+    name = "local"
+
+    def __init__(self):
+        self._workers: Dict[str, float] = {}
+        self._leases: Dict[str, tuple[str, float]] = {}
+        self._last_runs: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    async def heartbeat(self, worker_id: str, ttl_seconds: float) -> List[str]:
+        now = time.monotonic()
+        with self._lock:
+            self._workers[worker_id] = now
+            self._workers = {w: seen for w, seen in self._workers.items() if now - seen <= ttl_seconds}
+            return sorted(self._workers)
+
+    async def claim(self, worker_id: str, keys: List[str], ttl_seconds: float) -> Dict[str, Optional[float]]:
+        now = time.monotonic()
+        wanted = set(keys)
+        with self._lock:
+            for key, (owner, _) in list(self._leases.items()):
+                if owner == worker_id and key not in wanted:
+                    del self._leases[key]
+            for key in wanted:
+                owner, expires_at = self._leases.get(key, (None, 0.0))
+                if owner in (None, worker_id) or expires_at < now:
+                    self._leases[key] = (worker_id, now + ttl_seconds)
+            return {
+                key: now - self._last_runs[key] if key in self._last_runs else None
+                for key, (owner, _) in self._leases.items()
+                if owner == worker_id
+            }
+
+    async def record_runs(self, worker_id: str, keys: List[str]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                if self._leases.get(key, (None, 0.0))[0] == worker_id:
+                    self._last_runs[key] = now
+
+    async def leave(self, worker_id: str) -> None:
+        with self._lock:
+            self._workers.pop(worker_id, None)
+            for key, (owner, _) in list(self._leases.items()):
+                if owner == worker_id:
+                    del self._leases[key]
+
+
+class DatabaseLeaseStore(LeaseStore):
+    """
+    Lease store backed by the scheduler_workers and scheduler_leases tables.
+
+    Each call is a single RPC evaluated with the database clock, so lease
+    expiry and last-run ages do not depend on worker clocks agreeing.
+    """
+
+    name = "database"
+
+    async def heartbeat(self, worker_id: str, ttl_seconds: float) -> List[str]:
+        response = await db_service._execute(db_service.client.rpc(
+            "scheduler_heartbeat",
+            {"p_worker_id": worker_id, "p_ttl_seconds": int(ttl_seconds)},
+        ))
+        return [_scalar(row) for row in response.data or []]
+
+    async def claim(self, worker_id: str, keys: List[str], ttl_seconds: float) -> Dict[str, Optional[float]]:
+        response = await db_service._execute(db_service.client.rpc(
+            "claim_scheduler_leases",
+            {"p_owner": worker_id, "p_keys": keys, "p_ttl_seconds": int(ttl_seconds)},
+        ))
+        return {
+            str(row["held_key"]): (
+                float(row["seconds_since_run"]) if row.get("seconds_since_run") is not None else None
+            )
+            for row in response.data or []
+        }
+
+    async def record_runs(self, worker_id: str, keys: List[str]) -> None:
+        await db_service._execute(db_service.client.rpc(
+            "record_scheduler_runs", {"p_owner": worker_id, "p_keys": keys}
+        ))
+
+    async def leave(self, worker_id: str) -> None:
+        await db_service._execute(db_service.client.rpc("scheduler_leave", {"p_worker_id": worker_id}))
+
+
+def _scalar(row: Any) -> str:
+    """SETOF TEXT rows come back either bare or as single-column objects."""
+    if isinstance(row, dict):
+        return str(next(iter(row.values())))
+    return str(row)
+
+
+class SchedulerRuntime:
+    """
+    Runs registered ScheduledJobs on the shards this worker holds leases for.
+
+    A heartbeat task refreshes membership and leases every third of the lease
+    TTL; each job has its own loop that runs at a fixed rate.
+    """
+
+    def __init__(
+        self,
+        store: LeaseStore,
+        shard_count: int,
+        concurrency: int,
+        lease_ttl_seconds: float,
+        worker_id: Optional[str] = None,
+    ):
+        self.store = store
+        self.shard_count = max(1, shard_count)
+        self.concurrency = max(1, concurrency)
+        self.lease_ttl_seconds = lease_ttl_seconds
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._jobs: Dict[str, _JobState] = {}
+        self._held: Set[str] = set()
+        self._held_last_runs: Dict[str, float] = {}
+        self._held_until = 0.0
+        self._workers: List[str] = []
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+        self._stats = {"heartbeats": 0, "heartbeat_errors": 0}
+
+    def start_job(self, job: ScheduledJob) -> None:
+        """Register a job and start its loop (no-op if already running)."""
+        if job.name in self._jobs:
+            logger.warning(f"Scheduled job {job.name} is already running")
+            return
+
+        state = _JobState(job=job, shard_count=self.shard_count if job.sharded else 1)
+        self._jobs[job.name] = state
+        state.task = asyncio.create_task(self._job_loop(state))
+        if self._heartbeat_task is None:
+            self._wake = asyncio.Event()
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        else:
+            # Claim the new job's shards now rather than at the next heartbeat
+            self._wake.set()
+        logger.info(f"Scheduled job {job.name} started (worker={self.worker_id})")
+
+    async def stop_job(self, name: str) -> None:
+        """Stop a job; the last job to stop also releases this worker's leases."""
+        state = self._jobs.pop(name, None)
+        if state is None:
+            return
+        await _cancel(state.task)
+        logger.info(f"Scheduled job {name} stopped")
+
+        if not self._jobs:
+            await self.stop()
+
+    async def stop(self) -> None:
+        """Stop all jobs and hand this worker's shards back to the others."""
+        for state in list(self._jobs.values()):
+            await _cancel(state.task)
+        self._jobs.clear()
+
+        await _cancel(self._heartbeat_task)
+        self._heartbeat_task = None
+        self._held = set()
+        self._held_last_runs = {}
+        self._held_until = 0.0
+        try:
+            await self.store.leave(self.worker_id)
+        except Exception as e:
+            logger.warning(f"Failed to release scheduler leases: {e}")
+
+    def is_running(self, name: str) -> bool:
+        return name in self._jobs
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get lease ownership and per-job run/lag metrics for this worker."""
+        now = datetime.now(timezone.utc)
+        jobs = {}
+        for name, state in self._jobs.items():
+            jobs[name] = {
+                "interval_seconds": state.job.interval_seconds,
+                "shard_count": state.shard_count,
+                "owned_shards": len(self._owned_shards(state)),
+                "running": bool(state.running_keys),
+                "runs": state.runs,
+                "failures": state.failures,
+                "items_processed": state.items_processed,
+                "last_started_at": state.last_started_at.isoformat() if state.last_started_at else None,
+                "last_finished_at": state.last_finished_at.isoformat() if state.last_finished_at else None,
+                "last_duration_seconds": state.last_duration_seconds,
+                "lag_seconds": state.lag_seconds,
+                "seconds_since_last_run": (
+                    (now - state.last_finished_at).total_seconds() if state.last_finished_at else None
+                ),
+            }
+        return {
+            "backend": self.store.name,
+            "worker_id": self.worker_id,
+            "live_workers": len(self._workers),
+            "held_leases": len(self._held) if time.monotonic() < self._held_until else 0,
+            "jobs": jobs,
+            **self._stats,
+        }
+
+    # ------------------------------------------------------------------
+    # Leases
+    # ------------------------------------------------------------------
+
+    @property
+    def heartbeat_interval(self) -> float:
+        return max(0.05, self.lease_ttl_seconds / 3)
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            self._wake.clear()
+            await self._refresh_leases()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.heartbeat_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _refresh_leases(self) -> None:
+        try:
+            workers = await self.store.heartbeat(self.worker_id, self.lease_ttl_seconds)
+            if self.worker_id not in workers:
+                workers = sorted(set(workers) | {self.worker_id})
+            self._workers = workers
+
+            wanted: Set[str] = set()
+            for name, state in self._jobs.items():
+                for shard in range(state.shard_count):
+                    key = lease_key(name, shard)
+                    if preferred_owner(key, workers) == self.worker_id:
+                        wanted.add(key)
+                # Never give up a shard mid-run; it is released after the run
+                wanted |= state.running_keys
+
+            held = await self.store.claim(self.worker_id, sorted(wanted), self.lease_ttl_seconds)
+            now = time.monotonic()
+            self._held = set(held)
+            self._held_last_runs = {key: now - age for key, age in held.items() if age is not None}
+            # Stop trusting leases slightly before the store expires them
+            self._held_until = time.monotonic() + self.lease_ttl_seconds * 0.9
+            self._stats["heartbeats"] += 1
+        except Exception as e:
+            self._stats["heartbeat_errors"] += 1
+            logger.warning(f"Scheduler lease refresh failed: {e}")
+
+    def _owned_shards(self, state: _JobState) -> FrozenSet[int]:
+        if time.monotonic() >= self._held_until:
+            return frozenset()
+        prefix = f"{state.job.name}:"
+        return frozenset(
+            int(key[len(prefix):])
+            for key in self._held
+            if key.startswith(prefix) and key[len(prefix):].isdigit()
+        )
+
+    # ------------------------------------------------------------------
+    # Job loops
+    # ------------------------------------------------------------------
+
+    async def _job_loop(self, state: _JobState) -> None:
+        while True:
+            shards = self._owned_shards(state)
+            # Forget shards handed to another worker; if one comes back, its
+            # schedule is taken from the lease again
+            for shard in set(state.shard_due) - shards:
+                del state.shard_due[shard]
+            if not shards:
+                # Not an owner (yet); check again after the next lease refresh
+                await asyncio.sleep(self.heartbeat_interval)
+                continue
+
+            now = time.monotonic()
+            due = {shard: self._shard_due(state, shard, now) for shard in shards}
+            ready = frozenset(shard for shard, due_at in due.items() if due_at <= now)
+            if not ready:
+                # Wake at least every heartbeat so lost shards are not run
+                await asyncio.sleep(min(min(due.values()) - now, self.heartbeat_interval))
+                continue
+
+            await self._run_once(state, ready, min(due[shard] for shard in ready))
+
+            # Fixed-rate schedule; a run that overran its interval is followed
+            # by the next one immediately rather than queuing missed runs
+            finished = time.monotonic()
+            for shard in ready:
+                state.shard_due[shard] = max(due[shard] + state.job.interval_seconds, finished)
+
+    def _shard_due(self, state: _JobState, shard: int, now: float) -> float:
+        """When a shard should next run; newly owned shards continue the previous owner's schedule."""
+        if shard not in state.shard_due:
+            last_run = self._held_last_runs.get(lease_key(state.job.name, shard))
+            state.shard_due[shard] = now if last_run is None else last_run + state.job.interval_seconds
+        return state.shard_due[shard]
+
+    async def _run_once(self, state: _JobState, shards: FrozenSet[int], due_at: float) -> None:
+        job = state.job
+        started = time.monotonic()
+        state.lag_seconds = max(0.0, started - due_at)
+        state.last_started_at = datetime.now(timezone.utc)
+        state.running_keys = {lease_key(job.name, shard) for shard in shards}
+
+        # Record the run before starting it so a worker taking over one of
+        # these shards mid-run does not run it again
+        try:
+            await self.store.record_runs(self.worker_id, sorted(state.running_keys))
+        except Exception as e:
+            logger.warning(f"Failed to record scheduled run of {job.name}: {e}")
+
+        ctx = ShardContext(
+            job_name=job.name,
+            shard_count=state.shard_count,
+            shards=shards,
+            concurrency=self.concurrency,
+        )
+        try:
+            state.items_processed = await job.run(ctx)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            state.failures += 1
+            logger.error(f"Error in scheduled job {job.name}: {e}", exc_info=True)
+        finally:
+            state.running_keys = set()
+            state.runs += 1
+            state.last_finished_at = datetime.now(timezone.utc)
+            state.last_duration_seconds = time.monotonic() - started
+
+
+async def _cancel(task: Optional[asyncio.Task]) -> None:
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+def create_lease_store() -> LeaseStore:
+    """Build the lease store selected by SCHEDULER_LEASE_BACKEND."""
+    backend = (settings.SCHEDULER_LEASE_BACKEND or "database").lower()
+    if backend == "database":
+        return DatabaseLeaseStore()
+    if backend == "local":
+        return LocalLeaseStore()
+    raise ValueError(f"Unknown SCHEDULER_LEASE_BACKEND: {settings.SCHEDULER_LEASE_BACKEND}")
+
+
+scheduler_runtime = SchedulerRuntime(
+    store=create_lease_store(),
+    shard_count=settings.SCHEDULER_SHARD_COUNT,
+    concurrency=settings.SCHEDULER_SHARD_CONCURRENCY,
+    lease_ttl_seconds=settings.SCHEDULER_LEASE_TTL_SECONDS,
+)
@@ -128,26 +128,15 @@ class SnapshotService:
             total_workflows = len(workflows)
             logger.info(f"Found {total_workflows} workflows to export")
 
-            # Export workflows to GitHub with progress updates
-            commit_sha = None
-            workflows_synced = 0
+            # Fetch full workflows with progress updates
             workflow_metadata = []
+            full_workflows = []
 
             for idx, workflow in enumerate(workflows, 1):
                 try:
                     workflow_id = workflow.get("id")
                     full_workflow = await adapter.get_workflow(workflow_id)
-
-                    # Sync to GitHub
-                    await github_service.sync_workflow_to_github(
-                        workflow_id=workflow_id,
-                        workflow_name=full_workflow.get("name"),
-                        workflow_data=full_workflow,
-                        commit_message=f"Manual snapshot: {reason}",
-                        environment_type=env_type
-                    )
-
-                    workflows_synced += 1
+                    full_workflows.append({**full_workflow, "id": workflow_id})
 
                     # Collect workflow metadata
                     workflow_metadata.append({
@@ -164,7 +153,7 @@ class SnapshotService:
                             status=BackgroundJobStatus.RUNNING,
                             progress={
                                 "current_step": "syncing_workflows",
-                                "message": f"Syncing workflows to GitHub... ({idx}/{total_workflows})",
+                                "message": f"Exporting workflows... ({idx}/{total_workflows})",
                                 "current": idx,
                                 "total": total_workflows,
                                 "percentage": percentage
@@ -172,11 +161,11 @@ class SnapshotService:
                         )
 
                 except Exception as e:
-                    logger.error(f"Failed to sync workflow {workflow.get('id')}: {str(e)}")
+                    logger.error(f"Failed to export workflow {workflow.get('id')}: {str(e)}")
                     # Continue with other workflows
                     continue
 
-            if workflows_synced == 0:
+            if not full_workflows:
                 raise ValueError("Failed to sync any workflows to GitHub")
 
             # Update progress: finalizing
@@ -186,23 +175,19 @@ class SnapshotService:
                     status=BackgroundJobStatus.RUNNING,
                     progress={
                         "current_step": "finalizing",
-                        "message": "Creating snapshot record...",
+                        "message": "Committing workflows to GitHub...",
                         "percentage": 90
                     }
                 )
 
-            # Get the latest commit SHA
-            sanitized_folder = github_service._sanitize_foldername(env_type)
-            try:
-                commits = github_service.repo.get_commits(
-                    path=f"workflows/{sanitized_folder}",
-                    sha=github_service.branch
-                )
-                if commits:
-                    commit_sha = commits[0].sha
-                    logger.info(f"Got commit SHA: {commit_sha}")
-            except Exception as e:
-                logger.warning(f"Could not get commit SHA: {str(e)}")
+            # Write all workflows to GitHub as one commit
+            commit_sha = await github_service.sync_workflows_to_github(
+                full_workflows,
+                commit_message=f"Manual snapshot: {reason}",
+                environment_type=env_type
+            )
+            workflows_synced = len(full_workflows)
+            logger.info(f"Got commit SHA: {commit_sha}")
 
             # Create snapshot record
             snapshot_id = str(uuid4())
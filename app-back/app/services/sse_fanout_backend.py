@@ -0,0 +1,298 @@
+"""
+SSE Fan-out Backends - relay SSE events between API worker processes.
+
+SSEPubSubService delivers events to subscribers connected to the same
+process. A fan-out backend carries batches of events to every other worker
+so clients see updates no matter which worker runs the background job.
+
+Backends:
+- loopback: in-process bus, for tests and single-worker deployments
+- postgres: Postgres LISTEN/NOTIFY on DATABASE_URL (requires psycopg2)
+"""
+import asyncio
+import json
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from typing import Callable, List, Optional, Set
+
+from app.core.config import settings
+from app.services.sse_pubsub_service import SSEEvent
+
+logger = logging.getLogger(__name__)
+
+# Called with (origin worker id, events) for every batch received
+FanoutHandler = Callable[[str, List[SSEEvent]], None]
+
+
+def encode_batches(origin: str, events: List[SSEEvent], max_bytes: Optional[int] = None) -> List[str]:
+    """
+    Serialize events into one or more wire messages.
+
+    When max_bytes is set, events are split across messages so that none
+    exceeds it; a single event that does not fit on its own is dropped.
+    """
+    encoded = [json.dumps(asdict(event), default=str) for event in events]
+    envelope_overhead = len(json.dumps({"origin": origin, "events": []}))
+
+    messages: List[str] = []
+    chunk: List[str] = []
+    chunk_bytes = envelope_overhead
+    for item in encoded:
+        item_bytes = len(item.encode()) + 1
+        if max_bytes is not None and envelope_overhead + item_bytes > max_bytes:
+            logger.warning(f"SSE event too large for fan-out ({item_bytes} bytes), delivering locally only")
+            continue
+        if chunk and max_bytes is not None and chunk_bytes + item_bytes > max_bytes:
+            messages.append(_envelope(origin, chunk))
+            chunk, chunk_bytes = [], envelope_overhead
+        chunk.append(item)
+        chunk_bytes += item_bytes
+    if chunk:
+        messages.append(_envelope(origin, chunk))
+    return messages
+
+
+def _envelope(origin: str, encoded_events: List[str]) -> str:
+    return f'{{"origin": {json.dumps(origin)}, "events": [{",".join(encoded_events)}]}}'
+
+
+def decode_batch(message: str) -> tuple[str, List[SSEEvent]]:
+    """Parse a wire message back into (origin, events)."""
+    data = json.loads(message)
+    return data["origin"], [SSEEvent(**event) for event in data["events"]]
+
+
+class SSEFanoutBackend:
+    """Base class for cross-worker SSE event transport."""
+
+    name = "base"
+
+    async def start(self, on_batch: FanoutHandler) -> None:
+        """Begin receiving batches published by any worker (including this one)."""
+        raise NotImplementedError
+
+    async def publish(self, origin: str, events: List[SSEEvent]) -> None:
+        """Send a batch of events to every worker."""
+        raise NotImplementedError
+
+    async def stop(self) -> None:
+        """Stop receiving and release resources."""
+        raise NotImplementedError
+
+    def get_status(self) -> dict:
+        """Connection state for health reporting."""
+        return {"connected": True}
+
+    def _dispatch(self, on_batch: FanoutHandler, message: str) -> None:
+        try:
+            origin, events = decode_batch(message)
+        except Exception as e:
+            logger.error(f"Discarding malformed SSE fan-out message: {e}")
+            return
+        on_batch(origin, events)
+
+
+class LoopbackFanoutBus:
+    """Shared in-memory channel standing in for a broker between loopback backends."""
+
+    def __init__(self):
+        self.members: Set["LoopbackFanoutBackend"] = set()
+
+    def broadcast(self, message: str) -> None:
+        for member in list(self.members):
+            member._receive(message)
+
+
+class LoopbackFanoutBackend(SSEFanoutBackend):
+    """
+    In-process fan-out backend.
+
+    Backends attached to the same LoopbackFanoutBus behave like workers
+    sharing a broker: messages are serialized and delivered asynchronously
+    to every member, including the sender.
+    """
+
+    name = "loopback"
+
+    def __init__(self, bus: Optional[LoopbackFanoutBus] = None):
+        self.bus = bus or LoopbackFanoutBus()
+        self._on_batch: Optional[FanoutHandler] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self, on_batch: FanoutHandler) -> None:
+        self._on_batch = on_batch
+        self._loop = asyncio.get_running_loop()
+        self.bus.members.add(self)
+
+    async def publish(self, origin: str, events: List[SSEEvent]) -> None:
+        for message in encode_batches(origin, events):
+            self.bus.broadcast(message)
+
+    async def stop(self) -> None:
+        self.bus.members.discard(self)
+        self._on_batch = None
+
+    def _receive(self, message: str) -> None:
+        if self._on_batch is not None and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._dispatch, self._on_batch, message)
+
+
+class PostgresNotifyFanoutBackend(SSEFanoutBackend):
+    """
+    Fan-out over Postgres LISTEN/NOTIFY.
+
+    One autocommit connection LISTENs and is watched with loop.add_reader,
+    so notifications are consumed without a polling thread. A second
+    connection sends NOTIFYs from a single-thread executor. NOTIFY payloads
+    are limited to 8000 bytes, so batches are split to fit.
+
+    If the listener connection fails it is re-established with exponential
+    backoff; notifications sent while it is down are not replayed.
+    """
+
+    name = "postgres"
+    MAX_PAYLOAD_BYTES = 7900
+
+    def __init__(self, dsn: str, channel: str):
+        if not re.match(r"^[a-z_][a-z0-9_]*$", channel):
+            raise ValueError(f"Invalid fan-out channel name: {channel}")
+        self.dsn = dsn
+        self.channel = channel
+        self._listen_conn = None
+        self._notify_conn = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._on_batch: Optional[FanoutHandler] = None
+        self._listen_fd: Optional[int] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._reconnects = 0
+        self._last_error: Optional[str] = None
+
+    def _connect(self):
+        import psycopg2
+        import psycopg2.extensions
+
+        conn = psycopg2.connect(self.dsn)
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        return conn
+
+    async def start(self, on_batch: FanoutHandler) -> None:
+        self._on_batch = on_batch
+        self._loop = asyncio.get_running_loop()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sse-fanout")
+
+        self._stopping = False
+        self._notify_conn = await self._loop.run_in_executor(self._executor, self._connect)
+        await self._listen()
+        logger.info(f"SSE fan-out listening on Postgres channel '{self.channel}'")
+
+    def _open_listener(self):
+        conn = self._connect()
+        with conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {self.channel}")
+        return conn
+
+    async def _listen(self) -> None:
+        self._listen_conn = await self._loop.run_in_executor(self._executor, self._open_listener)
+        self._listen_fd = self._listen_conn.fileno()
+        self._loop.add_reader(self._listen_fd, self._on_readable)
+
+    def _close_listener(self) -> None:
+        if self._listen_fd is not None:
+            try:
+                self._loop.remove_reader(self._listen_fd)
+            except Exception:
+                pass
+            self._listen_fd = None
+        if self._listen_conn is not None:
+            try:
+                self._listen_conn.close()
+            except Exception:
+                pass
+            self._listen_conn = None
+
+    def _on_readable(self) -> None:
+        try:
+            self._listen_conn.poll()
+        except Exception as e:
+            logger.error(f"SSE fan-out listener connection failed: {e}")
+            self._last_error = str(e)
+            self._close_listener()
+            if not self._stopping and self._reconnect_task is None:
+                self._reconnect_task = self._loop.create_task(self._reconnect())
+            return
+        while self._listen_conn.notifies:
+            notify = self._listen_conn.notifies.pop(0)
+            self._dispatch(self._on_batch, notify.payload)
+
+    async def _reconnect(self) -> None:
+        delay = settings.SSE_FANOUT_RECONNECT_INITIAL_SECONDS
+        try:
+            while not self._stopping:
+                await asyncio.sleep(delay)
+                try:
+                    await self._listen()
+                except Exception as e:
+                    self._close_listener()
+                    self._last_error = str(e)
+                    delay = min(delay * 2, settings.SSE_FANOUT_RECONNECT_MAX_SECONDS)
+                    logger.warning(f"SSE fan-out reconnect failed, retrying in {delay:.1f}s: {e}")
+                    continue
+                self._reconnects += 1
+                logger.info(f"SSE fan-out reconnected to Postgres channel '{self.channel}'")
+                return
+        finally:
+            self._reconnect_task = None
+
+    def get_status(self) -> dict:
+        return {
+            "connected": self._listen_conn is not None,
+            "reconnects": self._reconnects,
+            "last_error": self._last_error,
+        }
+
+    def _notify(self, messages: List[str]) -> None:
+        if self._notify_conn is None or self._notify_conn.closed:
+            self._notify_conn = self._connect()
+        with self._notify_conn.cursor() as cursor:
+            for message in messages:
+                cursor.execute("SELECT pg_notify(%s, %s)", (self.channel, message))
+
+    async def publish(self, origin: str, events: List[SSEEvent]) -> None:
+        messages = encode_batches(origin, events, self.MAX_PAYLOAD_BYTES)
+        if messages:
+            await self._loop.run_in_executor(self._executor, self._notify, messages)
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        self._close_listener()
+        if self._notify_conn is not None:
+            try:
+                self._notify_conn.close()
+            except Exception:
+                pass
+        self._notify_conn = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+def create_fanout_backend() -> Optional[SSEFanoutBackend]:
+    """Build the fan-out backend selected by SSE_FANOUT_BACKEND, or None if disabled."""
+    backend = (settings.SSE_FANOUT_BACKEND or "none").lower()
+    if backend == "none":
+        return None
+    if backend == "loopback":
+        return LoopbackFanoutBackend()
+    if backend == "postgres":
+        return PostgresNotifyFanoutBackend(
+            dsn=settings.SSE_FANOUT_DATABASE_URL or settings.DATABASE_URL,
+            channel=settings.SSE_FANOUT_CHANNEL,
+        )
+    raise ValueError(f"Unknown SSE_FANOUT_BACKEND: {settings.SSE_FANOUT_BACKEND}")
@@ -2,16 +2,22 @@
 SSE Pub/Sub Service for real-time deployment updates.
 
 Provides an in-memory asyncio-based pub/sub mechanism for SSE event streaming.
-Supports tenant isolation and scope-based filtering.
+Supports tenant isolation and scope-based filtering. An optional fan-out
+backend (see sse_fanout_backend) relays events to other worker processes.
 """
 
 import asyncio
 from dataclasses import dataclass, field
 from datetime import datetime, UTC
-from typing import Optional, AsyncGenerator
+from typing import Optional, AsyncGenerator, TYPE_CHECKING, Hashable
 from uuid import uuid4
 import logging
 
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from app.services.sse_fanout_backend import SSEFanoutBackend
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,6 +35,50 @@ class SSEEvent:
     deployment_id: Optional[str] = None
 
 
+# Event types delivered to deployment-scoped subscriptions
+DEPLOYMENT_EVENT_PREFIX = "deployment."
+COUNTS_UPDATE_EVENT = "counts.update"
+
+# Event types delivered to background-job-scoped subscriptions
+BACKGROUND_JOB_EVENT_TYPES = frozenset({
+    "sync.progress",
+    "backup.progress",
+    "restore.progress",
+    "bulk_operation.progress",
+})
+
+# Scope kinds; keyed kinds carry an id after the colon ("deployment_detail:{id}")
+SCOPE_DEPLOYMENTS_LIST = "deployments_list"
+SCOPE_DEPLOYMENT_DETAIL = "deployment_detail"
+SCOPE_BACKGROUND_JOBS_LIST = "background_jobs_list"
+SCOPE_BACKGROUND_JOBS_ENV = "background_jobs_env"
+SCOPE_BACKGROUND_JOBS_JOB = "background_jobs_job"
+
+_KEYED_SCOPES = (SCOPE_DEPLOYMENT_DETAIL, SCOPE_BACKGROUND_JOBS_ENV, SCOPE_BACKGROUND_JOBS_JOB)
+
+ScopeKey = tuple[str, Optional[str]]
+
+# Progress events where only the latest per deployment/job matters within a fan-out window
+DEPLOYMENT_PROGRESS_EVENT = "deployment.progress"
+
+
+def parse_scope(scope: str) -> Optional[ScopeKey]:
+    """
+    Parse a scope string into its routing key.
+
+    Returns (kind, id) for keyed scopes, (kind, None) for list scopes,
+    and None for scopes that no event is routed to.
+    """
+    kind, sep, key = scope.partition(":")
+    if sep:
+        if kind in _KEYED_SCOPES:
+            return (kind, key)
+        return None
+    if scope in (SCOPE_DEPLOYMENTS_LIST, SCOPE_BACKGROUND_JOBS_LIST):
+        return (scope, None)
+    return None
+
+
 @dataclass
 class Subscription:
     """A client subscription to SSE events."""
@@ -37,27 +87,30 @@ class Subscription:
     scope: str  # "deployments_list" or "deployment_detail:{deployment_id}"
     queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=100))
     created_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+    route: Optional[ScopeKey] = field(init=False)
+
+    def __post_init__(self):
+        self.route = parse_scope(self.scope)
+
+    def _scope_id(self, kind: str) -> Optional[str]:
+        if self.route and self.route[0] == kind:
+            return self.route[1]
+        return None
 
     @property
     def deployment_id(self) -> Optional[str]:
         """Extract deployment_id from scope if this is a detail subscription."""
-        if self.scope.startswith("deployment_detail:"):
-            return self.scope.split(":", 1)[1]
-        return None
+        return self._scope_id(SCOPE_DEPLOYMENT_DETAIL)
 
     @property
     def environment_id(self) -> Optional[str]:
         """Extract environment_id from scope if this is an environment subscription."""
-        if self.scope.startswith("background_jobs_env:"):
-            return self.scope.split(":", 1)[1]
-        return None
+        return self._scope_id(SCOPE_BACKGROUND_JOBS_ENV)
 
     @property
     def job_id(self) -> Optional[str]:
         """Extract job_id from scope if this is a job subscription."""
-        if self.scope.startswith("background_jobs_job:"):
-            return self.scope.split(":", 1)[1]
-        return None
+        return self._scope_id(SCOPE_BACKGROUND_JOBS_JOB)
 
 
 class SSEPubSubService:
@@ -68,11 +121,36 @@ class SSEPubSubService:
     - Tenant isolation (events only reach subscriptions for same tenant)
     - Scope-based filtering (list vs detail subscriptions)
     - Backpressure handling (oldest events dropped when queue full)
+
+    Subscriptions are indexed by tenant and parsed scope key, so publishing
+    only visits the subscribers an event can actually reach. All index
+    updates and publishes run on the event loop without awaiting, so no
+    lock is needed around them.
+
+    With a fan-out backend attached, published events are also staged in an
+    outbox and sent to other workers once per flush window, keeping only
+    the latest progress event per deployment/job.
     """
 
     def __init__(self):
         self._subscriptions: dict[str, Subscription] = {}
-        self._lock = asyncio.Lock()
+        # tenant_id -> (scope kind, scope id) -> subscription_id -> Subscription
+        self._routes: dict[str, dict[ScopeKey, dict[str, Subscription]]] = {}
+        self._metrics = {
+            "events_published": 0,
+            "events_unrouted": 0,
+            "deliveries": 0,
+            "events_dropped": 0,
+            "max_fanout": 0,
+            "fanout_sent": 0,
+            "fanout_coalesced": 0,
+            "fanout_received": 0,
+            "fanout_errors": 0,
+        }
+        self._worker_id = uuid4().hex
+        self._fanout: Optional["SSEFanoutBackend"] = None
+        self._outbox: dict[Hashable, SSEEvent] = {}
+        self._flush_task: Optional[asyncio.Task] = None
 
     async def subscribe(self, tenant_id: str, scope: str) -> str:
         """
@@ -92,18 +170,63 @@ class SSEPubSubService:
             scope=scope
         )
 
-        async with self._lock:
-            self._subscriptions[subscription_id] = subscription
+        self._subscriptions[subscription_id] = subscription
+        if subscription.route is not None:
+            tenant_routes = self._routes.setdefault(tenant_id, {})
+            tenant_routes.setdefault(subscription.route, {})[subscription_id] = subscription
 
         logger.info(f"SSE subscription created: {subscription_id} (tenant={tenant_id}, scope={scope})")
         return subscription_id
 
     async def unsubscribe(self, subscription_id: str) -> None:
         """Remove a subscription."""
-        async with self._lock:
-            if subscription_id in self._subscriptions:
-                del self._subscriptions[subscription_id]
-                logger.info(f"SSE subscription removed: {subscription_id}")
+        subscription = self._subscriptions.pop(subscription_id, None)
+        if subscription is None:
+            return
+
+        tenant_routes = self._routes.get(subscription.tenant_id)
+        if tenant_routes is not None and subscription.route is not None:
+            route_subs = tenant_routes.get(subscription.route)
+            if route_subs is not None:
+                route_subs.pop(subscription_id, None)
+                if not route_subs:
+                    del tenant_routes[subscription.route]
+            if not tenant_routes:
+                del self._routes[subscription.tenant_id]
+
+        logger.info(f"SSE subscription removed: {subscription_id}")
+
+    def _match_routes(self, event: SSEEvent) -> list[ScopeKey]:
+        """
+        Routing keys an event is delivered to.
+
+        - deployments_list receives all deployment/counts events
+        - deployment_detail:{id} receives events for that deployment; events
+          without a deployment_id go to every detail scope if they are
+          deployment/counts events
+        - background_jobs_list receives all background job events
+        - background_jobs_env:{id} / background_jobs_job:{id} receive job
+          events whose env_id / payload job_id match
+        """
+        routes: list[ScopeKey] = []
+        is_deployment_event = (
+            event.type.startswith(DEPLOYMENT_EVENT_PREFIX) or event.type == COUNTS_UPDATE_EVENT
+        )
+
+        if is_deployment_event:
+            routes.append((SCOPE_DEPLOYMENTS_LIST, None))
+        if event.deployment_id:
+            routes.append((SCOPE_DEPLOYMENT_DETAIL, event.deployment_id))
+
+        if event.type in BACKGROUND_JOB_EVENT_TYPES:
+            routes.append((SCOPE_BACKGROUND_JOBS_LIST, None))
+            if event.env_id:
+                routes.append((SCOPE_BACKGROUND_JOBS_ENV, event.env_id))
+            event_job_id = event.payload.get("job_id") if isinstance(event.payload, dict) else None
+            if event_job_id:
+                routes.append((SCOPE_BACKGROUND_JOBS_JOB, event_job_id))
+
+        return routes
 
     async def publish(self, event: SSEEvent) -> None:
         """
@@ -114,63 +237,125 @@ class SSEPubSubService:
         - For deployment_detail scopes, deployment_id must match (if present in event)
         - deployments_list scope receives all deployment events for the tenant
         """
-        async with self._lock:
-            subscriptions = list(self._subscriptions.values())
+        self._metrics["events_published"] += 1
+        self._deliver(event)
+        if self._fanout is not None:
+            self._stage_for_fanout(event)
+
+    def _deliver(self, event: SSEEvent) -> None:
+        """Route an event to matching subscriptions on this worker."""
+        tenant_routes = self._routes.get(event.tenant_id)
+        if not tenant_routes:
+            self._metrics["events_unrouted"] += 1
+            return
 
-        for sub in subscriptions:
-            # Tenant isolation
-            if sub.tenant_id != event.tenant_id:
-                continue
+        targets: list[Subscription] = []
+        for route in self._match_routes(event):
+            route_subs = tenant_routes.get(route)
+            if route_subs:
+                targets.extend(route_subs.values())
+
+        if not event.deployment_id and (
+            event.type.startswith(DEPLOYMENT_EVENT_PREFIX) or event.type == COUNTS_UPDATE_EVENT
+        ):
+            # Tenant-wide deployment events (e.g. counts.update) reach every detail view
+            for route, route_subs in tenant_routes.items():
+                if route[0] == SCOPE_DEPLOYMENT_DETAIL:
+                    targets.extend(route_subs.values())
+
+        if not targets:
+            self._metrics["events_unrouted"] += 1
+            return
+
+        for sub in targets:
+            self._enqueue(sub, event)
+
+        self._metrics["deliveries"] += len(targets)
+        if len(targets) > self._metrics["max_fanout"]:
+            self._metrics["max_fanout"] = len(targets)
+
+    # ------------------------------------------------------------------
+    # Cross-worker fan-out
+    # ------------------------------------------------------------------
 
-            # Scope-based filtering
-            if sub.scope == "deployments_list":
-                # List scope receives all deployment events
-                should_send = event.type.startswith("deployment.") or event.type == "counts.update"
-            elif sub.scope.startswith("deployment_detail:"):
-                # Detail scope only receives events for that specific deployment
-                sub_deployment_id = sub.deployment_id
-                if event.deployment_id and sub_deployment_id:
-                    should_send = (event.deployment_id == sub_deployment_id)
-                else:
-                    # If event doesn't have deployment_id, send to all detail scopes
-                    # (for counts.update events, etc.)
-                    should_send = event.type.startswith("deployment.") or event.type == "counts.update"
-            elif sub.scope == "background_jobs_list":
-                # List scope receives all background job events
-                should_send = event.type in ["sync.progress", "backup.progress", "restore.progress", "bulk_operation.progress"]
-            elif sub.scope.startswith("background_jobs_env:"):
-                # Environment scope receives events for that specific environment
-                sub_env_id = sub.environment_id
-                if event.env_id and sub_env_id:
-                    should_send = (event.env_id == sub_env_id) and event.type in ["sync.progress", "backup.progress", "restore.progress", "bulk_operation.progress"]
-                else:
-                    should_send = False
-            elif sub.scope.startswith("background_jobs_job:"):
-                # Job scope receives events for that specific job
-                sub_job_id = sub.job_id
-                # Extract job_id from payload if available
-                event_job_id = event.payload.get("job_id") if isinstance(event.payload, dict) else None
-                if event_job_id and sub_job_id:
-                    should_send = (event_job_id == sub_job_id) and event.type in ["sync.progress", "backup.progress", "restore.progress", "bulk_operation.progress"]
-                else:
-                    should_send = False
-            else:
-                should_send = False
-
-            if should_send:
+    async def start_fanout(self, backend: "SSEFanoutBackend") -> None:
+        """Attach a fan-out backend so events reach subscribers on other workers."""
+        await backend.start(self._on_fanout_batch)
+        self._fanout = backend
+        logger.info(f"SSE fan-out started with {backend.name} backend (worker={self._worker_id})")
+
+    async def stop_fanout(self) -> None:
+        """Flush staged events and detach the fan-out backend."""
+        if self._fanout is None:
+            return
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self._flush_outbox()
+        backend, self._fanout = self._fanout, None
+        await backend.stop()
+
+    @staticmethod
+    def _coalesce_key(event: SSEEvent) -> Hashable:
+        """Events sharing a key within one flush window collapse to the latest."""
+        if event.type == DEPLOYMENT_PROGRESS_EVENT and event.deployment_id:
+            return (event.tenant_id, event.type, event.deployment_id)
+        if event.type in BACKGROUND_JOB_EVENT_TYPES and isinstance(event.payload, dict):
+            job_id = event.payload.get("job_id")
+            if job_id:
+                return (event.tenant_id, event.type, job_id)
+        return event.event_id
+
+    def _stage_for_fanout(self, event: SSEEvent) -> None:
+        key = self._coalesce_key(event)
+        if self._outbox.pop(key, None) is not None:
+            self._metrics["fanout_coalesced"] += 1
+        self._outbox[key] = event
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+
+    async def _flush_after_window(self) -> None:
+        try:
+            await asyncio.sleep(settings.SSE_FANOUT_FLUSH_INTERVAL_MS / 1000)
+        finally:
+            self._flush_task = None
+        await self._flush_outbox()
+
+    async def _flush_outbox(self) -> None:
+        if not self._outbox or self._fanout is None:
+            return
+        events = list(self._outbox.values())
+        self._outbox.clear()
+        try:
+            await self._fanout.publish(self._worker_id, events)
+            self._metrics["fanout_sent"] += len(events)
+        except Exception as e:
+            self._metrics["fanout_errors"] += 1
+            logger.error(f"Failed to fan out {len(events)} SSE events: {e}")
+
+    def _on_fanout_batch(self, origin: str, events: list[SSEEvent]) -> None:
+        """Deliver a batch published by another worker; our own echoes are skipped."""
+        if origin == self._worker_id:
+            return
+        self._metrics["fanout_received"] += len(events)
+        for event in events:
+            self._deliver(event)
+
+    def _enqueue(self, sub: Subscription, event: SSEEvent) -> None:
+        """Non-blocking put, dropping the oldest queued event when full."""
+        try:
+            if sub.queue.full():
+                # Drop oldest event to make room
                 try:
-                    # Non-blocking put with backpressure handling
-                    if sub.queue.full():
-                        # Drop oldest event to make room
-                        try:
-                            sub.queue.get_nowait()
-                            logger.warning(f"SSE queue full for {sub.id}, dropped oldest event")
-                        except asyncio.QueueEmpty:
-                            pass
-
-                    sub.queue.put_nowait(event)
-                except Exception as e:
-                    logger.error(f"Failed to queue event for subscription {sub.id}: {e}")
+                    sub.queue.get_nowait()
+                    self._metrics["events_dropped"] += 1
+                    logger.warning(f"SSE queue full for {sub.id}, dropped oldest event")
+                except asyncio.QueueEmpty:
+                    pass
+
+            sub.queue.put_nowait(event)
+        except Exception as e:
+            logger.error(f"Failed to queue event for subscription {sub.id}: {e}")
 
     async def get_events(self, subscription_id: str) -> AsyncGenerator[SSEEvent, None]:
         """
@@ -178,8 +363,7 @@ class SSEPubSubService:
 
         Yields events as they become available, with a timeout for keepalive.
         """
-        async with self._lock:
-            subscription = self._subscriptions.get(subscription_id)
+        subscription = self._subscriptions.get(subscription_id)
 
         if not subscription:
             return
@@ -199,6 +383,39 @@ class SSEPubSubService:
             except asyncio.CancelledError:
                 break
 
+    async def next_batch(
+        self,
+        subscription_id: str,
+        timeout: float,
+        max_events: int = 50,
+    ) -> Optional[list[SSEEvent]]:
+        """
+        Wait for queued events and return them as one batch.
+
+        Blocks on the subscription queue until at least one event is available
+        or timeout elapses, then drains up to max_events without waiting
+        further.
+
+        Returns:
+            The batch (empty on timeout), or None if the subscription is gone.
+        """
+        subscription = self._subscriptions.get(subscription_id)
+        if not subscription:
+            return None
+
+        try:
+            first = await asyncio.wait_for(subscription.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return []
+
+        batch = [first]
+        while len(batch) < max_events:
+            try:
+                batch.append(subscription.queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
     def get_subscription_count(self) -> int:
         """Get number of active subscriptions."""
         return len(self._subscriptions)
@@ -210,6 +427,17 @@ class SSEPubSubService:
             if sub.tenant_id == tenant_id
         ]
 
+    def get_metrics(self) -> dict:
+        """Get fan-out and backpressure counters."""
+        return {
+            **self._metrics,
+            "subscriptions": len(self._subscriptions),
+            "tenants": len(self._routes),
+            "fanout_backend": self._fanout.name if self._fanout is not None else None,
+            "fanout_status": self._fanout.get_status() if self._fanout is not None else None,
+            "fanout_pending": len(self._outbox),
+        }
+
 
 # Singleton instance
 sse_pubsub = SSEPubSubService()
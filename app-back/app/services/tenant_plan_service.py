@@ -11,6 +11,8 @@ from datetime import datetime, timezone
 from typing import Optional, Literal
 
 from app.services.database import db_service
+from app.services.auth_service import principal_cache
+from app.services.entitlements_service import entitlements_service
 
 
 PlanName = Literal["free", "pro", "agency", "enterprise"]
@@ -144,6 +146,8 @@ async def _set_plan_for_tenant(
     db_service.client.table("tenants").update(
         {"subscription_tier": plan_name}
     ).eq("id", tenant_id).execute()
+    principal_cache.invalidate_tenant(tenant_id)
+    entitlements_service.clear_cache(tenant_id)
 
     return True
 
@@ -0,0 +1,430 @@
+"""
+Workflow Matrix Service - per-tenant projection of the workflow × environment matrix.
+
+Computing the matrix means loading every environment, mapping and Git state of a
+tenant and deriving a status for every canonical workflow × environment cell.
+This service keeps the computed cells per tenant (per worker) and keeps them
+current from workflow_matrix_versions, a change log that database triggers bump
+for each canonical workflow whose mapping, Git state or metadata changes, and
+tenant-wide when an environment changes. Writers (env sync, repo sync,
+reconciliation, manual linking) need no hooks of their own.
+
+A request costs one change-log query when nothing changed. When a few workflows
+changed, only their rows (and rows sharing a content hash with them, for
+collision warnings) are reloaded and recomputed. Tenant-wide changes, large
+change sets and entries older than WORKFLOW_MATRIX_CACHE_TTL_SECONDS are rebuilt
+from scratch. Refreshes of one tenant's projection are serialized, so inputs
+loaded by one request are never applied over newer ones loaded by another.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import weakref
+from enum import Enum
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.services.database import db_service
+from app.services.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# workflow_matrix_versions row marking a change to every row (environments)
+TENANT_WIDE_CANONICAL_ID = "00000000-0000-0000-0000-000000000000"
+
+# Pages memoized per projection; dropped whenever the projection changes
+MAX_CACHED_PAGES = 64
+
+
+class WorkflowEnvironmentStatus(str, Enum):
+    """
+    Display status of a canonical workflow in a specific environment.
+
+    These statuses are computed for the workflow matrix UI based on:
+    1. The persisted mapping status (from WorkflowMappingStatus with precedence rules)
+    2. Content hash comparisons to detect drift/out-of-date conditions
+
+    Display Statuses:
+    - LINKED: Workflow is canonically mapped and in sync (env hash == git hash)
+    - UNMAPPED: Workflow exists in n8n but has no canonical mapping
+    - DRIFT: Workflow is linked but has local changes not yet pushed to git
+    - OUT_OF_DATE: Workflow is linked but git has newer version not deployed to env
+
+    Note: Workflows with DELETED, IGNORED, or MISSING status are not shown in the matrix.
+    """
+    LINKED = "linked"
+    UNMAPPED = "unmapped"
+    DRIFT = "drift"
+    OUT_OF_DATE = "out_of_date"
+
+
+def compute_cell_status(
+    mapping: Optional[Dict[str, Any]],
+    git_state: Optional[Dict[str, Any]]
+) -> Tuple[Optional[WorkflowEnvironmentStatus], bool]:
+    """
+    Compute the display status for a workflow in an environment.
+
+    Returns tuple of (status, can_sync).
+
+    This function computes display statuses for the workflow matrix UI based on:
+    1. The persisted mapping status (using precedence rules from compute_workflow_mapping_status)
+    2. Content hash comparisons to determine DRIFT or OUT_OF_DATE display states
+
+    Status Precedence (from WorkflowMappingStatus):
+    1. DELETED - Workflow/mapping is soft-deleted (not shown in matrix)
+    2. IGNORED - User explicitly ignored (not shown in matrix)
+    3. MISSING - Was mapped but disappeared from n8n (not shown in matrix)
+    4. UNMAPPED - Exists in n8n but no canonical_id (shown as "unmapped")
+    5. LINKED - Normal operational state (shown as "linked", "drift", or "out_of_date")
+
+    Display Status Logic:
+    - UNMAPPED: Workflow exists but no canonical mapping (mapping status = "unmapped")
+    - LINKED: Mapping status is "linked" and env_content_hash == git_content_hash
+    - DRIFT: Mapping status is "linked" but env has changes not in git
+    - OUT_OF_DATE: Mapping status is "linked" but git is ahead of env
+
+    Args:
+        mapping: The workflow_env_map record for this workflow in this environment
+        git_state: The canonical_workflow_git_state record (if exists)
+
+    Returns:
+        Tuple of (WorkflowEnvironmentStatus | None, can_sync: bool)
+        Returns (None, False) if workflow should not be displayed in matrix
+    """
+    if not mapping:
+        # No mapping means the workflow doesn't exist in this environment
+        return None, False
+
+    # Get the persisted mapping status
+    mapping_status = mapping.get("status")
+
+    # Apply status precedence rules: DELETED, IGNORED, and MISSING are not shown in matrix
+    # These statuses indicate the workflow should not be displayed as an active cell
+    if mapping_status in ("deleted", "ignored", "missing"):
+        return None, False
+
+    # UNMAPPED: workflow exists in n8n but has no canonical mapping
+    if mapping_status == "unmapped":
+        return WorkflowEnvironmentStatus.UNMAPPED, False
+
+    # LINKED: workflow has canonical mapping - now check for drift/out-of-date
+    if mapping_status == "linked":
+        env_content_hash = mapping.get("env_content_hash")
+        git_content_hash = git_state.get("git_content_hash") if git_state else None
+
+        # If no git state exists yet, the workflow is linked but not synced to git
+        if not git_content_hash:
+            return WorkflowEnvironmentStatus.LINKED, False
+
+        # Compare content hashes to determine if in sync, drifted, or out-of-date
+        if env_content_hash and git_content_hash:
+            if env_content_hash == git_content_hash:
+                # Fully in sync
+                return WorkflowEnvironmentStatus.LINKED, False
+            else:
+                # Hashes differ - determine if drift or out-of-date
+                # DRIFT: Environment has local changes not yet pushed to git
+                # OUT_OF_DATE: Git has newer version not yet deployed to environment
+                #
+                # For MVP, we use a simplified heuristic:
+                # - Compare timestamps: if env was updated after git sync, it's DRIFT
+                # - Otherwise, if git is different, it's OUT_OF_DATE
+                #
+                # Future enhancement: Track bidirectional sync timestamps for precise detection
+                env_updated_at = mapping.get("n8n_updated_at")
+                git_synced_at = git_state.get("last_repo_sync_at")
+
+                if env_updated_at and git_synced_at:
+                    # Parse timestamps for comparison
+                    try:
+                        from dateutil import parser
+                        env_dt = parser.parse(env_updated_at) if isinstance(env_updated_at, str) else env_updated_at
+                        git_dt = parser.parse(git_synced_at) if isinstance(git_synced_at, str) else git_synced_at
+
+                        if env_dt > git_dt:
+                            # Environment was updated after git sync - local changes (DRIFT)
+                            return WorkflowEnvironmentStatus.DRIFT, True
+                    except Exception as e:
+                        logger.warning(f"Error comparing timestamps: {e}")
+
+                # Default: git is ahead of environment (OUT_OF_DATE)
+                return WorkflowEnvironmentStatus.OUT_OF_DATE, True
+        else:
+            # Missing hash - treat as out of date
+            return WorkflowEnvironmentStatus.OUT_OF_DATE, True
+
+    # Fallback for unknown status - should not happen with proper data
+    logger.warning(f"Unexpected mapping status in matrix: {mapping_status}")
+    return None, False
+
+
+def _hash_key(mapping: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    """(environment_id, env_content_hash) bucket a mapping counts toward for collision warnings."""
+    env_id = mapping.get("environment_id")
+    content_hash = mapping.get("env_content_hash")
+    if env_id and content_hash:
+        return env_id, content_hash
+    return None
+
+
+class MatrixProjection:
+    """
+    Computed matrix for one tenant, plus the inputs needed to update it in place.
+
+    Cells are plain dicts in WorkflowMatrixCell field names; pages are built from
+    them on demand and memoized together with their ETag.
+    """
+
+    def __init__(self, version: int, environments: List[Dict[str, Any]]):
+        self.version = version
+        self.environments = environments
+        self.workflows: Dict[str, Dict[str, Any]] = {}
+        self.order: List[str] = []
+        # canonical_id -> mapping rows (every row, including hidden statuses)
+        self.mappings: Dict[str, List[Dict[str, Any]]] = {}
+        # canonical_id -> environment_id -> git state
+        self.git_states: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # (environment_id, env_content_hash) -> canonical_id per mapping row with that hash
+        self.hash_index: Dict[Tuple[str, str], List[str]] = {}
+        self.cells: Dict[str, Dict[str, Optional[Dict[str, Any]]]] = {}
+        self._pages: Dict[Tuple[int, int], Dict[str, Any]] = {}
+
+    def apply(self, inputs: Dict[str, List[Dict[str, Any]]], canonical_ids: Optional[Set[str]] = None) -> None:
+        """
+        Replace the inputs of canonical_ids with freshly loaded rows and recompute affected cells.
+
+        canonical_ids=None applies a full load: every canonical workflow in inputs.
+        Rows sharing a content hash with a changed workflow are recomputed too, since
+        their collision warnings depend on it.
+        """
+        if canonical_ids is None:
+            canonical_ids = {
+                row["canonical_id"]
+                for rows in inputs.values()
+                for row in rows
+                if row.get("canonical_id")
+            }
+
+        affected_buckets: Set[Tuple[str, str]] = set()
+        for canonical_id in canonical_ids:
+            for mapping in self.mappings.pop(canonical_id, []):
+                key = _hash_key(mapping)
+                if key is None:
+                    continue
+                bucket = self.hash_index[key]
+                bucket.remove(canonical_id)
+                if not bucket:
+                    del self.hash_index[key]
+                affected_buckets.add(key)
+            self.workflows.pop(canonical_id, None)
+            self.git_states.pop(canonical_id, None)
+            self.cells.pop(canonical_id, None)
+
+        for row in inputs.get("canonical_workflows", []):
+            canonical_id = row.get("canonical_id")
+            if canonical_id:
+                self.workflows[canonical_id] = {
+                    "canonical_id": canonical_id,
+                    "display_name": row.get("display_name") or canonical_id,
+                    "created_at": row.get("created_at"),
+                }
+
+        for mapping in inputs.get("mappings", []):
+            canonical_id = mapping.get("canonical_id")
+            if not canonical_id:
+                continue
+            self.mappings.setdefault(canonical_id, []).append(mapping)
+            key = _hash_key(mapping)
+            if key is not None:
+                self.hash_index.setdefault(key, []).append(canonical_id)
+                affected_buckets.add(key)
+
+        for git_state in inputs.get("git_states", []):
+            canonical_id = git_state.get("canonical_id")
+            env_id = git_state.get("environment_id")
+            if canonical_id and env_id:
+                self.git_states.setdefault(canonical_id, {})[env_id] = git_state
+
+        recompute = set(canonical_ids)
+        for key in affected_buckets:
+            recompute.update(self.hash_index.get(key, ()))
+        for canonical_id in recompute:
+            if canonical_id in self.workflows:
+                self.cells[canonical_id] = self._compute_row(canonical_id)
+
+        # Same order as db_service.get_canonical_workflows (newest first)
+        self.order = sorted(
+            self.workflows,
+            key=lambda cid: (str(self.workflows[cid]["created_at"] or ""), cid),
+            reverse=True,
+        )
+        self._pages.clear()
+
+    def _compute_row(self, canonical_id: str) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Compute the cells of one canonical workflow across the active environments."""
+        mappings_by_env = {
+            mapping["environment_id"]: mapping
+            for mapping in self.mappings.get(canonical_id, [])
+            if mapping.get("environment_id")
+        }
+        git_states_by_env = self.git_states.get(canonical_id, {})
+
+        row: Dict[str, Optional[Dict[str, Any]]] = {}
+        for env in self.environments:
+            env_id = env["id"]
+            mapping = mappings_by_env.get(env_id)
+            computed_status, can_sync = compute_cell_status(mapping, git_states_by_env.get(env_id))
+            if computed_status is None:
+                # Workflow doesn't exist in this environment
+                row[env_id] = None
+                continue
+
+            # Check for hash collision in this environment
+            collision_warning = None
+            content_hash = mapping.get("env_content_hash")
+            if content_hash:
+                canonical_ids_with_hash = self.hash_index.get((env_id, content_hash), [])
+                if len(canonical_ids_with_hash) > 1:
+                    # Collision detected: multiple canonical workflows share the same hash
+                    other_workflows = [cid for cid in canonical_ids_with_hash if cid != canonical_id]
+                    collision_warning = (
+                        f"Hash collision detected: Content hash '{content_hash[:12]}...' "
+                        f"is shared with {len(other_workflows)} other workflow(s). "
+                        f"This may indicate identical workflow content or a hash collision."
+                    )
+
+            row[env_id] = {
+                "status": computed_status.value,
+                "can_sync": can_sync,
+                "n8n_workflow_id": mapping.get("n8n_workflow_id"),
+                "content_hash": content_hash,
+                "collision_warning": collision_warning,
+            }
+        return row
+
+    def page(self, page: int, page_size: int) -> Dict[str, Any]:
+        """
+        Return one page of the matrix with its ETag.
+
+        Returns:
+            {"workflows": [...], "environments": [...], "matrix": {...},
+             "total_workflows": int, "etag": str}
+        """
+        cached = self._pages.get((page, page_size))
+        if cached is not None:
+            return cached
+
+        page_ids = self.order[(page - 1) * page_size:page * page_size]
+        result: Dict[str, Any] = {
+            "workflows": [self.workflows[cid] for cid in page_ids],
+            "environments": self.environments,
+            "matrix": {cid: self.cells.get(cid, {}) for cid in page_ids},
+            "total_workflows": len(self.order),
+        }
+        digest = hashlib.sha256(json.dumps(result, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        result["etag"] = f'"{digest[:32]}"'
+
+        if len(self._pages) >= MAX_CACHED_PAGES:
+            self._pages.clear()
+        self._pages[(page, page_size)] = result
+        return result
+
+
+class WorkflowMatrixService:
+    """Service serving workflow × environment matrix pages from per-tenant projections"""
+
+    # Projections keyed by tenant_id. The TTL bounds how long a change the log
+    # did not capture (e.g. environment type ordering) can stay visible.
+    _cache = TTLCache(
+        max_entries=settings.WORKFLOW_MATRIX_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.WORKFLOW_MATRIX_CACHE_TTL_SECONDS,
+    )
+    # One refresh lock per tenant, dropped once no request holds or awaits it
+    _refresh_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+    async def get_page(self, tenant_id: str, page: int, page_size: int) -> Dict[str, Any]:
+        """Get one page of the tenant's matrix (see MatrixProjection.page), refreshing the projection first."""
+        projection = await self._get_projection(tenant_id)
+        return projection.page(page, page_size)
+
+    async def _get_projection(self, tenant_id: str) -> MatrixProjection:
+        """Return the tenant's projection, applying logged changes or rebuilding it as needed."""
+        lock = self._refresh_locks.get(tenant_id)
+        if lock is None:
+            lock = self._refresh_locks[tenant_id] = asyncio.Lock()
+        async with lock:
+            return await self._refresh_projection(tenant_id)
+
+    async def _refresh_projection(self, tenant_id: str) -> MatrixProjection:
+        """Bring the cached projection up to date; callers hold the tenant's refresh lock."""
+        projection = self._cache.get(tenant_id)
+        if projection is None:
+            return await self._build_projection(tenant_id)
+
+        try:
+            changes = await db_service.get_workflow_matrix_changes(tenant_id, projection.version)
+        except Exception as e:
+            logger.warning(f"Failed to read workflow matrix changes for tenant {tenant_id}: {str(e)}")
+            return await self._build_projection(tenant_id)
+
+        if not changes:
+            return projection
+
+        changed_ids = {row["canonical_id"] for row in changes}
+        if (
+            TENANT_WIDE_CANONICAL_ID in changed_ids
+            or len(changed_ids) > settings.WORKFLOW_MATRIX_INCREMENTAL_MAX_CHANGES
+        ):
+            return await self._build_projection(tenant_id)
+
+        # Record the version before loading so writes that land meanwhile are re-applied next time
+        latest_version = max(row["version"] for row in changes)
+        inputs = await db_service.get_workflow_matrix_inputs(tenant_id, sorted(changed_ids))
+        projection.apply(inputs, changed_ids)
+        projection.version = max(projection.version, latest_version)
+        logger.debug(f"Applied {len(changed_ids)} workflow matrix change(s) for tenant {tenant_id}")
+        return projection
+
+    async def _build_projection(self, tenant_id: str) -> MatrixProjection:
+        """Load and compute the full matrix for a tenant; cached only when the change log is readable."""
+        try:
+            version: Optional[int] = await db_service.get_workflow_matrix_version(tenant_id)
+        except Exception as e:
+            logger.warning(f"Workflow matrix change log unavailable, not caching matrix: {str(e)}")
+            version = None
+
+        environments, inputs = await asyncio.gather(
+            db_service.get_environments(tenant_id),
+            db_service.get_workflow_matrix_inputs(tenant_id),
+        )
+
+        # Filter to only active environments
+        columns = [
+            {
+                "id": env["id"],
+                "name": env.get("n8n_name", env.get("name", "Unknown")),
+                "type": env.get("n8n_type"),
+                "environment_class": env.get("environment_class", "dev"),
+            }
+            for env in environments
+            if env.get("is_active", True)
+        ]
+
+        projection = MatrixProjection(version or 0, columns)
+        projection.apply(inputs)
+        if version is not None:
+            self._cache.set(tenant_id, projection)
+        return projection
+
+    def invalidate(self, tenant_id: Optional[str] = None) -> None:
+        """Drop the cached projection of one tenant, or of all tenants."""
+        if tenant_id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(tenant_id)
+
+
+# Global instance
+workflow_matrix_service = WorkflowMatrixService()
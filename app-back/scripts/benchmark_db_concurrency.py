@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent DatabaseService throughput: inline blocking execute()
+(the old behaviour) vs. the thread-pool dispatch in DatabaseService._execute.
+
+Queries are simulated with a fixed blocking latency so the benchmark runs
+without a database. Pass --live to issue real get_environments() calls
+against the configured Supabase project instead.
+
+Usage:
+    python scripts/benchmark_db_concurrency.py [--requests 200] [--latency-ms 20]
+    python scripts/benchmark_db_concurrency.py --live --tenant-id <tenant_id>
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.database import db_service
+
+
+class SimulatedQuery:
+    """Query builder stand-in whose execute() blocks like a PostgREST round-trip."""
+
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+
+    def execute(self):
+        time.sleep(self.latency_s)
+        return None
+
+
+async def run_load(make_request: Callable[[], Awaitable], total: int, concurrency: int) -> List[float]:
+    """Issue `total` requests with at most `concurrency` in flight; return per-request latencies."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await make_request()
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one() for _ in range(total)))
+    return latencies
+
+
+def report(label: str, latencies: List[float], elapsed: float):
+    ordered = sorted(latencies)
+    p99 = ordered[max(0, int(len(ordered) * 0.99) - 1)]
+    print(
+        f"{label:<10} {len(latencies) / elapsed:>10.1f} req/s   "
+        f"p50 {statistics.median(ordered) * 1000:>8.1f} ms   p99 {p99 * 1000:>8.1f} ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--live", action="store_true", help="Query the configured database")
+    parser.add_argument("--tenant-id", help="Tenant for --live get_environments() calls")
+    args = parser.parse_args()
+
+    if args.live:
+        if not args.tenant_id:
+            parser.error("--live requires --tenant-id")
+
+        def build_query():
+            return db_service.client.table("environments").select("*").eq("tenant_id", args.tenant_id)
+    else:
+        def build_query():
+            return SimulatedQuery(args.latency_ms / 1000)
+
+    async def before():
+        build_query().execute()
+
+    async def after():
+        await db_service._execute(build_query())
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}\n")
+    for label, make_request in (("before", before), ("after", after)):
+        start = time.perf_counter()
+        latencies = await run_load(make_request, args.requests, args.concurrency)
+        report(label, latencies, time.perf_counter() - start)
+
+    db_service.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,288 @@
+"""
+Unit tests for batched alert rule evaluation over shared execution windows.
+"""
+import asyncio
+
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from app.schemas.notification import AlertRuleType
+from app.services.alert_evaluation_engine import (
+    CONSECUTIVE_FAILURE_WINDOW_MINUTES,
+    ExecutionWindow,
+    WorkflowWindowStats,
+    load_execution_window,
+    plan_windows,
+)
+from app.services.alert_rules_service import AlertRulesService
+
+
+TENANT_ID = "tenant-1"
+
+
+def _rule(rule_id, rule_type, config=None, environment_id="env-1", tenant_id=TENANT_ID):
+    return {
+        "id": rule_id,
+        "tenant_id": tenant_id,
+        "name": f"Rule {rule_id}",
+        "rule_type": rule_type.value,
+        "environment_id": environment_id,
+        "threshold_config": config or {},
+    }
+
+
+WINDOW_ROWS = [
+    {
+        "workflow_id": "wf-1", "workflow_name": "Orders", "total_executions": 40, "error_count": 10,
+        "last_error_at": "2026-10-16T10:00:00+00:00", "long_running_ms": [90000, 70000], "consecutive_failures": 4,
+    },
+    {
+        "workflow_id": "wf-2", "workflow_name": "Invoices", "total_executions": 10, "error_count": 0,
+        "last_error_at": None, "long_running_ms": None, "consecutive_failures": 0,
+    },
+]
+
+
+def _window(rows=WINDOW_ROWS, error_types=None):
+    return ExecutionWindow(
+        environment_id="env-1",
+        window_minutes=60,
+        workflows={
+            row["workflow_id"]: WorkflowWindowStats(
+                workflow_id=row["workflow_id"],
+                workflow_name=row["workflow_name"],
+                total_executions=row["total_executions"],
+                error_count=row["error_count"],
+                last_error_at=row["last_error_at"],
+                long_running_ms=row["long_running_ms"] or [],
+                long_running_counts=row.get("long_running_counts") or {},
+                consecutive_failures=row["consecutive_failures"],
+            )
+            for row in rows
+        },
+        error_types=error_types or [],
+    )
+
+
+class TestPlanWindows:
+    """Tests for grouping rules by (environment, window)."""
+
+    @pytest.mark.unit
+    def test_groups_rules_sharing_environment_and_window(self):
+        rules = [
+            _rule("r1", AlertRuleType.ERROR_RATE, {"time_window_minutes": 60}),
+            _rule("r2", AlertRuleType.EXECUTION_DURATION, {"max_duration_ms": 30000}),
+            _rule("r3", AlertRuleType.EXECUTION_DURATION, {"max_duration_ms": 10000}),
+            _rule("r4", AlertRuleType.WORKFLOW_FAILURE),
+            _rule("r5", AlertRuleType.ERROR_RATE, {"time_window_minutes": 15}),
+            _rule("r6", AlertRuleType.ERROR_RATE, {"time_window_minutes": 60}, environment_id="env-2"),
+        ]
+
+        plan = plan_windows(rules)
+
+        assert set(plan) == {("env-1", 60), ("env-1", 15), ("env-2", 60)}
+        assert plan[("env-1", 60)].duration_threshold_ms == 10000
+        assert plan[("env-1", 60)].duration_thresholds_ms == {10000, 30000}
+        assert plan[("env-1", 15)].duration_threshold_ms is None
+
+    @pytest.mark.unit
+    def test_merges_streak_and_error_type_needs(self):
+        rules = [
+            _rule("r1", AlertRuleType.CONSECUTIVE_FAILURES, {"workflow_ids": ["wf-1"]}),
+            _rule("r2", AlertRuleType.CONSECUTIVE_FAILURES, {"workflow_ids": ["wf-9"]}),
+            _rule("r3", AlertRuleType.ERROR_TYPE, {"time_window_minutes": 60}),
+        ]
+
+        plan = plan_windows(rules)
+
+        streaks = plan[("env-1", CONSECUTIVE_FAILURE_WINDOW_MINUTES)]
+        assert streaks.include_streaks
+        assert streaks.streak_workflow_ids == {"wf-1", "wf-9"}
+        assert plan[("env-1", 60)].include_error_types
+        assert not plan[("env-1", 60)].include_streaks
+
+
+class TestExecutionWindow:
+    """Tests for in-memory aggregate queries."""
+
+    @pytest.mark.unit
+    def test_error_rate_metrics(self):
+        assert _window().error_rate_metrics() == {"total_executions": 50, "error_count": 10, "error_rate": 20.0}
+        assert _window(rows=[]).error_rate_metrics()["error_rate"] == 0
+
+    @pytest.mark.unit
+    def test_failures_filter_by_workflow(self):
+        window = _window()
+
+        assert [f["workflow_id"] for f in window.failures([], any_workflow=False)] == ["wf-1"]
+        assert window.failures(["wf-2"], any_workflow=False) == []
+        assert len(window.failures(["wf-2"], any_workflow=True)) == 1
+
+    @pytest.mark.unit
+    def test_long_running_applies_rule_threshold(self):
+        window = _window()
+
+        assert [e["duration_ms"] for e in window.long_running(60000, [])] == [90000, 70000]
+        assert [e["duration_ms"] for e in window.long_running(80000, [])] == [90000]
+        assert window.long_running(60000, ["wf-2"]) == []
+
+    @pytest.mark.unit
+    def test_long_running_count_is_not_capped_by_sample(self):
+        rows = [{**WINDOW_ROWS[0], "long_running_counts": {60000: 250, 80000: 120}}, WINDOW_ROWS[1]]
+        window = _window(rows=rows)
+
+        assert window.long_running_count(60000, []) == 250
+        assert window.long_running_count(80000, ["wf-1"]) == 120
+        # Thresholds without a count fall back to the sample
+        assert window.long_running_count(70000, []) == 1
+
+    @pytest.mark.unit
+    def test_max_consecutive_failures(self):
+        window = _window()
+
+        assert window.max_consecutive_failures([]) == (4, "wf-1")
+        assert window.max_consecutive_failures(["wf-2", "wf-missing"]) == (0, None)
+
+    @pytest.mark.unit
+    async def test_load_execution_window(self):
+        with patch("app.services.alert_evaluation_engine.db_service") as mock_db:
+            mock_db.get_alert_execution_window = AsyncMock(return_value=WINDOW_ROWS)
+            mock_db.get_error_intelligence_for_alert = AsyncMock(return_value=[{"error_type": "timeout", "count": 2}])
+            request = plan_windows([_rule("r1", AlertRuleType.ERROR_TYPE)])[("env-1", 60)]
+
+            window = await load_execution_window(TENANT_ID, request)
+
+        assert window.workflows["wf-1"].long_running_ms == [90000, 70000]
+        assert window.workflows["wf-2"].long_running_ms == []
+        assert window.error_types == [{"error_type": "timeout", "count": 2}]
+
+
+    @pytest.mark.unit
+    async def test_load_maps_long_running_counts_to_thresholds(self):
+        rows = [{**WINDOW_ROWS[0], "long_running_counts": [250, 120]}, WINDOW_ROWS[1]]
+        rules = [
+            _rule("r1", AlertRuleType.EXECUTION_DURATION, {"max_duration_ms": 80000}),
+            _rule("r2", AlertRuleType.EXECUTION_DURATION, {"max_duration_ms": 60000}),
+        ]
+        with patch("app.services.alert_evaluation_engine.db_service") as mock_db:
+            mock_db.get_alert_execution_window = AsyncMock(return_value=rows)
+            window = await load_execution_window(TENANT_ID, plan_windows(rules)[("env-1", 60)])
+
+        kwargs = mock_db.get_alert_execution_window.await_args.kwargs
+        assert kwargs["duration_threshold_ms"] == 60000
+        assert kwargs["count_thresholds_ms"] == [60000, 80000]
+        assert window.workflows["wf-1"].long_running_counts == {60000: 250, 80000: 120}
+        assert window.workflows["wf-2"].long_running_counts == {}
+
+
+class TestBatchedEvaluation:
+    """Tests for AlertRulesService batched evaluation."""
+
+    @pytest.mark.unit
+    async def test_rules_in_same_window_share_one_load(self):
+        rules = [
+            _rule("r1", AlertRuleType.ERROR_RATE, {"threshold_percent": 10, "min_executions": 10}),
+            _rule("r2", AlertRuleType.WORKFLOW_FAILURE),
+            _rule("r3", AlertRuleType.EXECUTION_DURATION, {"max_duration_ms": 80000}),
+            _rule("r4", AlertRuleType.CONSECUTIVE_FAILURES, {"failure_count": 3}),
+        ]
+        service = AlertRulesService()
+        service._process_evaluation_result = AsyncMock()
+
+        with patch("app.services.alert_evaluation_engine.db_service") as engine_db, \
+                patch("app.services.alert_rules_service.db_service") as service_db:
+            engine_db.get_alert_execution_window = AsyncMock(return_value=WINDOW_ROWS)
+            service_db.get_alert_rules = AsyncMock(return_value=rules)
+
+            results = await service.evaluate_all_rules(TENANT_ID)
+
+        # One load for the 60-minute window, one for the consecutive-failure window
+        assert engine_db.get_alert_execution_window.await_count == 2
+        service_db.evaluate_error_rate.assert_not_called()
+        service_db.count_consecutive_failures.assert_not_called()
+        assert [r.rule_id for r in results] == ["r1", "r2", "r3", "r4"]
+        assert all(r.is_triggered for r in results)
+        assert results[0].current_value == 20.0
+        assert results[1].current_value == 10.0
+        assert results[2].details["total_count"] == 1
+        assert service._process_evaluation_result.await_count == 4
+
+    @pytest.mark.unit
+    async def test_duration_rule_reports_uncapped_total(self):
+        rows = [{**WINDOW_ROWS[0], "long_running_counts": [250]}, WINDOW_ROWS[1]]
+        rules = [_rule("r1", AlertRuleType.EXECUTION_DURATION, {"max_duration_ms": 60000})]
+        service = AlertRulesService()
+        service._process_evaluation_result = AsyncMock()
+
+        with patch("app.services.alert_evaluation_engine.db_service") as engine_db, \
+                patch("app.services.alert_rules_service.db_service") as service_db:
+            engine_db.get_alert_execution_window = AsyncMock(return_value=rows)
+            service_db.get_alert_rules = AsyncMock(return_value=rules)
+
+            results = await service.evaluate_all_rules(TENANT_ID)
+
+        assert results[0].details["total_count"] == 250
+        assert len(results[0].details["long_running_executions"]) == 2
+        assert results[0].message.startswith("Found 250 executions")
+
+    @pytest.mark.unit
+    async def test_failed_window_falls_back_to_per_rule_queries(self):
+        rules = [_rule("r1", AlertRuleType.ERROR_RATE, {"threshold_percent": 10, "min_executions": 10})]
+        service = AlertRulesService()
+        service._process_evaluation_result = AsyncMock()
+
+        with patch("app.services.alert_evaluation_engine.db_service") as engine_db, \
+                patch("app.services.alert_rules_service.db_service") as service_db:
+            engine_db.get_alert_execution_window = AsyncMock(side_effect=Exception("function does not exist"))
+            service_db.get_alert_rules = AsyncMock(return_value=rules)
+            service_db.evaluate_error_rate = AsyncMock(
+                return_value={"total_executions": 20, "error_count": 1, "error_rate": 5.0}
+            )
+
+            results = await service.evaluate_all_rules(TENANT_ID)
+
+        service_db.evaluate_error_rate.assert_awaited_once()
+        assert results[0].is_triggered is False
+
+    @pytest.mark.unit
+    async def test_muted_rules_are_skipped(self):
+        rule = _rule("r1", AlertRuleType.ERROR_RATE)
+        rule["muted_until"] = "2999-01-01T00:00:00"
+        service = AlertRulesService()
+        service._process_evaluation_result = AsyncMock()
+
+        with patch("app.services.alert_evaluation_engine.db_service") as engine_db, \
+                patch("app.services.alert_rules_service.db_service") as service_db:
+            engine_db.get_alert_execution_window = AsyncMock(return_value=[])
+            service_db.get_alert_rules = AsyncMock(return_value=[rule])
+
+            results = await service.evaluate_all_rules(TENANT_ID)
+
+        assert results == []
+        engine_db.get_alert_execution_window.assert_not_called()
+
+    @pytest.mark.unit
+    async def test_tenants_evaluated_concurrently_with_bound(self):
+        rules = [_rule(f"r{i}", AlertRuleType.ERROR_RATE, tenant_id=f"tenant-{i}") for i in range(6)]
+        service = AlertRulesService()
+        in_flight = 0
+        peak = 0
+
+        async def evaluate(tenant_id, tenant_rules):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return [tenant_id]
+
+        service._evaluate_rules_batched = evaluate
+
+        with patch("app.services.alert_rules_service.db_service") as service_db, \
+                patch("app.services.alert_rules_service.settings.ALERT_EVALUATION_TENANT_CONCURRENCY", 2):
+            service_db.get_enabled_alert_rules_for_all_tenants = AsyncMock(return_value=rules)
+
+            results = await service.evaluate_all_tenants()
+
+        assert len(results) == 6
+        assert peak == 2
@@ -0,0 +1,294 @@
+"""
+Unit tests for CanonicalEnvSyncService batching and full-workflow fetch.
+"""
+import asyncio
+import pytest
+from unittest.mock import patch, AsyncMock, MagicMock
+
+from app.services import canonical_env_sync_service as sync_module
+from app.services.canonical_env_sync_service import (
+    CanonicalEnvSyncService,
+    _fetch_full_workflows,
+)
+
+
+class _FakeAdapter:
+    """Adapter stub that records fetch concurrency."""
+
+    def __init__(self, count: int, delay: float = 0.01, fail_ids=()):
+        self.summaries = [{"id": f"wf-{i}", "name": f"Workflow {i}"} for i in range(count)]
+        self.delay = delay
+        self.fail_ids = set(fail_ids)
+        self.in_flight = 0
+        self.peak = 0
+        self.fetched = []
+
+    async def get_workflows(self):
+        return list(self.summaries)
+
+    async def get_workflow(self, workflow_id):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if workflow_id in self.fail_ids:
+                raise RuntimeError("fetch failed")
+            self.fetched.append(workflow_id)
+            return {"id": workflow_id, "name": f"Full {workflow_id}", "nodes": []}
+        finally:
+            self.in_flight -= 1
+
+
+async def _process(tenant_id, environment_id, workflows, is_dev=True):
+    return _batch_result(workflows)
+
+
+def _batch_result(workflows):
+    return {
+        "synced": len(workflows),
+        "skipped": 0,
+        "linked": 0,
+        "unmapped": 0,
+        "errors": [],
+        "observed_workflow_ids": [w["id"] for w in workflows],
+        "created_workflow_ids": [],
+        "collision_warnings": [],
+    }
+
+
+class TestFetchFullWorkflows:
+    """Tests for the bounded concurrent fetch stage."""
+
+    @pytest.mark.unit
+    async def test_preserves_order_and_falls_back_to_summary(self):
+        """Should keep input order and use the summary when a fetch fails."""
+        adapter = _FakeAdapter(5, fail_ids={"wf-2"})
+        summaries = adapter.summaries + [{"name": "no id"}]
+
+        result = await _fetch_full_workflows(adapter, summaries, asyncio.Semaphore(3))
+
+        assert [w["id"] for w in result] == ["wf-0", "wf-1", "wf-2", "wf-3", "wf-4"]
+        assert result[2] == {"id": "wf-2", "name": "Workflow 2"}
+        assert result[0]["name"] == "Full wf-0"
+
+    @pytest.mark.unit
+    async def test_respects_semaphore(self):
+        """Should never exceed the semaphore's concurrency."""
+        adapter = _FakeAdapter(12)
+
+        await _fetch_full_workflows(adapter, adapter.summaries, asyncio.Semaphore(4))
+
+        assert adapter.peak == 4
+
+
+class TestSyncEnvironmentBatches:
+    """Tests for sync_environment batch pipelining."""
+
+    @pytest.fixture
+    def environment(self):
+        return {"id": "env-1", "environment_class": "dev"}
+
+    @pytest.mark.unit
+    async def test_processes_all_batches_in_order(self, environment):
+        """Every workflow should be processed once, in summary order."""
+        adapter = _FakeAdapter(60, delay=0)
+        processed = []
+
+        async def process(tenant_id, environment_id, workflows, is_dev=True):
+            processed.extend(w["id"] for w in workflows)
+            return await _process(tenant_id, environment_id, workflows, is_dev)
+
+        with patch.object(sync_module.ProviderRegistry, "get_adapter_for_environment", return_value=adapter), \
+                patch.object(CanonicalEnvSyncService, "_process_workflow_batch", side_effect=process), \
+                patch.object(CanonicalEnvSyncService, "_mark_missing_workflows_missing", AsyncMock(return_value=0)):
+            results = await CanonicalEnvSyncService.sync_environment("tenant-1", "env-1", environment)
+
+        assert processed == [f"wf-{i}" for i in range(60)]
+        assert results["workflows_synced"] == 60
+
+    @pytest.mark.unit
+    async def test_resumes_from_checkpoint(self, environment):
+        """Should skip workflows before last_processed_index and checkpoint batch ends."""
+        adapter = _FakeAdapter(60, delay=0)
+        checkpoints = []
+
+        async def update_job_status(job_id, status, progress=None, **kwargs):
+            if progress and "checkpoint" in progress:
+                checkpoints.append(progress["checkpoint"]["last_processed_index"])
+
+        job_service = MagicMock()
+        job_service.update_job_status = AsyncMock(side_effect=update_job_status)
+
+        with patch.object(sync_module.ProviderRegistry, "get_adapter_for_environment", return_value=adapter), \
+                patch.object(CanonicalEnvSyncService, "_process_workflow_batch", side_effect=_process), \
+                patch.object(CanonicalEnvSyncService, "_mark_missing_workflows_missing", AsyncMock(return_value=0)), \
+                patch("app.services.background_job_service.background_job_service", job_service):
+            await CanonicalEnvSyncService.sync_environment(
+                "tenant-1", "env-1", environment,
+                job_id="job-1",
+                checkpoint={"last_processed_index": 25}
+            )
+
+        assert "wf-0" not in adapter.fetched
+        assert sorted(adapter.fetched) == sorted(f"wf-{i}" for i in range(25, 60))
+        assert checkpoints == [50, 60]
+
+    @pytest.mark.unit
+    async def test_prefetches_next_batch_while_processing(self, environment):
+        """The next batch's fetch should start before the current batch finishes processing."""
+        adapter = _FakeAdapter(50, delay=0)
+        fetched_during_first_batch = []
+
+        async def process(tenant_id, environment_id, workflows, is_dev=True):
+            if not fetched_during_first_batch:
+                await asyncio.sleep(0.05)
+                fetched_during_first_batch.append(len(adapter.fetched))
+            return _batch_result(workflows)
+
+        with patch.object(sync_module.ProviderRegistry, "get_adapter_for_environment", return_value=adapter), \
+                patch.object(CanonicalEnvSyncService, "_process_workflow_batch", side_effect=process), \
+                patch.object(CanonicalEnvSyncService, "_mark_missing_workflows_missing", AsyncMock(return_value=0)):
+            await CanonicalEnvSyncService.sync_environment("tenant-1", "env-1", environment)
+
+        assert fetched_during_first_batch == [50]
+
+
+class _FakeClient:
+    """Supabase client stub that serves rows per table and records each query's filters."""
+
+    def __init__(self, tables):
+        self.tables = tables
+        self.queries = []
+
+    def table(self, name):
+        return _FakeQuery(self, name)
+
+
+class _FakeQuery:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.filters = {}
+
+    def select(self, *args, **kwargs):
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def neq(self, column, value):
+        self.filters[f"not.{column}"] = value
+        return self
+
+    def in_(self, column, values):
+        self.filters[column] = list(values)
+        return self
+
+    def execute(self):
+        self.client.queries.append((self.table, self.filters))
+        rows = []
+        for row in self.client.tables.get(self.table, []):
+            matches = True
+            for column, value in self.filters.items():
+                if column.startswith("not."):
+                    matches &= row.get(column[4:]) not in (None, value)
+                elif isinstance(value, list):
+                    matches &= row.get(column) in value
+                elif column in row:
+                    matches &= row[column] == value
+            if matches:
+                rows.append(row)
+        return MagicMock(data=rows)
+
+
+class TestProcessWorkflowBatch:
+    """Tests for keyed bulk lookups and the single bulk write per batch."""
+
+    @pytest.fixture
+    def run_batch(self):
+        async def run(workflows, mappings=(), git_states=(), failed=()):
+            client = _FakeClient({"workflow_env_map": list(mappings), "canonical_workflow_git_state": list(git_states)})
+            with patch.object(sync_module, "db_service") as mock_db, \
+                    patch.object(sync_module, "compute_workflow_hash", side_effect=lambda wf, **kw: f"hash-{wf['name']}"), \
+                    patch.object(sync_module, "_detect_hash_collision", return_value=None):
+                mock_db.client = client
+                mock_db.bulk_upsert_workflow_env_mappings = AsyncMock(side_effect=lambda records: {
+                    "rows": [r for r in records if r["n8n_workflow_id"] not in failed],
+                    "failed": [{"key": wf_id, "error": "constraint violation"} for wf_id in failed],
+                })
+                results = await CanonicalEnvSyncService._process_workflow_batch("tenant-1", "env-1", workflows)
+            upserts = mock_db.bulk_upsert_workflow_env_mappings.await_args_list
+            return results, client.queries, [call.args[0] for call in upserts]
+
+        return run
+
+    @staticmethod
+    def _workflow(wf_id, name=None, updated_at="2026-10-01T00:00:00.000Z"):
+        return {"id": wf_id, "name": name or wf_id, "updatedAt": updated_at, "nodes": []}
+
+    @pytest.mark.unit
+    async def test_batch_costs_three_lookups_and_one_write(self, run_batch):
+        workflows = [
+            self._workflow("wf-0"),
+            self._workflow("wf-1"),
+            self._workflow("wf-2", name="Orders"),
+            self._workflow("wf-3"),
+        ]
+        mappings = [
+            {"n8n_workflow_id": "wf-0", "canonical_id": "c0", "status": "linked", "n8n_updated_at": "2026-10-01T00:00:00.000Z"},
+            {"n8n_workflow_id": "wf-1", "canonical_id": "c9", "status": "linked", "n8n_updated_at": "2026-09-01T00:00:00Z"},
+        ]
+        git_states = [{"canonical_id": "c1", "git_content_hash": "hash-Orders"}]
+
+        results, queries, upserts = await run_batch(workflows, mappings, git_states)
+
+        assert [table for table, _ in queries] == ["workflow_env_map", "canonical_workflow_git_state", "workflow_env_map"]
+        assert queries[0][1]["n8n_workflow_id"] == ["wf-0", "wf-1", "wf-2", "wf-3"]
+        assert len(upserts) == 1
+        records = {r["n8n_workflow_id"]: r for r in upserts[0]}
+        assert set(records) == {"wf-1", "wf-2", "wf-3"}
+        assert "status" not in records["wf-1"] and records["wf-1"]["canonical_id"] == "c9"
+        assert (records["wf-2"]["canonical_id"], records["wf-2"]["status"]) == ("c1", "linked")
+        assert "canonical_id" not in records["wf-3"] and records["wf-3"]["status"] == "unmapped"
+        assert (results["synced"], results["skipped"], results["linked"], results["unmapped"]) == (3, 1, 3, 1)
+        assert results["created_workflow_ids"] == ["wf-3"]
+        assert results["observed_workflow_ids"] == ["wf-0", "wf-1", "wf-2", "wf-3"]
+
+    @pytest.mark.unit
+    async def test_auto_link_claims_canonical_once_per_batch(self, run_batch):
+        workflows = [self._workflow("wf-1", name="Same"), self._workflow("wf-2", name="Same")]
+        git_states = [{"canonical_id": "c1", "git_content_hash": "hash-Same"}]
+
+        results, _, upserts = await run_batch(workflows, git_states=git_states)
+
+        records = {r["n8n_workflow_id"]: r for r in upserts[0]}
+        assert records["wf-1"]["canonical_id"] == "c1"
+        assert "canonical_id" not in records["wf-2"]
+        assert (results["linked"], results["unmapped"]) == (1, 1)
+
+    @pytest.mark.unit
+    async def test_auto_link_skips_canonical_linked_elsewhere(self, run_batch):
+        mappings = [{"n8n_workflow_id": "wf-old", "canonical_id": "c1", "status": "linked", "n8n_updated_at": None}]
+        git_states = [
+            {"canonical_id": "c1", "git_content_hash": "hash-Orders"},
+            {"canonical_id": "c2", "git_content_hash": "hash-Shared"},
+            {"canonical_id": "c3", "git_content_hash": "hash-Shared"},
+        ]
+
+        results, _, upserts = await run_batch(
+            [self._workflow("wf-1", name="Orders"), self._workflow("wf-2", name="Shared")], mappings, git_states
+        )
+
+        assert all("canonical_id" not in r for r in upserts[0])
+        assert results["unmapped"] == 2
+
+    @pytest.mark.unit
+    async def test_rejected_rows_are_reported_individually(self, run_batch):
+        workflows = [self._workflow("wf-1"), self._workflow("wf-2"), self._workflow("wf-3")]
+
+        results, _, _ = await run_batch(workflows, failed={"wf-2"})
+
+        assert results["synced"] == 2
+        assert results["created_workflow_ids"] == ["wf-1", "wf-3"]
+        assert results["errors"] == ["Error processing workflow wf-2: constraint violation"]
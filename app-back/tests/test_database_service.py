@@ -0,0 +1,348 @@
+"""
+Unit tests for DatabaseService query dispatch (non-blocking execute path).
+"""
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.database import DatabaseService
+
+
+class _SlowQuery:
+    """Stand-in for a PostgREST builder whose execute() blocks."""
+
+    def __init__(self, delay: float, data=None):
+        self.delay = delay
+        self.data = data
+
+    def execute(self):
+        time.sleep(self.delay)
+        response = MagicMock()
+        response.data = self.data
+        return response
+
+
+@pytest.fixture
+def db():
+    service = DatabaseService()
+    yield service
+    service.close()
+
+
+class TestExecute:
+    """Tests for DatabaseService._execute."""
+
+    @pytest.mark.unit
+    async def test_returns_builder_response(self, db):
+        """Should return whatever the builder's execute() returns."""
+        response = await db._execute(_SlowQuery(0, data=[{"id": "env-1"}]))
+        assert response.data == [{"id": "env-1"}]
+
+    @pytest.mark.unit
+    async def test_does_not_block_event_loop(self, db):
+        """Concurrent queries should overlap instead of running back-to-back."""
+        start = time.perf_counter()
+        await asyncio.gather(*(db._execute(_SlowQuery(0.2)) for _ in range(5)))
+        assert time.perf_counter() - start < 0.8
+
+    @pytest.mark.unit
+    async def test_timeout_raises(self, db):
+        """Should raise TimeoutError when the query exceeds its timeout."""
+        with pytest.raises(asyncio.TimeoutError):
+            await db._execute(_SlowQuery(0.5), timeout=0.05)
+
+    @pytest.mark.unit
+    async def test_propagates_query_errors(self, db):
+        """Errors raised by execute() should surface to the caller."""
+        query = MagicMock()
+        query.execute.side_effect = RuntimeError("boom")
+        with pytest.raises(RuntimeError, match="boom"):
+            await db._execute(query)
+
+    @pytest.mark.unit
+    async def test_close_recreates_pool_lazily(self, db):
+        """Should keep working after close() by creating a new pool."""
+        await db._execute(_SlowQuery(0))
+        db.close()
+        assert db._executor is None
+        await db._execute(_SlowQuery(0))
+        assert db._executor is not None
+
+    @pytest.mark.unit
+    async def test_pool_size_bounds_concurrency(self):
+        """In-flight queries should not exceed DB_EXECUTOR_MAX_WORKERS."""
+        with patch("app.services.database.settings.DB_EXECUTOR_MAX_WORKERS", 2):
+            service = DatabaseService()
+            try:
+                start = time.perf_counter()
+                await asyncio.gather(*(service._execute(_SlowQuery(0.1)) for _ in range(4)))
+                assert time.perf_counter() - start >= 0.2
+            finally:
+                service.close()
+
+
+class TestSelectAll:
+    """Tests for range-paged reads past PostgREST's row cap."""
+
+    @pytest.mark.unit
+    async def test_pages_until_short_page(self, db):
+        rows = [{"id": i} for i in range(7)]
+        ranges = []
+
+        def build_query():
+            query = MagicMock()
+
+            def range_(start, end):
+                ranges.append((start, end))
+                return _SlowQuery(0, data=rows[start:end + 1])
+
+            query.range.side_effect = range_
+            return query
+
+        result = await db._select_all(build_query, page_size=3)
+
+        assert result == rows
+        assert ranges == [(0, 2), (3, 5), (6, 8)]
+
+    @pytest.mark.unit
+    async def test_exact_multiple_reads_one_empty_page(self, db):
+        rows = [{"id": i} for i in range(4)]
+        build_query = MagicMock()
+        build_query.return_value.range.side_effect = lambda start, end: _SlowQuery(0, data=rows[start:end + 1])
+
+        assert await db._select_all(build_query, page_size=2) == rows
+        assert build_query.call_count == 3
+
+
+class TestWorkflowMatrixInputs:
+    """Tests for loading the workflow matrix inputs."""
+
+    @pytest.mark.unit
+    async def test_full_load_is_range_paged(self, db):
+        pages = {
+            "canonical_workflows": [[{"canonical_id": f"c{i}"} for i in range(2)], [{"canonical_id": "c2"}]],
+            "workflow_env_map": [[{"canonical_id": "c0"}]],
+            "canonical_workflow_git_state": [[]],
+        }
+        ranges = []
+
+        def table(name):
+            query = MagicMock()
+            query.select.return_value.eq.return_value = query
+            query.is_.return_value = query.not_.is_.return_value = query.order.return_value = query
+
+            def range_(start, end):
+                ranges.append((name, start))
+                return _SlowQuery(0, data=pages[name][start // 2])
+
+            query.range.side_effect = range_
+            return query
+
+        db.client = MagicMock()
+        db.client.table.side_effect = table
+        with patch("app.services.database.settings.DB_SELECT_PAGE_SIZE", 2):
+            inputs = await db.get_workflow_matrix_inputs("tenant-1")
+
+        assert [row["canonical_id"] for row in inputs["canonical_workflows"]] == ["c0", "c1", "c2"]
+        assert inputs["mappings"] == [{"canonical_id": "c0"}]
+        assert inputs["git_states"] == []
+        assert sorted(ranges) == sorted([
+            ("canonical_workflows", 0), ("canonical_workflows", 2),
+            ("workflow_env_map", 0), ("canonical_workflow_git_state", 0),
+        ])
+
+
+class TestServiceMethods:
+    """Public methods should keep their signatures and results."""
+
+    @pytest.mark.unit
+    async def test_get_environment_by_type(self, db):
+        """Should return the first matching environment."""
+        db.client = MagicMock()
+        db.client.table.return_value.select.return_value.eq.return_value.eq.return_value.execute.return_value = MagicMock(
+            data=[{"id": "env-1", "n8n_type": "dev"}]
+        )
+
+        result = await db.get_environment_by_type("tenant-1", "dev")
+
+        assert result == {"id": "env-1", "n8n_type": "dev"}
+
+
+class TestBulkUpsert:
+    """Tests for chunked multi-row upserts used by the sync paths."""
+
+    @staticmethod
+    def _recording_client(calls, fail=lambda rows: False):
+        def upsert(rows, on_conflict=None):
+            rows = rows if isinstance(rows, list) else [rows]
+            query = MagicMock()
+
+            def execute():
+                calls.append(rows)
+                if fail(rows):
+                    raise RuntimeError("rejected")
+                return MagicMock(data=list(rows))
+
+            query.execute.side_effect = execute
+            return query
+
+        client = MagicMock()
+        client.table.return_value.upsert.side_effect = upsert
+        return client
+
+    @staticmethod
+    def _execution(i):
+        return {"id": f"exec-{i}", "workflowId": "wf-1", "status": "success",
+                "startedAt": "2024-01-15T10:00:00Z", "stoppedAt": "2024-01-15T10:01:00Z"}
+
+    @pytest.mark.unit
+    async def test_one_round_trip_per_chunk(self, db):
+        """Should send ceil(rows / chunk_size) upserts."""
+        calls = []
+        db.client = self._recording_client(calls)
+
+        rows = await db.sync_executions_from_n8n("t-1", "env-1", [self._execution(i) for i in range(25)], chunk_size=10)
+
+        assert [len(c) for c in calls] == [10, 10, 5]
+        assert len(rows) == 25
+        assert rows[0]["execution_time"] == 60000
+
+    @pytest.mark.unit
+    async def test_failed_chunk_isolates_bad_rows(self, db):
+        """A rejected chunk should be retried per row and failures reported by key."""
+        calls = []
+        db.client = self._recording_client(calls, fail=lambda rows: any(r["execution_id"] == "exec-3" for r in rows))
+
+        result = await db.bulk_upsert_executions("t-1", "env-1", [self._execution(i) for i in range(6)], chunk_size=5)
+
+        assert [r["execution_id"] for r in result["rows"]] == ["exec-0", "exec-1", "exec-2", "exec-4", "exec-5"]
+        assert [f["key"] for f in result["failed"]] == ["exec-3"]
+
+    @pytest.mark.unit
+    async def test_sync_raises_when_every_row_fails(self, db):
+        """Should raise when nothing could be synced."""
+        db.client = self._recording_client([], fail=lambda rows: True)
+
+        with pytest.raises(Exception, match="Failed to sync 2 execution"):
+            await db.sync_executions_from_n8n("t-1", "env-1", [self._execution(0), self._execution(1)])
+
+    @pytest.mark.unit
+    async def test_rows_grouped_by_column_set(self, db):
+        """Rows without analysis must not share a chunk with rows that have it."""
+        calls = []
+        db.client = self._recording_client(calls)
+
+        result = await db.bulk_upsert_workflows([
+            db._build_workflow_record("t-1", "env-1", {"id": "wf-1", "name": "A"}, analysis={"score": 1}),
+            db._build_workflow_record("t-1", "env-1", {"id": "wf-2", "name": "B"}),
+            db._build_workflow_record("t-1", "env-1", {"id": "wf-3", "name": "C"}, analysis={"score": 2}),
+        ])
+
+        assert sorted(len(c) for c in calls) == [1, 2]
+        assert all(len({frozenset(r) for r in c}) == 1 for c in calls)
+        assert len(result["rows"]) == 3
+
+    @pytest.mark.unit
+    async def test_sync_workflows_soft_deletes_in_one_update(self, db):
+        """Workflows missing from N8N should be soft-deleted with one update per chunk."""
+        calls = []
+        db.client = self._recording_client(calls)
+        db.get_workflows_from_canonical = AsyncMock(return_value=[{"id": "wf-1"}, {"id": "old-1"}, {"id": "old-2"}])
+        db.refresh_workflow_dependencies_for_env = AsyncMock()
+
+        await db.sync_workflows_from_n8n("t-1", "env-1", [{"id": "wf-1", "name": "A"}])
+
+        db.client.table.return_value.update.return_value.in_.assert_called_once_with("id", ["old-1", "old-2"])
+        assert len(calls) == 1
+
+
+class TestWorkflowListPagination:
+    """Tests for keyset-paginated workflow listing with DB-side filtering."""
+
+    @staticmethod
+    def _row(i, **extra):
+        return {
+            "id": f"00000000-0000-0000-0000-{i:012d}", "canonical_id": None, "n8n_workflow_id": f"wf-{i}",
+            "last_env_sync_at": "2026-10-01T00:00:00Z", "linked_at": None, "status": "linked",
+            "workflow_name": f"WF{i}", "workflow_description": None, "workflow_active": "true",
+            "workflow_tags": [{"id": "t1", "name": "prod"}], "workflow_created_at": None,
+            "workflow_updated_at": f"2026-10-{i:02d}", "sort_value": f"2026-10-{i:02d}", "total_count": 5,
+            **extra,
+        }
+
+    @pytest.mark.unit
+    async def test_first_page_is_paged_in_database(self, db):
+        db.client = MagicMock()
+        db.client.rpc.return_value.execute.return_value = MagicMock(data=[self._row(5), self._row(4)])
+
+        result = await db.get_workflows_paginated(
+            "tenant-1", "env-1", page=1, page_size=2, tag_filter=["prod"], status_filter="active"
+        )
+
+        name, params = db.client.rpc.call_args.args
+        assert name == "get_workflow_list_page"
+        assert params["p_tags"] == ["prod"]
+        assert params["p_active"] == "true"
+        assert params["p_offset"] == 0 and params["p_page_size"] == 2
+        assert params["p_excluded_statuses"] == ["missing", "deleted", "ignored"]
+        db.client.table.assert_not_called()
+        assert [w["id"] for w in result["workflows"]] == ["wf-5", "wf-4"]
+        assert result["workflows"][0]["tags"] == [{"id": "t1", "name": "prod"}]
+        assert (result["total"], result["total_pages"]) == (5, 3)
+        assert result["next_cursor"]
+
+    @pytest.mark.unit
+    async def test_next_page_seeks_from_cursor(self, db):
+        db.client = MagicMock()
+        db.client.rpc.return_value.execute.return_value = MagicMock(data=[self._row(5), self._row(4)])
+        first = await db.get_workflows_paginated("tenant-1", "env-1", page=1, page_size=2)
+
+        db.client.rpc.return_value.execute.return_value = MagicMock(data=[self._row(3), self._row(2)])
+        await db.get_workflows_paginated("tenant-1", "env-1", page=2, page_size=2, cursor=first["next_cursor"])
+
+        params = db.client.rpc.call_args.args[1]
+        assert params["p_after_value"] == "2026-10-04"
+        assert params["p_after_id"] == self._row(4)["id"]
+        assert params["p_offset"] == 0
+
+    @pytest.mark.unit
+    async def test_page_number_without_cursor_uses_offset(self, db):
+        db.client = MagicMock()
+        db.client.rpc.return_value.execute.return_value = MagicMock(data=[self._row(1)])
+
+        result = await db.get_workflows_paginated("tenant-1", "env-1", page=3, page_size=2)
+
+        assert db.client.rpc.call_args.args[1]["p_offset"] == 4
+        assert result["next_cursor"] is None
+
+    @pytest.mark.unit
+    async def test_cursor_from_another_sort_is_rejected(self, db):
+        db.client = MagicMock()
+        db.client.rpc.return_value.execute.return_value = MagicMock(data=[self._row(5), self._row(4)])
+        first = await db.get_workflows_paginated("tenant-1", "env-1", page_size=2)
+
+        with pytest.raises(ValueError):
+            await db.get_workflows_paginated("tenant-1", "env-1", sort_field="name", cursor=first["next_cursor"])
+        with pytest.raises(ValueError):
+            await db.get_workflows_paginated("tenant-1", "env-1", cursor="not-a-cursor")
+
+    @pytest.mark.unit
+    async def test_falls_back_to_ranged_query_without_rpc(self, db):
+        db.client = MagicMock()
+        db.client.rpc.return_value.execute.side_effect = Exception("function does not exist")
+        query = MagicMock()
+        for method in ("select", "eq", "or_", "is_", "order", "range"):
+            getattr(query, method).return_value = query
+        query.not_ = query
+        query.execute.return_value = MagicMock(data=[self._row(1)], count=7)
+        db.client.table.return_value = query
+
+        result = await db.get_workflows_paginated("tenant-1", "env-1", page=2, page_size=3, tag_filter=["prod"])
+
+        query.range.assert_called_once_with(3, 5)
+        or_filters = [call.args[0] for call in query.or_.call_args_list]
+        assert "status.is.null,status.not.in.(missing,deleted,ignored)" in or_filters
+        assert 'workflow_data->tags.cs.[{"name":"prod"}],workflow_data->tags.cs.["prod"]' in or_filters
+        assert "workflow_data" not in query.select.call_args.args[0].replace("workflow_data->", "")
+        assert (result["total"], result["total_pages"], result["next_cursor"]) == (7, 3, None)
@@ -12,6 +12,8 @@ from app.services.drift_detection_service import (
     DriftStatus,
     WorkflowDriftInfo,
     EnvironmentDriftSummary,
+    DRIFT_STATE_VERSION,
+    workflow_fingerprint,
 )
 
 
@@ -546,6 +548,138 @@ class TestDetectDriftWithoutUpdate:
                             assert result.in_sync == 1
 
 
+class TestIncrementalDriftDetection:
+    """Tests for reusing saved results when fingerprints are unchanged."""
+
+    RUNTIME = [
+        {"id": "wf-1", "name": "Workflow One", "active": True, "versionId": "v1", "updatedAt": "2026-10-01T00:00:00Z"},
+        {"id": "wf-2", "name": "Workflow Two", "active": False, "versionId": "v7", "updatedAt": "2026-10-02T00:00:00Z"},
+    ]
+    GIT = {
+        "wf-1": {"id": "wf-1", "name": "Workflow One"},
+        "wf-2": {"id": "wf-2", "name": "Workflow Two"},
+    }
+    DRIFTED_WF2 = {
+        "id": "wf-2", "name": "Workflow Two", "active": False, "hasDrift": True, "notInGit": False,
+        "driftType": "modified", "mappingStatus": "linked",
+    }
+
+    def _saved_state(self, head_sha="sha-1", runtime=None):
+        runtime = runtime or self.RUNTIME
+        return {
+            "state_version": DRIFT_STATE_VERSION,
+            "git_ref": "main:development",
+            "git_head_sha": head_sha,
+            "git_workflows": {"Workflow One": "", "Workflow Two": ""},
+            "workflow_results": {
+                "wf-1": {"fingerprint": workflow_fingerprint(runtime[0]), "result": None},
+                "wf-2": {"fingerprint": workflow_fingerprint(runtime[1]), "result": dict(self.DRIFTED_WF2)},
+            },
+        }
+
+    async def _detect(self, mock_environment, runtime, saved_state, head_sha="sha-1", **kwargs):
+        with patch("app.services.drift_detection_service.db_service") as mock_db, \
+                patch("app.services.git_snapshot_service.git_snapshot_service") as mock_snapshot, \
+                patch("app.services.drift_detection_service.ProviderRegistry") as mock_registry, \
+                patch("app.services.drift_detection_service.GitHubService") as mock_github_cls, \
+                patch("app.services.drift_detection_service.compare_workflows") as mock_compare:
+            mock_db.get_environment = AsyncMock(return_value=mock_environment)
+            mock_db.update_environment = AsyncMock()
+            mock_snapshot.is_env_onboarded = AsyncMock(return_value=(True, "onboarded"))
+            mock_adapter = MagicMock()
+            mock_adapter.get_workflows = AsyncMock(return_value=runtime)
+            mock_registry.get_adapter_for_environment.return_value = mock_adapter
+
+            mock_github = MagicMock()
+            mock_github.branch = "main"
+            mock_github.is_configured.return_value = True
+            mock_github.get_branch_head_sha = AsyncMock(return_value=head_sha)
+            mock_github.get_all_workflows_from_github = AsyncMock(return_value=self.GIT)
+            mock_github_cls.return_value = mock_github
+
+            def compare_side_effect(git_workflow=None, runtime_workflow=None):
+                result = MagicMock()
+                result.has_drift = runtime_workflow.get("name") == "Workflow Two"
+                result.summary = MagicMock(
+                    nodes_added=1, nodes_removed=0, nodes_modified=0,
+                    connections_changed=False, settings_changed=False,
+                )
+                result.differences = [{"type": "node_added"}]
+                return result
+
+            mock_compare.side_effect = compare_side_effect
+
+            service = DriftDetectionService()
+            service._get_linked_workflow_ids = AsyncMock(return_value=None)
+            service._load_drift_state = AsyncMock(return_value=saved_state)
+            service._save_drift_state = AsyncMock()
+            result = await service.detect_drift(MOCK_TENANT_ID, MOCK_ENVIRONMENT_ID, **kwargs)
+            return result, mock_github, mock_compare, service
+
+    @pytest.mark.unit
+    def test_fingerprint_requires_version_or_timestamp(self):
+        assert workflow_fingerprint({"id": "wf-1", "name": "A"}) is None
+        assert workflow_fingerprint(self.RUNTIME[0]) != workflow_fingerprint({**self.RUNTIME[0], "active": False})
+
+    @pytest.mark.asyncio
+    async def test_unchanged_environment_skips_git_and_diff(self, mock_environment):
+        result, github, compare, service = await self._detect(
+            mock_environment, self.RUNTIME, self._saved_state()
+        )
+
+        github.get_all_workflows_from_github.assert_not_called()
+        compare.assert_not_called()
+        service._save_drift_state.assert_not_called()
+        assert result.in_sync == 1
+        assert result.with_drift == 1
+        assert result.affected_workflows[0]["id"] == "wf-2"
+
+    @pytest.mark.asyncio
+    async def test_only_changed_workflow_is_compared(self, mock_environment):
+        runtime = [dict(self.RUNTIME[0]), {**self.RUNTIME[1], "versionId": "v8"}]
+
+        result, github, compare, service = await self._detect(
+            mock_environment, runtime, self._saved_state()
+        )
+
+        github.get_all_workflows_from_github.assert_awaited_once()
+        assert compare.call_count == 1
+        assert compare.call_args.kwargs["runtime_workflow"]["id"] == "wf-2"
+        assert result.with_drift == 1
+        saved_results = service._save_drift_state.call_args.args[5]
+        assert saved_results["wf-2"]["fingerprint"] == workflow_fingerprint(runtime[1])
+
+    @pytest.mark.asyncio
+    async def test_new_branch_head_compares_everything(self, mock_environment):
+        result, github, compare, _ = await self._detect(
+            mock_environment, self.RUNTIME, self._saved_state(head_sha="sha-0")
+        )
+
+        github.get_all_workflows_from_github.assert_awaited_once()
+        assert compare.call_count == 2
+        assert result.in_sync == 1
+        assert result.with_drift == 1
+
+    @pytest.mark.asyncio
+    async def test_force_full_ignores_saved_state(self, mock_environment):
+        _, github, compare, service = await self._detect(
+            mock_environment, self.RUNTIME, self._saved_state(), force_full=True
+        )
+
+        service._load_drift_state.assert_not_called()
+        github.get_all_workflows_from_github.assert_awaited_once()
+        assert compare.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_unresolved_head_falls_back_to_full_check(self, mock_environment):
+        _, github, compare, _ = await self._detect(
+            mock_environment, self.RUNTIME, self._saved_state(), head_sha=None
+        )
+
+        github.get_all_workflows_from_github.assert_awaited_once()
+        assert compare.call_count == 2
+
+
 class TestSingletonInstance:
     """Test that drift_detection_service is a singleton."""
 
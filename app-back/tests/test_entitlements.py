@@ -126,8 +126,8 @@ class TestEntitlementsService:
             # Second call should use cache
             await service.get_tenant_entitlements("tenant-123")
 
-            # _get_tenant_plan called twice, _get_plan_features only once
-            assert mock_get_plan.call_count == 2
+            # Hot tenants are served from cache without resolving the plan again
+            assert mock_get_plan.call_count == 1
             assert mock_get_features.call_count == 1
 
     # ==================== has_flag ====================
@@ -423,6 +423,106 @@ class TestEntitlementsService:
         assert defaults["features"]["workflow_limits"] == 10
 
 
+class TestEntitlementsVersionCheck:
+    """Tests for version-checked entitlements caching."""
+
+    @pytest.fixture
+    def service(self):
+        service = EntitlementsService()
+        service.clear_cache()
+        yield service
+        service.clear_cache()
+
+    @pytest.fixture
+    def mocks(self, service):
+        with patch.object(
+            service, "_get_entitlements_version", new_callable=AsyncMock
+        ) as mock_version, patch.object(
+            service, "_get_tenant_plan", new_callable=AsyncMock
+        ) as mock_get_plan, patch.object(
+            service, "_get_plan_features", new_callable=AsyncMock
+        ) as mock_get_features, patch.object(
+            service, "_get_tenant_overrides", new_callable=AsyncMock
+        ) as mock_get_overrides:
+            mock_version.return_value = 3
+            mock_get_plan.return_value = {"plan_id": "plan-pro", "plan_name": "pro", "entitlements_version": 1}
+            mock_get_features.return_value = []
+            mock_get_overrides.return_value = []
+            yield mock_version, mock_get_plan
+
+    @pytest.mark.asyncio
+    async def test_fresh_entry_served_without_db(self, service, mocks):
+        mock_version, mock_get_plan = mocks
+
+        first = await service.get_tenant_entitlements("tenant-1")
+        second = await service.get_tenant_entitlements("tenant-1")
+
+        assert second is first
+        assert first["entitlements_version"] == 3
+        assert mock_version.await_count == 1
+        assert mock_get_plan.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_unchanged_version_revalidates_entry(self, service, mocks):
+        mock_version, mock_get_plan = mocks
+
+        with patch("app.services.entitlements_service.settings.ENTITLEMENTS_VERSION_CHECK_SECONDS", 0):
+            await service.get_tenant_entitlements("tenant-1")
+            await service.get_tenant_entitlements("tenant-1")
+
+        assert mock_version.await_count == 2
+        assert mock_get_plan.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_version_bump_rebuilds_entry(self, service, mocks):
+        mock_version, mock_get_plan = mocks
+
+        with patch("app.services.entitlements_service.settings.ENTITLEMENTS_VERSION_CHECK_SECONDS", 0):
+            await service.get_tenant_entitlements("tenant-1")
+            mock_version.return_value = 4
+            result = await service.get_tenant_entitlements("tenant-1")
+
+        assert result["entitlements_version"] == 4
+        assert mock_get_plan.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_version_check_keeps_entry(self, service, mocks):
+        mock_version, mock_get_plan = mocks
+
+        with patch("app.services.entitlements_service.settings.ENTITLEMENTS_VERSION_CHECK_SECONDS", 0):
+            await service.get_tenant_entitlements("tenant-1")
+            mock_version.return_value = None
+            await service.get_tenant_entitlements("tenant-1")
+
+        assert mock_get_plan.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_unversioned_tenant_rebuilds_at_each_check(self, service, mocks):
+        mock_version, mock_get_plan = mocks
+        mock_version.return_value = 0
+
+        with patch("app.services.entitlements_service.settings.ENTITLEMENTS_VERSION_CHECK_SECONDS", 0):
+            await service.get_tenant_entitlements("tenant-1")
+            await service.get_tenant_entitlements("tenant-1")
+
+        assert mock_get_plan.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_feature_requirement_cache_remembers_missing_rows(self):
+        from app.services import entitlements_service as module
+
+        module._feature_requirements_cache.clear()
+        with patch.object(module, "db_service") as mock_db:
+            query = mock_db.client.table.return_value.select.return_value.eq.return_value.single.return_value
+            query.execute.return_value = MagicMock(data=None)
+
+            assert await module._get_feature_required_plan("sso_saml") is None
+            assert await module._get_feature_required_plan("sso_saml") is None
+
+        assert query.execute.call_count == 1
+        module._feature_requirements_cache.clear()
+
+
 class TestEntitlementsServiceSingleton:
     """Tests for the singleton instance."""
 
@@ -0,0 +1,104 @@
+"""
+Unit tests for the compiled error classifier.
+"""
+import pytest
+
+from app.services.error_classifier import (
+    ERROR_CATEGORIES,
+    _classify_lowered,
+    classify_error,
+    classify_errors,
+)
+from app.services.observability_service import ObservabilityService
+
+
+def _keyword_chain(error_message):
+    """Reference implementation: one keyword scan per category, in order."""
+    if not error_message:
+        return ("Unknown Error", False)
+    error_lower = error_message.lower()
+    for error_type, keywords in ERROR_CATEGORIES:
+        if any(kw in error_lower for kw in keywords):
+            return (error_type, True)
+    return ("Execution Error", False)
+
+
+MESSAGES = [
+    "Invalid token supplied",
+    "Request timeout after 30s",
+    "ECONNREFUSED 127.0.0.1:5432",
+    "Received 502 Bad Gateway",
+    "Resource not found",
+    "400 Bad Request: missing body",
+    "429 Too Many Requests",
+    "Forbidden: access denied",
+    "Validation failed: schema mismatch",
+    "Node 'HTTP Request' execution failed",
+    "Cannot read properties of undefined",
+    "Something unexpected happened",
+    # Lower-precedence keyword first, higher-precedence later in the text
+    "Node failed with JSON parse error after connection reset",
+    "invalid input (status 404) while refreshing credentials",
+    # Overlapping keywords: "404" inside "4040", "auth" inside "oauth"
+    "port 4040 rejected oauth handshake",
+    "nodes: 5000 items processed",
+    "",
+    None,
+]
+
+
+class TestClassifyError:
+    """Tests for single-message classification."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("message", MESSAGES)
+    def test_matches_keyword_chain_precedence(self, message):
+        assert classify_error(message) == _keyword_chain(message)
+
+    @pytest.mark.unit
+    def test_matches_keyword_chain_for_every_keyword_pair(self):
+        keywords = [kw for _, kws in ERROR_CATEGORIES for kw in kws]
+        for first in keywords:
+            for second in keywords:
+                for message in (f"{first} then {second}", f"{first}{second}".upper()):
+                    assert classify_error(message) == _keyword_chain(message), message
+
+    @pytest.mark.unit
+    def test_highest_precedence_category_wins_regardless_of_position(self):
+        assert classify_error("null value in column while calling auth service") == ("Credential Error", True)
+        assert classify_error("schema error: socket hang up") == ("Connection Error", True)
+
+    @pytest.mark.unit
+    def test_unknown_and_unclassified(self):
+        assert classify_error("") == ("Unknown Error", False)
+        assert classify_error(None) == ("Unknown Error", False)
+        assert classify_error("boom") == ("Execution Error", False)
+
+    @pytest.mark.unit
+    def test_repeated_messages_are_memoized(self):
+        _classify_lowered.cache_clear()
+
+        for _ in range(100):
+            classify_error("Connection refused by upstream")
+
+        info = _classify_lowered.cache_info()
+        assert info.misses == 1
+        assert info.hits == 99
+
+    @pytest.mark.unit
+    def test_observability_service_delegates(self):
+        assert ObservabilityService()._classify_error("Request timed out") == ("Timeout", True)
+
+
+class TestClassifyErrors:
+    """Tests for batch classification."""
+
+    @pytest.mark.unit
+    def test_batch_preserves_order_and_matches_single(self):
+        messages = MESSAGES * 3
+
+        assert classify_errors(messages) == [classify_error(m) for m in messages]
+
+    @pytest.mark.unit
+    def test_empty_batch(self):
+        assert classify_errors([]) == []
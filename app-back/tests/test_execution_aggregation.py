@@ -0,0 +1,160 @@
+"""
+Unit tests for columnar execution aggregation.
+"""
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from unittest.mock import MagicMock
+
+from app.services.database import DatabaseService
+from app.services.execution_aggregation import (
+    GroupedColumns,
+    numeric_column,
+    status_masks,
+    time_buckets,
+    timestamp_column,
+)
+
+
+RANGE_START = datetime(2026, 10, 16, 0, 0, tzinfo=timezone.utc)
+
+
+class TestColumns:
+    """Tests for column extraction."""
+
+    @pytest.mark.unit
+    def test_timestamp_column_handles_offsets_naive_and_invalid(self):
+        column = timestamp_column([
+            "2026-10-16T01:00:00Z",
+            "2026-10-16T03:00:00+02:00",
+            "2026-10-16T01:00:00",
+            "2026-10-16 01:00:00.123456+00:00",
+            None,
+            "not a timestamp",
+        ])
+
+        expected = RANGE_START.timestamp() + 3600
+        assert column[:3].tolist() == [expected, expected, expected]
+        assert column[3] == pytest.approx(expected + 0.123456)
+        assert np.isnan(column[4]) and np.isnan(column[5])
+
+    @pytest.mark.unit
+    def test_numeric_column_ignores_non_numeric(self):
+        column = numeric_column([100, 2.5, None, "300", True])
+
+        assert column[:2].tolist() == [100.0, 2.5]
+        assert np.isnan(column[2:]).all()
+
+
+class TestTimeBuckets:
+    """Tests for arithmetic bucket assignment."""
+
+    @pytest.mark.unit
+    def test_assigns_rows_to_half_open_intervals(self):
+        rows = [
+            {"started_at": "2026-10-16T00:00:00+00:00", "status": "success", "duration_ms": 100},
+            {"started_at": "2026-10-16T00:59:59.999+00:00", "status": "error", "duration_ms": 300},
+            {"started_at": "2026-10-16T01:00:00+00:00", "status": "running", "duration_ms": None},
+            {"started_at": "2026-10-16T02:30:00Z", "status": "success", "duration_ms": 50},
+            # Outside the range on either side, or unparseable
+            {"started_at": "2026-10-15T23:59:59+00:00", "status": "success", "duration_ms": 1},
+            {"started_at": "2026-10-16T03:00:00+00:00", "status": "success", "duration_ms": 1},
+            {"started_at": None, "status": "success", "duration_ms": 1},
+        ]
+
+        buckets = time_buckets(rows, RANGE_START, timedelta(hours=1), 3)
+
+        assert [b["start"] for b in buckets] == [RANGE_START + timedelta(hours=i) for i in range(3)]
+        assert [b["total"] for b in buckets] == [2, 1, 1]
+        assert [b["successes"] for b in buckets] == [1, 0, 1]
+        assert [b["failures"] for b in buckets] == [1, 0, 0]
+        assert [b["avg_duration"] for b in buckets] == [200.0, 0, 50.0]
+        assert set(buckets[0]) == {"start", "total", "successes", "failures", "avg_duration"}
+
+    @pytest.mark.unit
+    def test_empty_rows_produce_zero_buckets(self):
+        buckets = time_buckets([], RANGE_START, timedelta(minutes=15), 4)
+
+        assert len(buckets) == 4
+        assert all(b["total"] == 0 and b["avg_duration"] == 0 for b in buckets)
+
+
+class TestGroupedColumns:
+    """Tests for per-group reductions."""
+
+    @pytest.mark.unit
+    def test_groups_in_first_appearance_order_and_skips_missing_keys(self):
+        groups = GroupedColumns(["wf-b", "wf-a", None, "wf-b", ""])
+
+        assert groups.keys == ["wf-b", "wf-a"]
+        assert groups.first_rows.tolist() == [0, 1]
+        assert groups.count().tolist() == [2, 1]
+
+    @pytest.mark.unit
+    def test_counts_with_mask_and_duration_percentiles(self):
+        keys = ["wf-1"] * 5 + ["wf-2"] * 2
+        statuses = status_masks(["success", "error", "success", "running", "success", "error", "error"])
+        durations = numeric_column([140, 100, 130, None, 110, None, None])
+        groups = GroupedColumns(keys)
+
+        stats = groups.durations(durations, percentiles=(50, 95))
+
+        assert groups.count(statuses["success"]).tolist() == [3, 0]
+        assert groups.count(statuses["error"]).tolist() == [1, 2]
+        assert stats["avg"] == [120.0, None]
+        assert stats["p50"] == [float(np.percentile([100, 110, 130, 140], 50)), None]
+        assert stats["p95"] == [float(np.percentile([100, 110, 130, 140], 95)), None]
+
+    @pytest.mark.unit
+    def test_latest_rows_respects_mask_and_ties(self):
+        keys = ["wf-1", "wf-1", "wf-1", "wf-2"]
+        timestamps = timestamp_column([
+            "2026-10-16T01:00:00Z", "2026-10-16T02:00:00Z", "2026-10-16T02:00:00Z", "2026-10-16T05:00:00Z",
+        ])
+        errors = np.array([True, True, True, False])
+
+        assert GroupedColumns(keys).latest_rows(timestamps, mask=errors) == [1, None]
+        assert GroupedColumns(keys).latest_rows(timestamps) == [1, 3]
+
+
+class TestExecutionAnalytics:
+    """Tests for DatabaseService.get_execution_analytics on the columnar engine."""
+
+    @pytest.mark.asyncio
+    async def test_aggregates_by_workflow(self):
+        executions = [
+            {"workflow_id": "wf-1", "workflow_name": "Orders", "normalized_status": "success",
+             "started_at": "2026-10-16T01:00:00+00:00", "execution_time": 100},
+            {"workflow_id": "wf-1", "workflow_name": "Orders", "normalized_status": "error",
+             "started_at": "2026-10-16T03:00:00+00:00", "execution_time": 300,
+             "error_message": "x" * 400, "error_node": "HTTP"},
+            {"workflow_id": "wf-1", "workflow_name": "Orders", "normalized_status": "error",
+             "started_at": "2026-10-16T02:00:00+00:00", "execution_time": None,
+             "error_message": "older", "error_node": "Set"},
+            {"workflow_id": "wf-2", "workflow_name": None, "normalized_status": "success",
+             "started_at": "2026-10-16T01:00:00+00:00", "execution_time": 50},
+        ]
+        query = MagicMock()
+        for method in ("select", "eq", "gte", "lt", "in_"):
+            getattr(query, method).return_value = query
+        query.execute.return_value = MagicMock(data=executions)
+        db_service = DatabaseService()
+        db_service.client = MagicMock()
+        db_service.client.table.return_value = query
+
+        results = await db_service.get_execution_analytics(
+            "tenant-1", "env-1", "2026-10-16T00:00:00Z", "2026-10-17T00:00:00Z"
+        )
+
+        assert [r["workflow_id"] for r in results] == ["wf-1", "wf-2"]
+        wf1, wf2 = results
+        assert (wf1["total_runs"], wf1["success_runs"], wf1["failure_runs"]) == (3, 1, 2)
+        assert wf1["success_rate"] == pytest.approx(1 / 3)
+        assert wf1["avg_duration_ms"] == 200.0
+        assert wf1["p50_duration_ms"] == 200.0
+        assert wf1["last_failure_at"] == "2026-10-16T03:00:00+00:00"
+        assert wf1["last_failure_error"] == "x" * 300
+        assert wf1["last_failure_node"] == "HTTP"
+        assert wf2["workflow_name"] == "wf-2"
+        assert wf2["last_failure_at"] is None
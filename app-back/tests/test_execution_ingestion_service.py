@@ -0,0 +1,249 @@
+"""
+Unit tests for incremental execution ingestion.
+"""
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch, AsyncMock
+
+from app.services.execution_ingestion_service import ExecutionIngestionService
+
+
+class _FakeAdapter:
+    """Adapter stub serving execution pages and single executions."""
+
+    def __init__(self, pages, executions=None, fail_after=None):
+        self.pages = pages
+        self.executions = executions or {}
+        self.fail_after = fail_after
+        self.calls = []
+
+    async def iter_executions(self, since_id=None, page_size=250, max_executions=None, before_id=None):
+        self.calls.append({"since_id": since_id, "before_id": before_id, "max_executions": max_executions})
+        yielded = 0
+        for index, page in enumerate(self.pages):
+            if self.fail_after is not None and index >= self.fail_after:
+                raise RuntimeError("n8n unavailable")
+            if before_id is not None:
+                page = [e for e in page if int(e["id"]) < int(before_id)]
+            if since_id is not None:
+                page = [e for e in page if int(e["id"]) > int(since_id)]
+            if max_executions is not None:
+                page = page[:max_executions - yielded]
+            if page:
+                yielded += len(page)
+                yield page
+
+    async def get_execution(self, execution_id):
+        return self.executions[execution_id]
+
+
+def _bulk_result(tenant_id, environment_id, executions, chunk_size=None):
+    return {"rows": [{"execution_id": e["id"]} for e in executions], "failed": []}
+
+
+@pytest.fixture
+def mock_db():
+    with patch("app.services.execution_ingestion_service.db_service") as db:
+        db.bulk_upsert_executions = AsyncMock(side_effect=_bulk_result)
+        db.update_environment = AsyncMock()
+        db.get_unfinished_execution_ids = AsyncMock(return_value=[])
+        yield db
+
+
+class TestIngestEnvironment:
+    """Tests for ExecutionIngestionService.ingest_environment."""
+
+    @pytest.mark.unit
+    async def test_first_sync_uses_initial_limit_and_sets_cursor(self, mock_db):
+        """Without a cursor, read up to the initial limit and store the newest id."""
+        adapter = _FakeAdapter([[{"id": "12", "startedAt": "2024-01-02T00:00:00Z"}, {"id": "11"}]])
+
+        result = await ExecutionIngestionService().ingest_environment("t-1", "env-1", {"id": "env-1"}, adapter)
+
+        assert adapter.calls[0]["since_id"] is None
+        assert adapter.calls[0]["max_executions"] == 251
+        assert result["synced"] == 2
+        assert result["cursor"] == "12"
+        update = mock_db.update_environment.call_args[0][2]
+        assert update["execution_sync_cursor"] == "12"
+        assert update["execution_sync_cursor_started_at"] == "2024-01-02T00:00:00Z"
+
+    @pytest.mark.unit
+    async def test_streams_each_page_to_db(self, mock_db):
+        """Every page should be upserted as it arrives."""
+        adapter = _FakeAdapter([[{"id": "30"}, {"id": "29"}], [{"id": "28"}]])
+
+        result = await ExecutionIngestionService().ingest_environment(
+            "t-1", "env-1", {"execution_sync_cursor": "27"}, adapter
+        )
+
+        assert adapter.calls[0]["since_id"] == "27"
+        assert mock_db.bulk_upsert_executions.await_count == 2
+        assert result["pages"] == 2
+        assert result["reached_cursor"] is True
+        assert result["cursor"] == "30"
+
+    @pytest.mark.unit
+    async def test_nothing_new_keeps_cursor(self, mock_db):
+        """No new executions should leave the stored cursor untouched."""
+        adapter = _FakeAdapter([])
+
+        result = await ExecutionIngestionService().ingest_environment(
+            "t-1", "env-1", {"execution_sync_cursor": "27"}, adapter
+        )
+
+        assert result["synced"] == 0
+        assert result["cursor"] == "27"
+        mock_db.update_environment.assert_not_awaited()
+
+    @pytest.mark.unit
+    async def test_failure_mid_window_does_not_advance_cursor(self, mock_db):
+        """A failed page fetch must not move the mark past unread executions."""
+        adapter = _FakeAdapter([[{"id": "30"}], [{"id": "29"}]], fail_after=1)
+
+        with pytest.raises(RuntimeError):
+            await ExecutionIngestionService().ingest_environment(
+                "t-1", "env-1", {"execution_sync_cursor": "27"}, adapter
+            )
+
+        mock_db.update_environment.assert_not_awaited()
+
+    @pytest.mark.unit
+    async def test_refreshes_unfinished_executions(self, mock_db):
+        """Executions cached as running should be re-fetched and upserted."""
+        mock_db.get_unfinished_execution_ids = AsyncMock(return_value=["20", "21"])
+        adapter = _FakeAdapter([], executions={
+            "20": {"id": "20", "status": "success"},
+            "21": {"id": "21", "status": "error"},
+        })
+
+        result = await ExecutionIngestionService().ingest_environment(
+            "t-1", "env-1", {"execution_sync_cursor": "27"}, adapter
+        )
+
+        assert result["refreshed"] == 2
+        refreshed = mock_db.bulk_upsert_executions.await_args_list[0][0][2]
+        assert [e["id"] for e in refreshed] == ["20", "21"]
+
+    @pytest.mark.unit
+    async def test_reports_failed_rows(self, mock_db):
+        """Per-row storage failures should be surfaced in the result."""
+        mock_db.bulk_upsert_executions = AsyncMock(return_value={
+            "rows": [{"execution_id": "30"}],
+            "failed": [{"key": "29", "error": "bad row"}],
+        })
+        adapter = _FakeAdapter([[{"id": "30"}, {"id": "29"}]])
+
+        result = await ExecutionIngestionService().ingest_environment(
+            "t-1", "env-1", {"execution_sync_cursor": "27"}, adapter
+        )
+
+        assert result["synced"] == 1
+        assert result["failed"] == [{"key": "29", "error": "bad row"}]
+
+    @pytest.mark.unit
+    async def test_failed_row_holds_cursor_below_it(self, mock_db):
+        """The mark should stop below the first execution that failed to store."""
+        mock_db.bulk_upsert_executions = AsyncMock(return_value={
+            "rows": [{"execution_id": "30"}, {"execution_id": "28"}],
+            "failed": [{"key": "29", "error": "bad row"}],
+        })
+        adapter = _FakeAdapter([[{"id": "30"}, {"id": "29"}, {"id": "28"}]])
+
+        result = await ExecutionIngestionService().ingest_environment(
+            "t-1", "env-1", {"execution_sync_cursor": "27"}, adapter
+        )
+
+        assert result["cursor"] == "28"
+        assert mock_db.update_environment.call_args[0][2]["execution_sync_cursor"] == "28"
+
+
+def _execution(execution_id, minutes_ago, status="success"):
+    started_at = (datetime.now(timezone.utc) - timedelta(minutes=minutes_ago)).isoformat()
+    return {"id": str(execution_id), "startedAt": started_at, "status": status}
+
+
+class TestPerRunCap:
+    """Tests for resuming capped runs."""
+
+    @pytest.mark.unit
+    async def test_capped_run_keeps_cursor_and_stores_resume_point(self, mock_db):
+        adapter = _FakeAdapter([[_execution(i, 600) for i in range(40, 30, -1)]])
+
+        with patch("app.services.execution_ingestion_service.logger") as mock_logger:
+            result = await ExecutionIngestionService().ingest_environment(
+                "t-1", "env-1", {"execution_sync_cursor": "27"}, adapter, max_executions=5
+            )
+
+        assert result["synced"] == 5
+        assert result["reached_cursor"] is False
+        update = mock_db.update_environment.call_args[0][2]
+        assert update["execution_sync_cursor"] == "27"
+        assert update["execution_sync_resume_cursor"] == "36"
+        mock_logger.warning.assert_called_once()
+
+    @pytest.mark.unit
+    async def test_exactly_max_executions_is_not_capped(self, mock_db):
+        adapter = _FakeAdapter([[_execution(i, 600) for i in range(32, 27, -1)]])
+
+        with patch("app.services.execution_ingestion_service.logger") as mock_logger:
+            result = await ExecutionIngestionService().ingest_environment(
+                "t-1", "env-1", {"execution_sync_cursor": "27"}, adapter, max_executions=5
+            )
+
+        assert result["reached_cursor"] is True
+        assert result["cursor"] == "32"
+        assert result["resume_cursor"] is None
+        mock_logger.warning.assert_not_called()
+
+    @pytest.mark.unit
+    async def test_resumes_below_resume_cursor_then_reads_newer(self, mock_db):
+        adapter = _FakeAdapter([[_execution(i, 600) for i in range(40, 27, -1)]])
+
+        result = await ExecutionIngestionService().ingest_environment(
+            "t-1", "env-1", {"execution_sync_cursor": "27", "execution_sync_resume_cursor": "36"}, adapter
+        )
+
+        assert [call["before_id"] for call in adapter.calls] == ["36", None]
+        assert [call["since_id"] for call in adapter.calls] == ["27", "35"]
+        assert result["cursor"] == "40"
+        assert result["resume_cursor"] is None
+        update = mock_db.update_environment.call_args[0][2]
+        assert update["execution_sync_resume_cursor"] is None
+
+
+class TestLowWaterMark:
+    """Tests for holding the cursor below unseen and unfinished executions."""
+
+    @pytest.mark.unit
+    async def test_recent_unseen_id_holds_cursor(self, mock_db):
+        """A gap in recent IDs may be a running execution hidden from the listing."""
+        adapter = _FakeAdapter([[_execution(31, 1), _execution(30, 2), _execution(28, 3)]])
+
+        result = await ExecutionIngestionService().ingest_environment(
+            "t-1", "env-1", {"execution_sync_cursor": "27"}, adapter
+        )
+
+        assert result["synced"] == 3
+        assert result["cursor"] == "28"
+
+    @pytest.mark.unit
+    async def test_recent_unfinished_execution_holds_cursor(self, mock_db):
+        adapter = _FakeAdapter([[_execution(30, 1), _execution(29, 2, status="waiting"), _execution(28, 3)]])
+
+        result = await ExecutionIngestionService().ingest_environment(
+            "t-1", "env-1", {"execution_sync_cursor": "27"}, adapter
+        )
+
+        assert result["cursor"] == "28"
+
+    @pytest.mark.unit
+    async def test_old_gaps_do_not_hold_cursor(self, mock_db):
+        """Gaps older than the grace period are deleted or hidden executions."""
+        adapter = _FakeAdapter([[_execution(35, 1), _execution(30, 120, status="running"), _execution(28, 120)]])
+
+        result = await ExecutionIngestionService().ingest_environment(
+            "t-1", "env-1", {"execution_sync_cursor": "27"}, adapter
+        )
+
+        assert result["cursor"] == "30"
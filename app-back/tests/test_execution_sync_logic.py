@@ -412,40 +412,44 @@ class TestFailureHandling:
 
     async def test_partial_sync_failure_consistency(self, create_mock_execution, mock_tenant_and_env):
         """
-        PASS/FAIL: Partial sync failure should leave DB consistent.
+        PASS/FAIL: Partial sync failure should leave DB consistent and report failed rows.
         """
         from app.services.database import db_service
 
         # Create 10 executions
         executions = [create_mock_execution(f"exec-{i}") for i in range(10)]
 
-        # Mock upsert to fail on 5th execution
-        call_count = 0
-        async def failing_upsert(tenant_id, env_id, exec_data):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 5:
-                raise Exception("Simulated DB failure on 5th execution")
-            return {
-                "id": f"db-{exec_data['id']}",
-                "execution_id": exec_data["id"]
-            }
-
-        with patch.object(db_service, "upsert_execution", new=failing_upsert):
-            # Attempt sync (should fail)
-            try:
-                results = await db_service.sync_executions_from_n8n(
-                    mock_tenant_and_env["tenant_id"],
-                    mock_tenant_and_env["environment_id"],
-                    executions
-                )
-                assert False, "Expected sync to fail but it succeeded"
-            except Exception as e:
-                assert "Simulated DB failure" in str(e)
+        # Mock the DB so the multi-row chunk is rejected and exec-4 fails on its own
+        async def failing_execute(query, timeout=None):
+            rows = query.rows
+            if len(rows) > 1 or rows[0]["execution_id"] == "exec-4":
+                raise Exception("Simulated DB failure on exec-4")
+            response = MagicMock()
+            response.data = [{"id": f"db-{rows[0]['execution_id']}", "execution_id": rows[0]["execution_id"]}]
+            return response
+
+        def upsert(rows, on_conflict=None):
+            query = MagicMock()
+            query.rows = rows if isinstance(rows, list) else [rows]
+            return query
+
+        mock_client = MagicMock()
+        mock_client.table.return_value.upsert.side_effect = upsert
+
+        with patch.object(db_service, "client", mock_client), \
+                patch.object(db_service, "_execute", new=failing_execute):
+            result = await db_service.bulk_upsert_executions(
+                mock_tenant_and_env["tenant_id"],
+                mock_tenant_and_env["environment_id"],
+                executions
+            )
 
-        # Verify: First 4 executions should be synced, 5th+ should not
-        # This is consistent - partial success is acceptable
-        print("✅ PASS: Partial failure leaves DB in consistent state (first 4 synced)")
+        # Verify: every other execution is synced, exec-4 is reported per row
+        assert [r["execution_id"] for r in result["rows"]] == [f"exec-{i}" for i in range(10) if i != 4]
+        assert len(result["failed"]) == 1
+        assert result["failed"][0]["key"] == "exec-4"
+        assert "Simulated DB failure" in result["failed"][0]["error"]
+        print("✅ PASS: Partial failure leaves DB in consistent state (failed row reported)")
 
     async def test_retry_after_failure(self, create_mock_execution, mock_tenant_and_env):
         """
@@ -0,0 +1,100 @@
+"""
+Unit tests for the content-addressed Git blob cache.
+"""
+import json
+import os
+
+import pytest
+
+from app.services.git_blob_cache import GitBlobCache
+
+SHA_A = "a" * 40
+SHA_B = "b" * 40
+SHA_C = "c" * 40
+
+
+def _raw(payload):
+    return json.dumps(payload).encode()
+
+
+class TestGitBlobCache:
+    """Tests for the memory and disk tiers of GitBlobCache."""
+
+    @pytest.mark.unit
+    def test_put_then_get_returns_parsed_json(self, tmp_path):
+        """Stored blobs should come back parsed."""
+        cache = GitBlobCache(str(tmp_path), max_memory_bytes=1024, max_disk_bytes=1024)
+
+        cache.put(SHA_A, _raw({"name": "A"}))
+
+        assert cache.get(SHA_A) == {"name": "A"}
+        assert cache.get(SHA_B) is None
+        metrics = cache.get_metrics()
+        assert metrics["memory_hits"] == 1
+        assert metrics["misses"] == 1
+
+    @pytest.mark.unit
+    def test_readers_get_independent_copies(self, tmp_path):
+        """Mutating a returned dict must not affect later reads."""
+        cache = GitBlobCache(str(tmp_path), max_memory_bytes=1024, max_disk_bytes=1024)
+        cache.put(SHA_A, _raw({"nodes": []}))
+
+        cache.get(SHA_A)["nodes"].append({"id": "mutated"})
+
+        assert cache.get(SHA_A) == {"nodes": []}
+
+    @pytest.mark.unit
+    def test_disk_tier_survives_new_instance(self, tmp_path):
+        """A fresh process should read blobs written by an earlier one."""
+        GitBlobCache(str(tmp_path), max_memory_bytes=1024, max_disk_bytes=1024).put(SHA_A, _raw({"name": "A"}))
+
+        cache = GitBlobCache(str(tmp_path), max_memory_bytes=1024, max_disk_bytes=1024)
+
+        assert cache.get(SHA_A) == {"name": "A"}
+        assert cache.get_metrics()["disk_hits"] == 1
+        # Promoted into memory on first disk hit
+        cache.get(SHA_A)
+        assert cache.get_metrics()["memory_hits"] == 1
+
+    @pytest.mark.unit
+    def test_memory_tier_evicts_lru_by_size(self, tmp_path):
+        """Memory should hold at most max_memory_bytes, evicting least recently used."""
+        blob = _raw({"pad": "x" * 20})
+        cache = GitBlobCache(None, max_memory_bytes=len(blob) * 2, max_disk_bytes=0)
+
+        cache.put(SHA_A, blob)
+        cache.put(SHA_B, blob)
+        cache.get(SHA_A)
+        cache.put(SHA_C, blob)
+
+        assert cache.get(SHA_B) is None
+        assert cache.get(SHA_A) is not None
+        assert cache.get(SHA_C) is not None
+        metrics = cache.get_metrics()
+        assert metrics["memory_evictions"] == 1
+        assert metrics["memory_bytes"] <= metrics["max_memory_bytes"]
+
+    @pytest.mark.unit
+    def test_disk_tier_evicts_by_size(self, tmp_path):
+        """Disk usage should be capped at max_disk_bytes."""
+        blob = _raw({"pad": "x" * 20})
+        cache = GitBlobCache(str(tmp_path), max_memory_bytes=0, max_disk_bytes=len(blob) * 2)
+
+        cache.put(SHA_A, blob)
+        cache.put(SHA_B, blob)
+        cache.put(SHA_C, blob)
+
+        assert not os.path.exists(tmp_path / SHA_A[:2] / SHA_A)
+        assert os.path.exists(tmp_path / SHA_C[:2] / SHA_C)
+        metrics = cache.get_metrics()
+        assert metrics["disk_evictions"] == 1
+        assert metrics["disk_bytes"] <= metrics["max_disk_bytes"]
+
+    @pytest.mark.unit
+    def test_non_hex_keys_never_touch_disk(self, tmp_path):
+        """Keys that are not blob SHAs should stay out of the cache directory."""
+        cache = GitBlobCache(str(tmp_path), max_memory_bytes=1024, max_disk_bytes=1024)
+
+        cache.put("../escape", _raw({}))
+
+        assert list(tmp_path.iterdir()) == []
@@ -4,12 +4,22 @@ Unit tests for the GitHub service - workflow syncing to GitHub repositories.
 import pytest
 import json
 import base64
+import httpx
 from unittest.mock import MagicMock, AsyncMock, patch, PropertyMock
 from github import GithubException
 
+from app.services.git_blob_cache import GitBlobCache
 from app.services.github_service import GitHubService
 
 
+@pytest.fixture(autouse=True)
+def isolated_blob_cache(tmp_path):
+    """Give each test its own empty blob cache."""
+    cache = GitBlobCache(str(tmp_path / "blobs"), max_memory_bytes=1024 * 1024, max_disk_bytes=1024 * 1024)
+    with patch("app.services.github_service.git_blob_cache", cache):
+        yield cache
+
+
 class TestGitHubServiceInitialization:
     """Tests for GitHubService initialization and configuration."""
 
@@ -457,11 +467,11 @@ class TestGetWorkflowById:
 
 
 class TestGetAllWorkflowsFromGitHub:
-    """Tests for retrieving all workflows from GitHub."""
+    """Tests for retrieving all workflows from GitHub by walking directories."""
 
     @pytest.fixture
     def configured_service(self):
-        """Create a configured GitHubService with mocked repo."""
+        """Create a configured GitHubService with mocked repo and no tree API."""
         service = GitHubService(
             token="token",
             repo_owner="owner",
@@ -469,6 +479,7 @@ class TestGetAllWorkflowsFromGitHub:
             branch="main"
         )
         service._repo = MagicMock()
+        service._read_json_tree = AsyncMock(return_value=None)
         return service
 
     @pytest.mark.asyncio
@@ -549,6 +560,143 @@ class TestGetAllWorkflowsFromGitHub:
         assert result == {}
 
 
+class TestBulkTreeReader:
+    """Tests for reading workflow folders via the Git Trees and Blobs APIs."""
+
+    @staticmethod
+    def _service(files, tree_status=200, truncated=False, extra_tree=None):
+        """Build a service whose GitHub API is served from an in-memory repo."""
+        sha_of = lambda path: "sha-" + path.replace("/", "-")
+        blobs = {sha_of(path): json.dumps(data).encode() for path, data in files.items()}
+        tree = [{"path": path, "type": "blob", "sha": sha_of(path)} for path in files]
+        tree += extra_tree or []
+        requests = []
+
+        def handler(request):
+            requests.append(request.url.path)
+            if "/git/trees/" in request.url.path:
+                if tree_status != 200:
+                    return httpx.Response(tree_status, json={"message": "error"})
+                return httpx.Response(200, json={"tree": tree, "truncated": truncated})
+            sha = request.url.path.rsplit("/", 1)[-1]
+            return httpx.Response(200, content=blobs[sha])
+
+        service = GitHubService(token="token", repo_owner="owner", repo_name="repo", branch="main")
+        service._repo = MagicMock()
+        service._http_client = lambda: httpx.AsyncClient(
+            base_url="https://api.github.com", transport=httpx.MockTransport(handler)
+        )
+        return service, requests
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_reads_workflows_with_one_tree_call(self):
+        """Should resolve the tree once and fetch each blob, without get_contents."""
+        service, requests = self._service({
+            "workflows/dev/1.json": {"id": "1", "name": "One"},
+            "workflows/dev/nested/2.json": {"id": "2", "name": "Two"},
+            "workflows/dev/nested/deeper/3.json": {"id": "3", "name": "Too deep"},
+            "workflows/prod/4.json": {"id": "4", "name": "Other env"},
+            "workflows/dev/README.md": {"id": "readme"},
+        })
+
+        result = await service.get_all_workflows_from_github(environment_type="dev")
+
+        assert set(result) == {"1", "2"}
+        assert sum("/git/trees/" in path for path in requests) == 1
+        assert sum("/git/blobs/" in path for path in requests) == 2
+        service._repo.get_contents.assert_not_called()
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_identical_blobs_fetched_once(self):
+        """Files sharing a blob SHA should be downloaded once."""
+        service, requests = self._service(
+            {"workflows/dev/a.json": {"name": "Same"}},
+            extra_tree=[{"path": "workflows/dev/b.json", "type": "blob", "sha": "sha-workflows-dev-a.json"}],
+        )
+
+        result = await service.get_all_workflow_files_from_github(git_folder="dev")
+
+        assert set(result) == {"workflows/dev/a.json", "workflows/dev/b.json"}
+        assert sum("/git/blobs/" in path for path in requests) == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_workflow_files_skip_sidecars_and_subdirs(self):
+        """Canonical file listing should ignore sidecars and nested folders."""
+        service, _ = self._service({
+            "workflows/dev/abc.json": {"name": "Canonical"},
+            "workflows/dev/abc.env-map.json": {"environment_id": "env-1"},
+            "workflows/dev/sub/def.json": {"name": "Nested"},
+        })
+
+        result = await service.get_all_workflow_files_from_github(git_folder="dev")
+
+        assert list(result) == ["workflows/dev/abc.json"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_cached_blobs_are_not_downloaded_again(self, isolated_blob_cache):
+        """A second read of unchanged files should only fetch the tree."""
+        service, requests = self._service({
+            "workflows/dev/1.json": {"id": "1", "name": "One"},
+            "workflows/dev/2.json": {"id": "2", "name": "Two"},
+        })
+
+        first = await service.get_all_workflows_from_github(environment_type="dev")
+        requests.clear()
+        second = await service.get_all_workflows_from_github(environment_type="dev")
+
+        assert second == first
+        assert requests == ["/repos/owner/repo/git/trees/main"]
+        assert isolated_blob_cache.get_metrics()["memory_hits"] == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_snapshot_workflows_read_from_tree(self):
+        """Snapshot workflows should be keyed by file name without extension."""
+        service, _ = self._service({
+            "prod/snapshots/snap-1/workflows/wf-a.json": {"name": "A"},
+            "prod/snapshots/snap-1/manifest.json": {"kind": "manual"},
+        })
+
+        result = await service.read_snapshot_workflows("prod", "snap-1")
+
+        assert result == {"wf-a": {"name": "A"}}
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_missing_ref_returns_empty(self):
+        """A 404 from the Trees API means there is nothing to read."""
+        service, _ = self._service({}, tree_status=404)
+
+        assert await service.get_all_workflows_from_github(environment_type="dev") == {}
+        service._repo.get_contents.assert_not_called()
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_truncated_tree_falls_back_to_walk(self):
+        """Truncated trees should fall back to walking directories."""
+        service, _ = self._service({"workflows/dev/1.json": {"id": "1"}}, truncated=True)
+        service._repo.get_contents.side_effect = GithubException(404, {}, {})
+
+        await service.get_all_workflows_from_github(environment_type="dev")
+
+        service._repo.get_contents.assert_called_once_with("workflows/dev", ref="main")
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_api_error_falls_back_to_walk(self):
+        """API errors (e.g. rate limiting) should fall back to walking directories."""
+        service, _ = self._service({}, tree_status=403)
+        service._repo.get_contents.side_effect = GithubException(404, {}, {})
+
+        await service.get_all_workflow_files_from_github(git_folder="dev")
+
+        service._repo.get_contents.assert_called_once_with("workflows/dev", ref="main")
+
+
 class TestGetWorkflowByName:
     """Tests for retrieving workflow by name with commit info."""
 
@@ -800,3 +948,163 @@ class TestTestConnection:
         result = await service.test_connection()
 
         assert result is False
+
+
+class TestSingleCommitWriter:
+    """Tests for writing many files as one commit via the Git Data API."""
+
+    @staticmethod
+    def _service(existing=None, moved_heads=0):
+        """Build a service backed by an in-memory Git Data API with one branch."""
+        state = {
+            "head": "commit-0",
+            "trees": {"tree-0": dict(existing or {})},
+            "commits": {"commit-0": "tree-0"},
+            "blobs": set((existing or {}).values()),
+            "moved_heads": moved_heads,
+        }
+        requests = []
+
+        def handler(request):
+            path = request.url.path
+            requests.append((request.method, path))
+            body = json.loads(request.content) if request.content else {}
+            if request.method == "GET" and path.endswith("/git/ref/heads/main"):
+                return httpx.Response(200, json={"object": {"sha": state["head"]}})
+            if request.method == "GET" and "/git/commits/" in path:
+                return httpx.Response(200, json={"tree": {"sha": state["commits"][path.rsplit("/", 1)[-1]]}})
+            if request.method == "GET" and "/git/trees/" in path:
+                tree = state["trees"][path.rsplit("/", 1)[-1]]
+                return httpx.Response(200, json={
+                    "tree": [{"path": p, "type": "blob", "sha": sha} for p, sha in tree.items()],
+                    "truncated": False,
+                })
+            if path.endswith("/git/blobs"):
+                content = base64.b64decode(body["content"])
+                sha = GitHubService._git_blob_sha(content)
+                state["blobs"].add(sha)
+                return httpx.Response(201, json={"sha": sha})
+            if path.endswith("/git/trees"):
+                tree = dict(state["trees"][body["base_tree"]])
+                for entry in body["tree"]:
+                    assert entry["sha"] in state["blobs"]
+                    tree[entry["path"]] = entry["sha"]
+                sha = f"tree-{len(state['trees'])}"
+                state["trees"][sha] = tree
+                return httpx.Response(201, json={"sha": sha})
+            if path.endswith("/git/commits"):
+                sha = f"commit-{len(state['commits'])}"
+                state["commits"][sha] = body["tree"]
+                return httpx.Response(201, json={"sha": sha})
+            if request.method == "PATCH":
+                assert body["force"] is False
+                if state["moved_heads"]:
+                    # Another writer advanced the branch first
+                    state["moved_heads"] -= 1
+                    state["commits"]["commit-other"] = "tree-0"
+                    state["head"] = "commit-other"
+                    return httpx.Response(422, json={"message": "Update is not a fast forward"})
+                state["head"] = body["sha"]
+                return httpx.Response(200, json={"object": {"sha": body["sha"]}})
+            return httpx.Response(404)
+
+        service = GitHubService(token="token", repo_owner="owner", repo_name="repo", branch="main")
+        service._repo = MagicMock()
+        service._http_client = lambda: httpx.AsyncClient(
+            base_url="https://api.github.com", transport=httpx.MockTransport(handler)
+        )
+        return service, state, requests
+
+    @staticmethod
+    def _count(requests, method, suffix):
+        return sum(m == method and p.endswith(suffix) for m, p in requests)
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_snapshot_written_as_one_commit(self):
+        """Manifest and every workflow should land in a single commit and ref update."""
+        service, state, requests = self._service()
+        service._repo.get_contents.side_effect = GithubException(404, {}, {})
+        workflows = {f"wf-{i}": {"name": f"Workflow {i}"} for i in range(300)}
+
+        commit_sha = await service.write_snapshot("prod", "snap-1", {"kind": "manual"}, workflows)
+
+        assert commit_sha == state["head"] == "commit-1"
+        assert len(state["trees"][state["commits"][commit_sha]]) == 301
+        assert "prod/snapshots/snap-1/manifest.json" in state["trees"][state["commits"][commit_sha]]
+        assert self._count(requests, "POST", "/git/blobs") == 301
+        assert self._count(requests, "POST", "/git/commits") == 1
+        assert self._count(requests, "PATCH", "/git/refs/heads/main") == 1
+        service._repo.create_file.assert_not_called()
+        service._repo.get_commits.assert_not_called()
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_unchanged_files_and_known_blobs_are_skipped(self):
+        """Files already at their path are left out; blobs already in the tree are not re-uploaded."""
+        same = json.dumps({"name": "Same"})
+        service, state, requests = self._service(existing={
+            "workflows/dev/a.json": GitHubService._git_blob_sha(same.encode()),
+        })
+
+        await service.commit_files({
+            "workflows/dev/a.json": same,
+            "workflows/dev/copy-of-a.json": same,
+            "workflows/dev/b.json": json.dumps({"name": "New"}),
+        }, "Backup")
+
+        assert self._count(requests, "POST", "/git/blobs") == 1
+        assert set(state["trees"][state["commits"][state["head"]]]) == {
+            "workflows/dev/a.json", "workflows/dev/copy-of-a.json", "workflows/dev/b.json",
+        }
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_no_commit_when_nothing_changed(self):
+        """An unchanged backup should return the current head without committing."""
+        content = json.dumps({"name": "Same"})
+        service, state, requests = self._service(existing={
+            "workflows/dev/a.json": GitHubService._git_blob_sha(content.encode()),
+        })
+
+        assert await service.commit_files({"workflows/dev/a.json": content}, "Backup") == "commit-0"
+        assert self._count(requests, "POST", "/git/commits") == 0
+        assert self._count(requests, "PATCH", "/git/refs/heads/main") == 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_rebuilds_commit_when_branch_moves(self):
+        """A non-fast-forward ref update should rebuild on the new head without re-uploading blobs."""
+        service, state, requests = self._service(moved_heads=1)
+
+        commit_sha = await service.commit_files({"workflows/dev/a.json": "{}"}, "Backup")
+
+        assert state["head"] == commit_sha
+        assert self._count(requests, "POST", "/git/blobs") == 1
+        assert self._count(requests, "PATCH", "/git/refs/heads/main") == 2
+        assert self._count(requests, "POST", "/git/commits") == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_gives_up_after_configured_attempts(self):
+        """Persistent non-fast-forward failures should surface as an HTTP error."""
+        service, _, _ = self._service(moved_heads=5)
+
+        with patch("app.services.github_service.settings.GITHUB_REF_UPDATE_ATTEMPTS", 2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await service.commit_files({"workflows/dev/a.json": "{}"}, "Backup")
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_bulk_workflow_sync_uses_single_file_layout(self):
+        """Bulk sync should write the same paths and content as per-workflow sync."""
+        service, state, _ = self._service()
+        workflow = {"id": "wf-1", "name": "Orders", "nodes": []}
+
+        commit_sha = await service.sync_workflows_to_github([workflow], "Manual snapshot", environment_type="dev")
+
+        path, content = service._workflow_file("wf-1", "Orders", workflow, "dev")
+        assert path == "workflows/dev/wf-1.json"
+        assert state["trees"][state["commits"][commit_sha]] == {
+            path: GitHubService._git_blob_sha(content.encode()),
+        }
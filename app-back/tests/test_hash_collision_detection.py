@@ -17,7 +17,8 @@ from typing import Dict, Any
 from app.services.canonical_workflow_service import (
     compute_workflow_hash,
     register_workflow_hash,
-    get_registered_payload,
+    get_registered_fingerprint,
+    payload_fingerprint,
     clear_hash_registry,
     get_registry_stats,
 )
@@ -105,8 +106,8 @@ class TestSameHashDifferentPayloadDetection:
             hash1 = compute_workflow_hash(workflow_payload_a, canonical_id="workflow-1")
 
             # Verify hash was registered
-            registered = get_registered_payload(hash1)
-            assert registered == workflow_payload_a
+            registered = get_registered_fingerprint(hash1)
+            assert registered == payload_fingerprint(workflow_payload_a)
 
             # Now force a collision: normalize to different payload but produce same hash
             # We'll manipulate the hash function to return the same value
@@ -277,12 +278,12 @@ class TestHashRegistryOperations:
         register_workflow_hash(test_hash, workflow_payload_a)
 
         # Retrieve
-        retrieved = get_registered_payload(test_hash)
-        assert retrieved == workflow_payload_a
+        retrieved = get_registered_fingerprint(test_hash)
+        assert retrieved == payload_fingerprint(workflow_payload_a)
 
     def test_get_nonexistent_hash_returns_none(self):
         """Test that getting a non-registered hash returns None"""
-        result = get_registered_payload("nonexistent-hash")
+        result = get_registered_fingerprint("nonexistent-hash")
         assert result is None
 
     def test_clear_registry_removes_all_entries(self, workflow_payload_a, workflow_payload_b):
@@ -301,8 +302,8 @@ class TestHashRegistryOperations:
         stats = get_registry_stats()
         assert stats["total_entries"] == 0
 
-        assert get_registered_payload("hash1") is None
-        assert get_registered_payload("hash2") is None
+        assert get_registered_fingerprint("hash1") is None
+        assert get_registered_fingerprint("hash2") is None
 
     def test_registry_stats_counts_correctly(self, workflow_payload_a):
         """Test that registry stats return correct counts"""
@@ -325,11 +326,77 @@ class TestHashRegistryOperations:
 
         # Register with payload A
         register_workflow_hash(test_hash, workflow_payload_a)
-        assert get_registered_payload(test_hash) == workflow_payload_a
+        assert get_registered_fingerprint(test_hash) == payload_fingerprint(workflow_payload_a)
 
         # Overwrite with payload B
         register_workflow_hash(test_hash, workflow_payload_b)
-        assert get_registered_payload(test_hash) == workflow_payload_b
+        assert get_registered_fingerprint(test_hash) == payload_fingerprint(workflow_payload_b)
+
+    def test_registry_stores_fingerprint_not_payload(self, workflow_payload_a):
+        """Test that the registry keeps a compact digest rather than the payload"""
+        register_workflow_hash("hash1", workflow_payload_a)
+
+        fingerprint = get_registered_fingerprint("hash1")
+        assert isinstance(fingerprint, str)
+        assert len(fingerprint) == 32
+        assert fingerprint != hashlib.sha256(
+            json.dumps(workflow_payload_a, sort_keys=True).encode()
+        ).hexdigest()
+
+
+# Test Category: Registry Bounds
+class TestRegistryBounds:
+    """Tests for LRU and TTL eviction in the hash registry"""
+
+    @pytest.fixture
+    def small_registry(self):
+        from app.services import canonical_workflow_service as service
+
+        registry = service._HashFingerprintRegistry(max_entries=2, ttl_seconds=60)
+        with patch.object(service, "_hash_collision_registry", registry):
+            yield registry
+
+    def test_evicts_least_recently_used(self, small_registry, workflow_payload_a):
+        """Test that the oldest untouched hash is evicted once full"""
+        register_workflow_hash("hash1", workflow_payload_a)
+        register_workflow_hash("hash2", workflow_payload_a)
+
+        # Touch hash1 so hash2 becomes least recently used
+        assert get_registered_fingerprint("hash1") is not None
+        register_workflow_hash("hash3", workflow_payload_a)
+
+        assert get_registered_fingerprint("hash2") is None
+        assert get_registered_fingerprint("hash1") is not None
+        assert get_registered_fingerprint("hash3") is not None
+
+        stats = get_registry_stats()
+        assert stats["total_entries"] == 2
+        assert stats["max_entries"] == 2
+        assert stats["evictions"] == 1
+
+    def test_expires_entries_after_ttl(self, small_registry, workflow_payload_a):
+        """Test that entries untouched for longer than the TTL are dropped"""
+        with patch("app.services.canonical_workflow_service.time.monotonic", return_value=1000.0):
+            register_workflow_hash("hash1", workflow_payload_a)
+
+        with patch("app.services.canonical_workflow_service.time.monotonic", return_value=1061.0):
+            assert get_registered_fingerprint("hash1") is None
+
+        stats = get_registry_stats()
+        assert stats["total_entries"] == 0
+        assert stats["expirations"] == 1
+
+    def test_compute_hash_re_registers_after_eviction(self, small_registry):
+        """Test that an evicted hash is registered again without a collision"""
+        workflows = [{"name": f"WF{i}", "nodes": []} for i in range(3)]
+
+        first_hash = compute_workflow_hash(workflows[0], canonical_id="wf-0")
+        compute_workflow_hash(workflows[1], canonical_id="wf-1")
+        compute_workflow_hash(workflows[2], canonical_id="wf-2")
+
+        with patch('app.services.canonical_workflow_service.logger') as mock_logger:
+            assert compute_workflow_hash(workflows[0], canonical_id="wf-0") == first_hash
+            mock_logger.warning.assert_not_called()
 
 
 # Test Category: Integration with normalize_workflow_for_comparison
@@ -642,15 +709,17 @@ class TestDeterministicFallbackHashing:
         assert fallback_hash != normal_hash
 
         # Assert: fallback hash is now registered in collision registry
-        registered_fallback = get_registered_payload(fallback_hash)
+        registered_fallback = get_registered_fingerprint(fallback_hash)
         assert registered_fallback is not None
 
-        # Assert: registered payload includes __canonical_id__
-        assert "__canonical_id__" in registered_fallback
-        assert registered_fallback["__canonical_id__"] == "workflow-2"
+        # Assert: registered fingerprint is of the payload including __canonical_id__
+        assert registered_fallback == payload_fingerprint({
+            **normalized_b,
+            "__canonical_id__": "workflow-2"
+        })
 
         # Assert: original hash still registered with dummy payload
-        assert get_registered_payload(normal_hash) == dummy_payload
+        assert get_registered_fingerprint(normal_hash) == payload_fingerprint(dummy_payload)
 
     def test_multiple_collisions_produce_unique_deterministic_hashes(self):
         """
@@ -1,11 +1,14 @@
 """
 Unit tests for the N8N API client.
 """
+import asyncio
+import base64
+import json
 import pytest
 import httpx
 from unittest.mock import patch, MagicMock, AsyncMock
 
-from app.services.n8n_client import N8NClient
+from app.services.n8n_client import N8NClient, N8NConnectionPool
 
 
 class TestN8NClientInit:
@@ -679,3 +682,221 @@ class TestGetUsersAndTags:
 
         assert len(result) == 2
         assert result[0]["name"] == "Production"
+
+
+class TestConnectionPool:
+    """Tests for the shared per-environment HTTP connection pool."""
+
+    @pytest.fixture
+    def pool(self):
+        return N8NConnectionPool()
+
+    @staticmethod
+    def _mock_transport_client(handler):
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_reuses_client_per_base_url(self, pool):
+        """Should create one client per base URL and count hits/misses."""
+        first = pool.session("https://a.n8n.io")
+        second = pool.session("https://a.n8n.io/")
+        other = pool.session("https://b.n8n.io")
+
+        assert first._client is second._client
+        assert first._client is not other._client
+
+        metrics = pool.get_metrics()
+        assert metrics["open_clients"] == 2
+        assert metrics["hosts"]["https://a.n8n.io"]["hits"] == 1
+        assert metrics["hosts"]["https://a.n8n.io"]["misses"] == 1
+        assert metrics["totals"]["misses"] == 2
+
+        await pool.aclose()
+
+    @pytest.mark.unit
+    def test_closes_client_left_on_idle_loop(self, pool):
+        """Should close the previous loop's client when a new loop takes over the host."""
+        async def open_session():
+            return pool.session("https://a.n8n.io")._client
+
+        old_loop = asyncio.new_event_loop()
+        try:
+            stale = old_loop.run_until_complete(open_session())
+
+            async def replace():
+                fresh = pool.session("https://a.n8n.io")._client
+                await asyncio.sleep(0)
+                await asyncio.sleep(0)
+                return fresh
+
+            fresh = asyncio.run(replace())
+        finally:
+            old_loop.close()
+
+        assert fresh is not stale
+        assert stale.is_closed
+        assert pool.get_metrics()["open_clients"] == 1
+
+    @pytest.mark.unit
+    def test_drops_transport_of_client_on_closed_loop(self, pool):
+        """Should release the transport when the client's loop is already closed."""
+        async def open_session():
+            return pool.session("https://a.n8n.io")._client
+
+        stale = asyncio.run(open_session())
+        fresh = asyncio.run(open_session())
+
+        assert fresh is not stale
+        assert stale._transport is None
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_caps_concurrent_requests_per_host(self, pool):
+        """Should never exceed N8N_MAX_CONCURRENT_REQUESTS_PER_HOST in flight."""
+        in_flight = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json={"data": []})
+
+        with patch("app.services.n8n_client.settings.N8N_MAX_CONCURRENT_REQUESTS_PER_HOST", 2), \
+                patch.object(pool, "_create_client", return_value=self._mock_transport_client(handler)):
+            session = pool.session("https://n8n.io")
+            await asyncio.gather(*(session.get("https://n8n.io/api/v1/workflows") for _ in range(6)))
+
+        assert peak == 2
+        stats = pool.get_metrics()["hosts"]["https://n8n.io"]
+        assert stats["requests"] == 6
+        assert stats["in_flight"] == 0
+        assert stats["throttled"] > 0
+
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_aclose_closes_clients(self, pool):
+        """Should close pooled clients and create a fresh one afterwards."""
+        session = pool.session("https://n8n.io")
+        client = session._client
+
+        await pool.aclose()
+
+        assert client.is_closed
+        assert pool.get_metrics()["open_clients"] == 0
+        assert pool.session("https://n8n.io")._client is not client
+
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_client_methods_share_pooled_connection(self):
+        """Sequential N8NClient calls should reuse one pooled client."""
+        def handler(request):
+            return httpx.Response(200, json={"data": [{"id": "wf-1"}]})
+
+        pool = N8NConnectionPool()
+        with patch("app.services.n8n_client.n8n_connection_pool", pool), \
+                patch.object(pool, "_create_client", side_effect=lambda: self._mock_transport_client(handler)) as create:
+            client = N8NClient(base_url="https://n8n.io", api_key="test-key")
+            await client.get_workflows()
+            await client.get_workflows()
+            await client.get_tags()
+
+        assert create.call_count == 1
+        assert pool.get_metrics()["hosts"]["https://n8n.io"]["hits"] == 2
+
+        await pool.aclose()
+
+
+class TestIterExecutions:
+    """Tests for high-water-mark execution paging."""
+
+    @staticmethod
+    def _pages_client(pages):
+        """Serve pages of descending execution ids keyed by cursor."""
+        requests = []
+
+        def handler(request):
+            cursor = request.url.params.get("cursor")
+            requests.append(cursor)
+            index = int(cursor) if cursor else 0
+            body = {"data": [{"id": str(i)} for i in pages[index]]}
+            if index + 1 < len(pages):
+                body["nextCursor"] = str(index + 1)
+            return httpx.Response(200, json=body)
+
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler)), requests
+
+    async def _collect(self, pages, **kwargs):
+        http_client, requests = self._pages_client(pages)
+        pool = N8NConnectionPool()
+        with patch("app.services.n8n_client.n8n_connection_pool", pool), \
+                patch.object(pool, "_create_client", return_value=http_client):
+            client = N8NClient(base_url="https://n8n.io", api_key="test-key")
+            collected = [page async for page in client.iter_executions(**kwargs)]
+        await pool.aclose()
+        return collected, requests
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_stops_at_high_water_mark(self):
+        """Should only yield executions newer than since_id and stop paging there."""
+        pages = [[10, 9, 8], [7, 6, 5], [4, 3, 2]]
+
+        collected, requests = await self._collect(pages, since_id="6", page_size=3)
+
+        assert [[e["id"] for e in p] for p in collected] == [["10", "9", "8"], ["7"]]
+        assert requests == [None, "1"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_follows_cursor_without_mark(self):
+        """Should read every page when no mark is given."""
+        collected, requests = await self._collect([[5, 4], [3, 2], [1]], page_size=2)
+
+        assert sum(len(p) for p in collected) == 5
+        assert requests == [None, "1", "2"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_respects_max_executions(self):
+        """Should stop once max_executions have been yielded."""
+        collected, requests = await self._collect([[5, 4], [3, 2], [1]], page_size=2, max_executions=3)
+
+        assert [[e["id"] for e in p] for p in collected] == [["5", "4"], ["3"]]
+        assert requests == [None, "1"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_nothing_new(self):
+        """Should yield nothing when the newest execution is the mark."""
+        collected, requests = await self._collect([[5, 4], [3, 2]], since_id="5", page_size=2)
+
+        assert collected == []
+        assert requests == [None]
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_before_id_starts_from_encoded_cursor(self):
+        """Should start below before_id using N8N's lastId cursor."""
+        requests = []
+
+        def handler(request):
+            requests.append(request.url.params.get("cursor"))
+            return httpx.Response(200, json={"data": [{"id": "5"}, {"id": "4"}]})
+
+        pool = N8NConnectionPool()
+        with patch("app.services.n8n_client.n8n_connection_pool", pool), \
+                patch.object(pool, "_create_client", return_value=httpx.AsyncClient(transport=httpx.MockTransport(handler))):
+            client = N8NClient(base_url="https://n8n.io", api_key="test-key")
+            collected = [page async for page in client.iter_executions(before_id="6", page_size=2)]
+        await pool.aclose()
+
+        assert [e["id"] for e in collected[0]] == ["5", "4"]
+        assert json.loads(base64.b64decode(requests[0])) == {"lastId": "6", "limit": 2}
@@ -0,0 +1,188 @@
+"""
+Unit tests for the principal cache and request-scoped identity resolution.
+"""
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from starlette.requests import Request
+
+from app.services import auth_service
+from app.services.auth_service import PrincipalCache, get_current_user, principal_cache
+from app.services.rate_limit_middleware import RateLimitMiddleware
+
+
+USER = {"id": "user-1", "email": "a@example.com", "name": "A", "role": "admin", "tenant_id": "tenant-1"}
+TENANT = {"id": "tenant-1", "name": "Acme", "subscription_tier": "pro"}
+
+
+def _principal(user_id="user-1", tenant_id="tenant-1"):
+    return {
+        "user": {"id": user_id, "tenant_id": tenant_id, "email": f"{user_id}@example.com"},
+        "tenant": {"id": tenant_id, "name": "Acme"},
+        "is_new": False,
+        "is_platform_admin": False,
+    }
+
+
+def _request(token="tok"):
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/api/v1/environments",
+        "headers": [(b"authorization", f"Bearer {token}".encode())],
+    })
+
+
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+@pytest.fixture
+def mock_auth():
+    """Patch token verification and the user lookups behind resolve_principal."""
+    mock_db = MagicMock()
+    mock_db.client.table.return_value.select.return_value.eq.return_value.maybe_single.return_value.execute.return_value = MagicMock(data=None)
+    with patch.object(
+        auth_service.supabase_auth_service,
+        "verify_token",
+        AsyncMock(return_value={"sub": "sub-1", "email": "a@example.com"}),
+    ) as verify, patch.object(
+        auth_service.supabase_auth_service,
+        "get_or_create_user",
+        AsyncMock(return_value={"user": dict(USER), "tenant": dict(TENANT), "is_new": False}),
+    ) as lookup, patch.object(auth_service, "db_service", mock_db):
+        yield verify, lookup
+
+
+class TestPrincipalCache:
+    """Tests for the PrincipalCache class."""
+
+    @pytest.mark.unit
+    def test_get_returns_copy(self):
+        cache = PrincipalCache(max_entries=10, ttl_seconds=60)
+        cache.set("sub-1", _principal())
+
+        first = cache.get("sub-1")
+        first["user"]["role"] = "viewer"
+
+        assert "role" not in cache.get("sub-1")["user"]
+
+    @pytest.mark.unit
+    def test_expired_entries_miss(self):
+        cache = PrincipalCache(max_entries=10, ttl_seconds=30)
+        with patch("app.services.ttl_cache.time.monotonic", return_value=100.0):
+            cache.set("sub-1", _principal())
+        with patch("app.services.ttl_cache.time.monotonic", return_value=131.0):
+            assert cache.get("sub-1") is None
+
+        assert cache.get_metrics()["total_entries"] == 0
+
+    @pytest.mark.unit
+    def test_evicts_least_recently_used(self):
+        cache = PrincipalCache(max_entries=2, ttl_seconds=60)
+        cache.set("sub-1", _principal("user-1"))
+        cache.set("sub-2", _principal("user-2"))
+        cache.get("sub-1")
+        cache.set("sub-3", _principal("user-3"))
+
+        assert cache.get("sub-1") is not None
+        assert cache.get("sub-2") is None
+        assert cache.get_metrics()["evictions"] == 1
+
+    @pytest.mark.unit
+    def test_invalidate_user_and_tenant(self):
+        cache = PrincipalCache(max_entries=10, ttl_seconds=60)
+        cache.set("sub-1", _principal("user-1", "tenant-1"))
+        cache.set("sub-2", _principal("user-2", "tenant-1"))
+        cache.set("sub-3", _principal("user-3", "tenant-2"))
+
+        cache.invalidate_user("user-3")
+        assert cache.get("sub-3") is None
+        assert cache.get("sub-1") is not None
+
+        cache.invalidate_tenant("tenant-1")
+        assert cache.get("sub-1") is None
+        assert cache.get("sub-2") is None
+        assert cache.get_metrics()["invalidations"] == 3
+
+    @pytest.mark.unit
+    def test_indexes_pruned_after_evictions(self):
+        cache = PrincipalCache(max_entries=2, ttl_seconds=60)
+        for i in range(10):
+            cache.set(f"sub-{i}", _principal(f"user-{i}", f"tenant-{i}"))
+
+        assert len(cache._subs_by_user) + len(cache._subs_by_tenant) <= 4 * cache.max_entries
+        assert cache.get("sub-9") is not None
+
+    @pytest.mark.unit
+    def test_disabled_when_ttl_is_zero(self):
+        cache = PrincipalCache(max_entries=10, ttl_seconds=0)
+        cache.set("sub-1", _principal())
+        assert cache.get("sub-1") is None
+
+
+class TestRequestIdentityResolution:
+    """Tests for sharing identity between the rate limiter and get_current_user."""
+
+    @pytest.mark.unit
+    async def test_middleware_resolution_reused_by_get_current_user(self, mock_auth):
+        verify, lookup = mock_auth
+        request = _request("tok")
+        middleware = RateLimitMiddleware(app=MagicMock())
+
+        user_id, tenant_id = await middleware._extract_user_tenant(request)
+        result = await get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials="tok"), request)
+
+        assert (user_id, tenant_id) == ("user-1", "tenant-1")
+        assert result["user"]["id"] == "user-1"
+        assert result["tenant"]["subscription_tier"] == "pro"
+        assert verify.await_count == 1
+        assert lookup.await_count == 1
+
+    @pytest.mark.unit
+    async def test_principal_cached_across_requests(self, mock_auth):
+        _, lookup = mock_auth
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="tok")
+
+        await get_current_user(credentials, _request())
+        await get_current_user(credentials, _request())
+
+        assert lookup.await_count == 1
+        assert principal_cache.get_metrics()["hits"] == 1
+
+    @pytest.mark.unit
+    async def test_invalidation_forces_fresh_lookup(self, mock_auth):
+        _, lookup = mock_auth
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="tok")
+
+        await get_current_user(credentials, _request())
+        principal_cache.invalidate_tenant("tenant-1")
+        await get_current_user(credentials, _request())
+
+        assert lookup.await_count == 2
+
+    @pytest.mark.unit
+    async def test_onboarding_users_not_cached(self, mock_auth):
+        _, lookup = mock_auth
+        lookup.return_value = {"user": None, "tenant": None, "is_new": True}
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="tok")
+
+        for _ in range(2):
+            with pytest.raises(HTTPException) as exc_info:
+                await get_current_user(credentials, _request())
+            assert exc_info.value.status_code == 403
+
+        assert lookup.await_count == 2
+
+    @pytest.mark.unit
+    async def test_invalid_token_ignored_by_middleware(self, mock_auth):
+        verify, lookup = mock_auth
+        verify.side_effect = HTTPException(status_code=401, detail="Token validation failed")
+        middleware = RateLimitMiddleware(app=MagicMock())
+
+        assert await middleware._extract_user_tenant(_request()) == (None, None)
+        assert lookup.await_count == 0
@@ -0,0 +1,270 @@
+"""
+Unit tests for promotion execution with a prefetched target inventory,
+batched canonical source loading and bounded parallel deploys.
+"""
+import asyncio
+import pytest
+from datetime import datetime
+from unittest.mock import patch, MagicMock, AsyncMock
+
+from app.services.promotion_service import PromotionService, TargetWorkflowInventory
+from app.schemas.promotion import (
+    PromotionStatus,
+    WorkflowChangeType,
+    WorkflowSelection,
+    RollbackResult,
+)
+
+
+TENANT_ID = "00000000-0000-0000-0000-000000000001"
+
+
+@pytest.fixture
+def promotion_service():
+    service = PromotionService()
+    service.db = MagicMock()
+    service.db.list_logical_credentials = AsyncMock(return_value=[])
+    service.db.list_credential_mappings = AsyncMock(return_value=[])
+    return service
+
+
+def _env(env_id, **extra):
+    return {"id": env_id, "n8n_type": env_id, "git_repo_url": "repo", "git_pat": "token", "git_branch": "main", **extra}
+
+
+def _workflow(i):
+    return {"id": f"wf-{i}", "name": f"WF{i}", "active": True, "nodes": [{"id": f"n{i}", "type": f"type-{i}"}]}
+
+
+def _selections(count, change_type=WorkflowChangeType.CHANGED):
+    return [
+        WorkflowSelection(
+            workflow_id=f"wf-{i}", workflow_name=f"WF{i}", change_type=change_type,
+            enabled_in_source=True, selected=True,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+async def _execute(service, selections):
+    return await service.execute_promotion(
+        tenant_id=TENANT_ID,
+        promotion_id="promo-1",
+        source_env_id="env-source",
+        target_env_id="env-target",
+        workflow_selections=selections,
+        source_snapshot_id="snap-source",
+        target_pre_snapshot_id="snap-pre",
+        policy_flags={},
+    )
+
+
+class TestTargetInventory:
+    """Tests for the per-promotion target inventory."""
+
+    @pytest.mark.unit
+    async def test_target_listed_once_for_all_new_workflows(self, promotion_service):
+        promotion_service.db.get_environment = AsyncMock(side_effect=[_env("env-source"), _env("env-target")])
+        source_workflows = {f"wf-{i}": _workflow(i) for i in range(1, 4)}
+
+        with patch('app.services.promotion_service.db_service') as mock_db_service, \
+             patch.object(promotion_service, '_get_github_service') as mock_gh_service, \
+             patch('app.services.promotion_service.ProviderRegistry') as mock_registry, \
+             patch.object(promotion_service, '_create_audit_log', new_callable=AsyncMock):
+            mock_db_service.check_onboarding_gate = AsyncMock(return_value=True)
+            mock_db_service.get_workflow_mappings = AsyncMock(return_value=[])
+            mock_gh_service.return_value.get_all_workflows_from_github = AsyncMock(return_value=source_workflows)
+
+            mock_adapter = MagicMock()
+            # wf-2 already exists in the target under another ID with identical content
+            mock_adapter.get_workflows = AsyncMock(return_value=[{**_workflow(2), "id": "target-7"}])
+            mock_adapter.create_workflow = AsyncMock(return_value={"id": "created"})
+            mock_registry.get_adapter_for_environment.return_value = mock_adapter
+
+            result = await _execute(promotion_service, _selections(3, WorkflowChangeType.NEW))
+
+        mock_adapter.get_workflows.assert_awaited_once()
+        mock_adapter.get_workflow.assert_not_called()
+        assert mock_adapter.create_workflow.await_count == 2
+        assert result.status == PromotionStatus.COMPLETED
+        assert (result.workflows_promoted, result.workflows_skipped) == (2, 1)
+        assert "WF2 already exists in target" in result.warnings[0]
+
+    @pytest.mark.unit
+    async def test_update_missing_from_listing_is_fetched_directly(self, promotion_service):
+        promotion_service.db.get_environment = AsyncMock(side_effect=[_env("env-source"), _env("env-target")])
+        source_workflows = {f"wf-{i}": _workflow(i) for i in range(1, 3)}
+
+        with patch('app.services.promotion_service.db_service') as mock_db_service, \
+             patch.object(promotion_service, '_get_github_service') as mock_gh_service, \
+             patch('app.services.promotion_service.ProviderRegistry') as mock_registry, \
+             patch.object(promotion_service, '_create_audit_log', new_callable=AsyncMock):
+            mock_db_service.check_onboarding_gate = AsyncMock(return_value=True)
+            mock_db_service.get_workflow_mappings = AsyncMock(return_value=[])
+            mock_gh_service.return_value.get_all_workflows_from_github = AsyncMock(return_value=source_workflows)
+
+            mock_adapter = MagicMock()
+            # The listing only returned wf-1; wf-2 sits on a later page with identical content
+            mock_adapter.get_workflows = AsyncMock(return_value=[{**_workflow(1), "nodes": []}])
+            mock_adapter.get_workflow = AsyncMock(return_value=_workflow(2))
+            mock_adapter.update_workflow = AsyncMock(return_value={})
+            mock_registry.get_adapter_for_environment.return_value = mock_adapter
+
+            result = await _execute(promotion_service, _selections(2))
+
+        mock_adapter.get_workflow.assert_awaited_once_with("wf-2")
+        mock_adapter.update_workflow.assert_awaited_once()
+        assert (result.workflows_promoted, result.workflows_skipped) == (1, 1)
+
+    @pytest.mark.unit
+    async def test_identical_new_workflows_created_once(self, promotion_service):
+        promotion_service.db.get_environment = AsyncMock(side_effect=[_env("env-source"), _env("env-target")])
+        source_workflows = {"wf-1": _workflow(1), "wf-2": {**_workflow(1), "id": "wf-2"}}
+
+        with patch('app.services.promotion_service.db_service') as mock_db_service, \
+             patch.object(promotion_service, '_get_github_service') as mock_gh_service, \
+             patch('app.services.promotion_service.ProviderRegistry') as mock_registry, \
+             patch.object(promotion_service, '_create_audit_log', new_callable=AsyncMock):
+            mock_db_service.check_onboarding_gate = AsyncMock(return_value=True)
+            mock_db_service.get_workflow_mappings = AsyncMock(return_value=[])
+            mock_gh_service.return_value.get_all_workflows_from_github = AsyncMock(return_value=source_workflows)
+
+            mock_adapter = MagicMock()
+            mock_adapter.get_workflows = AsyncMock(return_value=[])
+            mock_adapter.create_workflow = AsyncMock(return_value={"id": "created"})
+            mock_registry.get_adapter_for_environment.return_value = mock_adapter
+
+            result = await _execute(promotion_service, _selections(2, WorkflowChangeType.NEW))
+
+        mock_adapter.create_workflow.assert_awaited_once()
+        assert (result.workflows_promoted, result.workflows_skipped) == (1, 1)
+
+    @pytest.mark.unit
+    async def test_inventory_load_failure_falls_back_to_per_workflow_checks(self):
+        adapter = MagicMock()
+        adapter.get_workflows = AsyncMock(side_effect=Exception("n8n unavailable"))
+
+        assert await TargetWorkflowInventory.load(adapter) is None
+
+
+class TestParallelDeploys:
+    """Tests for bounded parallel deploys and rollback ordering."""
+
+    @pytest.mark.unit
+    async def test_deploys_run_in_parallel_up_to_limit(self, promotion_service):
+        promotion_service.db.get_environment = AsyncMock(side_effect=[_env("env-source"), _env("env-target")])
+        source_workflows = {f"wf-{i}": _workflow(i) for i in range(1, 7)}
+        in_flight = 0
+        peak = 0
+
+        async def update(workflow_id, workflow_data):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        with patch('app.services.promotion_service.db_service') as mock_db_service, \
+             patch.object(promotion_service, '_get_github_service') as mock_gh_service, \
+             patch('app.services.promotion_service.ProviderRegistry') as mock_registry, \
+             patch.object(promotion_service, '_create_audit_log', new_callable=AsyncMock), \
+             patch('app.services.promotion_service.settings.PROMOTION_DEPLOY_CONCURRENCY', 3):
+            mock_db_service.check_onboarding_gate = AsyncMock(return_value=True)
+            mock_db_service.get_workflow_mappings = AsyncMock(return_value=[])
+            mock_gh_service.return_value.get_all_workflows_from_github = AsyncMock(return_value=source_workflows)
+
+            mock_adapter = MagicMock()
+            mock_adapter.get_workflows = AsyncMock(return_value=[])
+            mock_adapter.update_workflow = AsyncMock(side_effect=update)
+            mock_registry.get_adapter_for_environment.return_value = mock_adapter
+
+            result = await _execute(promotion_service, _selections(6))
+
+        assert result.status == PromotionStatus.COMPLETED
+        assert result.workflows_promoted == 6
+        assert peak == 3
+
+    @pytest.mark.unit
+    async def test_failure_stops_new_deploys_and_rolls_back_in_selection_order(self, promotion_service):
+        promotion_service.db.get_environment = AsyncMock(side_effect=[_env("env-source"), _env("env-target")])
+        source_workflows = {f"wf-{i}": _workflow(i) for i in range(1, 7)}
+        attempted = []
+
+        async def update(workflow_id, workflow_data):
+            attempted.append(workflow_id)
+            # wf-1 finishes last; wf-2 fails while wf-1 and wf-3 are still in flight
+            await asyncio.sleep({"wf-1": 0.03, "wf-2": 0.01, "wf-3": 0.02}.get(workflow_id, 0))
+            if workflow_id == "wf-2":
+                raise Exception("Deployment failed")
+
+        with patch('app.services.promotion_service.db_service') as mock_db_service, \
+             patch.object(promotion_service, '_get_github_service') as mock_gh_service, \
+             patch('app.services.promotion_service.ProviderRegistry') as mock_registry, \
+             patch.object(promotion_service, 'rollback_promotion', new_callable=AsyncMock) as mock_rollback, \
+             patch.object(promotion_service, '_create_audit_log', new_callable=AsyncMock) as mock_audit, \
+             patch('app.services.promotion_service.settings.PROMOTION_DEPLOY_CONCURRENCY', 3):
+            mock_db_service.check_onboarding_gate = AsyncMock(return_value=True)
+            mock_gh_service.return_value.get_all_workflows_from_github = AsyncMock(return_value=source_workflows)
+
+            mock_adapter = MagicMock()
+            mock_adapter.get_workflows = AsyncMock(return_value=[])
+            mock_adapter.update_workflow = AsyncMock(side_effect=update)
+            mock_registry.get_adapter_for_environment.return_value = mock_adapter
+            mock_rollback.return_value = RollbackResult(
+                rollback_triggered=True, workflows_rolled_back=2, rollback_errors=[],
+                snapshot_id="snap-pre", rollback_method="git_restore", rollback_timestamp=datetime.utcnow(),
+            )
+
+            result = await _execute(promotion_service, _selections(6))
+
+        assert sorted(attempted) == ["wf-1", "wf-2", "wf-3"]
+        assert result.status == PromotionStatus.FAILED
+        assert (result.workflows_promoted, result.workflows_failed) == (2, 1)
+        assert mock_rollback.call_args.kwargs["promoted_workflow_ids"] == ["wf-1", "wf-3"]
+        assert mock_audit.call_args.kwargs["result"]["status"] == "failed_with_rollback"
+        # No Git state updates for a rolled-back promotion
+        mock_db_service.get_workflow_mappings.assert_not_called()
+
+
+class TestCanonicalSourceLoading:
+    """Tests for batched canonical source loading."""
+
+    @pytest.mark.unit
+    async def test_loads_git_state_and_contents_in_bulk(self, promotion_service):
+        canonicals = [{"canonical_id": "c1"}, {"canonical_id": "c2"}, {"canonical_id": "c3"}]
+        git_states = {
+            "c1": {"canonical_id": "c1", "git_path": "workflows/dev/c1.json", "git_commit_sha": "abc"},
+            "c2": {"canonical_id": "c2", "git_path": "workflows/dev/c2.json", "git_commit_sha": "abc"},
+            "c3": {"canonical_id": "c3", "git_path": "workflows/dev/c3.json", "git_commit_sha": None},
+        }
+        mappings = [
+            {"canonical_id": "c1", "n8n_workflow_id": "wf-1"},
+            {"canonical_id": "c1", "n8n_workflow_id": "wf-1-dup"},
+        ]
+        github = MagicMock()
+
+        async def get_files_content(paths, ref):
+            return {path: {"name": path, "_comment": "meta"} for path in paths}
+
+        github.get_files_content = AsyncMock(side_effect=get_files_content)
+
+        with patch('app.services.promotion_service.db_service') as mock_db_service, \
+             patch('app.services.canonical_workflow_service.CanonicalWorkflowService.list_canonical_workflows',
+                   new_callable=AsyncMock, return_value=canonicals), \
+             patch('app.services.canonical_workflow_service.CanonicalWorkflowService.list_canonical_workflow_git_states',
+                   new_callable=AsyncMock, return_value=git_states), \
+             patch('app.services.canonical_workflow_service.CanonicalWorkflowService.get_canonical_workflow_git_state',
+                   new_callable=AsyncMock) as per_workflow_state:
+            mock_db_service.get_workflow_mappings = AsyncMock(return_value=mappings)
+
+            workflows, loaded_mappings, loaded_states = await promotion_service._load_canonical_source_workflows(
+                TENANT_ID, "env-source", {"git_branch": "develop"}, github
+            )
+
+        per_workflow_state.assert_not_called()
+        mock_db_service.get_workflow_mappings.assert_awaited_once()
+        assert sorted(call.args[1] for call in github.get_files_content.await_args_list) == ["abc", "develop"]
+        assert set(workflows) == {"wf-1", "c2", "c3"}
+        assert workflows["wf-1"] == {"name": "workflows/dev/c1.json"}
+        assert loaded_mappings == mappings
+        assert loaded_states == git_states
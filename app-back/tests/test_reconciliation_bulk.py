@@ -0,0 +1,245 @@
+"""
+Unit tests for set-based environment pair reconciliation: inputs are loaded in
+bulk and only recomputed diff rows are written back.
+"""
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+
+from app.services.canonical_reconciliation_service import CanonicalReconciliationService
+
+
+TENANT_ID = "00000000-0000-0000-0000-000000000001"
+
+
+def _git_states(**hashes):
+    return {cid: {"canonical_id": cid, "git_content_hash": h} for cid, h in hashes.items()}
+
+
+def _mappings(**hashes):
+    return {cid: {"canonical_id": cid, "env_content_hash": h} for cid, h in hashes.items()}
+
+
+@pytest.fixture
+def reconcile():
+    """Run reconcile_environment_pair against in-memory inputs; yields the mocked db_service."""
+    CanonicalReconciliationService._pending_reconciliations.clear()
+    with patch('app.services.canonical_reconciliation_service.db_service') as mock_db, \
+         patch('app.services.canonical_reconciliation_service.CanonicalWorkflowService') as mock_cws:
+        mock_db.bulk_upsert_workflow_diff_states = AsyncMock(
+            side_effect=lambda rows: {"rows": rows, "failed": []}
+        )
+        mock_db.delete_workflow_diff_states = AsyncMock()
+
+        async def run(canonical_ids, git_states, mappings, existing, force=False):
+            mock_cws.list_canonical_workflow_git_states = AsyncMock(
+                side_effect=lambda tenant_id, env_id: git_states[env_id]
+            )
+            with patch.object(
+                CanonicalReconciliationService, '_get_canonical_workflows',
+                new_callable=AsyncMock, return_value=[{"canonical_id": cid} for cid in canonical_ids],
+            ), patch.object(
+                CanonicalReconciliationService, '_get_workflow_mappings',
+                new_callable=AsyncMock, side_effect=lambda tenant_id, env_id: mappings[env_id],
+            ), patch.object(
+                CanonicalReconciliationService, '_get_existing_diffs',
+                new_callable=AsyncMock, return_value=existing,
+            ) as get_existing:
+                result = await CanonicalReconciliationService.reconcile_environment_pair(
+                    TENANT_ID, "env-dev", "env-prod", force=force
+                )
+            get_existing.assert_awaited_once()
+            return result
+
+        mock_db.run = run
+        yield mock_db
+    CanonicalReconciliationService._pending_reconciliations.clear()
+
+
+class TestReconcileEnvironmentPair:
+    """Tests for bulk loading and change-only write-back."""
+
+    @pytest.mark.unit
+    async def test_inputs_loaded_once_per_environment(self, reconcile):
+        git_states = {"env-dev": _git_states(c1="a", c2="b"), "env-prod": _git_states(c1="a", c2="x")}
+        mappings = {"env-dev": _mappings(c1="a", c2="b"), "env-prod": _mappings(c1="a", c2="x")}
+
+        with patch('app.services.canonical_reconciliation_service.CanonicalWorkflowService') as mock_cws:
+            mock_cws.list_canonical_workflow_git_states = AsyncMock(
+                side_effect=lambda tenant_id, env_id: git_states[env_id]
+            )
+            with patch.object(
+                CanonicalReconciliationService, '_get_canonical_workflows',
+                new_callable=AsyncMock, return_value=[{"canonical_id": "c1"}, {"canonical_id": "c2"}],
+            ), patch.object(
+                CanonicalReconciliationService, '_get_workflow_mappings',
+                new_callable=AsyncMock, side_effect=lambda tenant_id, env_id: mappings[env_id],
+            ) as get_mappings, patch.object(
+                CanonicalReconciliationService, '_get_existing_diffs',
+                new_callable=AsyncMock, return_value={},
+            ):
+                result = await CanonicalReconciliationService.reconcile_environment_pair(
+                    TENANT_ID, "env-dev", "env-prod"
+                )
+
+        assert mock_cws.list_canonical_workflow_git_states.await_count == 2
+        mock_cws.get_canonical_workflow_git_state.assert_not_called()
+        assert get_mappings.await_count == 2
+        reconcile.bulk_upsert_workflow_diff_states.assert_awaited_once()
+        rows = reconcile.bulk_upsert_workflow_diff_states.await_args.args[0]
+        assert {row["canonical_id"]: row["diff_status"] for row in rows} == {"c1": "unchanged", "c2": "modified"}
+        assert result["diffs_computed"] == result["diffs_updated"] == 2
+
+    @pytest.mark.unit
+    async def test_only_changed_rows_are_written(self, reconcile):
+        existing = {
+            "c1": {"canonical_id": "c1", "source_git_hash": "a", "target_git_hash": "a",
+                   "source_env_hash": "a", "target_env_hash": "a"},
+            "c2": {"canonical_id": "c2", "source_git_hash": "b", "target_git_hash": "b",
+                   "source_env_hash": "b", "target_env_hash": "b"},
+        }
+
+        result = await reconcile.run(
+            ["c1", "c2"],
+            {"env-dev": _git_states(c1="a", c2="b2"), "env-prod": _git_states(c1="a", c2="b")},
+            {"env-dev": _mappings(c1="a", c2="b2"), "env-prod": _mappings(c1="a", c2="b")},
+            existing,
+        )
+
+        rows = reconcile.bulk_upsert_workflow_diff_states.await_args.args[0]
+        assert [row["canonical_id"] for row in rows] == ["c2"]
+        assert rows[0]["source_git_hash"] == "b2"
+        assert (result["diffs_computed"], result["diffs_unchanged"]) == (1, 1)
+        reconcile.delete_workflow_diff_states.assert_not_called()
+
+    @pytest.mark.unit
+    async def test_no_write_when_nothing_changed(self, reconcile):
+        existing = {"c1": {"canonical_id": "c1", "source_git_hash": "a", "target_git_hash": "a",
+                           "source_env_hash": "a", "target_env_hash": "a"}}
+
+        result = await reconcile.run(
+            ["c1"],
+            {"env-dev": _git_states(c1="a"), "env-prod": _git_states(c1="a")},
+            {"env-dev": _mappings(c1="a"), "env-prod": _mappings(c1="a")},
+            existing,
+        )
+
+        reconcile.bulk_upsert_workflow_diff_states.assert_not_called()
+        assert result["diffs_unchanged"] == 1
+
+    @pytest.mark.unit
+    async def test_force_rewrites_every_row(self, reconcile):
+        existing = {"c1": {"canonical_id": "c1", "source_git_hash": "a", "target_git_hash": "a",
+                           "source_env_hash": "a", "target_env_hash": "a"}}
+
+        result = await reconcile.run(
+            ["c1"],
+            {"env-dev": _git_states(c1="a"), "env-prod": _git_states(c1="a")},
+            {"env-dev": _mappings(c1="a"), "env-prod": _mappings(c1="a")},
+            existing,
+            force=True,
+        )
+
+        assert len(reconcile.bulk_upsert_workflow_diff_states.await_args.args[0]) == 1
+        assert result["diffs_unchanged"] == 0
+
+    @pytest.mark.unit
+    async def test_stale_rows_deleted_in_one_call(self, reconcile):
+        existing = {cid: {"canonical_id": cid} for cid in ["c1", "gone-2", "gone-1"]}
+
+        await reconcile.run(
+            ["c1"],
+            {"env-dev": _git_states(c1="a"), "env-prod": {}},
+            {"env-dev": {}, "env-prod": {}},
+            existing,
+        )
+
+        reconcile.delete_workflow_diff_states.assert_awaited_once_with(
+            TENANT_ID, "env-dev", "env-prod", ["gone-1", "gone-2"]
+        )
+
+    @pytest.mark.unit
+    async def test_conflict_rows_carry_metadata(self, reconcile):
+        result = await reconcile.run(
+            ["c1", "c2"],
+            {"env-dev": _git_states(c1="a", c2="b"), "env-prod": _git_states(c1="a2", c2="b")},
+            {"env-dev": _mappings(c1="drift", c2="b"), "env-prod": _mappings(c1="a2", c2="b")},
+            {},
+        )
+
+        rows = {row["canonical_id"]: row for row in reconcile.bulk_upsert_workflow_diff_states.await_args.args[0]}
+        assert rows["c1"]["diff_status"] == "conflict"
+        assert rows["c1"]["conflict_metadata"]["source_env_hash"] == "drift"
+        assert "conflict_metadata" not in rows["c2"]
+
+    @pytest.mark.unit
+    async def test_failed_rows_reported_as_errors(self, reconcile):
+        reconcile.bulk_upsert_workflow_diff_states = AsyncMock(return_value={
+            "rows": [], "failed": [{"key": "c1", "error": "constraint violation"}],
+        })
+
+        result = await reconcile.run(
+            ["c1", "c2"],
+            {"env-dev": _git_states(c1="a", c2="b"), "env-prod": _git_states(c1="a", c2="b")},
+            {"env-dev": {}, "env-prod": {}},
+            {},
+        )
+
+        assert result["diffs_computed"] == 1
+        assert result["errors"] == ["Error computing diff for c1: constraint violation"]
+
+
+class TestGetWorkflowMappings:
+    """Tests for the per-environment mapping loader."""
+
+    @pytest.mark.unit
+    async def test_ambiguous_mappings_treated_as_unmapped(self):
+        rows = [
+            {"canonical_id": "c1", "env_content_hash": "a"},
+            {"canonical_id": "c2", "env_content_hash": "b"},
+            {"canonical_id": "c2", "env_content_hash": "b-dup"},
+        ]
+        with patch('app.services.canonical_reconciliation_service.db_service') as mock_db:
+            mock_db._select_all = AsyncMock(return_value=rows)
+
+            mappings = await CanonicalReconciliationService._get_workflow_mappings(TENANT_ID, "env-dev")
+            mock_db._select_all.await_args.args[0]()
+
+        mock_db.client.table.return_value.select.assert_called_once_with("canonical_id, env_content_hash")
+        assert mappings == {"c1": rows[0]}
+
+    @pytest.mark.unit
+    async def test_read_errors_propagate(self):
+        with patch('app.services.canonical_reconciliation_service.db_service') as mock_db:
+            mock_db._select_all = AsyncMock(side_effect=Exception("connection reset"))
+
+            with pytest.raises(Exception, match="connection reset"):
+                await CanonicalReconciliationService._get_workflow_mappings(TENANT_ID, "env-dev")
+            with pytest.raises(Exception, match="connection reset"):
+                await CanonicalReconciliationService._get_existing_diffs(TENANT_ID, "env-dev", "env-prod")
+
+
+class TestReconcileLoadFailure:
+    """A failed bulk read must abort the pair instead of writing diffs from partial inputs."""
+
+    @pytest.mark.unit
+    async def test_failed_load_writes_nothing(self):
+        CanonicalReconciliationService._pending_reconciliations.clear()
+        with patch('app.services.canonical_reconciliation_service.db_service') as mock_db, \
+             patch('app.services.canonical_reconciliation_service.CanonicalWorkflowService') as mock_cws:
+            mock_db.bulk_upsert_workflow_diff_states = AsyncMock()
+            mock_db.delete_workflow_diff_states = AsyncMock()
+            mock_cws.list_canonical_workflow_git_states = AsyncMock(side_effect=Exception("timeout"))
+            with patch.object(
+                CanonicalReconciliationService, '_get_canonical_workflows',
+                new_callable=AsyncMock, return_value=[{"canonical_id": "c1"}],
+            ), patch.object(
+                CanonicalReconciliationService, '_get_workflow_mappings', new_callable=AsyncMock, return_value={},
+            ), patch.object(
+                CanonicalReconciliationService, '_get_existing_diffs', new_callable=AsyncMock, return_value={},
+            ):
+                with pytest.raises(Exception, match="timeout"):
+                    await CanonicalReconciliationService.reconcile_environment_pair(TENANT_ID, "env-dev", "env-prod")
+
+        mock_db.bulk_upsert_workflow_diff_states.assert_not_awaited()
+        mock_db.delete_workflow_diff_states.assert_not_awaited()
+        CanonicalReconciliationService._pending_reconciliations.clear()
@@ -0,0 +1,330 @@
+"""
+Unit tests for the lease-sharded scheduler runtime.
+"""
+import asyncio
+from collections import Counter
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.scheduler_runtime import (
+    DatabaseLeaseStore,
+    LocalLeaseStore,
+    ScheduledJob,
+    SchedulerRuntime,
+    ShardContext,
+    lease_key,
+    preferred_owner,
+    shard_for,
+)
+
+
+SHARDS = 8
+TTL = 0.3
+
+
+def _runtime(store: LocalLeaseStore, worker_id: str) -> SchedulerRuntime:
+    return SchedulerRuntime(
+        store=store,
+        shard_count=SHARDS,
+        concurrency=2,
+        lease_ttl_seconds=TTL,
+        worker_id=worker_id,
+    )
+
+
+def _recording_job(name: str, runs: list, sharded: bool = True, interval: float = 0.05) -> ScheduledJob:
+    async def run(ctx: ShardContext) -> int:
+        runs.append(ctx.shards)
+        return len(ctx.shards)
+
+    return ScheduledJob(name=name, interval_seconds=interval, run=run, sharded=sharded)
+
+
+@pytest.fixture
+async def two_workers():
+    """Two runtimes sharing a lease store, like two API workers sharing the database."""
+    store = LocalLeaseStore()
+    worker_a, worker_b = _runtime(store, "worker-a"), _runtime(store, "worker-b")
+    yield worker_a, worker_b
+    await worker_a.stop()
+    await worker_b.stop()
+
+
+class TestSharding:
+    """Tests for key-to-shard and shard-to-worker assignment."""
+
+    @pytest.mark.unit
+    def test_shard_for_is_stable_and_in_range(self):
+        shards = [shard_for(f"env-{i}", SHARDS) for i in range(200)]
+
+        assert shards == [shard_for(f"env-{i}", SHARDS) for i in range(200)]
+        assert set(shards) == set(range(SHARDS))
+
+    @pytest.mark.unit
+    def test_preferred_owner_ignores_worker_order(self):
+        workers = ["worker-a", "worker-b", "worker-c"]
+
+        for shard in range(SHARDS):
+            key = lease_key("job", shard)
+            assert preferred_owner(key, workers) == preferred_owner(key, list(reversed(workers)))
+
+    @pytest.mark.unit
+    def test_removing_a_worker_only_moves_its_shards(self):
+        workers = ["worker-a", "worker-b", "worker-c"]
+        keys = [lease_key("job", shard) for shard in range(64)]
+        before = {key: preferred_owner(key, workers) for key in keys}
+        after = {key: preferred_owner(key, ["worker-a", "worker-b"]) for key in keys}
+
+        for key in keys:
+            if before[key] != "worker-c":
+                assert after[key] == before[key]
+
+    @pytest.mark.unit
+    def test_preferred_owner_without_workers(self):
+        assert preferred_owner("job:0", []) is None
+
+    @pytest.mark.unit
+    def test_context_owns_only_its_shards(self):
+        ctx = ShardContext(job_name="job", shard_count=SHARDS, shards=frozenset({0, 1}), concurrency=1)
+        keys = [f"env-{i}" for i in range(50)]
+
+        owned = [key for key in keys if ctx.owns(key)]
+
+        assert owned == [key for key in keys if shard_for(key, SHARDS) in (0, 1)]
+
+
+class TestRunEach:
+    """Tests for bounded-concurrency processing within a run."""
+
+    @pytest.mark.unit
+    async def test_limits_concurrency(self):
+        ctx = ShardContext(job_name="job", shard_count=1, shards=frozenset({0}), concurrency=3)
+        in_flight = 0
+        peak = 0
+
+        async def handler(item):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        assert await ctx.run_each(range(10), handler) == 10
+        assert peak == 3
+
+    @pytest.mark.unit
+    async def test_failed_item_does_not_stop_others(self):
+        ctx = ShardContext(job_name="job", shard_count=1, shards=frozenset({0}), concurrency=2)
+        done = []
+
+        async def handler(item):
+            if item == 2:
+                raise RuntimeError("boom")
+            done.append(item)
+
+        await ctx.run_each(range(5), handler)
+
+        assert sorted(done) == [0, 1, 3, 4]
+
+
+class TestSchedulerRuntime:
+    """Tests for running jobs across workers."""
+
+    @pytest.mark.unit
+    async def test_single_worker_runs_every_shard(self):
+        runtime = _runtime(LocalLeaseStore(), "worker-a")
+        runs = []
+        runtime.start_job(_recording_job("job", runs))
+        try:
+            await asyncio.sleep(0.2)
+        finally:
+            await runtime.stop()
+
+        assert runs
+        assert runs[-1] == frozenset(range(SHARDS))
+
+    @pytest.mark.unit
+    async def test_shards_split_between_workers(self, two_workers):
+        worker_a, worker_b = two_workers
+        runs_a, runs_b = [], []
+        worker_a.start_job(_recording_job("job", runs_a))
+        worker_b.start_job(_recording_job("job", runs_b))
+
+        # Let both workers see each other and settle lease ownership
+        await asyncio.sleep(TTL * 3)
+        runs_a.clear()
+        runs_b.clear()
+        await asyncio.sleep(0.2)
+
+        assert runs_a and runs_b
+        shards_a, shards_b = runs_a[-1], runs_b[-1]
+        assert shards_a and shards_b
+        assert not shards_a & shards_b
+        assert shards_a | shards_b == frozenset(range(SHARDS))
+
+    @pytest.mark.unit
+    async def test_singleton_job_runs_on_one_worker(self, two_workers):
+        worker_a, worker_b = two_workers
+        runs_a, runs_b = [], []
+        worker_a.start_job(_recording_job("rollups", runs_a, sharded=False))
+        worker_b.start_job(_recording_job("rollups", runs_b, sharded=False))
+
+        await asyncio.sleep(TTL * 3)
+        runs_a.clear()
+        runs_b.clear()
+        await asyncio.sleep(0.2)
+
+        assert bool(runs_a) != bool(runs_b)
+
+    @pytest.mark.unit
+    async def test_shard_never_runs_on_two_workers_at_once(self, two_workers):
+        worker_a, worker_b = two_workers
+        running = Counter()
+        overlaps = []
+
+        async def run(ctx: ShardContext) -> int:
+            for shard in ctx.shards:
+                running[shard] += 1
+                if running[shard] > 1:
+                    overlaps.append(shard)
+            await asyncio.sleep(0.02)
+            for shard in ctx.shards:
+                running[shard] -= 1
+            return 0
+
+        for worker in (worker_a, worker_b):
+            worker.start_job(ScheduledJob(name="job", interval_seconds=0.01, run=run, sharded=True))
+        await asyncio.sleep(TTL * 4)
+
+        assert overlaps == []
+
+    @pytest.mark.unit
+    async def test_remaining_worker_takes_over_after_stop(self, two_workers):
+        worker_a, worker_b = two_workers
+        runs_a, runs_b = [], []
+        worker_a.start_job(_recording_job("job", runs_a))
+        worker_b.start_job(_recording_job("job", runs_b))
+        await asyncio.sleep(TTL * 3)
+
+        await worker_b.stop_job("job")
+        assert not worker_b.is_running("job")
+        await asyncio.sleep(TTL * 2)
+        runs_a.clear()
+        await asyncio.sleep(0.2)
+
+        assert runs_a
+        assert frozenset().union(*runs_a) == frozenset(range(SHARDS))
+
+    @pytest.mark.unit
+    async def test_taken_over_shard_keeps_previous_schedule(self, two_workers):
+        """A new owner must not re-run a shard before its interval has passed."""
+        worker_a, worker_b = two_workers
+        runs_a, runs_b = [], []
+        worker_b.start_job(_recording_job("retention", runs_b, sharded=False, interval=60))
+        await asyncio.sleep(TTL)
+        assert runs_b
+
+        await worker_b.stop_job("retention")
+        worker_a.start_job(_recording_job("retention", runs_a, sharded=False, interval=60))
+        await asyncio.sleep(TTL * 2)
+
+        assert worker_a.get_metrics()["jobs"]["retention"]["owned_shards"] == 1
+        assert runs_a == []
+
+    @pytest.mark.unit
+    async def test_new_shard_runs_straight_away(self):
+        runtime = _runtime(LocalLeaseStore(), "worker-a")
+        runs = []
+        runtime.start_job(_recording_job("retention", runs, sharded=False, interval=60))
+        try:
+            await asyncio.sleep(TTL)
+        finally:
+            await runtime.stop()
+
+        assert runs == [frozenset({0})]
+
+    @pytest.mark.unit
+    async def test_start_job_twice_is_noop(self):
+        runtime = _runtime(LocalLeaseStore(), "worker-a")
+        runs = []
+        runtime.start_job(_recording_job("job", runs))
+        runtime.start_job(_recording_job("job", runs))
+        try:
+            assert len(runtime.get_metrics()["jobs"]) == 1
+        finally:
+            await runtime.stop()
+
+    @pytest.mark.unit
+    async def test_failed_run_counted_and_job_keeps_running(self):
+        runtime = _runtime(LocalLeaseStore(), "worker-a")
+        attempts = 0
+
+        async def run(ctx: ShardContext) -> None:
+            nonlocal attempts
+            attempts += 1
+            raise RuntimeError("boom")
+
+        runtime.start_job(ScheduledJob(name="job", interval_seconds=0.02, run=run))
+        try:
+            await asyncio.sleep(0.2)
+            metrics = runtime.get_metrics()["jobs"]["job"]
+        finally:
+            await runtime.stop()
+
+        assert attempts >= 2
+        assert metrics["failures"] == metrics["runs"]
+
+    @pytest.mark.unit
+    async def test_metrics(self):
+        runtime = _runtime(LocalLeaseStore(), "worker-a")
+        runtime.start_job(_recording_job("job", [], interval=0.05))
+        try:
+            await asyncio.sleep(0.2)
+            metrics = runtime.get_metrics()
+        finally:
+            await runtime.stop()
+
+        job = metrics["jobs"]["job"]
+        assert metrics["backend"] == "local"
+        assert metrics["worker_id"] == "worker-a"
+        assert metrics["live_workers"] == 1
+        assert metrics["held_leases"] == SHARDS
+        assert job["owned_shards"] == SHARDS
+        assert job["runs"] >= 1
+        assert job["items_processed"] == SHARDS
+        assert job["lag_seconds"] >= 0
+        assert job["last_finished_at"] is not None
+
+    @pytest.mark.unit
+    async def test_stop_releases_leases(self):
+        store = LocalLeaseStore()
+        runtime = _runtime(store, "worker-a")
+        runtime.start_job(_recording_job("job", []))
+        await asyncio.sleep(0.05)
+
+        await runtime.stop()
+
+        assert await store.heartbeat("worker-b", TTL) == ["worker-b"]
+        held = await store.claim("worker-b", [lease_key("job", 0)], TTL)
+        assert set(held) == {lease_key("job", 0)}
+
+
+class TestDatabaseLeaseStore:
+    """Tests for the RPC-backed lease store."""
+
+    @pytest.mark.unit
+    async def test_rpcs_run_off_the_event_loop(self):
+        with patch("app.services.scheduler_runtime.db_service") as mock_db:
+            mock_db._execute = AsyncMock(return_value=MagicMock(data=[
+                {"held_key": "job:0", "seconds_since_run": 12.5},
+                {"held_key": "job:1", "seconds_since_run": None},
+            ]))
+
+            held = await DatabaseLeaseStore().claim("worker-a", ["job:0", "job:1"], TTL)
+            await DatabaseLeaseStore().record_runs("worker-a", ["job:0"])
+
+        assert held == {"job:0": 12.5, "job:1": None}
+        assert mock_db._execute.await_count == 2
+        mock_db.client.rpc.assert_called_with("record_scheduler_runs", {"p_owner": "worker-a", "p_keys": ["job:0"]})
+        mock_db.client.rpc.return_value.execute.assert_not_called()
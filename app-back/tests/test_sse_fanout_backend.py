@@ -0,0 +1,240 @@
+"""
+Unit tests for cross-worker SSE fan-out.
+"""
+import asyncio
+import json
+import socket
+
+import pytest
+from unittest.mock import patch
+
+from app.services.sse_fanout_backend import (
+    LoopbackFanoutBackend,
+    LoopbackFanoutBus,
+    PostgresNotifyFanoutBackend,
+    decode_batch,
+    encode_batches,
+)
+from app.services.sse_pubsub_service import SSEEvent, SSEPubSubService
+
+
+def _drain(service: SSEPubSubService, subscription_id: str) -> list[SSEEvent]:
+    queue = service._subscriptions[subscription_id].queue
+    events = []
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    return events
+
+
+@pytest.fixture
+async def two_workers():
+    """Two pub/sub services sharing a loopback bus, like two API workers."""
+    bus = LoopbackFanoutBus()
+    worker_a, worker_b = SSEPubSubService(), SSEPubSubService()
+    await worker_a.start_fanout(LoopbackFanoutBackend(bus))
+    await worker_b.start_fanout(LoopbackFanoutBackend(bus))
+    with patch("app.services.sse_pubsub_service.settings.SSE_FANOUT_FLUSH_INTERVAL_MS", 1):
+        yield worker_a, worker_b
+    await worker_a.stop_fanout()
+    await worker_b.stop_fanout()
+
+
+async def _settle():
+    # One flush window plus the loopback delivery callback
+    await asyncio.sleep(0.02)
+
+
+class TestWireFormat:
+    """Tests for batch encoding."""
+
+    @pytest.mark.unit
+    def test_round_trip(self):
+        event = SSEEvent(type="sync.progress", tenant_id="t-1", payload={"job_id": "j-1"}, env_id="env-1")
+
+        [message] = encode_batches("worker-a", [event])
+        origin, [decoded] = decode_batch(message)
+
+        assert origin == "worker-a"
+        assert decoded == event
+
+    @pytest.mark.unit
+    def test_splits_batches_to_fit_payload_limit(self):
+        events = [SSEEvent(type="deployment.upsert", tenant_id="t-1", payload={"pad": "x" * 100}) for _ in range(10)]
+
+        messages = encode_batches("worker-a", events, max_bytes=600)
+
+        assert len(messages) > 1
+        assert all(len(m.encode()) <= 600 for m in messages)
+        assert sum(len(json.loads(m)["events"]) for m in messages) == 10
+
+    @pytest.mark.unit
+    def test_drops_single_oversized_event(self):
+        events = [
+            SSEEvent(type="deployment.upsert", tenant_id="t-1", payload={"pad": "x" * 1000}),
+            SSEEvent(type="counts.update", tenant_id="t-1", payload={}),
+        ]
+
+        messages = encode_batches("worker-a", events, max_bytes=600)
+
+        assert [e.type for m in messages for e in decode_batch(m)[1]] == ["counts.update"]
+
+
+class TestCrossWorkerFanout:
+    """Tests for relaying events between pub/sub services."""
+
+    @pytest.mark.unit
+    async def test_event_reaches_subscriber_on_other_worker(self, two_workers):
+        worker_a, worker_b = two_workers
+        sub_a = await worker_a.subscribe("t-1", "background_jobs_list")
+        sub_b = await worker_b.subscribe("t-1", "background_jobs_list")
+
+        await worker_a.publish(SSEEvent(type="sync.progress", tenant_id="t-1", payload={"job_id": "j-1"}))
+        await _settle()
+
+        # Local subscriber gets it immediately and exactly once (own echo is ignored)
+        assert len(_drain(worker_a, sub_a)) == 1
+        assert len(_drain(worker_b, sub_b)) == 1
+        assert worker_b.get_metrics()["fanout_received"] == 1
+
+    @pytest.mark.unit
+    async def test_progress_events_coalesced_per_deployment(self, two_workers):
+        worker_a, worker_b = two_workers
+        sub_b = await worker_b.subscribe("t-1", "deployments_list")
+
+        for step in range(5):
+            await worker_a.publish(SSEEvent(
+                type="deployment.progress", tenant_id="t-1", deployment_id="dep-1", payload={"step": step}
+            ))
+        await worker_a.publish(SSEEvent(
+            type="deployment.progress", tenant_id="t-1", deployment_id="dep-2", payload={"step": 0}
+        ))
+        await worker_a.publish(SSEEvent(type="deployment.upsert", tenant_id="t-1", payload={}))
+        await _settle()
+
+        received = _drain(worker_b, sub_b)
+        assert [(e.type, e.deployment_id, e.payload.get("step")) for e in received] == [
+            ("deployment.progress", "dep-1", 4),
+            ("deployment.progress", "dep-2", 0),
+            ("deployment.upsert", None, None),
+        ]
+        assert worker_a.get_metrics()["fanout_coalesced"] == 4
+
+    @pytest.mark.unit
+    async def test_stop_flushes_pending_events(self):
+        bus = LoopbackFanoutBus()
+        worker_a, worker_b = SSEPubSubService(), SSEPubSubService()
+        await worker_a.start_fanout(LoopbackFanoutBackend(bus))
+        await worker_b.start_fanout(LoopbackFanoutBackend(bus))
+        sub_b = await worker_b.subscribe("t-1", "deployments_list")
+
+        await worker_a.publish(SSEEvent(type="deployment.upsert", tenant_id="t-1", payload={}))
+        await worker_a.stop_fanout()
+        await asyncio.sleep(0)
+
+        assert len(_drain(worker_b, sub_b)) == 1
+        await worker_b.stop_fanout()
+
+
+class _FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append(sql)
+
+
+class _FakeConnection:
+    """Stands in for a psycopg2 connection; readiness is driven through a socketpair."""
+
+    def __init__(self):
+        self._reader, self._writer = socket.socketpair()
+        self.notifies = []
+        self.executed = []
+        self.closed = 0
+        self.fail_poll = False
+
+    def fileno(self):
+        return self._reader.fileno()
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+    def poll(self):
+        self._reader.recv(1024)
+        if self.fail_poll:
+            raise ConnectionError("server closed the connection unexpectedly")
+
+    def wake(self):
+        self._writer.send(b"x")
+
+    def close(self):
+        if not self.closed:
+            self.closed = 1
+            self._reader.close()
+            self._writer.close()
+
+
+class TestPostgresFanoutReconnect:
+    """Listener connection loss on the Postgres backend."""
+
+    @pytest.mark.unit
+    async def test_listener_reconnects_after_poll_failure(self):
+        connections = []
+
+        def connect():
+            conn = _FakeConnection()
+            connections.append(conn)
+            return conn
+
+        received = []
+        backend = PostgresNotifyFanoutBackend("postgresql://unused", "sse_events")
+        with patch.object(backend, "_connect", side_effect=connect), \
+             patch("app.services.sse_fanout_backend.settings.SSE_FANOUT_RECONNECT_INITIAL_SECONDS", 0.05):
+            await backend.start(lambda origin, events: received.append((origin, events)))
+            listener = backend._listen_conn
+
+            listener.fail_poll = True
+            listener.wake()
+            await asyncio.sleep(0.005)
+            assert backend.get_status()["connected"] is False
+            assert "closed the connection" in backend.get_status()["last_error"]
+
+            await asyncio.sleep(0.1)
+            status = backend.get_status()
+            assert status["connected"] is True
+            assert status["reconnects"] == 1
+            new_listener = backend._listen_conn
+            assert new_listener is not listener
+            assert new_listener.executed == ["LISTEN sse_events"]
+
+            message = encode_batches("worker-x", [SSEEvent(type="deployment.upsert", tenant_id="t-1", payload={})])[0]
+            new_listener.notifies.append(type("Notify", (), {"payload": message})())
+            new_listener.wake()
+            await asyncio.sleep(0.01)
+            assert [origin for origin, _ in received] == ["worker-x"]
+
+            await backend.stop()
+
+        assert all(conn.closed for conn in connections)
+
+    @pytest.mark.unit
+    async def test_dead_listener_reported_in_metrics(self):
+        backend = PostgresNotifyFanoutBackend("postgresql://unused", "sse_events")
+        service = SSEPubSubService()
+        with patch.object(backend, "_connect", side_effect=_FakeConnection), \
+             patch("app.services.sse_fanout_backend.settings.SSE_FANOUT_RECONNECT_INITIAL_SECONDS", 60):
+            await service.start_fanout(backend)
+            assert service.get_metrics()["fanout_status"]["connected"] is True
+
+            backend._listen_conn.fail_poll = True
+            backend._listen_conn.wake()
+            await asyncio.sleep(0.01)
+
+            assert service.get_metrics()["fanout_status"]["connected"] is False
+            await service.stop_fanout()
@@ -0,0 +1,142 @@
+"""
+Unit tests for SSE pub/sub routing.
+"""
+import pytest
+
+from app.services.sse_pubsub_service import SSEEvent, SSEPubSubService, parse_scope
+
+
+def _drain(service: SSEPubSubService, subscription_id: str) -> list[SSEEvent]:
+    queue = service._subscriptions[subscription_id].queue
+    events = []
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    return events
+
+
+class TestParseScope:
+    """Tests for scope string parsing."""
+
+    @pytest.mark.unit
+    def test_parses_list_and_keyed_scopes(self):
+        assert parse_scope("deployments_list") == ("deployments_list", None)
+        assert parse_scope("deployment_detail:dep-1") == ("deployment_detail", "dep-1")
+        assert parse_scope("background_jobs_env:env-1") == ("background_jobs_env", "env-1")
+        assert parse_scope("background_jobs_job:job:with:colons") == ("background_jobs_job", "job:with:colons")
+
+    @pytest.mark.unit
+    def test_unknown_scopes_are_unroutable(self):
+        assert parse_scope("something_else") is None
+        assert parse_scope("unknown:123") is None
+
+
+class TestPublishRouting:
+    """Tests that publish reaches exactly the matching subscribers."""
+
+    @pytest.mark.unit
+    async def test_tenant_isolation(self):
+        service = SSEPubSubService()
+        mine = await service.subscribe("t-1", "deployments_list")
+        theirs = await service.subscribe("t-2", "deployments_list")
+
+        await service.publish(SSEEvent(type="deployment.upsert", tenant_id="t-1", payload={}))
+
+        assert len(_drain(service, mine)) == 1
+        assert _drain(service, theirs) == []
+
+    @pytest.mark.unit
+    async def test_deployment_detail_routing(self):
+        service = SSEPubSubService()
+        listing = await service.subscribe("t-1", "deployments_list")
+        detail_a = await service.subscribe("t-1", "deployment_detail:dep-a")
+        detail_b = await service.subscribe("t-1", "deployment_detail:dep-b")
+
+        await service.publish(SSEEvent(type="deployment.progress", tenant_id="t-1", payload={}, deployment_id="dep-a"))
+        await service.publish(SSEEvent(type="counts.update", tenant_id="t-1", payload={}))
+
+        assert [e.type for e in _drain(service, listing)] == ["deployment.progress", "counts.update"]
+        assert [e.type for e in _drain(service, detail_a)] == ["deployment.progress", "counts.update"]
+        assert [e.type for e in _drain(service, detail_b)] == ["counts.update"]
+
+    @pytest.mark.unit
+    async def test_background_job_routing(self):
+        service = SSEPubSubService()
+        listing = await service.subscribe("t-1", "background_jobs_list")
+        env_1 = await service.subscribe("t-1", "background_jobs_env:env-1")
+        env_2 = await service.subscribe("t-1", "background_jobs_env:env-2")
+        job = await service.subscribe("t-1", "background_jobs_job:job-1")
+        deployments = await service.subscribe("t-1", "deployments_list")
+
+        await service.publish(SSEEvent(type="sync.progress", tenant_id="t-1", env_id="env-1", payload={"job_id": "job-1"}))
+        await service.publish(SSEEvent(type="backup.progress", tenant_id="t-1", env_id="env-2", payload={}))
+
+        assert len(_drain(service, listing)) == 2
+        assert [e.type for e in _drain(service, env_1)] == ["sync.progress"]
+        assert [e.type for e in _drain(service, env_2)] == ["backup.progress"]
+        assert [e.type for e in _drain(service, job)] == ["sync.progress"]
+        assert _drain(service, deployments) == []
+
+    @pytest.mark.unit
+    async def test_unsubscribe_removes_from_index(self):
+        service = SSEPubSubService()
+        sub = await service.subscribe("t-1", "deployment_detail:dep-a")
+
+        await service.unsubscribe(sub)
+        await service.publish(SSEEvent(type="deployment.progress", tenant_id="t-1", payload={}, deployment_id="dep-a"))
+
+        assert service._routes == {}
+        assert service.get_metrics()["events_unrouted"] == 1
+
+
+class TestPublishMetrics:
+    """Tests for fan-out and drop counters."""
+
+    @pytest.mark.unit
+    async def test_counts_fanout_and_drops(self):
+        service = SSEPubSubService()
+        first = await service.subscribe("t-1", "deployments_list")
+        await service.subscribe("t-1", "deployments_list")
+        service._subscriptions[first].queue = type(service._subscriptions[first].queue)(maxsize=1)
+
+        await service.publish(SSEEvent(type="deployment.upsert", tenant_id="t-1", payload={}))
+        await service.publish(SSEEvent(type="deployment.upsert", tenant_id="t-1", payload={"n": 2}))
+
+        metrics = service.get_metrics()
+        assert metrics["events_published"] == 2
+        assert metrics["deliveries"] == 4
+        assert metrics["max_fanout"] == 2
+        assert metrics["events_dropped"] == 1
+        assert _drain(service, first)[0].payload == {"n": 2}
+
+
+class TestNextBatch:
+    """Tests for batched, blocking event reads."""
+
+    @pytest.mark.unit
+    async def test_drains_queued_events_in_one_batch(self):
+        service = SSEPubSubService()
+        sub = await service.subscribe("t-1", "deployments_list")
+        for i in range(3):
+            await service.publish(SSEEvent(type="deployment.upsert", tenant_id="t-1", payload={"i": i}))
+
+        batch = await service.next_batch(sub, timeout=1)
+
+        assert [e.payload["i"] for e in batch] == [0, 1, 2]
+
+    @pytest.mark.unit
+    async def test_respects_max_events(self):
+        service = SSEPubSubService()
+        sub = await service.subscribe("t-1", "deployments_list")
+        for i in range(5):
+            await service.publish(SSEEvent(type="deployment.upsert", tenant_id="t-1", payload={"i": i}))
+
+        assert len(await service.next_batch(sub, timeout=1, max_events=2)) == 2
+        assert len(await service.next_batch(sub, timeout=1)) == 3
+
+    @pytest.mark.unit
+    async def test_timeout_and_missing_subscription(self):
+        service = SSEPubSubService()
+        sub = await service.subscribe("t-1", "deployments_list")
+
+        assert await service.next_batch(sub, timeout=0.01) == []
+        assert await service.next_batch("missing", timeout=0.01) is None
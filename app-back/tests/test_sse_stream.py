@@ -0,0 +1,68 @@
+"""
+Unit tests for the event-driven SSE stream generator.
+"""
+import asyncio
+
+import pytest
+from unittest.mock import patch
+
+from app.api.endpoints import sse
+from app.services.sse_pubsub_service import SSEEvent, SSEPubSubService
+
+
+@pytest.fixture
+def pubsub():
+    service = SSEPubSubService()
+    with patch.object(sse, "sse_pubsub", service):
+        yield service
+
+
+class TestStreamSubscriptionEvents:
+    """Tests for _stream_subscription_events."""
+
+    @pytest.mark.unit
+    async def test_queued_events_written_as_one_chunk(self, pubsub):
+        sub = await pubsub.subscribe("t-1", "deployments_list")
+        for i in range(3):
+            await pubsub.publish(SSEEvent(type="deployment.upsert", tenant_id="t-1", payload={"i": i}))
+
+        stream = sse._stream_subscription_events(sub)
+        chunk = await asyncio.wait_for(stream.__anext__(), timeout=1)
+        await stream.aclose()
+
+        assert chunk.count("event: deployment.upsert") == 3
+        assert chunk.index('"i": 0') < chunk.index('"i": 2')
+
+    @pytest.mark.unit
+    async def test_wakes_immediately_on_publish(self, pubsub):
+        sub = await pubsub.subscribe("t-1", "deployments_list")
+        stream = sse._stream_subscription_events(sub)
+        pending = asyncio.ensure_future(stream.__anext__())
+
+        await asyncio.sleep(0.01)
+        assert not pending.done()
+        await pubsub.publish(SSEEvent(type="counts.update", tenant_id="t-1", payload={}))
+
+        chunk = await asyncio.wait_for(pending, timeout=0.5)
+        await stream.aclose()
+        assert chunk.startswith("event: counts.update")
+
+    @pytest.mark.unit
+    async def test_keepalive_sent_when_idle(self, pubsub):
+        sub = await pubsub.subscribe("t-1", "deployments_list")
+
+        with patch.object(sse, "KEEPALIVE_INTERVAL", 0.02):
+            stream = sse._stream_subscription_events(sub)
+            chunk = await asyncio.wait_for(stream.__anext__(), timeout=1)
+            await stream.aclose()
+
+        assert chunk == ": keepalive\n\n"
+
+    @pytest.mark.unit
+    async def test_ends_when_subscription_removed(self, pubsub):
+        sub = await pubsub.subscribe("t-1", "deployments_list")
+        await pubsub.unsubscribe(sub)
+
+        chunks = [chunk async for chunk in sse._stream_subscription_events(sub)]
+
+        assert chunks == []
@@ -0,0 +1,49 @@
+"""
+Unit tests for the TTL cache.
+"""
+import pytest
+from unittest.mock import patch
+
+from app.services.ttl_cache import TTLCache
+
+
+class TestTTLCache:
+    """Tests for TTLCache."""
+
+    @pytest.mark.unit
+    def test_get_and_default(self):
+        cache = TTLCache(max_entries=10, ttl_seconds=60)
+        cache.set("a", None)
+
+        assert cache.get("a", "missing") is None
+        assert cache.get("b", "missing") == "missing"
+        assert "a" in cache
+
+    @pytest.mark.unit
+    def test_entries_expire(self):
+        cache = TTLCache(max_entries=10, ttl_seconds=30)
+        with patch("app.services.ttl_cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+        with patch("app.services.ttl_cache.time.monotonic", return_value=131.0):
+            assert cache.get("a") is None
+
+        assert cache.get_metrics()["expirations"] == 1
+        assert len(cache) == 0
+
+    @pytest.mark.unit
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(max_entries=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get_metrics()["evictions"] == 1
+
+    @pytest.mark.unit
+    def test_disabled_with_zero_ttl(self):
+        cache = TTLCache(max_entries=10, ttl_seconds=0)
+        cache.set("a", 1)
+        assert cache.get("a") is None
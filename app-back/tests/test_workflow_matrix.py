@@ -0,0 +1,285 @@
+"""
+Tests for the workflow × environment matrix projection and its endpoint.
+"""
+import asyncio
+
+import pytest
+from unittest.mock import patch, AsyncMock
+from fastapi.testclient import TestClient
+
+from app.services.workflow_matrix_service import (
+    MatrixProjection,
+    TENANT_WIDE_CANONICAL_ID,
+    WorkflowMatrixService,
+)
+
+
+TENANT_ID = "00000000-0000-0000-0000-000000000001"
+
+ENVIRONMENTS = [
+    {"id": "env-dev", "n8n_name": "Dev", "n8n_type": "dev", "environment_class": "dev", "is_active": True},
+    {"id": "env-prod", "n8n_name": "Prod", "n8n_type": "prod", "environment_class": "production", "is_active": True},
+    {"id": "env-old", "n8n_name": "Old", "n8n_type": "dev", "environment_class": "dev", "is_active": False},
+]
+
+
+def _canonical(cid, created_at, name=None):
+    return {"canonical_id": cid, "display_name": name or cid.upper(), "created_at": created_at}
+
+
+def _mapping(cid, env_id, content_hash, status="linked", n8n_id=None):
+    return {
+        "canonical_id": cid, "environment_id": env_id, "status": status,
+        "env_content_hash": content_hash, "n8n_workflow_id": n8n_id or f"{cid}-{env_id}", "n8n_updated_at": None,
+    }
+
+
+def _git_state(cid, env_id, content_hash):
+    return {"canonical_id": cid, "environment_id": env_id, "git_content_hash": content_hash, "last_repo_sync_at": None}
+
+
+def _inputs(canonical_workflows=(), mappings=(), git_states=()):
+    return {
+        "canonical_workflows": list(canonical_workflows),
+        "mappings": list(mappings),
+        "git_states": list(git_states),
+    }
+
+
+def _full_inputs():
+    return _inputs(
+        [_canonical("c1", "2026-01-01T00:00:00+00:00"), _canonical("c2", "2026-02-01T00:00:00+00:00"),
+         _canonical("c3", "2026-03-01T00:00:00+00:00")],
+        [_mapping("c1", "env-dev", "h1"), _mapping("c2", "env-dev", "h2"), _mapping("c3", "env-dev", "h3"),
+         _mapping("c1", "env-prod", "h1-old")],
+        [_git_state("c1", "env-dev", "h1"), _git_state("c1", "env-prod", "h1")],
+    )
+
+
+def _columns():
+    return [{"id": env["id"], "name": env["n8n_name"], "type": env["n8n_type"],
+             "environment_class": env["environment_class"]} for env in ENVIRONMENTS if env["is_active"]]
+
+
+class TestMatrixProjection:
+    """Tests for computing and patching the per-tenant projection."""
+
+    @pytest.mark.unit
+    def test_full_apply_computes_cells_newest_first(self):
+        projection = MatrixProjection(1, _columns())
+        projection.apply(_full_inputs())
+
+        assert projection.order == ["c3", "c2", "c1"]
+        assert projection.cells["c1"]["env-dev"]["status"] == "linked"
+        assert projection.cells["c1"]["env-prod"]["status"] == "out_of_date"
+        assert projection.cells["c1"]["env-prod"]["can_sync"] is True
+        assert projection.cells["c2"]["env-prod"] is None
+        assert "env-old" not in projection.cells["c1"]
+
+    @pytest.mark.unit
+    def test_incremental_apply_matches_full_rebuild(self):
+        projection = MatrixProjection(1, _columns())
+        projection.apply(_full_inputs())
+
+        # c2 now has c3's content in dev (collision), c1 is deleted
+        changed = _inputs(
+            [_canonical("c2", "2026-02-01T00:00:00+00:00", name="Renamed")],
+            [_mapping("c2", "env-dev", "h3")],
+        )
+        projection.apply(changed, {"c1", "c2"})
+
+        full = _full_inputs()
+        full["canonical_workflows"] = [row for row in full["canonical_workflows"] if row["canonical_id"] != "c1"]
+        full["canonical_workflows"][0]["display_name"] = "Renamed"
+        full["mappings"] = [_mapping("c2", "env-dev", "h3"), _mapping("c3", "env-dev", "h3")]
+        full["git_states"] = []
+        rebuilt = MatrixProjection(1, _columns())
+        rebuilt.apply(full)
+
+        assert projection.order == rebuilt.order == ["c3", "c2"]
+        assert projection.cells == rebuilt.cells
+        assert projection.workflows == rebuilt.workflows
+
+    @pytest.mark.unit
+    def test_collision_warning_follows_shared_hash(self):
+        projection = MatrixProjection(1, _columns())
+        projection.apply(_full_inputs())
+        assert projection.cells["c3"]["env-dev"]["collision_warning"] is None
+
+        # c2 takes c3's hash: c3's warning appears although only c2 changed
+        projection.apply(_inputs([_canonical("c2", "2026-02-01T00:00:00+00:00")], [_mapping("c2", "env-dev", "h3")]), {"c2"})
+        assert "shared with 1 other workflow(s)" in projection.cells["c3"]["env-dev"]["collision_warning"]
+
+        # ... and disappears when c2 moves off it again
+        projection.apply(_inputs([_canonical("c2", "2026-02-01T00:00:00+00:00")], [_mapping("c2", "env-dev", "h2")]), {"c2"})
+        assert projection.cells["c3"]["env-dev"]["collision_warning"] is None
+
+    @pytest.mark.unit
+    def test_page_etag_is_stable_until_content_changes(self):
+        projection = MatrixProjection(1, _columns())
+        projection.apply(_full_inputs())
+
+        first = projection.page(1, 2)
+        assert [row["canonical_id"] for row in first["workflows"]] == ["c3", "c2"]
+        assert first["total_workflows"] == 3
+        assert projection.page(1, 2) is first
+        assert projection.page(2, 2)["etag"] != first["etag"]
+
+        projection.apply(_inputs([_canonical("c1", "2026-01-01T00:00:00+00:00")]), {"c1"})
+        assert projection.page(1, 2)["etag"] == first["etag"]
+
+        projection.apply(_inputs([_canonical("c3", "2026-03-01T00:00:00+00:00", name="New")]), {"c3"})
+        assert projection.page(1, 2)["etag"] != first["etag"]
+
+
+class TestWorkflowMatrixService:
+    """Tests for refreshing projections from the change log."""
+
+    @pytest.fixture
+    def service(self):
+        service = WorkflowMatrixService()
+        service.invalidate()
+        yield service
+        service.invalidate()
+
+    @pytest.fixture
+    def mock_db(self):
+        with patch("app.services.workflow_matrix_service.db_service") as mock_db:
+            mock_db.get_workflow_matrix_version = AsyncMock(return_value=10)
+            mock_db.get_workflow_matrix_changes = AsyncMock(return_value=[])
+            mock_db.get_environments = AsyncMock(return_value=ENVIRONMENTS)
+            mock_db.get_workflow_matrix_inputs = AsyncMock(return_value=_full_inputs())
+            yield mock_db
+
+    @pytest.mark.unit
+    async def test_unchanged_matrix_costs_one_change_query(self, service, mock_db):
+        first = await service.get_page(TENANT_ID, 1, 50)
+        second = await service.get_page(TENANT_ID, 1, 50)
+
+        assert second is first
+        mock_db.get_workflow_matrix_inputs.assert_awaited_once_with(TENANT_ID)
+        mock_db.get_workflow_matrix_changes.assert_awaited_once_with(TENANT_ID, 10)
+
+    @pytest.mark.unit
+    async def test_changed_workflows_reloaded_incrementally(self, service, mock_db):
+        await service.get_page(TENANT_ID, 1, 50)
+        mock_db.get_workflow_matrix_changes.return_value = [
+            {"canonical_id": "c2", "version": 12}, {"canonical_id": "c1", "version": 11},
+        ]
+        mock_db.get_workflow_matrix_inputs.return_value = _inputs(
+            [_canonical("c1", "2026-01-01T00:00:00+00:00"), _canonical("c2", "2026-02-01T00:00:00+00:00")],
+            [_mapping("c2", "env-prod", "h2")],
+        )
+
+        page = await service.get_page(TENANT_ID, 1, 50)
+
+        mock_db.get_workflow_matrix_inputs.assert_awaited_with(TENANT_ID, ["c1", "c2"])
+        mock_db.get_environments.assert_awaited_once()
+        assert page["matrix"]["c2"]["env-prod"]["status"] == "linked"
+        assert page["matrix"]["c1"] == {"env-dev": None, "env-prod": None}
+        assert service._cache.get(TENANT_ID).version == 12
+
+    @pytest.mark.unit
+    async def test_tenant_wide_change_rebuilds(self, service, mock_db):
+        await service.get_page(TENANT_ID, 1, 50)
+        mock_db.get_workflow_matrix_changes.return_value = [{"canonical_id": TENANT_WIDE_CANONICAL_ID, "version": 11}]
+        mock_db.get_workflow_matrix_version.return_value = 11
+
+        await service.get_page(TENANT_ID, 1, 50)
+
+        assert mock_db.get_environments.await_count == 2
+        assert mock_db.get_workflow_matrix_inputs.await_args_list[-1].args == (TENANT_ID,)
+
+    @pytest.mark.unit
+    async def test_large_change_set_rebuilds(self, service, mock_db):
+        await service.get_page(TENANT_ID, 1, 50)
+        mock_db.get_workflow_matrix_changes.return_value = [
+            {"canonical_id": f"c{i}", "version": 10 + i} for i in range(1, 5)
+        ]
+
+        with patch("app.services.workflow_matrix_service.settings.WORKFLOW_MATRIX_INCREMENTAL_MAX_CHANGES", 3):
+            await service.get_page(TENANT_ID, 1, 50)
+
+        assert mock_db.get_environments.await_count == 2
+
+    @pytest.mark.unit
+    async def test_concurrent_refreshes_apply_changes_once(self, service, mock_db):
+        """A request must not apply inputs it loaded over newer ones applied by another."""
+        await service.get_page(TENANT_ID, 1, 50)
+        log = [{"canonical_id": "c2", "version": 11}]
+        mock_db.get_workflow_matrix_changes.side_effect = (
+            lambda tenant_id, since: [row for row in log if row["version"] > since]
+        )
+
+        async def slow_inputs(tenant_id, canonical_ids=None):
+            await asyncio.sleep(0.01)
+            return _inputs([_canonical("c2", "2026-02-01T00:00:00+00:00", name="Renamed")])
+
+        mock_db.get_workflow_matrix_inputs.side_effect = slow_inputs
+
+        first, second = await asyncio.gather(
+            service.get_page(TENANT_ID, 1, 50), service.get_page(TENANT_ID, 1, 50)
+        )
+
+        assert mock_db.get_workflow_matrix_inputs.await_count == 2  # initial build + one incremental load
+        assert first is second
+        assert service._cache.get(TENANT_ID).version == 11
+
+    @pytest.mark.unit
+    async def test_missing_change_log_serves_uncached(self, service, mock_db):
+        mock_db.get_workflow_matrix_version.side_effect = Exception('relation "workflow_matrix_versions" does not exist')
+
+        page = await service.get_page(TENANT_ID, 1, 50)
+        await service.get_page(TENANT_ID, 1, 50)
+
+        assert page["total_workflows"] == 3
+        assert mock_db.get_workflow_matrix_inputs.await_count == 2
+        mock_db.get_workflow_matrix_changes.assert_not_called()
+
+
+@pytest.fixture
+def mock_entitlements():
+    with patch("app.core.entitlements_gate.entitlements_service") as mock_ent:
+        mock_ent.enforce_flag = AsyncMock(return_value=None)
+        mock_ent.has_flag = AsyncMock(return_value=True)
+        yield mock_ent
+
+
+class TestWorkflowMatrixAPI:
+    """Tests for GET /api/v1/workflows/matrix."""
+
+    @pytest.fixture
+    def matrix_page(self):
+        projection = MatrixProjection(1, _columns())
+        projection.apply(_full_inputs())
+        return projection.page(1, 50)
+
+    @pytest.mark.api
+    def test_returns_matrix_with_etag(self, client: TestClient, auth_headers, mock_entitlements, matrix_page):
+        with patch("app.api.endpoints.workflow_matrix.workflow_matrix_service") as mock_service:
+            mock_service.get_page = AsyncMock(return_value=matrix_page)
+
+            response = client.get("/api/v1/workflows/matrix", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.headers["etag"] == matrix_page["etag"]
+        data = response.json()
+        assert [row["canonicalId"] for row in data["workflows"]] == ["c3", "c2", "c1"]
+        assert [env["environmentClass"] for env in data["environments"]] == ["dev", "production"]
+        assert data["matrix"]["c1"]["env-prod"]["status"] == "out_of_date"
+        assert data["matrix"]["c2"]["env-prod"] is None
+        assert data["pageMetadata"]["totalWorkflows"] == 3
+
+    @pytest.mark.api
+    def test_matching_if_none_match_returns_304(self, client: TestClient, auth_headers, mock_entitlements, matrix_page):
+        with patch("app.api.endpoints.workflow_matrix.workflow_matrix_service") as mock_service:
+            mock_service.get_page = AsyncMock(return_value=matrix_page)
+
+            response = client.get(
+                "/api/v1/workflows/matrix",
+                headers={**auth_headers, "If-None-Match": f'"stale", W/{matrix_page["etag"]}'},
+            )
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == matrix_page["etag"]
@@ -0,0 +1,155 @@
+"""
+Unit tests for single-pass workflow normalization and memoized content hashing.
+"""
+import copy
+import json
+import pytest
+from unittest.mock import patch
+
+from app.services import canonical_workflow_service
+from app.services.canonical_workflow_service import (
+    clear_hash_registry,
+    compute_workflow_hash,
+    workflow_content_digest,
+    workflow_identity_key,
+)
+from app.services.git_snapshot_service import normalize_workflow_for_hash
+from app.services.promotion_service import normalize_workflow_for_comparison
+
+
+def _deep_copy_normalize(workflow):
+    """Reference implementation: deep copy via JSON round-trip, then strip fields."""
+    normalized = json.loads(json.dumps(workflow))
+    for field in [
+        'id', 'createdAt', 'updatedAt', 'versionId', 'triggerCount', 'staticData', 'meta', 'hash',
+        'executionOrder', 'homeProject', 'sharedWithProjects', '_comment', 'pinData', 'active',
+        'tags', 'tagIds', 'shared', 'scopes', 'usedCredentials',
+    ]:
+        normalized.pop(field, None)
+    if 'settings' in normalized and isinstance(normalized['settings'], dict):
+        for field in [
+            'executionOrder', 'saveDataErrorExecution', 'saveDataSuccessExecution',
+            'callerPolicy', 'timezone', 'saveManualExecutions', 'availableInMCP',
+        ]:
+            normalized['settings'].pop(field, None)
+        if not normalized['settings']:
+            normalized.pop('settings', None)
+    if 'nodes' in normalized and isinstance(normalized['nodes'], list):
+        for node in normalized['nodes']:
+            for field in [
+                'position', 'positionAbsolute', 'selected', 'selectedNodes', 'executionData',
+                'typeVersion', 'onError', 'id', 'webhookId', 'extendsCredential', 'notesInFlow',
+            ]:
+                node.pop(field, None)
+            if 'credentials' in node and isinstance(node['credentials'], dict):
+                node['credentials'] = {
+                    cred_type: {'name': cred_ref.get('name')} if isinstance(cred_ref, dict) else cred_ref
+                    for cred_type, cred_ref in node['credentials'].items()
+                }
+        normalized['nodes'] = sorted(normalized['nodes'], key=lambda n: n.get('name', ''))
+    return normalized
+
+
+@pytest.fixture
+def workflow():
+    return {
+        "id": "wf-1",
+        "name": "Orders",
+        "active": True,
+        "versionId": "v-7",
+        "updatedAt": "2026-10-01T10:00:00.000Z",
+        "createdAt": "2026-01-01T00:00:00.000Z",
+        "tags": [{"id": "t1", "name": "prod"}],
+        "pinData": {"Webhook": [{"json": {}}]},
+        "settings": {"executionOrder": "v1", "timezone": "UTC", "errorWorkflow": "wf-err"},
+        "nodes": [
+            {
+                "id": "n2", "name": "Slack", "type": "n8n-nodes-base.slack", "typeVersion": 2,
+                "position": [400, 300], "parameters": {"channel": "#ops"},
+                "credentials": {"slackApi": {"id": "cred-9", "name": "Slack Bot"}, "legacy": "raw"},
+            },
+            {
+                "id": "n1", "name": "Webhook", "type": "n8n-nodes-base.webhook", "webhookId": "hook-1",
+                "position": [200, 300], "parameters": {"path": "orders"},
+            },
+        ],
+        "connections": {"Webhook": {"main": [[{"node": "Slack", "type": "main", "index": 0}]]}},
+    }
+
+
+class TestNormalizeWorkflowForComparison:
+    """Tests for the single-pass normalizer."""
+
+    @pytest.mark.unit
+    def test_matches_deep_copy_implementation(self, workflow):
+        assert normalize_workflow_for_comparison(workflow) == _deep_copy_normalize(workflow)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("workflow", [
+        {},
+        {"name": "No nodes", "settings": {"timezone": "UTC"}},
+        {"name": "Odd shapes", "settings": "inherit", "nodes": "none", "connections": {}},
+        {"name": "Empty node list", "nodes": [], "settings": {}},
+    ])
+    def test_matches_deep_copy_implementation_for_edge_shapes(self, workflow):
+        assert normalize_workflow_for_comparison(workflow) == _deep_copy_normalize(workflow)
+
+    @pytest.mark.unit
+    def test_does_not_modify_input(self, workflow):
+        original = copy.deepcopy(workflow)
+
+        normalize_workflow_for_comparison(workflow)
+
+        assert workflow == original
+
+    @pytest.mark.unit
+    def test_git_snapshot_normalizer_shares_rules(self, workflow):
+        assert normalize_workflow_for_hash(workflow) == normalize_workflow_for_comparison(workflow)
+
+
+class TestMemoizedWorkflowHash:
+    """Tests for digest memoization keyed by workflow identity."""
+
+    @pytest.fixture(autouse=True)
+    def _fresh_registry(self):
+        clear_hash_registry()
+        yield
+        clear_hash_registry()
+
+    @pytest.mark.unit
+    def test_identity_key_requires_version_fields(self, workflow):
+        assert workflow_identity_key(workflow) == "wf-1|v-7|2026-10-01T10:00:00.000Z|2"
+        assert workflow_identity_key({**workflow, "versionId": None}) is None
+        assert workflow_identity_key({k: v for k, v in workflow.items() if k != "updatedAt"}) is None
+
+    @pytest.mark.unit
+    def test_list_summary_does_not_share_full_workflow_key(self, workflow):
+        summary = {k: v for k, v in workflow.items() if k != "nodes"}
+
+        assert workflow_identity_key(summary) != workflow_identity_key(workflow)
+
+    @pytest.mark.unit
+    def test_memoized_hash_normalizes_once_per_version(self, workflow):
+        with patch.object(
+            canonical_workflow_service,
+            "normalize_workflow_for_comparison",
+            wraps=normalize_workflow_for_comparison,
+        ) as normalize:
+            first = compute_workflow_hash(workflow, memoize=True)
+            second = compute_workflow_hash(copy.deepcopy(workflow), memoize=True)
+            digest = workflow_content_digest(workflow, memoize=True)
+            bumped = compute_workflow_hash({**workflow, "versionId": "v-8"}, memoize=True)
+
+        assert first == second == digest[0] == bumped
+        assert normalize.call_count == 2
+
+    @pytest.mark.unit
+    def test_memoized_and_plain_hashes_agree(self, workflow):
+        assert compute_workflow_hash(workflow, memoize=True) == compute_workflow_hash(workflow)
+
+    @pytest.mark.unit
+    def test_plain_hash_is_not_memoized(self, workflow):
+        compute_workflow_hash(workflow)
+        edited = {**workflow, "nodes": list(reversed(workflow["nodes"])), "name": "Edited in Git"}
+
+        assert compute_workflow_hash(edited) != compute_workflow_hash(workflow)